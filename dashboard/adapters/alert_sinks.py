@@ -0,0 +1,72 @@
+"""Alert delivery sinks.
+
+Each sink exposes ``send(event: dict)``. Delivery failures raise; the alert engine
+records them without losing the alert state transition.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class MemorySink:
+    """Keeps events in memory. Local stand-in for tests and dry runs."""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+
+    def send(self, event: Dict[str, Any]) -> None:
+        self.events.append(dict(event))
+
+
+class FileSink:
+    """Appends one JSON line per event."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def send(self, event: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(event, sort_keys=True) + "\n")
+
+
+class WebhookSink:
+    """POSTs the event as JSON."""
+
+    def __init__(self, url: str, timeout: float = 10.0, headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def send(self, event: Dict[str, Any]) -> None:
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps(event).encode("utf-8"),
+            headers=self.headers,
+            method="POST",
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            if resp.status >= 400:
+                raise RuntimeError(f"webhook returned HTTP {resp.status}")
+
+
+def sinks_for_channels(channels: List[str], events_path: Path, webhook_url: Optional[str] = None) -> List:
+    """
+    Map spec ``alerting.channels`` to sinks:
+      ui_badge          -> FileSink(events_path) (the dashboard reads active alerts from engine state)
+      webhook_optional  -> WebhookSink if a URL is given or MT_ALERT_WEBHOOK_URL is set
+      email_optional    -> not implemented; skipped
+    """
+    sinks: List = []
+    url = webhook_url or os.environ.get("MT_ALERT_WEBHOOK_URL", "")
+    for ch in channels:
+        if ch == "ui_badge":
+            sinks.append(FileSink(events_path))
+        elif ch == "webhook_optional" and url:
+            sinks.append(WebhookSink(url))
+    return sinks
@@ -0,0 +1,93 @@
+"""Commodity price adapter.
+
+The spec names commodities by symbol (COPPER, SILVER, ...) with futures-style
+aliases (``/HG``). Aliases resolve to the continuous front-month contract on
+Yahoo (``/HG`` -> ``HG=F``), and histories are cached in the same local
+PriceStore as equities, keyed by the resolved ticker. A stored series is only
+refetched once its file is older than ``max_age`` seconds.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from adapters.market_data import PriceSeries
+from adapters.price_store import PriceStore
+
+# Explicit front-month tickers; any other "/XX" alias falls back to "XX=F".
+FRONT_MONTH = {
+    "/HG": "HG=F",
+    "/SI": "SI=F",
+    "/GC": "GC=F",
+    "/CL": "CL=F",
+}
+
+DEFAULT_MAX_AGE = 6 * 3600
+
+
+@dataclass(frozen=True)
+class Commodity:
+    symbol: str  # spec name, e.g. COPPER
+    ticker: str  # fetchable front-month ticker, e.g. HG=F
+    unit: str = ""
+    aliases: Tuple[str, ...] = ()
+
+
+def resolve_alias(alias: str) -> str:
+    if alias in FRONT_MONTH:
+        return FRONT_MONTH[alias]
+    if alias.startswith("/"):
+        return alias[1:] + "=F"
+    return alias
+
+
+def commodities_from_spec(spec: Dict) -> List[Commodity]:
+    """data_contract.required_inputs.commodities with each entry's first alias resolved."""
+    out = []
+    for item in spec.get("data_contract", {}).get("required_inputs", {}).get("commodities", []):
+        sym = item.get("symbol")
+        if not sym:
+            continue
+        aliases = tuple(item.get("aliases", []))
+        ticker = resolve_alias(aliases[0]) if aliases else sym
+        out.append(Commodity(symbol=sym, ticker=ticker, unit=item.get("unit", ""), aliases=aliases))
+    return out
+
+
+def is_stale(store: PriceStore, ticker: str, interval: str = "1d", max_age: float = DEFAULT_MAX_AGE) -> bool:
+    path = store.path_for(ticker, interval)
+    try:
+        return time.time() - path.stat().st_mtime > max_age
+    except OSError:
+        return True
+
+
+def fetch_commodities(
+    commodities: List[Commodity],
+    store: Optional[PriceStore] = None,
+    period: str = "2y",
+    interval: str = "1d",
+    max_age: float = DEFAULT_MAX_AGE,
+    refresh: bool = True,
+) -> Tuple[Dict[str, PriceSeries], Dict[str, str]]:
+    """
+    ({spec symbol: PriceSeries}, {spec symbol: error}) served from the store.
+
+    Stale or missing tickers are refreshed first (unless ``refresh`` is False); a failed
+    refresh falls back to whatever history the store already holds.
+    """
+    store = store or PriceStore()
+    stale = [c.ticker for c in commodities if refresh and is_stale(store, c.ticker, interval, max_age)]
+    results = store.refresh(stale, period=period, interval=interval) if stale else {}
+
+    series: Dict[str, PriceSeries] = {}
+    errors: Dict[str, str] = {}
+    for c in commodities:
+        ps = store.load(c.ticker, interval)
+        if ps is not None and ps.dates:
+            series[c.symbol] = ps
+        else:
+            errors[c.symbol] = results.get(c.ticker) if results.get(c.ticker, "OK") != "OK" else f"No stored data for {c.ticker}"
+    return series, errors
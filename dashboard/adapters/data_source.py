@@ -0,0 +1,363 @@
+"""Pluggable upstream data source behind fetch_prices / fetch_prices_batch / fetch_macro.
+
+Selected once per process from the environment:
+
+  MT_DATA_SOURCE       live (default) | record | replay
+  MT_FIXTURE_DIR       fixture root (default var/dashboard/fixtures)
+  MT_FAULT_LATENCY_MS  simulated latency per upstream call: "50" or a range "20-200"
+  MT_FAULT_ERROR_RATE  probability (0..1) that an upstream call fails
+  MT_FAULT_SEED        seed for the two above (default 0)
+
+live    yfinance (and the macro adapter), as before.
+record  live, and every successful response is written to the fixture dir.
+replay  fixtures only, no network: price requests are answered from the longest
+        recorded history for (symbol, interval), cut to the requested period; a
+        symbol with no fixture fails exactly like an unknown ticker would.
+
+Fixtures are plain JSON per series (prices/<interval>/<symbol>.json,
+macro/<series>.json) and CSV per symbol for corporate actions, so they can be
+checked in or hand-edited. The fault settings wrap any mode (set_source() takes
+explicit ones), and every source counts its upstream calls in ``stats``, which
+is what load tests read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from adapters.market_data import CLOSE, PriceSeries
+
+DEFAULT_FIXTURE_DIR = Path(__file__).resolve().parents[2] / "var" / "dashboard" / "fixtures"
+MODES = ("live", "record", "replay")
+
+
+def _safe(name: str) -> str:
+    return name.replace("/", "_")
+
+
+class DataSource:
+    """Live upstream (yfinance + macro adapter)."""
+
+    mode = "live"
+
+    def __init__(self):
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def fetch_prices(self, symbols: List[str], period: str, interval: str) -> Dict[str, PriceSeries]:
+        from adapters.market_data import _live_fetch_prices
+
+        self._count("prices")
+        return _live_fetch_prices(symbols, period, interval)
+
+    def fetch_prices_batch(self, symbols: List[str], period: str, interval: str) -> Dict[str, PriceSeries]:
+        from adapters.market_data import _live_fetch_prices_batch
+
+        self._count("prices_batch")
+        return _live_fetch_prices_batch(symbols, period, interval)
+
+    def fetch_macro(self, series_ids: List[str]) -> Dict[str, object]:
+        from adapters.macro_data import _live_fetch_macro
+
+        self._count("macro")
+        return _live_fetch_macro(series_ids)
+
+    def fetch_actions(self, symbol: str):
+        from adapters.dividend_data import _live_fetch_actions
+
+        self._count("actions")
+        return _live_fetch_actions(symbol)
+
+
+class Fixtures:
+    """Read/write recorded responses under ``root``."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else DEFAULT_FIXTURE_DIR
+        self._lock = threading.Lock()
+
+    def price_path(self, symbol: str, interval: str) -> Path:
+        return self.root / "prices" / interval / f"{_safe(symbol)}.json"
+
+    def macro_path(self, series_id: str) -> Path:
+        return self.root / "macro" / f"{_safe(series_id)}.json"
+
+    def actions_path(self, symbol: str) -> Path:
+        return self.root / "actions" / f"{_safe(symbol)}.csv"
+
+    @staticmethod
+    def _write(path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+
+    def save_prices(self, symbol: str, interval: str, ps: PriceSeries) -> None:
+        import pandas as pd
+
+        path = self.price_path(symbol, interval)
+        with self._lock:
+            old = self.load_prices(symbol, interval)
+            if old is not None and len(old.dates) > len(ps.dates):
+                return  # keep the longest recording; replay cuts it to the requested period
+            doc = {
+                "symbol": symbol,
+                "interval": interval,
+                "close_kind": ps.close_kind,
+                "dates": [pd.Timestamp(d).isoformat() for d in ps.dates],
+                "close": ps.close,
+            }
+            self._write(path, json.dumps(doc))
+
+    def load_prices(self, symbol: str, interval: str) -> Optional[PriceSeries]:
+        import pandas as pd
+
+        from adapters.market_data import bar_time_utc
+
+        try:
+            doc = json.loads(self.price_path(symbol, interval).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        dates = list(pd.DatetimeIndex(doc["dates"]))
+        last_bar = bar_time_utc(dates[-1]) if dates else ""
+        return PriceSeries(
+            dates=dates,
+            close=[float(v) for v in doc["close"]],
+            as_of_utc=last_bar,
+            last_bar_utc=last_bar,
+            fetched_utc=pd.Timestamp.now("UTC").isoformat(),  # replayed "now"
+            close_kind=doc.get("close_kind") or CLOSE,
+        )
+
+    def save_macro(self, series_id: str, ms) -> None:
+        doc = {"series": ms.series, "dates": list(ms.dates), "values": list(ms.values), "as_of_utc": ms.as_of_utc}
+        self._write(self.macro_path(series_id), json.dumps(doc))
+
+    def load_macro(self, series_id: str):
+        from adapters.macro_data import MacroSeries
+
+        try:
+            doc = json.loads(self.macro_path(series_id).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return MacroSeries(doc["series"], doc["dates"], doc["values"], doc.get("as_of_utc", ""))
+
+    def save_actions(self, symbol: str, df) -> None:
+        path = self.actions_path(symbol)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, index_label="date")
+
+    def load_actions(self, symbol: str):
+        import pandas as pd
+
+        path = self.actions_path(symbol)
+        if not path.is_file():
+            return None
+        return pd.read_csv(path, parse_dates=["date"]).set_index("date").sort_index()
+
+
+class RecordingSource(DataSource):
+    """Live, and every successful response is saved as a fixture."""
+
+    mode = "record"
+
+    def __init__(self, fixtures: Fixtures):
+        super().__init__()
+        self.fixtures = fixtures
+
+    def fetch_prices(self, symbols, period, interval):
+        out = super().fetch_prices(symbols, period, interval)
+        for sym, ps in out.items():
+            self.fixtures.save_prices(sym, interval, ps)
+        return out
+
+    def fetch_prices_batch(self, symbols, period, interval):
+        out = super().fetch_prices_batch(symbols, period, interval)
+        for sym, ps in out.items():
+            self.fixtures.save_prices(sym, interval, ps)
+        return out
+
+    def fetch_macro(self, series_ids):
+        out = super().fetch_macro(series_ids)
+        for sid, ms in out.items():
+            self.fixtures.save_macro(sid, ms)
+        return out
+
+    def fetch_actions(self, symbol):
+        df = super().fetch_actions(symbol)
+        self.fixtures.save_actions(symbol, df)
+        return df
+
+
+class ReplaySource(DataSource):
+    """Recorded fixtures only; never touches the network."""
+
+    mode = "replay"
+
+    def __init__(self, fixtures: Fixtures):
+        super().__init__()
+        self.fixtures = fixtures
+
+    def _series(self, symbol: str, period: str, interval: str) -> Optional[PriceSeries]:
+        import bisect
+        from dataclasses import replace
+        from datetime import timedelta
+
+        from utils.prefetch import MAX_DAYS, period_days
+
+        ps = self.fixtures.load_prices(symbol, interval)
+        if ps is None or not ps.dates:
+            return None
+        days = period_days(period)
+        if days >= MAX_DAYS:
+            return ps
+        # Same cut as PrefetchResult.slice: bars strictly after (last bar - period).
+        i = bisect.bisect_right(ps.dates, ps.dates[-1] - timedelta(days=days))
+        return replace(ps, dates=ps.dates[i:], close=ps.close[i:])
+
+    def fetch_prices(self, symbols, period, interval):
+        self._count("prices")
+        out = {}
+        for sym in symbols:
+            ps = self._series(sym, period, interval)
+            if ps is None:
+                raise RuntimeError(f"replay: no fixture for {sym} ({interval})")
+            out[sym] = ps
+        return out
+
+    def fetch_prices_batch(self, symbols, period, interval):
+        self._count("prices_batch")
+        out = {}
+        for sym in symbols:
+            ps = self._series(sym, period, interval)
+            if ps is not None:
+                out[sym] = ps
+        return out
+
+    def fetch_macro(self, series_ids):
+        self._count("macro")
+        out = {}
+        for sid in series_ids:
+            ms = self.fixtures.load_macro(sid)
+            if ms is None:
+                raise RuntimeError(f"replay: no fixture for macro series {sid}")
+            out[sid] = ms
+        return out
+
+    def fetch_actions(self, symbol):
+        import pandas as pd
+
+        self._count("actions")
+        df = self.fixtures.load_actions(symbol)
+        if df is None:  # no recording: behave like a symbol without actions
+            return pd.DataFrame(columns=["amount", "split"], index=pd.DatetimeIndex([], name="date"), dtype=float)
+        return df
+
+
+class FaultInjector:
+    """Wraps a source with latency and random failures (deterministic per call key)."""
+
+    def __init__(self, inner: DataSource, latency_ms: Tuple[float, float] = (0.0, 0.0), error_rate: float = 0.0, seed: int = 0):
+        self.inner = inner
+        self.mode = inner.mode
+        self.stats = inner.stats
+        self.latency_ms = latency_ms
+        self.error_rate = float(error_rate)
+        self.seed = seed
+        self._seq: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _rng(self, key: str) -> random.Random:
+        # Same key -> same sequence of delays/failures, whatever the thread interleaving.
+        with self._lock:
+            self._seq[key] += 1
+            n = self._seq[key]
+        digest = hashlib.sha256(f"{self.seed}:{key}:{n}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _before(self, key: str) -> None:
+        rng = self._rng(key)
+        lo, hi = self.latency_ms
+        if hi > 0:
+            time.sleep(rng.uniform(lo, hi) / 1000.0)
+        if self.error_rate and rng.random() < self.error_rate:
+            self.inner._count("injected_errors")
+            raise RuntimeError(f"injected upstream failure ({key})")
+
+    def fetch_prices(self, symbols, period, interval):
+        self._before(f"prices:{','.join(symbols)}:{period}:{interval}")
+        return self.inner.fetch_prices(symbols, period, interval)
+
+    def fetch_prices_batch(self, symbols, period, interval):
+        self._before(f"batch:{','.join(symbols)}:{period}:{interval}")
+        return self.inner.fetch_prices_batch(symbols, period, interval)
+
+    def fetch_macro(self, series_ids):
+        self._before(f"macro:{','.join(series_ids)}")
+        return self.inner.fetch_macro(series_ids)
+
+    def fetch_actions(self, symbol):
+        self._before(f"actions:{symbol}")
+        return self.inner.fetch_actions(symbol)
+
+
+def _parse_latency(text: str) -> Tuple[float, float]:
+    if not text:
+        return (0.0, 0.0)
+    lo, _, hi = text.partition("-")
+    return (float(lo), float(hi or lo))
+
+
+def build_source(
+    mode: str = "live",
+    fixture_dir: Optional[Path] = None,
+    latency_ms: Tuple[float, float] = (0.0, 0.0),
+    error_rate: float = 0.0,
+    seed: int = 0,
+):
+    if mode not in MODES:
+        raise ValueError(f"data source mode must be one of {MODES}, got {mode!r}")
+    fixtures = Fixtures(fixture_dir)
+    src = {"live": DataSource, "record": lambda: RecordingSource(fixtures), "replay": lambda: ReplaySource(fixtures)}[mode]()
+    if latency_ms[1] > 0 or error_rate > 0:
+        src = FaultInjector(src, latency_ms, error_rate, seed)
+    return src
+
+
+_source = None
+_source_lock = threading.Lock()
+
+
+def get_source():
+    global _source
+    if _source is None:
+        with _source_lock:
+            if _source is None:
+                fixture_dir = os.environ.get("MT_FIXTURE_DIR")
+                _source = build_source(
+                    os.environ.get("MT_DATA_SOURCE", "live").strip().lower() or "live",
+                    Path(fixture_dir) if fixture_dir else None,
+                    _parse_latency(os.environ.get("MT_FAULT_LATENCY_MS", "")),
+                    float(os.environ.get("MT_FAULT_ERROR_RATE", "0") or 0),
+                    int(os.environ.get("MT_FAULT_SEED", "0") or 0),
+                )
+    return _source
+
+
+def set_source(source) -> None:
+    """Install a source for this process (harnesses, tests); None re-reads the environment."""
+    global _source
+    with _source_lock:
+        _source = source
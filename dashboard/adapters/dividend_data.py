@@ -0,0 +1,148 @@
+"""Local corporate-action cache (cash dividends and splits).
+
+One CSV of (date, amount, split) per symbol under ``var/dashboard/dividends/``,
+next to the price store: ``amount`` is the cash dividend per share (0 on a
+split-only row), ``split`` the split ratio (0 when none). Used for income
+estimates (the trailing-12-month sum of dividends per share) and for adjusted
+price views (utils/adjustment.py), which are recomputed from the stored closes
+whenever an action appears instead of refetching price history.
+
+A symbol is refetched only when its file is older than ``max_age`` seconds;
+symbols with no actions are cached as an empty file. Files from before splits
+were cached (no ``split`` column) still serve dividends, and are refetched by
+``refresh(..., need_splits=True)``.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+
+# pandas is imported where used, so app.py can import the store before its first render.
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_DIVIDEND_ROOT = Path(__file__).resolve().parents[2] / "var" / "dashboard" / "dividends"
+DEFAULT_MAX_AGE = 24 * 3600
+
+
+ACTION_COLUMNS = ["amount", "split"]
+
+
+def _naive_dates(index) -> pd.DatetimeIndex:
+    import pandas as pd
+
+    idx = pd.DatetimeIndex(index)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    return idx.normalize()
+
+
+def fetch_actions(symbol: str) -> pd.DataFrame:
+    """Dividends and splits (columns ``amount``, ``split``; tz-naive dates) via the configured data source."""
+    from adapters.data_source import get_source
+
+    return get_source().fetch_actions(symbol)
+
+
+def _live_fetch_actions(symbol: str) -> pd.DataFrame:
+    import pandas as pd
+    import yfinance as yf
+
+    df = yf.Ticker(symbol).actions
+    if df is None or df.empty:
+        return pd.DataFrame(columns=ACTION_COLUMNS, index=pd.DatetimeIndex([], name="date"), dtype=float)
+    out = pd.DataFrame(
+        {
+            "amount": df.get("Dividends", pd.Series(0.0, index=df.index)).to_numpy(dtype=float),
+            "split": df.get("Stock Splits", pd.Series(0.0, index=df.index)).to_numpy(dtype=float),
+        },
+        index=_naive_dates(df.index).rename("date"),
+    )
+    return out.groupby(level=0).agg({"amount": "sum", "split": "max"}).sort_index()
+
+
+class DividendStore:
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else DEFAULT_DIVIDEND_ROOT
+
+    def path_for(self, symbol: str) -> Path:
+        return self.root / (symbol.replace("/", "_") + ".csv")
+
+    def _read(self, symbol: str) -> Optional[pd.DataFrame]:
+        import pandas as pd
+
+        path = self.path_for(symbol)
+        if not path.is_file():
+            return None
+        return pd.read_csv(path, parse_dates=["date"]).set_index("date").sort_index()
+
+    def load(self, symbol: str) -> Optional[pd.Series]:
+        """Cash dividends per share (split-only rows dropped)."""
+        df = self._read(symbol)
+        if df is None:
+            return None
+        s = df["amount"]
+        return s[s != 0] if "split" in df.columns else s
+
+    def load_actions(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Dividends and splits (``amount``, ``split``), or None if splits were never cached."""
+        df = self._read(symbol)
+        if df is None or "split" not in df.columns:
+            return None
+        return df[ACTION_COLUMNS]
+
+    def version(self, symbol: str) -> float:
+        """Changes whenever the symbol's actions are rewritten (cache key for adjusted views)."""
+        try:
+            return self.path_for(symbol).stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def save(self, symbol: str, data: Union[pd.Series, pd.DataFrame]) -> Path:
+        """A dividend Series (``amount`` only) or an actions DataFrame (``amount``, ``split``)."""
+        import pandas as pd
+
+        path = self.path_for(symbol)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".csv.tmp")
+        frame = data.rename("amount").to_frame() if isinstance(data, pd.Series) else data[ACTION_COLUMNS]
+        frame.to_csv(tmp, index_label="date")
+        tmp.replace(path)
+        return path
+
+    def is_stale(self, symbol: str, max_age: float = DEFAULT_MAX_AGE) -> bool:
+        try:
+            return time.time() - self.path_for(symbol).stat().st_mtime > max_age
+        except OSError:
+            return True
+
+    def refresh(self, symbols: Iterable[str], max_age: float = DEFAULT_MAX_AGE, need_splits: bool = False) -> Dict[str, str]:
+        """Refetch stale symbols (dividends and splits). Returns {symbol: "OK" | error} for the ones attempted."""
+        results: Dict[str, str] = {}
+        for sym in symbols:
+            if not self.is_stale(sym, max_age) and not (need_splits and self.load_actions(sym) is None):
+                continue
+            try:
+                self.save(sym, fetch_actions(sym))
+                results[sym] = "OK"
+            except Exception as e:
+                results[sym] = str(e)
+        return results
+
+    def trailing_annual(self, symbols: List[str], as_of: Optional[pd.Timestamp] = None) -> Tuple[Dict[str, float], List[str]]:
+        """({symbol: TTM dividends per share}, symbols with no cached history)."""
+        import pandas as pd
+
+        as_of = pd.Timestamp(as_of or pd.Timestamp.utcnow().tz_localize(None)).normalize()
+        start = as_of - pd.DateOffset(years=1)
+        out: Dict[str, float] = {}
+        missing: List[str] = []
+        for sym in symbols:
+            s = self.load(sym)
+            if s is None:
+                missing.append(sym)
+                continue
+            out[sym] = float(s[(s.index > start) & (s.index <= as_of)].sum())
+        return out, missing
@@ -12,5 +12,11 @@ class MacroSeries:
     as_of_utc: str
 
 def fetch_macro(series_ids: List[str]) -> Dict[str, MacroSeries]:
+    # Goes through the configured data source (live / record / replay fixtures).
+    from adapters.data_source import get_source
+
+    return get_source().fetch_macro(list(series_ids))
+
+def _live_fetch_macro(series_ids: List[str]) -> Dict[str, MacroSeries]:
     # TODO: Implement (e.g., FRED, BLS API, BEA, etc.)
     raise NotImplementedError("Implement macro fetching")
@@ -1,16 +1,37 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import numpy as np
-import pandas as pd
-import yfinance as yf
+# numpy/pandas/yfinance are imported where used: importing this module (e.g. for
+# PriceSeries) must stay cheap, and yfinance is only needed on an actual fetch.
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 
 @dataclass
 class PriceSeries:
     dates: List[pd.Timestamp]
     close: List[float]
-    as_of_utc: str
+    as_of_utc: str  # timestamp of the last bar (UTC ISO); kept for existing readers
+    last_bar_utc: str = ""  # same as as_of_utc when known
+    fetched_utc: str = ""  # when the data was downloaded
+    close_kind: str = ""  # CLOSE (split-adjusted only) or ADJ_CLOSE (split + dividend adjusted); "" if unknown
+
+
+# Which yfinance column a series came from. With auto_adjust=False, "Close" is
+# split-adjusted but not dividend-adjusted; "Adj Close" is both.
+CLOSE, ADJ_CLOSE = "close", "adj_close"
+
+
+def bar_time_utc(ts) -> str:
+    """ISO UTC for a bar index value; tz-naive (daily) bars are taken as UTC dates."""
+    import pandas as pd
+
+    t = pd.Timestamp(ts)
+    t = t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+    return t.isoformat()
 
 
 def _to_1d_series(x: Union[pd.Series, pd.DataFrame, np.ndarray], index=None) -> pd.Series:
@@ -21,6 +42,9 @@ def _to_1d_series(x: Union[pd.Series, pd.DataFrame, np.ndarray], index=None) ->
       - single-column DataFrame
       - ndarray (n,) or (n,1)
     """
+    import numpy as np
+    import pandas as pd
+
     if isinstance(x, pd.Series):
         return x
 
@@ -39,38 +63,91 @@ def _to_1d_series(x: Union[pd.Series, pd.DataFrame, np.ndarray], index=None) ->
     return pd.Series(arr, index=index)
 
 
-def _extract_close(df: pd.DataFrame) -> Optional[Union[pd.Series, pd.DataFrame, np.ndarray]]:
+def _extract_close(df: pd.DataFrame) -> Tuple[Optional[Union[pd.Series, pd.DataFrame, np.ndarray]], str]:
     """
-    Normalize yfinance output to something representing a Close series.
+    Normalize yfinance output to something representing a Close series, and say which.
 
     Handles:
     - Standard OHLCV: 'Close'
     - Alternative: 'Adj Close'
     - MultiIndex columns: pick any column that has a level equal to 'Close' (or 'Adj Close')
+
+    Returns (data, CLOSE | ADJ_CLOSE), or (None, "") if neither is present.
     """
+    import pandas as pd
+
     if df is None or df.empty:
-        return None
+        return None, ""
 
     # Plain columns
-    for col in ("Close", "Adj Close", "close", "adjclose"):
+    for col, kind in (("Close", CLOSE), ("Adj Close", ADJ_CLOSE), ("close", CLOSE), ("adjclose", ADJ_CLOSE)):
         if col in df.columns:
-            return df[col]
+            return df[col], kind
 
     # MultiIndex columns
     if isinstance(df.columns, pd.MultiIndex):
         # Look for any column tuple containing "close"
         close_cols = [c for c in df.columns if any(str(level).lower() == "close" for level in c)]
         if close_cols:
-            return df[close_cols[0]]
+            return df[close_cols[0]], CLOSE
 
         adj_cols = [c for c in df.columns if any(str(level).lower() in ("adj close", "adjclose") for level in c)]
         if adj_cols:
-            return df[adj_cols[0]]
+            return df[adj_cols[0]], ADJ_CLOSE
+
+    return None, ""
+
+
+def _price_series(df: pd.DataFrame, sym: str) -> PriceSeries:
+    import pandas as pd
+
+    if df is None or df.empty:
+        raise RuntimeError(f"yfinance returned empty data for {sym}")
+
+    close_raw, kind = _extract_close(df)
+    if close_raw is None:
+        raise RuntimeError(f"Could not extract Close series for {sym}. Columns={list(df.columns)[:10]}")
+
+    close = _to_1d_series(close_raw, index=getattr(close_raw, "index", df.index)).dropna()
+    fetched = pd.Timestamp.utcnow().isoformat()
+    last_bar = bar_time_utc(close.index[-1]) if len(close) else ""
 
-    return None
+    return PriceSeries(
+        dates=list(close.index),
+        close=[float(v) for v in close.tolist()],
+        as_of_utc=last_bar or fetched,
+        last_bar_utc=last_bar,
+        fetched_utc=fetched,
+        close_kind=kind,
+    )
 
 
 def fetch_prices(symbols: List[str], period: str = "2y", interval: str = "1d") -> Dict[str, PriceSeries]:
+    """One download per symbol; raises on a symbol with no usable data."""
+    from adapters.data_source import get_source
+
+    return get_source().fetch_prices(list(symbols), period, interval)
+
+
+def fetch_prices_batch(symbols: List[str], period: str = "2y", interval: str = "1d") -> Dict[str, PriceSeries]:
+    """
+    All symbols in one yf.download call (columns grouped by ticker).
+
+    Unlike fetch_prices this does not raise for a bad ticker: symbols with no usable
+    data are simply absent from the result, so callers can retry or report them.
+    """
+    from adapters.data_source import get_source
+
+    if not symbols:
+        return {}
+    return get_source().fetch_prices_batch(list(symbols), period, interval)
+
+
+# Live (yfinance) implementations; the public functions above go through the
+# configured data source (adapters/data_source.py), which calls these in live mode.
+def _live_fetch_prices(symbols: List[str], period: str = "2y", interval: str = "1d") -> Dict[str, PriceSeries]:
+    import yfinance as yf
+
     out: Dict[str, PriceSeries] = {}
 
     for sym in symbols:
@@ -82,20 +159,38 @@ def fetch_prices(symbols: List[str], period: str = "2y", interval: str = "1d") -
             progress=False,
             threads=False,
         )
+        out[sym] = _price_series(df, sym)
 
-        if df is None or df.empty:
-            raise RuntimeError(f"yfinance returned empty data for {sym}")
+    return out
 
-        close_raw = _extract_close(df)
-        if close_raw is None:
-            raise RuntimeError(f"Could not extract Close series for {sym}. Columns={list(df.columns)[:10]}")
 
-        close = _to_1d_series(close_raw, index=getattr(close_raw, "index", df.index)).dropna()
+def _live_fetch_prices_batch(symbols: List[str], period: str = "2y", interval: str = "1d") -> Dict[str, PriceSeries]:
+    import pandas as pd
+    import yfinance as yf
 
-        out[sym] = PriceSeries(
-            dates=list(close.index),
-            close=[float(v) for v in close.tolist()],
-            as_of_utc=pd.Timestamp.utcnow().isoformat(),
-        )
+    if not symbols:
+        return {}
+    df = yf.download(
+        list(symbols),
+        period=period,
+        interval=interval,
+        auto_adjust=False,
+        progress=False,
+        group_by="ticker",
+        threads=True,
+    )
 
+    out: Dict[str, PriceSeries] = {}
+    if df is None or df.empty:
+        return out
+    grouped = isinstance(df.columns, pd.MultiIndex)
+    for sym in symbols:
+        if grouped and sym not in df.columns.get_level_values(0):
+            continue
+        try:
+            ps = _price_series(df[sym] if grouped else df, sym)
+        except (RuntimeError, ValueError):
+            continue
+        if ps.dates:  # a failed ticker comes back as an all-NaN column group
+            out[sym] = ps
     return out
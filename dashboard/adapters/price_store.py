@@ -0,0 +1,112 @@
+"""Local on-disk price store.
+
+One CSV per (interval, symbol) under ``var/dashboard/prices/<interval>/``.
+Used by offline tooling (backtests, sweeps) so long histories are fetched once
+and replayed from disk.
+
+The value column is named after the series' close kind (``close`` or
+``adj_close``, see market_data), so adjusted views know what they start from.
+Older files have a ``close`` column, which is what fetch_prices preferred then too.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from adapters.market_data import ADJ_CLOSE, CLOSE, PriceSeries, bar_time_utc
+
+# pandas is imported where used, so app.py can import the store before its first render.
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_STORE_ROOT = Path(__file__).resolve().parents[2] / "var" / "dashboard" / "prices"
+
+
+def _symbol_filename(symbol: str) -> str:
+    # Tickers like ^TNX, DX-Y.NYB, HG=F are filesystem-safe; futures aliases (/HG) are not.
+    return symbol.replace("/", "_") + ".csv"
+
+
+class PriceStore:
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else DEFAULT_STORE_ROOT
+
+    def path_for(self, symbol: str, interval: str = "1d") -> Path:
+        return self.root / interval / _symbol_filename(symbol)
+
+    def symbols(self, interval: str = "1d") -> List[str]:
+        d = self.root / interval
+        if not d.is_dir():
+            return []
+        return sorted(p.stem for p in d.glob("*.csv"))
+
+    def _read(self, symbol: str, interval: str):
+        import pandas as pd
+
+        path = self.path_for(symbol, interval)
+        if not path.is_file():
+            return None, ""
+        df = pd.read_csv(path, parse_dates=["date"])
+        kind = ADJ_CLOSE if ADJ_CLOSE in df.columns else CLOSE
+        if df.empty:
+            return None, kind
+        return df.set_index("date")[kind].sort_index().rename(symbol), kind
+
+    def load_frame(self, symbol: str, interval: str = "1d") -> Optional[pd.Series]:
+        """Return the stored close series (DatetimeIndex, sorted) or None if absent."""
+        return self._read(symbol, interval)[0]
+
+    def load(self, symbol: str, interval: str = "1d") -> Optional[PriceSeries]:
+        import pandas as pd
+
+        s, kind = self._read(symbol, interval)
+        if s is None:
+            return None
+        last_bar = bar_time_utc(s.index[-1])
+        # The file is rewritten on every save, so its mtime is the last fetch time.
+        mtime = self.path_for(symbol, interval).stat().st_mtime
+        return PriceSeries(
+            dates=list(s.index),
+            close=[float(v) for v in s.tolist()],
+            as_of_utc=last_bar,
+            last_bar_utc=last_bar,
+            fetched_utc=pd.Timestamp(mtime, unit="s", tz="UTC").isoformat(),
+            close_kind=kind,
+        )
+
+    def save(self, symbol: str, series: PriceSeries, interval: str = "1d") -> Path:
+        """
+        Merge ``series`` into the stored history (new bars win on overlap). History of a
+        different close kind is replaced, never mixed into one column.
+        """
+        import pandas as pd
+
+        kind = series.close_kind or CLOSE
+        new = pd.Series(series.close, index=pd.DatetimeIndex(series.dates, name="date"), name=kind)
+        old, old_kind = self._read(symbol, interval)
+        if old is not None and old_kind == kind:
+            old = old.rename(kind)
+            new = pd.concat([old[~old.index.isin(new.index)], new]).sort_index()
+
+        path = self.path_for(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".csv.tmp")
+        new.to_frame().to_csv(tmp, index_label="date")
+        tmp.replace(path)
+        return path
+
+    def refresh(self, symbols: Iterable[str], period: str = "max", interval: str = "1d") -> Dict[str, str]:
+        """Fetch ``symbols`` and merge them into the store. Returns {symbol: "OK" | error}."""
+        # Imported here so read-only users of the store don't need network deps loaded.
+        from adapters.market_data import fetch_prices
+
+        results: Dict[str, str] = {}
+        for sym in symbols:
+            try:
+                series = fetch_prices([sym], period=period, interval=interval)[sym]
+                self.save(sym, series, interval)
+                results[sym] = "OK"
+            except Exception as e:
+                results[sym] = str(e)
+        return results
@@ -1,141 +1,1150 @@
+from __future__ import annotations
+
 import json
+import os
 import sys
+import threading
 from pathlib import Path
-from typing import List, Dict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-import pandas as pd
 import streamlit as st
 
+# Ensure dashboard/ imports work whether you run from repo root or dashboard/
 THIS_DIR = Path(__file__).resolve().parent
 if str(THIS_DIR) not in sys.path:
     sys.path.insert(0, str(THIS_DIR))
 
-from adapters.market_data import fetch_prices
-from utils.indicators import rs_vs_spy, sma, last_non_nan, status_from_rs_sma
+from adapters.commodity_data import commodities_from_spec, fetch_commodities  # noqa: E402
+from adapters.dividend_data import DividendStore  # noqa: E402
+from adapters.market_data import ADJ_CLOSE, fetch_prices, fetch_prices_batch  # noqa: E402
+from adapters.price_store import PriceStore  # noqa: E402
+from utils.conditions import SUSTAINED_OBS  # noqa: E402
+from utils.fresh_cache import FreshPriceCache  # noqa: E402
+from utils.freshness import FRESH, format_age  # noqa: E402
+from utils.intraday import IntradayBook  # noqa: E402
+from utils.parallel import BoundedRunner, TaskResult  # noqa: E402
+from utils.portfolio import (  # noqa: E402
+    PortfolioBook,
+    concentration_lookup,
+    evaluate_rules,
+    holdings_from_thesis,
+    load_holdings,
+    targets_from_rows,
+)
+from utils.prefetch import FetchRequest, PrefetchResult, plan_prefetch  # noqa: E402
+from utils.regime import RegimeEngine, RegimeSnapshot  # noqa: E402
+from utils.rolling_stats import RollingCovariance, dispersion, history_points, mean_pairwise, ranks  # noqa: E402
+from utils.regime import rules_from_card as regime_rules_from_card  # noqa: E402
+from utils.regime import rules_from_spec as regime_rules_from_spec  # noqa: E402
+from utils.indicators import rs_vs_spy, sma, last_non_nan, status_from_rs_sma  # noqa: E402
+from utils.signals import CREDIT_SMA_LENGTH, credit_proxy, credit_states, credit_trend  # noqa: E402
+from utils.spec_index import (  # noqa: E402
+    DEFAULT_BENCH,
+    DEFAULT_MACRO,
+    DEFAULT_ROTATION,
+    card_symbols,
+    load_json_cached,
+    load_spec_index,
+    radar_symbols,
+)
+
+# pandas and the alignment/adjustment modules (~0.3 s to import) load on first use,
+# after the page header is on screen; see scripts/bench_startup.py.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from utils.alignment import AlignedMatrix
 
 REPO_ROOT = THIS_DIR.parent
+ALERT_STATE_PATH = REPO_ROOT / "var" / "dashboard" / "alerts" / "state.json"
+REGIME_STATE_PATH = REPO_ROOT / "var" / "dashboard" / "regime" / "state.json"
+BACKTEST_CUBE_PATH = REPO_ROOT / "var" / "dashboard" / "backtest" / "backtest_cube.npz"  # scripts/backtest.py --cube
+# Private holdings stay out of git; without a file the thesis JSON snapshot is used.
+HOLDINGS_PATH = Path(os.environ.get("MT_HOLDINGS_FILE", REPO_ROOT / "var" / "dashboard" / "holdings.csv"))
+
+# Card data preparation: bounded pool, per-task timeouts (seconds). Worst-case page
+# latency is FETCH_TIMEOUT + RETRY_TIMEOUT (+ local compute), not the sum of all fetches.
+PREP_WORKERS = 8
+FETCH_WORKERS = 8  # separate pool: prep tasks wait on fetches, so they must not share workers
+FETCH_TIMEOUT = 20.0  # one batched download per (interval, period)
+RETRY_TIMEOUT = 10.0  # per-symbol retry of anything a batch missed
+PREP_TIMEOUT = FETCH_TIMEOUT + RETRY_TIMEOUT + 5.0
 
+
+# -------------------------
+# Streamlit configuration
+# -------------------------
 st.set_page_config(page_title="Market Thesis Dashboard", layout="wide")
 st.title("Market Thesis Dashboard")
 st.caption("Data-first monitoring UI. No narratives. No execution.")
 
 
-@st.cache_data(ttl=1800, show_spinner=False)
-def cached_fetch(symbols: List[str], period: str, interval: str):
-    return fetch_prices(symbols, period=period, interval=interval)
+# -------------------------
+# Helpers
+# -------------------------
+def _with_script_ctx(fn):
+    """Attach the session's Streamlit script context to a worker thread (keeps st.cache_* quiet there)."""
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    except ImportError:
+        return fn
+    ctx = get_script_run_ctx()
 
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
 
-def rs_sma50(asset_sym: str, bench_sym: str, period="2y", interval="1d"):
-    series = cached_fetch([asset_sym, bench_sym], period, interval)
-    a = series[asset_sym]
-    b = series[bench_sym]
+    return run
+
+
+@st.cache_resource(show_spinner=False)
+def task_runner() -> BoundedRunner:
+    """One bounded pool per server process, shared by all sessions."""
+    return BoundedRunner(max_workers=PREP_WORKERS, thread_name_prefix="mt-prep", wrap=_with_script_ctx)
+
+
+@st.cache_resource(show_spinner=False)
+def fetch_runner() -> BoundedRunner:
+    """Upstream price fetches, on their own pool: card prep tasks block on these."""
+    return BoundedRunner(max_workers=FETCH_WORKERS, thread_name_prefix="mt-fetch")
+
+
+@st.cache_resource(show_spinner=False)
+def price_cache() -> FreshPriceCache:
+    """Process-wide stale-while-revalidate price cache, persisted to the local price store."""
+    return FreshPriceCache(fetch_prices_batch, PriceStore(), fetch_runner(), timeout=FETCH_TIMEOUT, retry_timeout=RETRY_TIMEOUT)
+
+
+def prefetch_prices(plan: Tuple[FetchRequest, ...]) -> PrefetchResult:
+    """
+    Every (symbol, interval) the spec needs, at its longest lookback. Served from the last
+    good data immediately; stale symbols (market-hours budgets) refresh in the background.
+    Only never-fetched symbols block, in concurrent batches bounded by the fetch timeouts.
+    """
+    return price_cache().get_many(plan)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def aligned_universe(
+    symbols: Tuple[str, ...], period: str, interval: str, fill_policy: str = "none", version: str = "", basis: str = "close"
+) -> AlignedMatrix:
+    """
+    One aligned (sessions x symbols) matrix per (universe, period, interval), shared by all cards.
+
+    ``version`` changes whenever a member symbol gets new data, so the matrix is rebuilt
+    exactly then (not on a TTL). Series are sliced to ``period`` out of the spec-wide
+    prefetch; a symbol the plan missed is fetched on its own, and one bad ticker degrades
+    to UNKNOWN instead of failing the whole universe. The calendar is the benchmark's sessions.
+    ``basis`` other than "close" re-adjusts each series from the cached corporate actions.
+    """
+    from utils.adjustment import adjusted_series
+    from utils.alignment import align
+
+    data = prefetch_prices(plan_prefetch(spec_index))
+    series = {}
+    errors = {}
+    for sym in symbols:
+        ps = data.slice(sym, interval, period)
+        if ps is not None:
+            series[sym] = ps
+            continue
+        if (sym, interval) in data.errors:
+            errors[sym] = data.errors[(sym, interval)]
+            continue
+        try:
+            series[sym] = fetch_prices([sym], period=period, interval=interval)[sym]
+        except Exception as e:
+            errors[sym] = str(e)
+    if basis != "close":
+        store = DividendStore()
+        for sym in list(series):
+            try:
+                series[sym] = adjusted_series(series[sym], store.load_actions(sym), basis)
+            except ValueError as e:
+                errors[sym] = str(e)
+                del series[sym]
+    matrix = align(series, calendar_symbol=DEFAULT_BENCH, fill_policy=fill_policy, normalize=interval.endswith(("d", "wk", "mo")))
+    matrix.errors.update(errors)
+    return matrix
+
+
+@st.cache_data(ttl=60 * 30, show_spinner=False)
+def commodity_regime(period: str = "2y", interval: str = "1d") -> Tuple[RegimeSnapshot, Dict]:
+    """
+    Commodity histories (local price store, refetched only when stale) and the regime
+    snapshot advanced over any new bars. Every commodity card reads this one result.
+    """
+    commodities = commodities_from_spec(spec)
+    series, errors = fetch_commodities(commodities, period=period, interval=interval)
+    engine = RegimeEngine(regime_rules_from_spec(spec, [c.symbol for c in commodities]), REGIME_STATE_PATH)
+    return engine.update(series, errors), series
+
+
+@st.cache_resource(show_spinner=False)
+def portfolio_book(holdings_key: Tuple[str, int], thesis_sha: str, spec_sha: str, targets_card: str = "portfolio_targets") -> PortfolioBook:
+    """
+    Holdings collapsed onto the ticker axis; rebuilt only when the holdings file, thesis
+    JSON or spec changes. Revaluing it against fresh prices is cheap, so that happens per render.
+    """
+    thesis, _ = load_json_cached(REPO_ROOT / latest.get("json", ""))
+    holdings = load_holdings(HOLDINGS_PATH) if holdings_key[0] else holdings_from_thesis(thesis, source=latest.get("json", ""))
+    rows = card_defs.get(targets_card, {}).get("rows") or thesis.get("portfolio", {}).get("target_allocation", {}).get("weights", [])
+    return PortfolioBook(holdings, targets_from_rows(rows))
 
-    df = pd.DataFrame(
-        {
-            "date": a.dates,
-            asset_sym: a.close,
-            bench_sym: b.close,
-        }
-    ).dropna()
 
+def current_book(targets_card: str = "portfolio_targets") -> PortfolioBook:
+    try:
+        holdings_key = (str(HOLDINGS_PATH), HOLDINGS_PATH.stat().st_mtime_ns)
+    except OSError:
+        holdings_key = ("", 0)
+    _, thesis_sha = load_json_cached(REPO_ROOT / latest.get("json", ""))
+    _, spec_sha = load_json_cached(spec_path)
+    return portfolio_book(holdings_key, thesis_sha, spec_sha, targets_card)
+
+
+def last_prices(tickers: Tuple[str, ...]) -> Dict[str, float]:
+    """Last cached close per ticker from the spec-wide prefetch (no extra fetches)."""
+    data = prefetch_prices(plan_prefetch(spec_index))
+    out = {}
+    for t in tickers:
+        ps = data.get(t, "1d")
+        if ps is not None and ps.close:
+            out[t] = ps.close[-1]
+    return out
+
+
+def held_tickers(book: PortfolioBook) -> Tuple[str, ...]:
+    return tuple(t for t, n in zip(book.tickers, book.shares) if n)
+
+
+@st.cache_data(ttl=60 * 60 * 6, show_spinner=False)
+def dividends_per_share(tickers: Tuple[str, ...]) -> Dict[str, float]:
+    """Trailing-12-month dividends per share from the local dividend cache (refreshed daily)."""
+    store = DividendStore()
+    store.refresh(tickers)
+    dps, _ = store.trailing_annual(list(tickers))
+    return dps
+
+
+@st.cache_data(ttl=60 * 60 * 6, show_spinner=False)
+def corporate_actions(symbols: Tuple[str, ...]) -> str:
+    """Refresh cached dividends/splits (daily); returns a version that changes when any file does."""
+    store = DividendStore()
+    store.refresh(symbols, need_splits=True)
+    return "|".join(f"{store.version(s):.0f}" for s in symbols)
+
+
+def ensure_path(p: Path, err: str):
+    if not p.exists():
+        st.error(err)
+        st.stop()
+
+
+# Relative-strength cards compare returns, so a payer's ex-date drop (O, PPL vs SPY) must
+# not read as underperformance: they default to total return. Any card can set price_basis.
+RS_CARD_TYPES = {"status_summary", "live_market_slice", "multi_series_chart", "rs_grid", "sector_sequence"}
+
+
+def price_basis(card: dict) -> str:
+    return card.get("price_basis", "total_return" if card.get("type") in RS_CARD_TYPES else "close")
+
+
+def universe_for(card: dict) -> AlignedMatrix:
+    """The shared matrix for this card's period/interval (built once for all cards that use it)."""
+    period, interval, syms = spec_index.universe_for(card)
+    prefetch_prices(plan_prefetch(spec_index))  # schedules refreshes; cheap when warm
+    version = price_cache().version(syms, interval)
+    basis = price_basis(card)
+    if basis != "close":
+        version += "#" + corporate_actions(tuple(syms))
+    return aligned_universe(tuple(syms), period, interval, card.get("fill_policy", "none"), version, basis)
+
+
+def render_freshness(card: dict, matrix: Optional[AlignedMatrix] = None):
+    """One caption line: fetch age / last bar / staleness across the card's symbols (those in ``matrix``, if given)."""
+    _, interval, symbols = spec_index.universe_for(card)
+    if matrix is None:
+        symbols = card_symbols(card)
+    cache = price_cache()
+    views = [(sym, cache.freshness((sym, interval))) for sym in symbols if matrix is None or matrix.has(sym)]
+    if not views:
+        return
+    stale = [sym for sym, f in views if f.status != FRESH]
+    oldest = max((f.fetched_age_s for _, f in views if f.fetched_age_s is not None), default=None)
+    last_bars = sorted(f.last_bar_utc[:16].replace("T", " ") for _, f in views if f.last_bar_utc)
+    behind = [f"{sym} ({f.sessions_behind})" for sym, f in views if f.sessions_behind]
+    parts = [f"Fetched up to {format_age(oldest)} ago", f"last bar {last_bars[0]} UTC" if last_bars else "no bars"]
+    if stale:
+        parts.append(f"stale, refreshing: {', '.join(stale)}")
+    if behind:
+        parts.append(f"sessions behind: {', '.join(behind)}")
+    if price_basis(card) != "close":
+        parts.append(f"price basis: {price_basis(card)}")
+    elif matrix is not None:
+        adj = [sym for sym, _ in views if matrix.close_kind.get(sym) == ADJ_CLOSE]
+        if adj:
+            parts.append(f"dividend-adjusted closes (no raw Close): {', '.join(adj)}")
+    st.caption(" · ".join(parts))
+
+
+def rs_sma50_for_pair(matrix: AlignedMatrix, asset_sym: str, bench_sym: str) -> Tuple[pd.DataFrame, float, str, str]:
+    """Return df with aligned series + RS + RS_SMA_50, and last RS_SMA_50."""
+    import pandas as pd
+
+    for sym in (asset_sym, bench_sym):
+        if not matrix.has(sym):
+            return pd.DataFrame(), float("nan"), "", matrix.errors.get(sym, f"No data for {sym}")
+
+    df = matrix.pair(asset_sym, bench_sym)
+    asof = matrix.as_of_utc.get(asset_sym, "")
     if len(df) < 80:
-        return None, None, "Not enough aligned data"
+        return df, float("nan"), asof, f"Not enough aligned rows ({len(df)})"
+
+    asset_close = df[asset_sym].tolist()
+    bench_close = df[bench_sym].tolist()
 
-    rs = rs_vs_spy(df[asset_sym].tolist(), df[bench_sym].tolist())
+    rs = rs_vs_spy(asset_close, bench_close)
     rs_sma_50 = sma(rs, 50)
-    last = last_non_nan(rs_sma_50)
+    last_val = last_non_nan(rs_sma_50)
+
+    df_plot = df.assign(RS=rs, RS_SMA_50=rs_sma_50)
+    return df_plot, last_val, asof, "OK" + dropped_note(matrix, asset_sym, bench_sym)
 
-    df["RS"] = rs
-    df["RS_SMA_50"] = rs_sma_50
-    return df.set_index("date"), last, a.as_of_utc
 
+def dropped_note(matrix: AlignedMatrix, a: str, b: str) -> str:
+    """' (N sessions dropped ...)' when ``matrix.pair(a, b)`` skipped sessions one side is missing, else ''."""
+    dropped = matrix.pair_dropped(a, b)
+    return f" ({dropped} sessions dropped: no {a} or {b} bar, policy={matrix.fill_policy})" if dropped else ""
 
-manifest_path = REPO_ROOT / "manifest_latest.json"
-if not manifest_path.exists():
-    st.error("manifest_latest.json not found in repo root.")
-    st.stop()
 
-manifest = json.loads(manifest_path.read_text())
-latest = manifest["latest"]
+def banner(status: str, msg: str):
+    if status == "GREEN":
+        st.success(msg)
+    elif status == "YELLOW":
+        st.warning(msg)
+    elif status == "RED":
+        st.error(msg)
+    else:
+        st.info(msg)
+
+
+def compute_rotation_health(matrix: AlignedMatrix, sectors: List[str], bench: str, yellow_band: float) -> Dict[str, Dict[str, str]]:
+    """Compute RS SMA(50) status for each sector vs benchmark. Returns per-symbol status dict."""
+    results = {}
+    for sym in sectors:
+        try:
+            _, last_val, _, note = rs_sma50_for_pair(matrix, sym, bench)
+            if not note.startswith("OK") or last_val != last_val:
+                results[sym] = {"status": "UNKNOWN", "reason": note}
+            else:
+                stt, reason = status_from_rs_sma(last_val, yellow_band=yellow_band)
+                results[sym] = {"status": stt, "reason": reason, "last": f"{last_val:.4%}"}
+        except Exception as e:
+            results[sym] = {"status": "UNKNOWN", "reason": str(e)}
+    return results
+
+
+def compute_credit_health(
+    matrix: AlignedMatrix, hyg: str, lqd: str, length: int = CREDIT_SMA_LENGTH, sustained: int = SUSTAINED_OBS
+) -> Tuple[pd.DataFrame, str, str]:
+    """
+    CREDIT_DIVERGENCE per the spec: proxy = HYG/LQD, trend = slope(SMA(proxy, length)).
+    trend < 0 is YELLOW, < 0 for ``sustained`` sessions RED (utils.signals.credit_states,
+    the same rule the alert engine and the backtest use).
+    """
+    import pandas as pd
+
+    try:
+        for sym in (hyg, lqd):
+            if not matrix.has(sym):
+                return pd.DataFrame(), "UNKNOWN", matrix.errors.get(sym, f"No data for {sym}")
+
+        df = matrix.pair(hyg, lqd)
+        if len(df) < 80:
+            return df, "UNKNOWN", f"Not enough rows ({len(df)})"
+
+        proxy = credit_proxy(df[hyg].tolist(), df[lqd].tolist())
+        trend = credit_trend(proxy, length)
+        df_out = pd.DataFrame({f"{hyg}/{lqd}": proxy, f"SMA_{length}": sma(proxy, length)}, index=df.index)
+
+        status = credit_states(trend, sustained)[-1]
+        last, note = trend[-1], dropped_note(matrix, hyg, lqd)
+        if status == "RED":
+            return df_out, "RED", f"Credit trend {last:+.5f} < 0 for {sustained}+ sessions: sustained tightening{note}"
+        if status == "YELLOW":
+            return df_out, "YELLOW", f"Credit trend {last:+.5f} < 0: tightening risk rising{note}"
+        if status == "GREEN":
+            return df_out, "GREEN", f"Credit trend {last:+.5f} ≥ 0{note}"
+        return df_out, "UNKNOWN", f"No credit trend yet (needs {length + 1} aligned sessions)"
+    except Exception as e:
+        return pd.DataFrame(), "UNKNOWN", str(e)
+
 
-c1, c2, c3, c4 = st.columns(4)
-c1.metric("HR (source of truth)", latest["hr"])
-c2.metric("JSON (derived)", latest["json"])
-c3.metric("AGENT (derived)", latest["agent"])
-c4.metric("Spec", latest["dashboard_spec"])
+def overall_thesis_health(rotation: Dict[str, Dict[str, str]], credit_status: str) -> Tuple[str, str]:
+    """
+    Simple aggregate:
+    - Any RED => RED
+    - Else any YELLOW => YELLOW
+    - Else GREEN if credit GREEN and at least 2 sectors GREEN
+    - Else UNKNOWN
+    """
+    statuses = [v.get("status", "UNKNOWN") for v in rotation.values()]
+    if "RED" in statuses or credit_status == "RED":
+        return "RED", "At least one critical signal is RED."
+    if "YELLOW" in statuses or credit_status == "YELLOW":
+        return "YELLOW", "At least one signal is YELLOW. Monitor closely."
+    green_count = sum(1 for s in statuses if s == "GREEN")
+    if credit_status == "GREEN" and green_count >= 2:
+        return "GREEN", "Rotation + credit conditions are supportive."
+    return "UNKNOWN", "Insufficient confirmed signals for an aggregate call."
+
+
+def render_alert_badges(spec: Dict):
+    """ui_badge channel: show alerts that scripts/run_alerts.py currently holds active."""
+    if not ALERT_STATE_PATH.exists():
+        return
+    try:
+        states = json.loads(ALERT_STATE_PATH.read_text()).get("alerts", {})
+    except Exception:
+        return
+    for alert in spec.get("alerting", {}).get("alerts", []):
+        if states.get(alert.get("id"), {}).get("active"):
+            msg = f"Alert {alert['id']}: {alert.get('message', '')}"
+            if alert.get("severity") == "RED":
+                st.error(msg)
+            else:
+                st.warning(msg)
+
+
+# -------------------------
+# Load manifest + spec
+# -------------------------
+manifest_file = REPO_ROOT / "manifest_latest.json"
+ensure_path(manifest_file, "manifest_latest.json not found in repo root.")
+manifest, _ = load_json_cached(manifest_file)
+latest = manifest.get("latest", {})
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("HR (source of truth)", latest.get("hr", ""))
+col2.metric("JSON (derived)", latest.get("json", ""))
+col3.metric("AGENT (derived)", latest.get("agent", ""))
+col4.metric("Spec", latest.get("dashboard_spec", ""))
 
 st.divider()
 
-spec_path = REPO_ROOT / latest["dashboard_spec"]
-spec = json.loads(spec_path.read_text())
+spec_path = REPO_ROOT / latest.get("dashboard_spec", "")
+ensure_path(spec_path, "Dashboard spec not found at path specified in manifest_latest.json.")
+# Parsed once per content change, not per rerun; indexes pages -> cards -> symbols.
+spec_index = load_spec_index(REPO_ROOT)
+spec = spec_index.spec
+
+pages = spec_index.pages
+card_defs = spec_index.cards
+
+render_alert_badges(spec)
+
+tab_titles = [p.get("title", p.get("id", "Page")) for p in pages] or ["Overview"]
+tabs = st.tabs(tab_titles)
+
+
+# -------------------------
+# Card renderers
+# -------------------------
+def render_status_summary(card: dict):
+    # Defaults if spec doesn't define them
+    import pandas as pd
+
+    bench = card.get("benchmark", DEFAULT_BENCH)
+    sectors = card.get("rotation_symbols", DEFAULT_ROTATION)
+    yellow_band = float(card.get("yellow_band", 0.0002))
+
+    hyg = card.get("hyg", "HYG")
+    lqd = card.get("lqd", "LQD")
+    credit_window = int(card.get("credit_window", CREDIT_SMA_LENGTH))
+    credit_sustained = int(card.get("credit_sustained", SUSTAINED_OBS))
+
+    matrix = universe_for(card)
+    rotation = compute_rotation_health(matrix, sectors, bench, yellow_band=yellow_band)
+    credit_df, credit_status, credit_reason = compute_credit_health(matrix, hyg, lqd, credit_window, credit_sustained)
+
+    overall, msg = overall_thesis_health(rotation, credit_status)
+
+    banner(overall, f"Thesis Health: {overall} — {msg}")
+    render_freshness(card, matrix)
+
+    with st.expander("Rotation details"):
+        st.dataframe(
+            pd.DataFrame.from_dict(rotation, orient="index").reset_index().rename(columns={"index": "symbol"}),
+            width="stretch",
+        )
+
+    with st.expander("Credit details"):
+        banner(credit_status, credit_reason)
+        if not credit_df.empty:
+            st.line_chart(credit_df, height=220)
+
+
+def render_live_market_slice(card: dict):
+    symbols = card.get("symbols", ["FCX", "SPY"])
+    yellow_band = float((card.get("status_rule", {}) or {}).get("yellow_band", 0.0002))
+
+    if not isinstance(symbols, list) or len(symbols) < 2:
+        st.error("live_market_slice requires at least 2 symbols, e.g. ['FCX','SPY'].")
+        return
+
+    asset_sym, bench_sym = symbols[0], symbols[1]
+
+    try:
+        matrix = universe_for(card)
+        df_plot, last_val, asof, note = rs_sma50_for_pair(matrix, asset_sym, bench_sym)
+        c1, c2, c3 = st.columns(3)
+        c1.metric("As-of (UTC)", asof)
+        render_freshness(card, matrix)
+
+        if not note.startswith("OK") or last_val != last_val:
+            c2.metric("RS SMA(50) Status", "UNKNOWN")
+            c3.metric("RS SMA(50) Last", "N/A")
+            st.warning(note)
+            return
+
+        status, reason = status_from_rs_sma(last_val, yellow_band=yellow_band)
+        c2.metric("RS SMA(50) Status", status)
+        c3.metric("RS SMA(50) Last", f"{last_val:.4%}")
+        banner(status, reason)
+        if note != "OK":
+            st.caption(note)
+
+        st.subheader(f"{asset_sym} & {bench_sym} Close Prices")
+        st.line_chart(df_plot[[asset_sym, bench_sym]])
+
+        st.subheader(f"Relative Strength: ({asset_sym} daily return - {bench_sym} daily return)")
+        st.line_chart(df_plot[["RS", "RS_SMA_50"]])
+
+    except Exception as e:
+        st.error(f"Live data fetch failed: {e}")
+
+
+def render_rotation_radar(card: dict):
+    import pandas as pd
+
+    bench = card.get("benchmark", DEFAULT_BENCH)
+    sectors = radar_symbols(card)
+    yellow_band = float(card.get("yellow_band", 0.0002))
+
+    st.caption(f"RS SMA(50) vs {bench}. Computed from daily return differential.")
+
+    matrix = universe_for(card)
+    frames = []
+    status_rows = []
+    for sym in sectors:
+        try:
+            df_plot, last_val, _, note = rs_sma50_for_pair(matrix, sym, bench)
+            if not note.startswith("OK") or last_val != last_val:
+                status_rows.append({"symbol": sym, "status": "UNKNOWN", "last": "N/A", "note": note})
+                continue
+            stt, reason = status_from_rs_sma(last_val, yellow_band=yellow_band)
+            status_rows.append({"symbol": sym, "status": stt, "last": f"{last_val:.4%}", "note": reason})
+            frames.append(df_plot[["RS_SMA_50"]].rename(columns={"RS_SMA_50": sym}))
+        except Exception as e:
+            status_rows.append({"symbol": sym, "status": "UNKNOWN", "last": "N/A", "note": str(e)})
+
+    if frames:
+        merged = pd.concat(frames, axis=1).dropna(how="all")
+        st.line_chart(merged, height=300)
+
+    st.dataframe(pd.DataFrame(status_rows), width="stretch")
+    render_freshness(card, matrix)
+
 
-pages = spec["dashboard"]["layout"]["pages"]
-cards = spec["dashboard"]["cards"]
+@st.cache_resource(show_spinner=False)
+def rotation_engine(symbols: Tuple[str, ...], window: int, interval: str, bench: str, basis: str = "close") -> RollingCovariance:
+    """One rolling covariance engine per (universe, window, basis); shared by every session and rotation card."""
+    return RollingCovariance(symbols, window, reference=bench)
 
-tabs = st.tabs([p["title"] for p in pages])
 
+def rotation_view(card: dict) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], AlignedMatrix]:
+    """
+    (per-symbol table, history, headline stats, matrix) for a rotation card.
 
-def render_status_summary(card: Dict):
-    symbols = card.get("rotation_symbols", ["XLB", "XLI", "XLP", "XLY", "IWM", "KRE"])
-    bench = card.get("benchmark", "SPY")
-    yellow = float(card.get("yellow_band", 0.0002))
+    The engine covers the card's whole aligned universe and only consumes sessions it
+    has not seen, so a render costs O(new bars x N^2) instead of a full rolling corr.
+    """
+    import pandas as pd
 
-    statuses = []
+    matrix = universe_for(card)
+    _, interval, _ = spec_index.universe_for(card)
+    bench = card.get("benchmark", DEFAULT_BENCH)
+    window = int(card.get("window", 60))
+    lag = int(card.get("rank_lag", 5))
+    syms = [s for s in card.get("symbols", DEFAULT_ROTATION) if matrix.has(s) and s != bench]
+    if not matrix.has(bench) or not syms:
+        raise RuntimeError(f"no aligned data for {bench} and the card's symbols")
+
+    universe = tuple(matrix.symbols)
+    engine = rotation_engine(universe, window, interval, bench, price_basis(card))
+    closes = matrix.frame(list(universe))
+    with engine.lock:
+        engine.update(list(closes.index), closes.to_numpy())
+        idx = [universe.index(s) for s in syms]
+        b = universe.index(bench)
+        corr = engine.corr()
+        now = engine.window_return()
+        hist = list(engine.history)
+        history = pd.DataFrame(history_points(engine, syms)).set_index("date") if hist else pd.DataFrame()
+    if not hist:
+        raise RuntimeError("not enough sessions for the rolling window")
+
+    then = hist[-1 - lag] if len(hist) > lag else hist[0]
+    excess_now = now[idx] - now[b]
+    excess_then = then.window_return[idx] - then.window_return[b]
+    rank_now, rank_then = ranks(excess_now), ranks(excess_then)
+    table = pd.DataFrame(
+        {
+            "symbol": syms,
+            "corr_to_bench": corr[b, idx],
+            "corr_change": corr[b, idx] - then.reference_corr[idx],
+            "excess_return": excess_now,
+            "rank": rank_now,
+            "rank_change": rank_then - rank_now,  # positive = moved up
+        }
+    )
+    stats = {
+        "dispersion": dispersion(now[idx]),
+        "mean_corr_to_bench": float(pd.Series(corr[b, idx]).mean()),
+        "mean_pairwise_corr": mean_pairwise(corr, idx),
+    }
+    return table, history, stats, matrix
+
+
+def render_rs_grid(card: dict):
+    bench = card.get("benchmark", DEFAULT_BENCH)
+    window, lag = int(card.get("window", 60)), int(card.get("rank_lag", 5))
+    st.caption(f"{window}-session rolling stats of daily log returns vs {bench}; rank changes over {lag} sessions.")
+    try:
+        table, _, stats, matrix = rotation_view(card)
+    except Exception as e:
+        banner("UNKNOWN", f"Rotation stats unavailable: {e}")
+        return
+
+    cols = st.columns(3)
+    cols[0].metric(f"Mean corr to {bench}", f"{stats['mean_corr_to_bench']:.2f}")
+    cols[1].metric("Mean pairwise corr", f"{stats['mean_pairwise_corr']:.2f}")
+    cols[2].metric("Dispersion (window return)", f"{stats['dispersion']:.2%}")
+    st.dataframe(
+        table.sort_values("rank").style.format(
+            {"corr_to_bench": "{:.2f}", "corr_change": "{:+.2f}", "excess_return": "{:+.2%}", "rank": "{:.0f}", "rank_change": "{:+.0f}"},
+            na_rep="N/A",
+        ),
+        width="stretch",
+        hide_index=True,
+    )
+    render_freshness(card, matrix)
+
+
+def render_sector_sequence(card: dict):
+    bench = card.get("benchmark", DEFAULT_BENCH)
+    st.caption(f"Sectors ordered by excess return vs {bench} over the rolling window; arrows show rank moves.")
+    try:
+        table, history, stats, matrix = rotation_view(card)
+    except Exception as e:
+        banner("UNKNOWN", f"Rotation stats unavailable: {e}")
+        return
+
+    def arrow(change: float) -> str:
+        if change != change or change == 0:
+            return ""
+        return f" (↑{change:.0f})" if change > 0 else f" (↓{-change:.0f})"
+
+    ranked = table.dropna(subset=["rank"]).sort_values("rank")
+    st.write(" → ".join(f"**{r.symbol}**{arrow(r.rank_change)}" for r in ranked.itertuples()) or "N/A")
+    if not history.empty:
+        st.line_chart(history[["dispersion", "mean_corr"]].rename(columns={"mean_corr": f"mean corr to {bench}"}), height=220)
+    st.caption(f"Dispersion now {stats['dispersion']:.2%}; mean corr to {bench} {stats['mean_corr_to_bench']:.2f}.")
+    render_freshness(card, matrix)
+
+
+@st.cache_resource(show_spinner=False)
+def intraday_book(symbols: Tuple[str, ...], timeframes: Tuple[str, ...]) -> IntradayBook:
+    """One bounded bar book per (pair, timeframes); shared by every session, fed incrementally."""
+    return IntradayBook(timeframes)
+
+
+def intraday_feed(card: dict) -> IntradayBook:
+    """
+    The card's book, caught up with the prefetched minute series. Only bars newer than
+    the last one ingested are read (found from the series' end) and aggregated, so a warm
+    render costs O(new minutes) however long the cached window is.
+    """
+    symbols = tuple(card.get("symbols", ["IWM", DEFAULT_BENCH])[:2])
+    interval = card.get("interval", "1m")
+    data = prefetch_prices(plan_prefetch(spec_index))
+    book = intraday_book(symbols, tuple(card.get("timeframes", ["5m", "15m"])))
+    with book.lock:
+        for sym in symbols:
+            ps = data.get(sym, interval)
+            if ps is None:
+                raise RuntimeError(data.errors.get((sym, interval), f"No {interval} data for {sym}"))
+            book.ingest(sym, ps.dates, ps.close)
+    return book
+
+
+def render_intraday_rs(card: dict):
+    import pandas as pd
+
+    symbols = card.get("symbols", ["IWM", DEFAULT_BENCH])
+    if not isinstance(symbols, list) or len(symbols) < 2:
+        st.error("intraday_rs requires 2 symbols, e.g. ['IWM','SPY'].")
+        return
+    asset_sym, bench_sym = symbols[0], symbols[1]
+    timeframes = card.get("timeframes", ["5m", "15m"])
+    length = int(card.get("sma", 50))
+    yellow_band = float(card.get("yellow_band", 0.0002))
+    st.caption(f"RS SMA({length}) of {asset_sym} vs {bench_sym} on {card.get('interval', '1m')} bars resampled to {', '.join(timeframes)}.")
+
+    try:
+        book = intraday_feed(card)
+    except Exception as e:
+        banner("UNKNOWN", f"Intraday data unavailable: {e}")
+        return
+
+    cols = st.columns(len(timeframes))
+    chart, chart_tf = None, ""
+    with book.lock:
+        for col, tf in zip(cols, timeframes):
+            last_val, note = book.rs_sma_last(asset_sym, bench_sym, tf, length)
+            status, reason = status_from_rs_sma(last_val, yellow_band=yellow_band) if note == "OK" else ("UNKNOWN", note)
+            col.metric(f"{tf} RS SMA({length})", status, f"{last_val:.4%}" if last_val == last_val else None)
+            col.caption(reason)
+            if chart is None and note == "OK":
+                ts, rs, rs_sma = book.rs_sma(asset_sym, bench_sym, tf, length)
+                chart = pd.DataFrame({"RS": rs, f"RS_SMA_{length}": rs_sma}, index=pd.to_datetime(ts, unit="s", utc=True))
+                chart_tf = tf
+    if chart is not None:
+        st.subheader(f"Relative Strength ({chart_tf} bars): {asset_sym} return - {bench_sym} return")
+        st.line_chart(chart)
+    render_freshness(card)
+
+
+def render_credit_panel(card: dict):
+    hyg = card.get("hyg", "HYG")
+    lqd = card.get("lqd", "LQD")
+    length = int(card.get("sma", CREDIT_SMA_LENGTH))
+    sustained = int(card.get("sustained", SUSTAINED_OBS))
+
+    matrix = universe_for(card)
+    df, stt, reason = compute_credit_health(matrix, hyg, lqd, length, sustained)
+    banner(stt, reason)
+    render_freshness(card, matrix)
+    if df.empty:
+        st.info("No credit data available.")
+        return
+    st.line_chart(df, height=300)
+    st.caption(f"Trend = slope(SMA({length})) of {hyg}/{lqd}: < 0 YELLOW, < 0 for {sustained} sessions RED")
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_sweep_cube(path: str, mtime: float):
+    """The sweep cube written by scripts/backtest.py --cube; ``mtime`` keys the cache to the file version."""
+    from utils.sweep import SweepCube
+
+    return SweepCube.load(Path(path))
+
+
+SWEEP_METRICS = {"flips": "{:.1f}", "pct_green": "{:.0%}", "pct_yellow": "{:.0%}", "pct_red": "{:.0%}"}
+
+
+def render_sweep_heatmap(card: dict):
+    path = REPO_ROOT / card["path"] if card.get("path") else BACKTEST_CUBE_PATH
+    if not path.exists():
+        st.info("No sweep cube yet: run `python scripts/backtest.py --sweep-windows ... --sweep-bands ... --cube`.")
+        return
+    try:
+        cube = load_sweep_cube(str(path), path.stat().st_mtime)
+    except Exception as e:
+        banner("UNKNOWN", f"Sweep cube unreadable: {e}")
+        return
+
+    key = card.get("id", "sweep_heatmap")
+    cols = st.columns(2)
+    metric = cols[0].selectbox("Metric", list(SWEEP_METRICS), index=list(SWEEP_METRICS).index(card.get("metric", "flips")), key=f"{key}_metric")
+    symbol = cols[1].selectbox("Symbol", ["All (mean)"] + list(cube.symbols), key=f"{key}_symbol")
+    grid = cube.heatmap(metric, None if symbol == "All (mean)" else symbol)
+    st.dataframe(grid.style.format(SWEEP_METRICS[metric], na_rep="N/A"), width="stretch")
+    st.caption(f"RS_SMA window (rows) x yellow band (columns) over {len(cube.symbols)} symbols; fewer flips = steadier status.")
+
+
+def render_macro_panel(card: dict):
+    symbols = card.get("symbols", DEFAULT_MACRO)
+
+    try:
+        matrix = universe_for(card)
+        available = [s for s in symbols if matrix.has(s) and matrix.observed[:, matrix.symbols.index(s)].sum() >= 10]
+        if not available:
+            st.info("No macro series available.")
+            return
+        st.line_chart(matrix.frame(available, how="all"), height=300)
+        render_freshness(card, matrix)
+    except Exception as e:
+        st.error(f"Macro panel failed: {e}")
+
+
+def render_allocation_table(card: dict):
+    rows = card.get("rows", [])
+    if rows:
+        st.dataframe(rows, width="stretch")
+    else:
+        st.info("No rows defined in spec.")
+
+
+def render_commodity_prices(card: dict):
+    import pandas as pd
+
+    snapshot, series = commodity_regime(card.get("period", "2y"), card.get("interval", "1d"))
+    units = {c.symbol: (c.ticker, c.unit) for c in commodities_from_spec(spec)}
+    symbols = card.get("symbols") or list(units)
+
+    rows = []
     for sym in symbols:
-        df, last, _ = rs_sma50(sym, bench)
-        if last is None:
-            statuses.append("UNKNOWN")
+        summary = snapshot.signals.get(sym) or {}
+        ticker, unit = units.get(sym, (sym, ""))
+        if not summary:
+            rows.append({"symbol": sym, "ticker": ticker, "last": "N/A", "unit": unit, "note": snapshot.errors.get(sym, "No data")})
             continue
-        stt, _ = status_from_rs_sma(last, yellow)
-        statuses.append(stt)
-
-    if "RED" in statuses:
-        st.error("Thesis Health: RED")
-    elif "YELLOW" in statuses:
-        st.warning("Thesis Health: YELLOW")
-    elif statuses.count("GREEN") >= 2:
-        st.success("Thesis Health: GREEN")
-    else:
-        st.info("Thesis Health: UNKNOWN")
+        rows.append(
+            {
+                "symbol": sym,
+                "ticker": ticker,
+                "last": f"{summary['last']:.2f}",
+                "unit": unit,
+                **{k: "N/A" if summary[k] is None else f"{summary[k]:+.2f}%" for k in ("chg_1d_pct", "chg_1m_pct", "chg_1y_pct")},
+                "as_of": summary["date"][:10],
+            }
+        )
+    st.dataframe(pd.DataFrame(rows), width="stretch")
+
+    frames = {sym: pd.Series(series[sym].close, index=pd.DatetimeIndex(series[sym].dates)) for sym in symbols if sym in series}
+    if frames:
+        df = pd.DataFrame(frames).sort_index()
+        st.line_chart(df / df.bfill().iloc[0] * 100.0, height=300)
+        st.caption("Rebased to 100 at the start of the window.")
+
 
+def rule_states(card_id: str, card: dict) -> List[dict]:
+    """Commodity rules from the precomputed regime snapshot; everything else against the current book."""
+    rules = card.get("rules", [])
+    commodity_syms = {c.symbol for c in commodities_from_spec(spec)}
+    regime_rules = {r.id for r in regime_rules_from_card(card_id, card, commodity_syms)}
 
-def render_live_market_slice(card: Dict):
-    asset, bench = card.get("symbols", ["FCX", "SPY"])
-    yellow = float(card.get("status_rule", {}).get("yellow_band", 0.0002))
+    out = []
+    if regime_rules:
+        snapshot, _ = commodity_regime()
+        for r in rules:
+            if r.get("id") in regime_rules:
+                state = snapshot.rules.get(r["id"], {})
+                out.append({**r, "state": state.get("state", "UNKNOWN"), "since": state.get("since", ""), "values": state.get("values") or {}})
+    others = [r for r in rules if r.get("id") not in regime_rules]
+    if others:
+        book = current_book()
+        val = book.revalue(book.price_vector(last_prices(tuple(book.tickers))))
+        out += evaluate_rules(others, concentration_lookup(val))
+    order = {r.get("id"): i for i, r in enumerate(rules)}
+    return sorted(out, key=lambda r: order.get(r.get("id"), 0))
 
-    df, last, asof = rs_sma50(asset, bench)
-    if df is None:
-        st.warning("Not enough data")
+
+def render_rule_list(card_id: str, card: dict):
+    import pandas as pd
+
+    states = rule_states(card_id, card)
+    if not states:
+        st.info("No rules defined in spec.")
         return
 
-    status, reason = status_from_rs_sma(last, yellow)
+    worst = "GREEN"
+    rows = []
+    for r in states:
+        status = r.get("state", "UNKNOWN")
+        if status == "ACTIVE" and r.get("severity") == "RED":
+            worst = "RED"
+        elif status == "ACTIVE" and r.get("severity") == "YELLOW" and worst != "RED":
+            worst = "YELLOW"
+        elif status == "UNKNOWN" and worst == "GREEN":
+            worst = "UNKNOWN"
+        values = r.get("values") or {}
+        rows.append(
+            {
+                "rule": r.get("id", ""),
+                "if": r.get("if", ""),
+                "then": r.get("then", ""),
+                "severity": r.get("severity", ""),
+                "state": status,
+                "since": (r.get("since") or "")[:10],
+                "inputs": ", ".join(f"{k}={v:.4g}" if v is not None else f"{k}=N/A" for k, v in values.items()),
+            }
+        )
+    banner(worst, f"{card.get('title', card_id)}: {worst}")
+    st.dataframe(pd.DataFrame(rows), width="stretch")
+    st.caption(f"'sustained' = last {SUSTAINED_OBS} observations.")
+
+
+def portfolio_valuation(targets_card: str = "portfolio_targets"):
+    book = current_book(targets_card)
+    prices = last_prices(tuple(book.tickers))
+    return book, book.revalue(book.price_vector(prices)), prices
+
+
+def render_current_vs_target(card: dict):
+    book, val, prices = portfolio_valuation(card.get("targets", "portfolio_targets"))
+    df = val.frame()
+    df["price_source"] = ["live" if t in prices else ("holdings" if p == p else "none") for t, p in zip(df["ticker"], df["price"])]
+    st.metric("Book value (USD)", f"{val.total:,.2f}")
+    st.dataframe(
+        df.style.format({"price": "{:.2f}", "value": "{:,.2f}", "weight": "{:.2%}", "target": "{:.2%}", "drift": "{:+.2%}"}, na_rep="N/A"),
+        width="stretch",
+    )
+    chart = df.set_index("ticker")[["weight", "target"]].fillna(0.0) * 100.0
+    st.bar_chart(chart, height=280)
+    if len(book.accounts) > 1:
+        with st.expander("Weights by account"):
+            st.dataframe(book.account_weights(val.price).style.format("{:.2%}", na_rep="N/A"), width="stretch")
+    if val.missing_prices:
+        st.caption(f"No price for: {', '.join(val.missing_prices)} (excluded from the book value)")
+    st.caption(f"Holdings: {book.holdings.source}")
+
 
+def render_income_estimates(card: dict):
+    book, val, _ = portfolio_valuation()
+    prep = prepared.get(("dividends",))
+    if prep is not None and not prep.ok:
+        dps_map, note = {}, f"Dividend cache unavailable ({prep.error}); using holdings estimates."
+    else:
+        try:
+            dps_map = dividends_per_share(held_tickers(book))
+            note = "Trailing-12-month dividends from the local cache; holdings estimates where missing."
+        except Exception as e:
+            dps_map, note = {}, f"Dividend cache unavailable ({e}); using holdings estimates."
+    dps = book.price_vector(dps_map, fallback_to_hint=False)
+    df = book.income(val.price, dps)
+
+    annual = float(df["annual_usd"].sum(skipna=True))
     c1, c2, c3 = st.columns(3)
-    c1.metric("As-of (UTC)", asof)
-    c2.metric("RS SMA(50)", status)
-    c3.metric("Last", f"{last:.4%}")
+    c1.metric("Annual income (USD)", f"{annual:,.2f}")
+    c2.metric("Monthly income (USD)", f"{annual / 12.0:,.2f}")
+    c3.metric("Portfolio yield", f"{annual / val.total:.2%}" if val.total else "N/A")
+    st.dataframe(
+        df.style.format({"dps_annual": "{:.2f}", "yield": "{:.2%}", "annual_usd": "{:,.2f}", "monthly_usd": "{:,.2f}"}, na_rep="N/A"),
+        width="stretch",
+    )
+    st.caption(note)
 
-    if status == "GREEN":
-        st.success(reason)
-    elif status == "YELLOW":
-        st.warning(reason)
-    elif status == "RED":
-        st.error(reason)
 
-    st.line_chart(df[[asset, bench]])
-    st.line_chart(df[["RS", "RS_SMA_50"]])
+def render_checklist(card: dict):
+    for item in card.get("items", []):
+        src = f" _(source: {item['source']})_" if item.get("source") else ""
+        st.checkbox(f"{item.get('text', '')}{src}", value=bool(item.get("done")), disabled=True)
+
+    if card.get("computed") == "rebalance":
+        book, val, _ = portfolio_valuation()
+        plan = book.trade_plan(val, min_trade_usd=float(card.get("min_trade_usd", 0.0)), sell_untargeted=bool(card.get("sell_untargeted", False)))
+        plan = plan[plan["action"] != "HOLD"]
+        st.markdown("**Computed rebalance (whole shares, current prices)**")
+        if plan.empty:
+            st.info("Book is within targets.")
+            return
+        st.dataframe(plan.style.format({"est_usd": "{:,.2f}", "weight": "{:.2%}", "target": "{:.2%}"}, na_rep="N/A"), width="stretch")
+        st.caption("Monitoring output only; not an order ticket.")
+
+
+def render_ppi_linkage(card: dict):
+    import pandas as pd
+
+    snapshot, _ = commodity_regime()
+    pairs = card.get("pairs", [])
+    try:
+        from adapters.macro_data import fetch_macro
+
+        ppi = fetch_macro(sorted({p["ppi"] for p in pairs}))
+        ppi_note = ""
+    except Exception as e:
+        ppi, ppi_note = {}, f"PPI series unavailable: {e}" if str(e) else "PPI series unavailable"
+
+    rows = []
+    for p in pairs:
+        yoy = (snapshot.signals.get(p["commodity"]) or {}).get("chg_1y_pct")
+        series = ppi.get(p["ppi"])
+        ppi_last = series.values[-1] if series is not None and series.values else None
+        rows.append(
+            {
+                "commodity": p["commodity"],
+                "commodity_yoy": "N/A" if yoy is None else f"{yoy:+.2f}%",
+                "ppi_series": p["ppi"],
+                "ppi_yoy": "N/A" if ppi_last is None else f"{ppi_last:+.2f}%",
+                "gap_pp": "N/A" if yoy is None or ppi_last is None else f"{yoy - ppi_last:+.2f}",
+            }
+        )
+    if not rows:
+        st.info("No commodity/PPI pairs defined in spec.")
+        return
+    st.dataframe(pd.DataFrame(rows), width="stretch")
+    if ppi_note:
+        st.caption(ppi_note)
+
+
+def render_card(card_id: str):
+    card = card_defs.get(card_id, {})
+    title = card.get("title", card_id)
+    ctype = card.get("type", "unknown")
+
+    with st.container(border=True):
+        st.subheader(title)
+        st.caption(f"Card type: {ctype}")
+
+        # Never re-run a dependency that already failed or timed out this run: degrade instead of blocking.
+        failed = [(key, prepared[key]) for key in card_deps(card_id, card) if key in prepared and not prepared[key].ok and key not in OPTIONAL_DEPS]
+        if failed:
+            banner("UNKNOWN", "Data unavailable: " + "; ".join(f"{key[0]} {r.status.lower()} ({r.error})" for key, r in failed))
+            return
+
+        if ctype == "status_summary":
+            render_status_summary(card)
+            return
+
+        if ctype == "live_market_slice":
+            render_live_market_slice(card)
+            return
 
+        if ctype == "intraday_rs":
+            render_intraday_rs(card)
+            return
+
+        if ctype == "multi_series_chart":
+            # interpret as rotation radar if card requests RS
+            if card.get("mode") == "rotation_radar" or "benchmark" in card or radar_symbols(card) != DEFAULT_ROTATION:
+                render_rotation_radar(card)
+            else:
+                st.info("multi_series_chart not yet bound for this card.")
+            return
+
+        if ctype == "chart_plus_thresholds":
+            render_credit_panel(card)
+            return
+
+        if ctype == "rs_grid":
+            render_rs_grid(card)
+            return
+
+        if ctype == "sector_sequence":
+            render_sector_sequence(card)
+            return
+
+        if ctype == "macro_panel":
+            render_macro_panel(card)
+            return
+
+        if ctype == "sweep_heatmap":
+            render_sweep_heatmap(card)
+            return
+
+        if ctype == "allocation_table":
+            render_allocation_table(card)
+            return
+
+        if ctype == "commodity_prices":
+            render_commodity_prices(card)
+            return
+
+        if ctype == "rule_list":
+            render_rule_list(card_id, card)
+            return
+
+        if ctype == "ppi_linkage":
+            render_ppi_linkage(card)
+            return
+
+        if ctype == "current_vs_target":
+            render_current_vs_target(card)
+            return
+
+        if ctype == "income_estimates":
+            render_income_estimates(card)
+            return
+
+        if ctype == "checklist":
+            render_checklist(card)
+            return
+
+        # fallback
+        st.code(json.dumps(card, indent=2), language="json")
+
+
+# -------------------------
+# Card data preparation
+# -------------------------
+MARKET_CARD_TYPES = {"status_summary", "live_market_slice", "multi_series_chart", "chart_plus_thresholds", "macro_panel", "rs_grid", "sector_sequence"}
+OPTIONAL_DEPS = {("dividends",)}  # cards fall back (holdings estimates) instead of going UNKNOWN
+
+
+def card_deps(card_id: str, card: dict) -> Dict[tuple, object]:
+    """{dependency key: zero-arg loader} for the data a card reads; cards sharing a key share one task."""
+    ctype = card.get("type")
+    deps: Dict[tuple, object] = {}
+    if ctype in MARKET_CARD_TYPES:
+        period, interval, syms = spec_index.universe_for(card)
+        fill, basis = card.get("fill_policy", "none"), price_basis(card)
+        deps[("universe", period, interval, fill, basis)] = lambda: universe_for(card)
+    if ctype == "intraday_rs":
+        symbols = tuple(card.get("symbols", ["IWM", DEFAULT_BENCH])[:2])
+        deps[("intraday", card.get("interval", "1m"), symbols)] = lambda: intraday_feed(card)
+    if ctype == "commodity_prices":
+        period, interval = card.get("period", "2y"), card.get("interval", "1d")
+        deps[("commodities", period, interval)] = lambda: commodity_regime(period, interval)
+    if ctype == "ppi_linkage":
+        deps[("commodities", "2y", "1d")] = commodity_regime
+    if ctype == "rule_list":
+        commodity_syms = {c.symbol for c in commodities_from_spec(spec)}
+        regime_ids = {r.id for r in regime_rules_from_card(card_id, card, commodity_syms)}
+        if regime_ids:
+            deps[("commodities", "2y", "1d")] = commodity_regime
+        if len(regime_ids) < len(card.get("rules", [])):
+            deps[("portfolio", "portfolio_targets")] = portfolio_valuation
+    if ctype in ("current_vs_target", "income_estimates") or (ctype == "checklist" and card.get("computed") == "rebalance"):
+        targets = card.get("targets", "portfolio_targets")
+        deps[("portfolio", targets)] = lambda: portfolio_valuation(targets)
+    if ctype == "income_estimates":
+        deps[("dividends",)] = lambda: dividends_per_share(held_tickers(current_book()))
+    return deps
+
+
+def prepare_cards(card_ids: List[str]) -> Dict[tuple, TaskResult]:
+    """
+    Warm every card's data concurrently on the shared pool. A dependency that fails or
+    overruns PREP_TIMEOUT is reported per key, so its cards render UNKNOWN while the
+    rest render from the warmed caches.
+    """
+    tasks: Dict[tuple, object] = {}
+    for cid in card_ids:
+        tasks.update(card_deps(cid, card_defs.get(cid, {})))
+    if not tasks:
+        return {}
+    return task_runner().run(tasks, PREP_TIMEOUT)
+
+
+# -------------------------
+# Pages
+# -------------------------
+if not pages:
+    pages = [{"id": "overview", "title": "Overview", "cards": []}]
+
+with st.spinner("Loading card data..."):
+    prepared = prepare_cards(list(dict.fromkeys(cid for page in pages for cid in page.get("cards", []))))
 
 for i, page in enumerate(pages):
     with tabs[i]:
-        st.caption(f"Page id: {page['id']}")
-        for cid in page["cards"]:
-            card = cards[cid]
-            with st.container(border=True):
-                st.subheader(card["title"])
-                if card["type"] == "status_summary":
-                    render_status_summary(card)
-                elif card["type"] == "live_market_slice":
-                    render_live_market_slice(card)
-                else:
-                    st.info("Card type wired later.")
+        st.write(f"### {page.get('title','')}")
+        st.caption(f"Page id: {page.get('id','')}")
+        for card_id in page.get("cards", []):
+            render_card(card_id)
+
+st.divider()
+with st.expander("Diagnostics"):
+    st.code(json.dumps(manifest, indent=2), language="json")
+    st.code(json.dumps(spec.get("meta", {}), indent=2), language="json")
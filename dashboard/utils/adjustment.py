@@ -0,0 +1,95 @@
+"""Adjusted price views from one stored close series plus cached corporate actions.
+
+Stored series are yfinance ``Close`` (``close_kind == "close"``): split-adjusted,
+not dividend-adjusted. From that one series and the symbol's cached dividends
+and splits (adapters/dividend_data.py) we derive, per bar:
+
+  "close"          as stored (the default basis everywhere)
+  "total_return"   also dividend-adjusted, like Yahoo's Adj Close: every bar before
+                   an ex-date is scaled by (1 - dividend / previous close)
+  "unadjusted"     as traded: splits undone (bars before a split x its ratio)
+
+Factors are cumulative products over the events after each bar, computed in one
+vectorized pass (searchsorted + reverse cumprod), so a newly cached dividend or
+split costs an O(n) re-adjust of the stored history and no download.
+
+A series that is already ``adj_close`` can only serve "total_return" (returned
+as-is); asking it for another basis raises ValueError.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BASES = ("close", "total_return", "unadjusted")
+
+
+def _event_positions(dates: pd.DatetimeIndex, event_dates: pd.DatetimeIndex) -> np.ndarray:
+    """For each event, the first bar on/after it (bars before that position are affected)."""
+    return np.searchsorted(dates.values, event_dates.values, side="left")
+
+
+def _cumulative(n: int, pos: np.ndarray, mult: np.ndarray) -> np.ndarray:
+    """factor[i] = product of ``mult`` over events with position > i."""
+    g = np.ones(n + 1)
+    np.multiply.at(g, pos, mult)
+    return np.cumprod(g[::-1])[::-1][1:]
+
+
+def adjustment_factors(dates, close, actions: Optional[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (dividend factors, split ratios) per bar for a split-adjusted ``close``.
+
+    ``actions`` has columns ``amount`` (cash dividend per share, split-adjusted, as
+    yfinance reports it) and ``split`` (ratio, 0/NaN when none), indexed by ex-date.
+    Multiply closes by the first to get total-return prices, by the second to undo splits.
+    """
+    idx = pd.DatetimeIndex(dates)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    idx = idx.normalize()
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    ones = np.ones(n)
+    if actions is None or actions.empty or n == 0:
+        return ones, ones.copy()
+
+    ex = pd.DatetimeIndex(actions.index).normalize()
+    amount = np.nan_to_num(actions["amount"].to_numpy(dtype=float))
+    split = np.nan_to_num(actions["split"].to_numpy(dtype=float)) if "split" in actions else np.zeros(len(ex))
+
+    div = amount > 0
+    pos = _event_positions(idx, ex[div])
+    valid = (pos > 0) & (pos <= n - 1)  # needs a previous close, and the ex-date inside the history
+    prev_close = close[np.maximum(pos - 1, 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mult = 1.0 - amount[div] / prev_close
+    valid &= np.isfinite(mult) & (mult > 0)
+    div_factor = _cumulative(n, pos[valid], mult[valid])
+
+    spl = (split > 0) & (split != 1)
+    pos = _event_positions(idx, ex[spl])
+    inside = pos <= n - 1
+    split_factor = _cumulative(n, pos[inside], split[spl][inside])
+    return div_factor, split_factor
+
+
+def adjusted_series(series, actions: Optional[pd.DataFrame], basis: str = "close"):
+    """A copy of ``series`` (PriceSeries) on ``basis``; ``close_kind`` names the basis."""
+    if basis not in BASES:
+        raise ValueError(f"basis must be one of {BASES}, got {basis!r}")
+    kind = getattr(series, "close_kind", "") or "close"
+    if kind == "adj_close":
+        if basis != "total_return":
+            raise ValueError("series is already dividend-adjusted (adj_close); only 'total_return' is available")
+        return series
+    if basis == "close":
+        return series
+    div_factor, split_factor = adjustment_factors(series.dates, series.close, actions)
+    factor = div_factor if basis == "total_return" else split_factor
+    close = (np.asarray(series.close, dtype=float) * factor).tolist()
+    return replace(series, close=close, close_kind=basis)
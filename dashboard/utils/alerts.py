@@ -0,0 +1,221 @@
+"""Headless evaluator for the spec's ``alerting`` section.
+
+Per evaluation pass:
+1. Resolve only the signals referenced by alert conditions and fingerprint each.
+2. Re-evaluate only the alerts whose input fingerprints changed (signal -> alerts index);
+   untouched alerts keep their state without being evaluated.
+3. Debounce: a point-in-time condition must hold (or clear) across ``debounce``
+   consecutive distinct inputs (combined fingerprint of the alert's signals) before the
+   alert flips, so flapping inputs don't spam and re-running on unchanged data never
+   advances it. Conditions that already count observations ("for N months",
+   "sustained") flip on the first distinct input instead of stacking a second count.
+4. Dedupe: an alert fires once per activation; it can only fire again after it has
+   resolved. Events go to every configured sink.
+
+State (signal fingerprints + per-alert state) is persisted as JSON between runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from .conditions import Condition, ConditionError, parse_condition
+
+FINGERPRINT_OBS = 32  # trailing observations hashed per signal
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    id: str
+    condition: Condition
+    severity: str
+    message: str
+
+
+@dataclass
+class AlertState:
+    active: bool = False
+    streak: int = 0  # consecutive distinct inputs disagreeing with `active`
+    inputs: str = ""  # combined fingerprint of the inputs that last advanced the streak
+    last_result: Optional[bool] = None
+    fired_at: str = ""
+    resolved_at: str = ""
+    fire_count: int = 0
+
+
+@dataclass
+class EvaluationReport:
+    changed_signals: List[str] = field(default_factory=list)
+    evaluated: List[str] = field(default_factory=list)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def fingerprint(history: Optional[Sequence[float]]) -> str:
+    if history is None:
+        return "none"
+    tail = [round(float(v), 10) if v == v else None for v in list(history)[-FINGERPRINT_OBS:]]
+    return hashlib.sha256(json.dumps(tail).encode("utf-8")).hexdigest()[:16]
+
+
+def rules_from_spec(spec: Dict[str, Any]) -> List[AlertRule]:
+    rules = []
+    for a in spec.get("alerting", {}).get("alerts", []):
+        try:
+            cond = parse_condition(a["condition"])
+        except (KeyError, ConditionError) as e:
+            raise ConditionError(f"alert {a.get('id', '<no id>')}: {e}") from e
+        rules.append(
+            AlertRule(
+                id=a["id"],
+                condition=cond,
+                severity=a.get("severity", "YELLOW"),
+                message=a.get("message", ""),
+            )
+        )
+    return rules
+
+
+class AlertEngine:
+    def __init__(self, rules: Sequence[AlertRule], signals, sinks: Sequence = (), state_path: Optional[Path] = None, debounce: int = 2):
+        self.rules = {r.id: r for r in rules}
+        self.signals = signals
+        self.sinks = list(sinks)
+        self.state_path = Path(state_path) if state_path else None
+        self.debounce = max(int(debounce), 1)
+
+        self.by_signal: Dict[str, Set[str]] = {}
+        for r in rules:
+            for key in r.condition.signals:
+                self.by_signal.setdefault(key, set()).add(r.id)
+
+        self.fingerprints: Dict[str, str] = {}
+        self.states: Dict[str, AlertState] = {rid: AlertState() for rid in self.rules}
+        self._unseen: Set[str] = set(self.rules)  # never evaluated: check once regardless of fingerprints
+        self._load()
+
+    # -- persistence --------------------------------------------------------
+    def _load(self) -> None:
+        if not self.state_path or not self.state_path.is_file():
+            return
+        try:
+            raw = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        self.fingerprints = dict(raw.get("signals", {}))
+        known = {f.name for f in fields(AlertState)}
+        for rid, st in raw.get("alerts", {}).items():
+            if rid not in self.states or not isinstance(st, dict):
+                continue
+            try:
+                # Keys from older/newer state layouts are ignored; an unreadable entry starts fresh.
+                self.states[rid] = AlertState(**{k: v for k, v in st.items() if k in known})
+            except (TypeError, ValueError):
+                continue
+            self._unseen.discard(rid)
+
+    def save(self) -> None:
+        if not self.state_path:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "updated_utc": _now(),
+            "signals": self.fingerprints,
+            "alerts": {rid: st.__dict__ for rid, st in self.states.items()},
+        }
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    def active(self) -> List[Dict[str, Any]]:
+        return [
+            {"id": rid, "severity": self.rules[rid].severity, "message": self.rules[rid].message, "since": st.fired_at}
+            for rid, st in self.states.items()
+            if st.active
+        ]
+
+    # -- evaluation ---------------------------------------------------------
+    def evaluate(self) -> EvaluationReport:
+        report = EvaluationReport()
+        if hasattr(self.signals, "reset"):
+            self.signals.reset()
+
+        dirty: Set[str] = set()
+        for key in sorted(self.by_signal):
+            fp = fingerprint(self.signals(key))
+            if self.fingerprints.get(key) != fp:
+                self.fingerprints[key] = fp
+                report.changed_signals.append(key)
+                dirty |= self.by_signal[key]
+        report.errors.update(getattr(self.signals, "errors", {}) or {})
+        dirty |= self._unseen
+        self._unseen = set()
+
+        for rid in sorted(dirty):
+            rule = self.rules[rid]
+            result = rule.condition.evaluate(self.signals)
+            report.evaluated.append(rid)
+            event = self._step(rule, self.states[rid], result, self._inputs(rule))
+            if event:
+                report.events.append(event)
+
+        for event in report.events:
+            for sink in self.sinks:
+                try:
+                    sink.send(event)
+                except Exception as e:
+                    report.errors[f"sink:{type(sink).__name__}"] = str(e)
+
+        self.save()
+        return report
+
+    def _inputs(self, rule: AlertRule) -> str:
+        joined = "|".join(f"{key}={self.fingerprints.get(key, '')}" for key in sorted(rule.condition.signals))
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+    def debounce_for(self, rule: AlertRule) -> int:
+        return 1 if rule.condition.counts_observations else self.debounce
+
+    def _step(self, rule: AlertRule, st: AlertState, result: Optional[bool], inputs: str = "") -> Optional[Dict[str, Any]]:
+        st.last_result = result
+        if result is None or result == st.active:
+            # Unknown inputs neither fire nor resolve; agreement resets the debounce streak.
+            st.streak = 0
+            return None
+        if st.streak and inputs == st.inputs:
+            return None  # same data as the last counted evaluation: no progress
+
+        st.streak += 1
+        st.inputs = inputs
+        if st.streak < self.debounce_for(rule):
+            return None
+
+        st.streak = 0
+        st.active = result
+        now = _now()
+        if result:
+            st.fired_at = now
+            st.fire_count += 1
+            kind = "fired"
+        else:
+            st.resolved_at = now
+            kind = "resolved"
+        return {
+            "schema": "mt.dashboard.alert.v1",
+            "event": kind,
+            "alert_id": rule.id,
+            "severity": rule.severity,
+            "message": rule.message,
+            "condition": rule.condition.text,
+            "at_utc": now,
+            "activation": st.fire_count,
+        }
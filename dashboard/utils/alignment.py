@@ -0,0 +1,146 @@
+"""Shared session-calendar alignment for price series.
+
+Builds one canonical session calendar per as-of (the benchmark's sessions, or the
+union of all fetched sessions) and maps every symbol onto it with integer index
+arrays. Missing sessions are handled by an explicit fill policy and counted, so
+cards can report gaps instead of silently dropping days:
+
+  "none"   leave missing sessions NaN (pair views then drop them, like an inner join;
+           ``pair_dropped`` counts them so callers can say so)
+  "ffill"  carry the last observed close forward, at most ``fill_limit`` sessions
+
+The resulting AlignedMatrix is built once and shared by every card; per-card
+views (``pair``, ``frame``) are slices of it, not new joins.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FILL_POLICIES = ("none", "ffill")
+
+
+def _session_index(dates, normalize: bool) -> pd.DatetimeIndex:
+    idx = pd.DatetimeIndex(dates)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    return idx.normalize() if normalize else idx
+
+
+@dataclass(frozen=True)
+class SessionCalendar:
+    sessions: pd.DatetimeIndex
+
+    @classmethod
+    def build(cls, series: Dict[str, object], calendar_symbol: Optional[str] = None, normalize: bool = True) -> "SessionCalendar":
+        """Sessions of ``calendar_symbol`` if available, else the union of all series' sessions."""
+        if calendar_symbol and calendar_symbol in series:
+            idx = _session_index(series[calendar_symbol].dates, normalize)
+        else:
+            parts = [_session_index(s.dates, normalize) for s in series.values()]
+            idx = parts[0].append(parts[1:]) if parts else pd.DatetimeIndex([])
+        return cls(sessions=idx.unique().sort_values())
+
+    def positions(self, dates, normalize: bool = True) -> np.ndarray:
+        """Calendar row for each date (-1 if the date is not a calendar session)."""
+        return self.sessions.get_indexer(_session_index(dates, normalize))
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+
+@dataclass
+class AlignedMatrix:
+    calendar: SessionCalendar
+    symbols: List[str]
+    values: np.ndarray  # (sessions x symbols) closes after fill policy
+    observed: np.ndarray  # (sessions x symbols) True where a real bar exists
+    fill_policy: str = "none"
+    as_of_utc: Dict[str, str] = field(default_factory=dict)  # last bar per symbol
+    fetched_utc: Dict[str, str] = field(default_factory=dict)
+    close_kind: Dict[str, str] = field(default_factory=dict)  # price basis per symbol (see utils/adjustment.py)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def has(self, symbol: str) -> bool:
+        return symbol in self.symbols
+
+    def column(self, symbol: str) -> np.ndarray:
+        return self.values[:, self.symbols.index(symbol)]
+
+    def frame(self, symbols: Sequence[str], how: str = "all") -> pd.DataFrame:
+        """DataFrame of ``symbols`` on the calendar; drop rows where all (or any) are NaN."""
+        cols = [s for s in symbols if s in self.symbols]
+        df = pd.DataFrame(
+            self.values[:, [self.symbols.index(s) for s in cols]],
+            index=pd.Index(self.calendar.sessions, name="date"),
+            columns=cols,
+        )
+        return df.dropna(how=how)
+
+    def pair(self, a: str, b: str) -> pd.DataFrame:
+        """
+        Rows where both symbols have a value (after fill), as columns [a, b]. Sessions
+        where either is missing are dropped, not filled; see ``pair_dropped``.
+        """
+        return self.frame([a, b], how="any")
+
+    def pair_dropped(self, a: str, b: str) -> int:
+        """Sessions ``pair(a, b)`` drops after the first session both symbols have a value."""
+        if not (self.has(a) and self.has(b)):
+            return 0
+        both = ~np.isnan(self.column(a)) & ~np.isnan(self.column(b))
+        if not both.any():
+            return 0
+        return int((~both[np.argmax(both):]).sum())
+
+
+def align(
+    series: Dict[str, object],
+    calendar: Optional[SessionCalendar] = None,
+    calendar_symbol: Optional[str] = None,
+    fill_policy: str = "none",
+    fill_limit: Optional[int] = 1,
+    normalize: bool = True,
+) -> AlignedMatrix:
+    """Map PriceSeries-like objects (``.dates``, ``.close``) onto one session calendar."""
+    if fill_policy not in FILL_POLICIES:
+        raise ValueError(f"fill_policy must be one of {FILL_POLICIES}, got {fill_policy!r}")
+    calendar = calendar or SessionCalendar.build(series, calendar_symbol, normalize)
+    symbols = list(series)
+    n = len(calendar)
+    values = np.full((n, len(symbols)), np.nan)
+
+    for j, sym in enumerate(symbols):
+        s = series[sym]
+        pos = calendar.positions(s.dates, normalize)
+        close = np.asarray(s.close, dtype=float)
+        keep = pos >= 0
+        # Later bars win when several timestamps map to one session.
+        values[pos[keep], j] = close[keep]
+
+    observed = ~np.isnan(values)
+    if fill_policy == "ffill" and n:
+        rows = np.arange(n)[:, None]
+        last = np.where(observed, rows, -1)
+        np.maximum.accumulate(last, axis=0, out=last)
+        age = rows - last
+        ok = (last >= 0) & ~observed
+        if fill_limit is not None:
+            ok &= age <= fill_limit
+        filled = np.take_along_axis(values, np.maximum(last, 0), axis=0)
+        values = np.where(ok, filled, values)
+
+    return AlignedMatrix(
+        calendar=calendar,
+        symbols=symbols,
+        values=values,
+        observed=observed,
+        fill_policy=fill_policy,
+        as_of_utc={sym: getattr(series[sym], "as_of_utc", "") for sym in symbols},
+        fetched_utc={sym: getattr(series[sym], "fetched_utc", "") for sym in symbols},
+        close_kind={sym: getattr(series[sym], "close_kind", "") for sym in symbols},
+    )
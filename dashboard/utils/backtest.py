@@ -0,0 +1,278 @@
+"""Vectorized historical replay of thesis-health signals.
+
+Replays RS_50D (per symbol vs benchmark), CREDIT_DIVERGENCE (HYG/LQD) and the
+thesis-health aggregate over a full history in one pass of array operations:
+every symbol and every date is evaluated at once on a (dates x symbols) matrix.
+
+Status rules mirror the live dashboard:
+- RS SMA:  > +yellow_band GREEN, < -yellow_band RED, otherwise YELLOW
+- Credit:  trend = slope(SMA(HYG/LQD, 50)) < 0 YELLOW, < 0 sustained RED,
+           otherwise GREEN (the rule in signals.py, shared with the alert engine)
+- Thesis:  any RED => RED; else any YELLOW => YELLOW;
+           else GREEN if credit GREEN and >= 2 symbols GREEN; else UNKNOWN
+A day only gets a status once at least ``min_rows`` aligned rows exist, matching
+the app's "Not enough aligned data" guard.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import signals
+from .alignment import align
+
+UNKNOWN, RED, YELLOW, GREEN = 0, 1, 2, 3
+STATUS_LABELS = np.array(["UNKNOWN", "RED", "YELLOW", "GREEN"], dtype=object)
+
+MIN_ALIGNED_ROWS = 80
+
+
+def rs_matrix(closes: np.ndarray, bench: np.ndarray) -> np.ndarray:
+    """Daily return differential for every column of ``closes`` vs ``bench`` (row 0 is NaN)."""
+    closes = np.asarray(closes, dtype=float)
+    bench = np.asarray(bench, dtype=float).reshape(-1, 1)
+    out = np.full(closes.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a_ret = closes[1:] / closes[:-1]
+        b_ret = bench[1:] / bench[:-1]
+        rs = a_ret - b_ret
+    # Same guard as indicators.rs_vs_spy: a zero previous close yields no value.
+    rs[(closes[:-1] == 0) | (bench[:-1] == 0)] = np.nan
+    out[1:] = rs
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Column-wise SMA via prefix sums; NaN unless the full window is valid (as indicators.sma)."""
+    values = np.asarray(values, dtype=float)
+    n = values.shape[0]
+    out = np.full(values.shape, np.nan)
+    if window <= 0 or window > n:
+        return out
+
+    valid = ~np.isnan(values)
+    pad = np.zeros((1,) + values.shape[1:])
+    csum = np.concatenate([pad, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    ccnt = np.concatenate([pad, np.cumsum(valid, axis=0)])
+
+    win_sum = csum[window:] - csum[:-window]
+    win_cnt = ccnt[window:] - ccnt[:-window]
+    out[window - 1:] = np.where(win_cnt == window, win_sum / window, np.nan)
+    return out
+
+
+def rs_status(rs_sma: np.ndarray, yellow_band: float) -> np.ndarray:
+    return np.select(
+        [np.isnan(rs_sma), rs_sma > yellow_band, rs_sma < -yellow_band],
+        [UNKNOWN, GREEN, RED],
+        default=YELLOW,
+    ).astype(np.int8)
+
+
+def credit_trend(hyg: np.ndarray, lqd: np.ndarray, length: int = signals.CREDIT_SMA_LENGTH) -> np.ndarray:
+    """CREDIT_DIVERGENCE trend per day: slope(SMA(HYG/LQD, length)), via signals.credit_trend."""
+    proxy = signals.credit_proxy(np.asarray(hyg, dtype=float), np.asarray(lqd, dtype=float))
+    return np.asarray(signals.credit_trend(proxy, length), dtype=float)
+
+
+def credit_status(trend: np.ndarray, sustained: int = signals.SUSTAINED_OBS) -> np.ndarray:
+    codes = {str(label): code for code, label in enumerate(STATUS_LABELS)}
+    return np.array([codes[s] for s in signals.credit_states(np.asarray(trend, dtype=float), sustained)], dtype=np.int8)
+
+
+def thesis_status(rotation: np.ndarray, credit: np.ndarray) -> np.ndarray:
+    """Row-wise aggregate of a (dates x symbols) rotation matrix and a credit vector."""
+    any_red = (rotation == RED).any(axis=1) | (credit == RED)
+    any_yellow = (rotation == YELLOW).any(axis=1) | (credit == YELLOW)
+    green = (credit == GREEN) & ((rotation == GREEN).sum(axis=1) >= 2)
+    return np.select([any_red, any_yellow, green], [RED, YELLOW, GREEN], default=UNKNOWN).astype(np.int8)
+
+
+def last_known(known: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Index of the last True in ``known`` at or before each position along ``axis`` (-1 before the first)."""
+    known = np.asarray(known, dtype=bool)
+    shape = [1] * known.ndim
+    shape[axis] = known.shape[axis]
+    idx = np.where(known, np.arange(known.shape[axis]).reshape(shape), -1)
+    return np.maximum.accumulate(idx, axis=axis)
+
+
+def flip_counts(status: np.ndarray) -> np.ndarray:
+    """
+    Changes between consecutive known statuses along axis 0. UNKNOWN days are skipped,
+    not counted: GREEN, UNKNOWN, GREEN is no flip. sweep.sweep_cube pairs days the same way.
+    """
+    status = np.asarray(status)
+    if status.ndim == 1:
+        status = status[:, None]
+    known = status != UNKNOWN
+    prev = last_known(known)[:-1]  # last known day at or before t-1
+    before = np.take_along_axis(status, np.maximum(prev, 0), axis=0)
+    return (known[1:] & (prev >= 0) & (status[1:] != before)).sum(axis=0)
+
+
+def status_shares(status: np.ndarray) -> Dict[str, np.ndarray]:
+    status = np.asarray(status)
+    if status.ndim == 1:
+        status = status[:, None]
+    n = max(status.shape[0], 1)
+    return {str(STATUS_LABELS[c]).lower(): (status == c).sum(axis=0) / n for c in (GREEN, YELLOW, RED, UNKNOWN)}
+
+
+@dataclass
+class PriceMatrix:
+    dates: pd.DatetimeIndex
+    symbols: List[str]
+    closes: np.ndarray  # (dates x symbols), NaN where a symbol has no bar
+
+    def column(self, symbol: str) -> np.ndarray:
+        return self.closes[:, self.symbols.index(symbol)]
+
+
+def load_price_matrix(store, symbols: Sequence[str], calendar_symbol: str, interval: str = "1d") -> PriceMatrix:
+    """
+    Load ``symbols`` from a PriceStore onto ``calendar_symbol``'s sessions.
+
+    Symbols missing a session get NaN for that row; the strict SMA then withholds a
+    value until a full window of valid returns is available again.
+    """
+    series = {}
+    for sym in dict.fromkeys([calendar_symbol, *symbols]):
+        ps = store.load(sym, interval)
+        if ps is None:
+            raise FileNotFoundError(f"No stored prices for {sym} ({interval}); run with --refresh first")
+        series[sym] = ps
+
+    matrix = align(series, calendar_symbol=calendar_symbol, normalize=interval.endswith(("d", "wk", "mo")))
+    return PriceMatrix(dates=matrix.calendar.sessions, symbols=matrix.symbols, closes=matrix.values)
+
+
+@dataclass
+class BacktestResult:
+    dates: pd.DatetimeIndex
+    symbols: List[str]
+    rs_sma: np.ndarray  # (dates x symbols)
+    rotation: np.ndarray  # (dates x symbols) status codes
+    credit_trend: np.ndarray  # (dates,)
+    credit: np.ndarray  # (dates,) status codes
+    thesis: np.ndarray  # (dates,) status codes
+
+    def status_frame(self) -> pd.DataFrame:
+        """Per-day status labels: one column per symbol plus CREDIT and THESIS."""
+        df = pd.DataFrame(STATUS_LABELS[self.rotation], index=self.dates, columns=self.symbols)
+        df["CREDIT"] = STATUS_LABELS[self.credit]
+        df["THESIS"] = STATUS_LABELS[self.thesis]
+        df.index.name = "date"
+        return df
+
+    def flip_stats(self) -> pd.DataFrame:
+        status = np.column_stack([self.rotation, self.credit, self.thesis])
+        names = [*self.symbols, "CREDIT", "THESIS"]
+        flips = flip_counts(status)
+        shares = status_shares(status)
+        known_days = (status != UNKNOWN).sum(axis=0)
+        df = pd.DataFrame(
+            {
+                "flips": flips,
+                "known_days": known_days,
+                "avg_run_days": known_days / (flips + 1),
+                **{f"pct_{k}": v for k, v in shares.items()},
+            },
+            index=pd.Index(names, name="series"),
+        )
+        return df
+
+
+def run_backtest(
+    prices: PriceMatrix,
+    rotation_symbols: Sequence[str],
+    bench: str = "SPY",
+    hyg: str = "HYG",
+    lqd: str = "LQD",
+    window: int = 50,
+    yellow_band: float = 0.0002,
+    credit_window: int = signals.CREDIT_SMA_LENGTH,
+    credit_sustained: int = signals.SUSTAINED_OBS,
+    min_rows: int = MIN_ALIGNED_ROWS,
+) -> BacktestResult:
+    closes = np.column_stack([prices.column(s) for s in rotation_symbols])
+    rs_sma = rolling_mean(rs_matrix(closes, prices.column(bench)), window)
+    rs_sma[: max(min_rows - 1, 0)] = np.nan
+
+    trend = credit_trend(prices.column(hyg), prices.column(lqd), credit_window)
+    credit_in = trend.copy()
+    credit_in[: max(min_rows - 1, 0)] = np.nan
+
+    rotation = rs_status(rs_sma, yellow_band)
+    credit = credit_status(credit_in, credit_sustained)
+    return BacktestResult(
+        dates=prices.dates,
+        symbols=list(rotation_symbols),
+        rs_sma=rs_sma,
+        rotation=rotation,
+        credit_trend=trend,
+        credit=credit,
+        thesis=thesis_status(rotation, credit),
+    )
+
+
+def _sweep_window(args: Tuple[np.ndarray, np.ndarray, int, Sequence[float], int]) -> List[Dict[str, float]]:
+    rs, credit, window, bands, min_rows = args
+    rs_sma = rolling_mean(rs, window)
+    rs_sma[: max(min_rows - 1, 0)] = np.nan
+    rows = []
+    for band in bands:
+        rotation = rs_status(rs_sma, band)
+        thesis = thesis_status(rotation, credit)
+        shares = status_shares(thesis)
+        rows.append(
+            {
+                "window": window,
+                "yellow_band": float(band),
+                "thesis_flips": int(flip_counts(thesis)[0]),
+                "symbol_flips": int(flip_counts(rotation).sum()),
+                **{f"pct_{k}": float(v[0]) for k, v in shares.items()},
+            }
+        )
+    return rows
+
+
+def sweep(
+    prices: PriceMatrix,
+    rotation_symbols: Sequence[str],
+    windows: Sequence[int],
+    yellow_bands: Sequence[float],
+    bench: str = "SPY",
+    hyg: str = "HYG",
+    lqd: str = "LQD",
+    credit_window: int = signals.CREDIT_SMA_LENGTH,
+    credit_sustained: int = signals.SUSTAINED_OBS,
+    min_rows: int = MIN_ALIGNED_ROWS,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate every (window, yellow_band) combination; one row of flip/share stats each.
+
+    RS and credit status are computed once and shared; windows are fanned out across
+    processes (``workers=1`` runs inline).
+    """
+    closes = np.column_stack([prices.column(s) for s in rotation_symbols])
+    rs = rs_matrix(closes, prices.column(bench))
+    trend = credit_trend(prices.column(hyg), prices.column(lqd), credit_window)
+    trend[: max(min_rows - 1, 0)] = np.nan
+    credit = credit_status(trend, credit_sustained)
+
+    tasks = [(rs, credit, int(w), list(yellow_bands), min_rows) for w in windows]
+    if workers == 1 or len(tasks) <= 1:
+        chunks = [_sweep_window(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            chunks = list(ex.map(_sweep_window, tasks))
+
+    rows = [r for chunk in chunks for r in chunk]
+    return pd.DataFrame(rows).sort_values(["window", "yellow_band"]).reset_index(drop=True)
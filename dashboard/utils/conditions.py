@@ -0,0 +1,126 @@
+"""Parser/evaluator for the spec's plain-text rule conditions.
+
+Covers the forms used in DASHBOARD_SPEC alerting/rule_list entries:
+  ISM_PMI < 48
+  UNEMPLOYMENT_RATE >= 4.5 for 2 months      (last N observations must all hold)
+  COPPER > 4.50 sustained                    (last SUSTAINED_OBS observations)
+  CREDIT_DIVERGENCE trend < 0                (field -> signal key "CREDIT_DIVERGENCE.trend")
+  COPPER < 4.00 AND SILVER < 28              (AND binds tighter than OR)
+  any_position_weight > 25%                  (% divides by 100, k multiplies by 1000)
+
+Signals are looked up by key and must return their history oldest-first. Missing
+data makes a clause UNKNOWN (None); AND/OR use three-valued logic.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+SUSTAINED_OBS = 5
+
+_CLAUSE_RE = re.compile(
+    r"^\s*(?P<signal>[A-Za-z_][\w.]*)"
+    r"(?:\s+(?P<field>[a-z_]+))?"
+    r"\s*(?P<op><=|>=|==|<|>)\s*"
+    r"(?P<value>-?\d+(?:\.\d+)?)(?P<suffix>[%k])?"
+    r"(?:\s+(?:for\s+(?P<n>\d+)\s+\w+|(?P<sustained>sustained)))?\s*$"
+)
+
+_OPS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+}
+
+Lookup = Callable[[str], Optional[Sequence[float]]]
+
+
+class ConditionError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Clause:
+    signal: str  # lookup key, e.g. "ISM_PMI" or "CREDIT_DIVERGENCE.trend"
+    op: str
+    value: float
+    observations: int = 1
+
+    def test(self, value: float) -> bool:
+        """Whether a single observation satisfies the comparison (ignores ``observations``)."""
+        return _OPS[self.op](value, self.value)
+
+    def evaluate(self, lookup: Lookup) -> Optional[bool]:
+        history = lookup(self.signal)
+        if history is None:
+            return None
+        recent = [v for v in list(history)[-self.observations:] if v == v]
+        if len(recent) < self.observations:
+            return None
+        return all(self.test(v) for v in recent)
+
+
+@dataclass(frozen=True)
+class Condition:
+    text: str
+    any_of: Tuple[Tuple[Clause, ...], ...]  # OR of AND-groups
+
+    @property
+    def signals(self) -> List[str]:
+        return sorted({c.signal for group in self.any_of for c in group})
+
+    @property
+    def counts_observations(self) -> bool:
+        """Whether any clause must hold over several observations ("for N ...", "sustained")."""
+        return any(c.observations > 1 for group in self.any_of for c in group)
+
+    def evaluate(self, lookup: Lookup) -> Optional[bool]:
+        return self.combine(lambda c: c.evaluate(lookup))
+
+    def combine(self, clause_result: Callable[[Clause], Optional[bool]]) -> Optional[bool]:
+        """OR of AND-groups over per-clause results (e.g. precomputed ones), three-valued."""
+        saw_unknown = False
+        for group in self.any_of:
+            res = _and(clause_result(c) for c in group)
+            if res is True:
+                return True
+            if res is None:
+                saw_unknown = True
+        return None if saw_unknown else False
+
+
+def _and(results) -> Optional[bool]:
+    saw_unknown = False
+    for r in results:
+        if r is False:
+            return False
+        if r is None:
+            saw_unknown = True
+    return None if saw_unknown else True
+
+
+def parse_clause(text: str) -> Clause:
+    m = _CLAUSE_RE.match(text)
+    if not m:
+        raise ConditionError(f"Unsupported condition clause: {text!r}")
+    value = float(m.group("value"))
+    if m.group("suffix") == "%":
+        value /= 100.0
+    elif m.group("suffix") == "k":
+        value *= 1000.0
+    signal = m.group("signal")
+    if m.group("field"):
+        signal = f"{signal}.{m.group('field')}"
+    obs = int(m.group("n")) if m.group("n") else (SUSTAINED_OBS if m.group("sustained") else 1)
+    return Clause(signal=signal, op=m.group("op"), value=value, observations=max(obs, 1))
+
+
+def parse_condition(text: str) -> Condition:
+    groups = []
+    for or_part in re.split(r"\s+OR\s+", text.strip()):
+        groups.append(tuple(parse_clause(p) for p in re.split(r"\s+AND\s+", or_part)))
+    return Condition(text=text, any_of=tuple(groups))
@@ -0,0 +1,169 @@
+"""Stale-while-revalidate price cache.
+
+Serves the last good series for every (symbol, interval) immediately, and keeps
+them current in the background:
+
+- Memory first. After a restart, the on-disk PriceStore is used (its file mtime
+  is the fetch time). Only a key that has never been fetched anywhere is fetched
+  synchronously, and that happens only on a true cold start. Concurrent callers
+  asking for a key whose cold fetch is already running wait for that fetch
+  instead of starting their own.
+- Keys past their freshness budget (freshness.py: market hours, bar interval)
+  are refreshed by one background job per batch. Viewers never wait on it.
+  Keys already being refreshed are not resubmitted.
+- A failed refresh keeps the previous series and records the error; that key is
+  not retried for ``retry_after`` seconds, then again in the background. A key
+  with no data at all reports the error (-> UNKNOWN) meanwhile.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Sequence, Set, Tuple
+
+from .freshness import STALE, Freshness, assess
+from .parallel import BoundedRunner
+from .prefetch import FetchRequest, PrefetchResult, prefetch
+
+Key = Tuple[str, str]  # (symbol, interval)
+
+
+class FreshPriceCache:
+    def __init__(
+        self,
+        fetch: Callable,
+        store=None,
+        runner: Optional[BoundedRunner] = None,
+        timeout: float = 20.0,
+        retry_timeout: float = 10.0,
+        retry_after: float = 300.0,
+    ):
+        self.fetch = fetch
+        self.store = store
+        self.runner = runner
+        self.timeout = timeout
+        self.retry_timeout = retry_timeout
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Key, object] = {}  # PriceSeries
+        self._lookback: Dict[Key, int] = {}  # longest lookback requested, so refreshes cover it
+        self._errors: Dict[Key, Tuple[float, str]] = {}  # key -> (monotonic time, message)
+        self._refreshing: Set[Key] = set()
+        self._inflight: Dict[Key, threading.Event] = {}  # cold fetches in progress; set when done
+        self.upstream_calls = 0
+        # Per requested key: "memory" hit, "store" (warm start from disk), "cold" (blocking
+        # fetch), "joined" (waited on another caller's cold fetch), "stale" (served, refresh
+        # scheduled). Read by scripts/load_test.py.
+        self.stats: Counter = Counter()
+
+    # -- reads --------------------------------------------------------------
+    def _from_store(self, key: Key):
+        if self.store is None:
+            return None
+        try:
+            return self.store.load(*key)
+        except Exception:
+            return None
+
+    def get_many(self, plan: Sequence[FetchRequest]) -> PrefetchResult:
+        """Current series for ``plan``; schedules background refreshes, blocks only on never-seen keys."""
+        now = datetime.now(timezone.utc)
+        cold, stale = [], []
+        waits: Dict[Key, threading.Event] = {}
+        with self._lock:
+            for req in plan:
+                key = (req.symbol, req.interval)
+                grew = key in self._lookback and req.lookback_days > self._lookback[key]
+                self._lookback[key] = max(self._lookback.get(key, 0), req.lookback_days)
+                if key in self._entries:
+                    self.stats["memory"] += 1
+                else:
+                    ps = self._from_store(key)
+                    if ps is not None and ps.dates:
+                        self._entries[key] = ps
+                        self.stats["store"] += 1
+                if key in self._inflight:
+                    waits[key] = self._inflight[key]
+                    continue
+                if key in self._refreshing:
+                    continue
+                entry = self._entries.get(key)
+                err = self._errors.get(key)
+                if err is not None and time.monotonic() - err[0] < self.retry_after:
+                    continue  # failed recently: serve what we have (or the error) until the backoff passes
+                if entry is None:
+                    (cold if err is None else stale).append(req)
+                elif grew or self.freshness(key, entry, now).status == STALE:
+                    stale.append(req)
+            for req in stale:
+                self._refreshing.add((req.symbol, req.interval))
+            for req in cold:
+                self._inflight[(req.symbol, req.interval)] = threading.Event()
+            self.stats["cold"] += len(cold)
+            self.stats["joined"] += len(waits)
+            self.stats["stale"] += len(stale)
+
+        if cold:
+            try:
+                self._refresh(cold)
+            finally:
+                with self._lock:
+                    done = [self._inflight.pop((r.symbol, r.interval)) for r in cold]
+                for ev in done:
+                    ev.set()
+        for ev in waits.values():
+            ev.wait(self.timeout + self.retry_timeout)  # the owner's fetch is bounded by the same budget
+        if stale:
+            threading.Thread(target=self._refresh, args=(stale, True), name="mt-swr-refresh", daemon=True).start()
+        return self.snapshot(plan)
+
+    def snapshot(self, plan: Sequence[FetchRequest]) -> PrefetchResult:
+        result = PrefetchResult()
+        with self._lock:
+            for req in plan:
+                key = (req.symbol, req.interval)
+                if key in self._entries:
+                    result.series[key] = self._entries[key]
+                elif key in self._errors:
+                    result.errors[key] = self._errors[key][1]
+            result.refreshing = {k for k in self._refreshing if k in result.series or k in result.errors}
+        return result
+
+    def freshness(self, key: Key, entry=None, now: Optional[datetime] = None) -> Freshness:
+        entry = entry if entry is not None else self._entries.get(key)
+        return assess(key[0], key[1], getattr(entry, "last_bar_utc", ""), getattr(entry, "fetched_utc", ""), now)
+
+    def version(self, symbols: Sequence[str], interval: str = "1d") -> str:
+        """Changes whenever any of ``symbols`` gets new data (cache key for derived results)."""
+        with self._lock:
+            return "|".join(getattr(self._entries.get((s, interval)), "fetched_utc", "") for s in symbols)
+
+    # -- refresh ------------------------------------------------------------
+    def _refresh(self, plan: Sequence[FetchRequest], background: bool = False) -> None:
+        keys = [(r.symbol, r.interval) for r in plan]
+        try:
+            with self._lock:
+                # Refresh at the longest lookback any caller asked for.
+                plan = [FetchRequest(r.symbol, r.interval, self._lookback.get((r.symbol, r.interval), r.lookback_days)) for r in plan]
+            result = prefetch(plan, self.fetch, runner=self.runner, timeout=self.timeout, retry_timeout=self.retry_timeout)
+            with self._lock:
+                self.upstream_calls += result.calls
+                for key, ps in result.series.items():
+                    self._entries[key] = ps
+                    self._errors.pop(key, None)
+                for key, err in result.errors.items():
+                    self._errors[key] = (time.monotonic(), err)
+            if self.store is not None:
+                for (sym, interval), ps in result.series.items():
+                    try:
+                        self.store.save(sym, ps, interval)
+                    except Exception:
+                        pass  # disk cache is best effort; memory already has the data
+        finally:
+            if background:
+                with self._lock:
+                    self._refreshing.difference_update(keys)
@@ -0,0 +1,140 @@
+"""Market-hours-aware staleness budgets for cached price series.
+
+A cached series is FRESH while the time since it was fetched is within its
+symbol's budget, and STALE after that: it is still served, and a refresh is
+started in the background. The budget depends on whether the symbol's market is
+open right now:
+
+  market open     2 bars, at least 1 minute and at most 15 minutes
+                  (daily bars: 15 minutes, today's bar is still moving)
+  market closed   6 hours (nothing new prints; only catch late corrections)
+
+Sessions (America/New_York, weekdays; exchange holidays are not modelled):
+  equity / index  09:30-16:00
+  futures (=F)    Sun 18:00 - Fri 17:00, daily break 17:00-18:00
+  fx (=X)         Sun 17:00 - Fri 17:00
+
+Stdlib only.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+NY = ZoneInfo("America/New_York")
+
+FRESH, STALE, MISSING = "FRESH", "STALE", "MISSING"
+CLOSED_BUDGET = 6 * 3600.0
+MAX_OPEN_BUDGET = 15 * 60.0
+
+_BAR_SECONDS = {"m": 60, "h": 3600, "d": 86400, "wk": 7 * 86400, "mo": 30 * 86400}
+
+
+@dataclass(frozen=True)
+class Freshness:
+    status: str
+    budget_s: float
+    fetched_age_s: Optional[float] = None
+    last_bar_utc: str = ""
+    market_open: bool = False
+    sessions_behind: Optional[int] = None  # daily bars only: completed sessions missing after the last bar
+
+
+def session_kind(symbol: str) -> str:
+    if symbol.endswith("=F"):
+        return "futures"
+    if symbol.endswith("=X"):
+        return "fx"
+    return "equity"
+
+
+def is_open(symbol: str, now: Optional[datetime] = None) -> bool:
+    local = (now or datetime.now(timezone.utc)).astimezone(NY)
+    wd, t = local.weekday(), local.time()  # Mon=0 .. Sun=6
+    kind = session_kind(symbol)
+    if kind == "equity":
+        return wd < 5 and time(9, 30) <= t < time(16, 0)
+    if kind == "futures":
+        if wd == 5 or (wd == 4 and t >= time(17, 0)) or (wd == 6 and t < time(18, 0)):
+            return False
+        return not (time(17, 0) <= t < time(18, 0))
+    # fx
+    return not (wd == 5 or (wd == 4 and t >= time(17, 0)) or (wd == 6 and t < time(17, 0)))
+
+
+def bar_seconds(interval: str) -> float:
+    for suffix in ("wk", "mo", "m", "h", "d"):
+        if interval.endswith(suffix):
+            return float(interval[: -len(suffix)] or 1) * _BAR_SECONDS[suffix]
+    raise ValueError(f"Unsupported interval: {interval!r}")
+
+
+def budget_seconds(symbol: str, interval: str = "1d", now: Optional[datetime] = None) -> float:
+    if not is_open(symbol, now):
+        return CLOSED_BUDGET
+    return min(max(2 * bar_seconds(interval), 60.0), MAX_OPEN_BUDGET)
+
+
+def last_completed_session(now: Optional[datetime] = None) -> date:
+    """Most recent weekday whose equity session has closed (holidays not modelled)."""
+    local = (now or datetime.now(timezone.utc)).astimezone(NY)
+    day = local.date()
+    if local.weekday() >= 5 or local.time() < time(16, 0):
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def _weekdays_between(a: date, b: date) -> int:
+    """Weekdays in (a, b]."""
+    if b <= a:
+        return 0
+    days = (b - a).days
+    full, rem = divmod(days, 7)
+    n = full * 5
+    for i in range(1, rem + 1):
+        if (a + timedelta(days=full * 7 + i)).weekday() < 5:
+            n += 1
+    return n
+
+
+def _parse(ts: str) -> Optional[datetime]:
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts)
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def assess(symbol: str, interval: str, last_bar_utc: str, fetched_utc: str, now: Optional[datetime] = None) -> Freshness:
+    now = now or datetime.now(timezone.utc)
+    budget = budget_seconds(symbol, interval, now)
+    market_open = is_open(symbol, now)
+    fetched = _parse(fetched_utc)
+    if fetched is None:
+        return Freshness(MISSING, budget, last_bar_utc=last_bar_utc, market_open=market_open)
+
+    age = max((now - fetched).total_seconds(), 0.0)
+    behind = None
+    last_bar = _parse(last_bar_utc)
+    if last_bar is not None and interval.endswith("d") and session_kind(symbol) == "equity":
+        behind = _weekdays_between(last_bar.date(), last_completed_session(now))
+    return Freshness(FRESH if age <= budget else STALE, budget, age, last_bar_utc, market_open, behind)
+
+
+def format_age(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "never"
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 90 * 60:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 48 * 3600:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
@@ -0,0 +1,229 @@
+"""Bounded-memory intraday bars.
+
+Minute bars stream in per symbol and are resampled incrementally into coarser
+timeframes (e.g. 5m, 1h, 1d). Each (symbol, timeframe) keeps only a fixed-size
+ring buffer of completed bars plus the in-progress bar, so memory stays flat for
+a whole session no matter how many minute bars arrive.
+
+Buckets are anchored to the exchange session open (09:30 America/New_York by
+default): a 1h bar covers 09:30-10:30, and a 1d bar is the whole local date.
+The indicator layer reads bounded close arrays (``closes``), never full history.
+
+``ingest`` only consumes bars newer than the last one seen per symbol, found by
+scanning back from the end of the series, so a book shared across reruns (app.py
+``intraday_book``) can be handed the whole refreshed minute series every time and
+pays only for the new bars.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, time as dtime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .indicators import last_non_nan, rs_vs_spy, sma
+
+_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+# Completed bars kept per timeframe unless overridden; enough for SMA(50) + warm-up.
+DEFAULT_CAPACITY = {"1m": 390, "5m": 390, "15m": 260, "30m": 260, "1h": 260, "1d": 260}
+
+_FIELDS = ("ts", "open", "high", "low", "close", "volume")
+
+
+def timeframe_seconds(tf: str) -> int:
+    try:
+        return int(tf[:-1]) * _UNITS[tf[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe: {tf!r} (use e.g. 1m, 5m, 1h, 1d)")
+
+
+def _epoch(t) -> int:
+    return int(t.timestamp()) if hasattr(t, "timestamp") else int(t)
+
+
+class RingBuffer:
+    """Fixed-capacity float64 ring; ``values()`` returns oldest-first."""
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._buf = np.full(self.capacity, np.nan)
+        self._n = 0
+        self._head = 0  # next write position
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, value: float) -> None:
+        self._buf[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._n = min(self._n + 1, self.capacity)
+
+    def last(self) -> float:
+        return float(self._buf[self._head - 1]) if self._n else float("nan")
+
+    def values(self) -> np.ndarray:
+        if self._n < self.capacity:
+            return self._buf[: self._n].copy()
+        return np.concatenate([self._buf[self._head:], self._buf[: self._head]])
+
+
+@dataclass
+class _Partial:
+    bucket: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class BarAggregator:
+    """Resamples a stream of finer bars into one timeframe, keeping ``capacity`` completed bars."""
+
+    def __init__(self, timeframe: str, capacity: Optional[int] = None, tz: str = "America/New_York", session_open: dtime = dtime(9, 30)):
+        self.timeframe = timeframe
+        self.seconds = timeframe_seconds(timeframe)
+        self.capacity = capacity or DEFAULT_CAPACITY.get(timeframe, 260)
+        self.tz = ZoneInfo(tz)
+        self.session_open = session_open
+        self._rings = {f: RingBuffer(self.capacity) for f in _FIELDS}
+        self._partial: Optional[_Partial] = None
+        self._day = (0, -1, 0)  # (local-midnight epoch, next-midnight epoch, session-open epoch)
+
+    def _session_open_epoch(self, ts: int) -> int:
+        lo, hi, anchor = self._day
+        if lo <= ts < hi:
+            return anchor
+        day = datetime.fromtimestamp(ts, self.tz).date()
+        midnight = datetime.combine(day, dtime(0, 0), tzinfo=self.tz)
+        next_midnight = datetime.combine(day + timedelta(days=1), dtime(0, 0), tzinfo=self.tz)
+        start = datetime.combine(day, self.session_open, tzinfo=self.tz)
+        self._day = (int(midnight.timestamp()), int(next_midnight.timestamp()), int(start.timestamp()))
+        return self._day[2]
+
+    def bucket(self, ts: int) -> int:
+        anchor = self._session_open_epoch(ts)
+        if self.seconds >= 86400:
+            return anchor
+        return anchor + ((ts - anchor) // self.seconds) * self.seconds
+
+    def update(self, ts: int, open_: float, high: float, low: float, close: float, volume: float = 0.0) -> bool:
+        """Fold one finer bar in. Returns True when it closed the previous bucket."""
+        b = self.bucket(int(ts))
+        p = self._partial
+        if p is not None and b == p.bucket:
+            p.high = max(p.high, high)
+            p.low = min(p.low, low)
+            p.close = close
+            p.volume += volume
+            return False
+        if p is not None and b < p.bucket:
+            return False  # late bar for an already-closed bucket; drop
+        closed = p is not None
+        if closed:
+            self._commit(p)
+        self._partial = _Partial(b, open_, high, low, close, volume)
+        return closed
+
+    def _commit(self, p: _Partial) -> None:
+        for f, v in zip(_FIELDS, (p.bucket, p.open, p.high, p.low, p.close, p.volume)):
+            self._rings[f].append(v)
+
+    def __len__(self) -> int:
+        return len(self._rings["ts"]) + (1 if self._partial else 0)
+
+    def series(self, field: str = "close", include_partial: bool = True) -> np.ndarray:
+        out = self._rings[field].values()
+        if include_partial and self._partial is not None:
+            val = self._partial.bucket if field == "ts" else getattr(self._partial, field)
+            out = np.append(out, val)
+        return out
+
+
+class IntradayBook:
+    """Per-symbol aggregators for a set of timeframes, fed by minute bars."""
+
+    def __init__(self, timeframes: Iterable[str] = ("5m", "1h", "1d"), capacity: Optional[Dict[str, int]] = None, tz: str = "America/New_York"):
+        self.timeframes = list(timeframes)
+        self.capacity = dict(capacity or {})
+        self.tz = tz
+        self._aggs: Dict[str, Dict[str, BarAggregator]] = {}
+        self._last_ts: Dict[str, int] = {}
+        self.lock = threading.Lock()  # books are shared across sessions; ingest/read under it
+
+    def _for(self, symbol: str) -> Dict[str, BarAggregator]:
+        aggs = self._aggs.get(symbol)
+        if aggs is None:
+            aggs = {tf: BarAggregator(tf, self.capacity.get(tf), tz=self.tz) for tf in self.timeframes}
+            self._aggs[symbol] = aggs
+        return aggs
+
+    def symbols(self) -> List[str]:
+        return sorted(self._aggs)
+
+    def on_bar(self, symbol: str, ts: int, close: float, open_: Optional[float] = None, high: Optional[float] = None, low: Optional[float] = None, volume: float = 0.0) -> None:
+        """Ingest one minute bar (close-only feeds may omit open/high/low)."""
+        o = close if open_ is None else open_
+        h = close if high is None else high
+        lo = close if low is None else low
+        for agg in self._for(symbol).values():
+            agg.update(ts, o, h, lo, close, volume)
+
+    def ingest(self, symbol: str, timestamps: Sequence, closes: Sequence[float]) -> int:
+        """
+        Feed a close-only series (e.g. PriceSeries.dates/.close from fetch_prices(interval='1m')).
+        Only bars after the last one ingested for ``symbol`` are read (the series is scanned
+        back from its end, so a warm book costs O(new bars)); returns the number consumed.
+        """
+        last = self._last_ts.get(symbol)
+        start = 0
+        if last is not None:
+            start = min(len(timestamps), len(closes))
+            while start and _epoch(timestamps[start - 1]) > last:
+                start -= 1
+        n = 0
+        for i in range(start, min(len(timestamps), len(closes))):
+            ts = _epoch(timestamps[i])
+            if last is not None and ts <= last:
+                continue  # out-of-order bar inside the new tail
+            self.on_bar(symbol, ts, float(closes[i]))
+            last = ts
+            n += 1
+        if last is not None:
+            self._last_ts[symbol] = last
+        return n
+
+    def bars(self, symbol: str, timeframe: str) -> Optional[BarAggregator]:
+        return self._aggs.get(symbol, {}).get(timeframe)
+
+    def closes(self, symbol: str, timeframe: str, include_partial: bool = True) -> np.ndarray:
+        agg = self.bars(symbol, timeframe)
+        return agg.series("close", include_partial) if agg else np.array([])
+
+    def aligned_closes(self, asset: str, bench: str, timeframe: str, include_partial: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(bucket_ts, asset_close, bench_close) on buckets both symbols have."""
+        a, b = self.bars(asset, timeframe), self.bars(bench, timeframe)
+        if a is None or b is None:
+            empty = np.array([])
+            return empty, empty, empty
+        ta, tb = a.series("ts", include_partial), b.series("ts", include_partial)
+        common, ia, ib = np.intersect1d(ta, tb, assume_unique=True, return_indices=True)
+        return common, a.series("close", include_partial)[ia], b.series("close", include_partial)[ib]
+
+    def rs_sma(self, asset: str, bench: str, timeframe: str, length: int = 50) -> Tuple[np.ndarray, List[float], List[float]]:
+        """(bucket_ts, RS, RS SMA(length)) on ``timeframe`` bars both symbols have."""
+        ts, a, b = self.aligned_closes(asset, bench, timeframe)
+        rs = rs_vs_spy(a.tolist(), b.tolist())
+        return ts, rs, sma(rs, length)
+
+    def rs_sma_last(self, asset: str, bench: str, timeframe: str, length: int = 50, min_rows: int = 80) -> Tuple[float, str]:
+        """Latest RS SMA(length) on ``timeframe`` bars, with the app's minimum-rows guard."""
+        ts, _, rs_sma = self.rs_sma(asset, bench, timeframe, length)
+        if len(ts) < min_rows:
+            return float("nan"), f"Not enough aligned {timeframe} bars ({len(ts)})"
+        return last_non_nan(rs_sma), "OK"
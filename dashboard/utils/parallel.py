@@ -0,0 +1,113 @@
+"""Bounded, failure-isolated task runner for card data preparation.
+
+Tasks run concurrently on a fixed-size thread pool; each has its own timeout,
+measured from submission. ``run`` returns as soon as every task has finished or
+passed its deadline, so its latency is bounded by the largest timeout rather than
+the sum of task times. A task that raises or overruns becomes an ERROR/TIMEOUT
+result for its key only; callers render that key as UNKNOWN.
+
+Python threads cannot be killed: an overrunning task keeps its worker until it
+returns (its result is discarded, though anything it cached is kept). The pool
+size bounds how many such stragglers can pile up.
+
+A task must not wait on tasks queued on its own pool: with every worker busy the
+inner tasks never start and all of them time out. Give nested work its own runner
+(the app fetches on a pool separate from card preparation); ``run`` called from
+one of this runner's workers anyway executes the tasks inline, without timeouts,
+rather than deadlocking.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Union
+
+OK, TIMEOUT, ERROR = "OK", "TIMEOUT", "ERROR"
+
+
+@dataclass
+class TaskResult:
+    status: str
+    value: Any = None
+    error: str = ""
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+class BoundedRunner:
+    def __init__(self, max_workers: int = 8, thread_name_prefix: str = "mt-task", wrap: Optional[Callable[[Callable], Callable]] = None):
+        """``wrap`` adapts each task before submission (e.g. to attach a Streamlit script context)."""
+        self.max_workers = max(int(max_workers), 1)
+        self.wrap = wrap
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stragglers = 0  # tasks abandoned after their deadline and still running
+
+    def _done_straggler(self, _fut: Future) -> None:
+        with self._lock:
+            self.stragglers -= 1
+
+    def _submit(self, fn: Callable[[], Any]) -> Future:
+        fn = self.wrap(fn) if self.wrap else fn
+
+        def task():
+            self._local.worker = True
+            return fn()
+
+        return self._pool.submit(task)
+
+    def _run_inline(self, tasks: Mapping[Hashable, Callable[[], Any]]) -> Dict[Hashable, TaskResult]:
+        results: Dict[Hashable, TaskResult] = {}
+        start = time.monotonic()
+        for key, fn in tasks.items():
+            try:
+                results[key] = TaskResult(OK, value=fn(), elapsed=time.monotonic() - start)
+            except Exception as e:
+                results[key] = TaskResult(ERROR, error=str(e) or type(e).__name__, elapsed=time.monotonic() - start)
+        return results
+
+    def run(self, tasks: Mapping[Hashable, Callable[[], Any]], timeout: Union[float, Mapping[Hashable, float]]) -> Dict[Hashable, TaskResult]:
+        if getattr(self._local, "worker", False):
+            return self._run_inline(tasks)  # nested on our own pool: queueing would deadlock
+        start = time.monotonic()
+        deadlines: Dict[Hashable, float] = {}
+        futures: Dict[Future, Hashable] = {}
+        for key, fn in tasks.items():
+            t = timeout.get(key, max(timeout.values(), default=0.0)) if isinstance(timeout, Mapping) else timeout
+            deadlines[key] = start + float(t)
+            futures[self._submit(fn)] = key
+
+        results: Dict[Hashable, TaskResult] = {}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            for fut in [f for f in pending if deadlines[futures[f]] <= now and not f.done()]:
+                pending.discard(fut)
+                key = futures[fut]
+                results[key] = TaskResult(TIMEOUT, error=f"timed out after {deadlines[key] - start:.1f}s", elapsed=now - start)
+                if not fut.cancel():  # already running: let it finish in the background
+                    with self._lock:
+                        self.stragglers += 1
+                    fut.add_done_callback(self._done_straggler)
+            if not pending:
+                break
+            next_deadline = min(deadlines[futures[f]] for f in pending)
+            done, pending = wait(pending, timeout=max(next_deadline - time.monotonic(), 0.0), return_when=FIRST_COMPLETED)
+            for fut in done:
+                key = futures[fut]
+                elapsed = time.monotonic() - start
+                try:
+                    results[key] = TaskResult(OK, value=fut.result(), elapsed=elapsed)
+                except Exception as e:
+                    results[key] = TaskResult(ERROR, error=str(e) or type(e).__name__, elapsed=elapsed)
+        return results
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
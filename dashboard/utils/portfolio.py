@@ -0,0 +1,274 @@
+"""Vectorized portfolio analytics: weights, drift vs target, concentration, income, trades.
+
+Holdings (any number of rows, across accounts) are collapsed once onto a sorted
+ticker axis (holdings tickers plus target tickers). After that, a revaluation is
+a handful of array operations on length-N vectors (N = distinct tickers), so
+re-pricing intraday costs tens of microseconds even for a large multi-account book:
+
+    book = PortfolioBook(holdings, targets)
+    val = book.revalue(book.price_vector(last_prices))
+    val.frame()                       # ticker, shares, price, value, weight, target, drift
+    book.account_weights(val.price)   # (accounts x tickers) weights within each account
+
+Holdings come from a CSV/JSON holdings file (columns/keys: account, ticker, shares,
+optional current_price and annual_dividend_usd_est) or, failing that, the thesis
+JSON's ``portfolio.current_snapshot.positions``. Weights and targets are fractions
+(0.23 == 23%), which is also what conditions.py yields for ``25%``.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# pandas is imported where used: app.py imports this module before its first render.
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .conditions import ConditionError, parse_condition
+
+RULE_STATES = {True: "ACTIVE", False: "INACTIVE", None: "UNKNOWN"}
+
+
+@dataclass
+class Holdings:
+    account: np.ndarray  # object
+    ticker: np.ndarray  # object
+    shares: np.ndarray  # float
+    price_hint: np.ndarray  # float, NaN when absent
+    dps_hint: np.ndarray  # annual dividend per share, NaN when absent
+    source: str = ""
+
+    def __len__(self) -> int:
+        return len(self.ticker)
+
+
+def _holdings_from_records(records: Sequence[Mapping[str, Any]], source: str, default_account: str = "default") -> Holdings:
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(list(records))
+    if df.empty or "ticker" not in df or "shares" not in df:
+        raise ValueError(f"{source}: holdings need 'ticker' and 'shares'")
+    n = len(df)
+
+    def col(name: str) -> np.ndarray:
+        if name not in df:
+            return np.full(n, np.nan)
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+
+    shares = col("shares")
+    price = col("current_price")
+    if "price" in df:
+        price = np.where(np.isnan(price), col("price"), price)
+    annual = col("annual_dividend_usd_est")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dps = np.where(shares != 0, annual / shares, np.nan)
+    dps = np.where(np.isnan(dps), col("dividend_yield") * price, dps)
+
+    account = df["account"].fillna(default_account).astype(str) if "account" in df else pd.Series([default_account] * n)
+    return Holdings(
+        account=account.to_numpy(dtype=object),
+        ticker=df["ticker"].astype(str).str.strip().str.upper().to_numpy(dtype=object),
+        shares=np.nan_to_num(shares),
+        price_hint=price,
+        dps_hint=dps,
+        source=source,
+    )
+
+
+def load_holdings(path: Path) -> Holdings:
+    """CSV (one row per position) or JSON (a list, or {"positions": [...]})."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        records = raw.get("positions", []) if isinstance(raw, dict) else raw
+    else:
+        records = pd.read_csv(path).to_dict("records")
+    return _holdings_from_records(records, source=path.name)
+
+
+def holdings_from_thesis(thesis: Mapping[str, Any], source: str = "thesis JSON") -> Holdings:
+    snapshot = thesis.get("portfolio", {}).get("current_snapshot", {})
+    return _holdings_from_records(snapshot.get("positions", []), source=source, default_account="thesis")
+
+
+def targets_from_rows(rows: Sequence[Mapping[str, Any]]) -> Dict[str, float]:
+    """{ticker: target fraction} from spec ``rows`` (target_pct) or thesis weights (target_weight_pct)."""
+    out: Dict[str, float] = {}
+    for r in rows:
+        pct = r.get("target_pct", r.get("target_weight_pct"))
+        if r.get("ticker") and pct is not None:
+            out[str(r["ticker"]).upper()] = float(pct) / 100.0
+    return out
+
+
+@dataclass
+class Valuation:
+    tickers: np.ndarray
+    shares: np.ndarray
+    price: np.ndarray
+    value: np.ndarray
+    weight: np.ndarray
+    target: np.ndarray
+    has_target: np.ndarray
+    total: float
+
+    @property
+    def drift(self) -> np.ndarray:
+        return self.weight - self.target
+
+    @property
+    def missing_prices(self) -> List[str]:
+        return self.tickers[(self.shares != 0) & np.isnan(self.price)].tolist()
+
+    def weight_of(self, ticker: str) -> float:
+        i = np.searchsorted(self.tickers, ticker)
+        if i < len(self.tickers) and self.tickers[i] == ticker:
+            return float(self.weight[i])
+        return float("nan")
+
+    def frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "ticker": self.tickers,
+                "shares": self.shares,
+                "price": self.price,
+                "value": self.value,
+                "weight": self.weight,
+                "target": np.where(self.has_target, self.target, np.nan),
+                "drift": np.where(self.has_target, self.drift, np.nan),
+            }
+        )
+
+
+class PortfolioBook:
+    def __init__(self, holdings: Holdings, targets: Mapping[str, float]):
+        self.holdings = holdings
+        self.tickers = np.array(sorted(set(holdings.ticker.tolist()) | set(targets)), dtype=object)
+        n = len(self.tickers)
+        self.codes = np.searchsorted(self.tickers, holdings.ticker)
+        self.shares = np.bincount(self.codes, weights=holdings.shares, minlength=n)
+        self.target = np.array([targets.get(t, 0.0) for t in self.tickers], dtype=float)
+        self.has_target = np.array([t in targets for t in self.tickers], dtype=bool)
+
+        self.accounts, self.account_codes = np.unique(holdings.account.astype(str), return_inverse=True)
+        self.price_hint = self._first_valid(holdings.price_hint)
+        self.dps_hint = self._first_valid(holdings.dps_hint)
+
+    def _first_valid(self, per_row: np.ndarray) -> np.ndarray:
+        out = np.full(len(self.tickers), np.nan)
+        valid = ~np.isnan(per_row)
+        # Reverse so the first row per ticker wins the fancy-index assignment.
+        out[self.codes[valid][::-1]] = per_row[valid][::-1]
+        return out
+
+    def price_vector(self, prices: Mapping[str, float], fallback_to_hint: bool = True) -> np.ndarray:
+        """Prices aligned to ``tickers``; unpriced tickers take the holdings file's price, else NaN."""
+        vec = np.array([prices.get(t, np.nan) for t in self.tickers], dtype=float)
+        if fallback_to_hint:
+            vec = np.where(np.isnan(vec), self.price_hint, vec)
+        return vec
+
+    def revalue(self, price: np.ndarray) -> Valuation:
+        value = self.shares * price
+        total = float(np.nansum(value))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(np.isnan(value), np.nan, value / total) if total else np.full_like(value, np.nan)
+        return Valuation(
+            tickers=self.tickers,
+            shares=self.shares,
+            price=price,
+            value=value,
+            weight=weight,
+            target=self.target,
+            has_target=self.has_target,
+            total=total,
+        )
+
+    def account_weights(self, price: np.ndarray) -> pd.DataFrame:
+        """(accounts x tickers) weight of each ticker within each account."""
+        import pandas as pd
+
+        values = np.zeros((len(self.accounts), len(self.tickers)))
+        np.add.at(values, (self.account_codes, self.codes), self.holdings.shares * price[self.codes])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = values / values.sum(axis=1, keepdims=True)
+        return pd.DataFrame(weights, index=self.accounts, columns=self.tickers)
+
+    def income(self, price: np.ndarray, dps: np.ndarray) -> pd.DataFrame:
+        """Annual/monthly income and yield per ticker from dividends per share (NaN -> holdings hint)."""
+        import pandas as pd
+
+        dps = np.where(np.isnan(dps), self.dps_hint, dps)
+        annual = self.shares * dps
+        with np.errstate(divide="ignore", invalid="ignore"):
+            yld = dps / price
+        df = pd.DataFrame(
+            {"ticker": self.tickers, "shares": self.shares, "dps_annual": dps, "yield": yld, "annual_usd": annual, "monthly_usd": annual / 12.0}
+        )
+        return df[self.shares != 0]
+
+    def trade_plan(self, val: Valuation, min_trade_usd: float = 0.0, sell_untargeted: bool = False) -> pd.DataFrame:
+        """
+        Whole-share orders moving each targeted ticker to its target weight at current prices.
+        Holdings without a target are left alone (HOLD, target N/A) unless ``sell_untargeted``
+        treats them as target 0, i.e. a full SELL.
+        """
+        import pandas as pd
+
+        trades = val.has_target | sell_untargeted
+        target_value = np.where(trades, val.target * val.total, np.nan_to_num(val.value))
+        delta_value = target_value - np.nan_to_num(val.value)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta_shares = np.trunc(delta_value / val.price)
+        act = np.abs(delta_value) >= max(min_trade_usd, 0.0)
+        action = np.where(~act | (delta_shares == 0) | np.isnan(delta_shares), "HOLD", np.where(delta_shares > 0, "BUY", "SELL"))
+        df = pd.DataFrame(
+            {
+                "ticker": val.tickers,
+                "action": action,
+                "shares": np.abs(np.nan_to_num(delta_shares)),
+                "est_usd": np.abs(np.nan_to_num(delta_shares) * np.nan_to_num(val.price)),
+                "weight": val.weight,
+                "target": np.where(val.has_target, val.target, 0.0 if sell_untargeted else np.nan),
+            }
+        )
+        df.loc[np.isnan(val.price) & trades, "action"] = "NO PRICE"
+        return df
+
+
+def concentration_lookup(val: Valuation) -> Callable[[str], Optional[List[float]]]:
+    """Signals for concentration rules: ``any_position_weight`` (max) and ``<TICKER>_weight``."""
+
+    def lookup(key: str) -> Optional[List[float]]:
+        if key == "any_position_weight":
+            w = val.weight[~np.isnan(val.weight)]
+            return [float(w.max())] if len(w) else None
+        if key.endswith("_weight"):
+            w = val.weight_of(key[: -len("_weight")].upper())
+            return None if w != w else [w]
+        return None
+
+    return lookup
+
+
+def evaluate_rules(rules: Sequence[Mapping[str, Any]], lookup: Callable[[str], Optional[List[float]]]) -> List[Dict[str, Any]]:
+    """rule_list entries evaluated against ``lookup``: id/if/then/severity + state and inputs."""
+    out = []
+    for r in rules:
+        try:
+            cond = parse_condition(r.get("if", ""))
+        except ConditionError as e:
+            out.append({**r, "state": "UNKNOWN", "values": {}, "note": str(e)})
+            continue
+        values = {s: (lookup(s) or [None])[-1] for s in cond.signals}
+        out.append({**r, "state": RULE_STATES[cond.evaluate(lookup)], "values": values, "note": ""})
+    return out
@@ -0,0 +1,175 @@
+"""Spec-derived symbol prefetch.
+
+Cards learn which symbols they need only while rendering, so fetches used to
+happen card by card and repeat for overlapping windows (1y and 2y of SPY).
+The planner walks ``dashboard.cards`` (via the spec index) and
+``data_contract.required_inputs.market_prices``, and reduces them to one request
+per (symbol, interval) at the longest lookback anyone needs. Requests sharing
+an (interval, period) are fetched as one batch; every card then slices its own
+window out of the shared result.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .parallel import ERROR, OK, BoundedRunner, TaskResult
+from .spec_index import DEFAULT_BENCH, SpecIndex
+
+# yfinance periods in ascending span (days); "max" covers anything longer.
+PERIOD_DAYS = [("1d", 1), ("5d", 5), ("1mo", 31), ("3mo", 92), ("6mo", 183), ("1y", 366), ("2y", 731), ("5y", 1827), ("10y", 3653)]
+MAX_DAYS = 10 ** 6
+
+
+def period_days(period: str) -> int:
+    if period == "max":
+        return MAX_DAYS
+    if period == "ytd":
+        return 366
+    for name, days in PERIOD_DAYS:
+        if name == period:
+            return days
+    raise ValueError(f"Unsupported period: {period!r}")
+
+
+def period_for(days: int) -> str:
+    """Smallest yfinance period covering ``days`` calendar days."""
+    for name, span in PERIOD_DAYS:
+        if days <= span:
+            return name
+    return "max"
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    symbol: str
+    interval: str
+    lookback_days: int
+
+    @property
+    def period(self) -> str:
+        return period_for(self.lookback_days)
+
+
+def plan_prefetch(index: SpecIndex) -> Tuple[FetchRequest, ...]:
+    """Minimal (symbol, interval, max lookback) requests for every card and the spec's data contract."""
+    need: Dict[Tuple[str, str], int] = {}
+
+    def want(symbol: str, interval: str, days: int) -> None:
+        key = (symbol, interval)
+        need[key] = max(need.get(key, 0), days)
+
+    for cid, card in index.cards.items():
+        days = period_days(card.get("period", "2y"))
+        interval = card.get("interval", "1d")
+        # Universes always carry the benchmark: it is the alignment calendar.
+        for sym in [DEFAULT_BENCH, *index.card_symbols.get(cid, [])]:
+            want(sym, interval, days)
+
+    contract = index.spec.get("data_contract", {})
+    history = contract.get("required_history", {}).get("market_prices", {})
+    days = int(history.get("lookback_days", 365))
+    for item in contract.get("required_inputs", {}).get("market_prices", []):
+        if item.get("symbol"):
+            want(item["symbol"], "1d", days)
+
+    return tuple(FetchRequest(sym, interval, days) for (sym, interval), days in sorted(need.items()))
+
+
+def batches(plan: Iterable[FetchRequest]) -> Dict[Tuple[str, str], List[str]]:
+    """{(interval, period): symbols}: one upstream call per group."""
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for req in plan:
+        groups.setdefault((req.interval, req.period), []).append(req.symbol)
+    return groups
+
+
+@dataclass
+class PrefetchResult:
+    series: Dict[Tuple[str, str], object] = field(default_factory=dict)  # (symbol, interval) -> PriceSeries
+    errors: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    calls: int = 0
+    refreshing: Set[Tuple[str, str]] = field(default_factory=set)  # keys a background refresh is updating
+
+    def get(self, symbol: str, interval: str = "1d"):
+        return self.series.get((symbol, interval))
+
+    def slice(self, symbol: str, interval: str = "1d", period: str = "2y"):
+        """The symbol's series trimmed to ``period`` before its last bar (None if it was not fetched)."""
+        ps = self.get(symbol, interval)
+        days = period_days(period)
+        if ps is None or days >= MAX_DAYS or not ps.dates:
+            return ps
+        cutoff = ps.dates[-1] - timedelta(days=days)
+        i = bisect.bisect_right(ps.dates, cutoff)
+        if i == 0:
+            return ps
+        return replace(ps, dates=ps.dates[i:], close=ps.close[i:])
+
+
+def prefetch(
+    plan: Sequence[FetchRequest],
+    fetch: Callable,
+    result: Optional[PrefetchResult] = None,
+    runner: Optional[BoundedRunner] = None,
+    timeout: float = 20.0,
+    retry_timeout: float = 10.0,
+) -> PrefetchResult:
+    """
+    Fetch the plan with one ``fetch(symbols, period=..., interval=...)`` call per batch.
+
+    ``fetch`` is fetch_prices_batch (absent symbols = no data) or fetch_prices (raises).
+    Symbols a batch did not return are retried one by one, so one bad ticker only costs itself.
+
+    With a ``runner``, batches run concurrently (each bounded by ``timeout``) and then the
+    retries run concurrently (each bounded by ``retry_timeout``): worst-case latency is
+    ``timeout + retry_timeout`` however many symbols are slow, and a symbol that overruns
+    is recorded as an error (-> UNKNOWN) instead of holding up the others.
+    """
+    result = result or PrefetchResult()
+    groups = batches(plan)
+
+    def call(symbols: List[str], period: str, interval: str) -> Callable[[], Dict]:
+        return lambda: dict(fetch(symbols, period=period, interval=interval))
+
+    got: Dict[Tuple[str, str], Dict] = {}
+    if runner is None:
+        for (interval, period), symbols in groups.items():
+            result.calls += 1
+            try:
+                got[(interval, period)] = call(symbols, period, interval)()
+            except Exception:
+                got[(interval, period)] = {}
+    else:
+        result.calls += len(groups)
+        done = runner.run({g: call(syms, g[1], g[0]) for g, syms in groups.items()}, timeout)
+        got = {g: (r.value if r.ok else {}) for g, r in done.items()}
+
+    retries = {(sym, interval, period): call([sym], period, interval) for (interval, period), symbols in groups.items() for sym in symbols if sym not in got[(interval, period)]}
+    result.calls += len(retries)
+    if runner is None:
+        outcomes = {}
+        for key, fn in retries.items():
+            try:
+                outcomes[key] = TaskResult(OK, value=fn())
+            except Exception as e:
+                outcomes[key] = TaskResult(ERROR, error=str(e))
+    else:
+        outcomes = runner.run(retries, retry_timeout)
+
+    for (sym, interval, period), r in outcomes.items():
+        if not r.ok:
+            result.errors[(sym, interval)] = r.error
+        elif sym not in r.value:
+            result.errors[(sym, interval)] = f"No data for {sym}"
+        else:
+            got[(interval, period)][sym] = r.value[sym]
+
+    for (interval, period), symbols in groups.items():
+        for sym in symbols:
+            if sym in got[(interval, period)]:
+                result.series[(sym, interval)] = got[(interval, period)][sym]
+    return result
@@ -0,0 +1,234 @@
+"""Incremental regime states for ``rule_list`` cards (Commodity Triggers).
+
+Rules use the alerting condition grammar (conditions.py), e.g.
+``COPPER > 4.50 sustained`` or ``COPPER < 4.00 AND SILVER < 28``.
+
+Instead of re-scanning history, each distinct clause keeps a running state over
+its signal's bars: the date/value of the last bar consumed, the number of
+non-NaN observations seen, and the current streak of consecutive observations
+satisfying the comparison. An update only walks bars newer than the last one
+consumed; a clause holds once its streak reaches ``observations``. If history
+was restated (the last consumed bar is gone or its value changed), that clause
+is replayed from the start.
+
+The engine's snapshot (rule states plus per-signal price summaries) is persisted
+as JSON, so renderers read precomputed state instead of refetching.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .conditions import Clause, Condition, ConditionError, parse_condition
+
+STATES = {True: "ACTIVE", False: "INACTIVE", None: "UNKNOWN"}
+
+
+@dataclass(frozen=True)
+class RegimeRule:
+    id: str
+    card: str
+    condition: Condition
+    then: str
+    severity: str
+
+
+@dataclass
+class ClauseState:
+    last_date: str = ""
+    last_value: Optional[float] = None
+    seen: int = 0
+    streak: int = 0
+
+
+@dataclass
+class RuleState:
+    result: Optional[bool] = None
+    since: str = ""  # last bar date when the current result was first observed
+
+
+@dataclass
+class RegimeSnapshot:
+    updated_utc: str = ""
+    rules: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    signals: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    replayed: List[str] = field(default_factory=list)  # clauses rebuilt from full history this update
+    bars: int = 0  # bars consumed across clauses this update
+
+    def state(self, rule_id: str) -> str:
+        return self.rules.get(rule_id, {}).get("state", "UNKNOWN")
+
+
+def clause_key(c: Clause) -> str:
+    return f"{c.signal} {c.op} {c.value:g} x{c.observations}"
+
+
+def _date_key(d: Any) -> str:
+    return d.isoformat() if hasattr(d, "isoformat") else str(d)
+
+
+def _same(a: Optional[float], b: Optional[float]) -> bool:
+    return a == b or (a != a and b != b)
+
+
+def rules_from_card(card_id: str, card: Dict[str, Any], signals: Iterable[str]) -> List[RegimeRule]:
+    """Rules of a rule_list card whose conditions only reference ``signals``."""
+    known = set(signals)
+    out: List[RegimeRule] = []
+    for r in card.get("rules", []):
+        try:
+            cond = parse_condition(r["if"])
+        except (KeyError, ConditionError) as e:
+            raise ConditionError(f"{card_id}.{r.get('id', '<no id>')}: {e}") from e
+        if not set(cond.signals) <= known:
+            continue
+        out.append(RegimeRule(id=r.get("id", r["if"]), card=card_id, condition=cond, then=r.get("then", ""), severity=r.get("severity", "YELLOW")))
+    return out
+
+
+def rules_from_spec(spec: Dict[str, Any], signals: Iterable[str]) -> List[RegimeRule]:
+    """Regime rules across every rule_list card in the spec."""
+    known = set(signals)
+    out: List[RegimeRule] = []
+    for cid, card in spec.get("dashboard", {}).get("cards", {}).items():
+        if card.get("type") == "rule_list":
+            out += rules_from_card(cid, card, known)
+    return out
+
+
+def summarize_series(dates: Sequence[Any], close: Sequence[float]) -> Dict[str, Any]:
+    """Last value and 1d / 1m / 1y percent changes (calendar lookback from the last bar)."""
+    if not dates:
+        return {}
+    last = close[-1]
+
+    def change(days: int) -> Optional[float]:
+        i = bisect.bisect_right(dates, dates[-1] - timedelta(days=days)) - 1
+        if i < 0 or not close[i]:
+            return None
+        return (last / close[i] - 1.0) * 100.0
+
+    return {
+        "date": _date_key(dates[-1]),
+        "last": last,
+        "chg_1d_pct": (last / close[-2] - 1.0) * 100.0 if len(close) > 1 and close[-2] else None,
+        "chg_1m_pct": change(30),
+        "chg_1y_pct": change(365),
+    }
+
+
+class RegimeEngine:
+    def __init__(self, rules: Sequence[RegimeRule], state_path: Optional[Path] = None):
+        self.rules = {r.id: r for r in rules}
+        self.state_path = Path(state_path) if state_path else None
+        self.clauses: Dict[str, Clause] = {}
+        for r in rules:
+            for group in r.condition.any_of:
+                for c in group:
+                    self.clauses[clause_key(c)] = c
+        self.clause_states: Dict[str, ClauseState] = {k: ClauseState() for k in self.clauses}
+        self.rule_states: Dict[str, RuleState] = {rid: RuleState() for rid in self.rules}
+        self.snapshot = RegimeSnapshot()
+        self._load()
+
+    # -- persistence --------------------------------------------------------
+    def _load(self) -> None:
+        if not self.state_path or not self.state_path.is_file():
+            return
+        try:
+            raw = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        # Keys from older/newer state layouts are ignored; an unreadable entry starts fresh
+        # (a clause then replays its history on the next update).
+        for states, cls, section in ((self.clause_states, ClauseState, "clauses"), (self.rule_states, RuleState, "rule_states")):
+            known = {f.name for f in fields(cls)}
+            for k, st in raw.get(section, {}).items():
+                if k not in states or not isinstance(st, dict):
+                    continue
+                try:
+                    states[k] = cls(**{f: v for f, v in st.items() if f in known})
+                except (TypeError, ValueError):
+                    continue
+        snap = raw.get("snapshot", {})
+        self.snapshot = RegimeSnapshot(**{k: snap[k] for k in ("updated_utc", "rules", "signals", "errors") if k in snap})
+
+    def save(self) -> None:
+        if not self.state_path:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "clauses": {k: asdict(st) for k, st in self.clause_states.items()},
+            "rule_states": {rid: asdict(st) for rid, st in self.rule_states.items()},
+            "snapshot": asdict(self.snapshot),
+        }
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    # -- evaluation ---------------------------------------------------------
+    def _advance(self, key: str, dates: Sequence[Any], close: Sequence[float], snap: RegimeSnapshot) -> None:
+        c, st = self.clauses[key], self.clause_states[key]
+        keys = [_date_key(d) for d in dates]
+        start = 0
+        if st.last_date:
+            i = bisect.bisect_left(keys, st.last_date)
+            if i < len(keys) and keys[i] == st.last_date and _same(close[i], st.last_value):
+                start = i + 1
+            else:
+                st = self.clause_states[key] = ClauseState()
+                snap.replayed.append(key)
+        for d, v in zip(keys[start:], close[start:]):
+            if v == v:
+                st.seen += 1
+                st.streak = st.streak + 1 if c.test(v) else 0
+            st.last_date, st.last_value = d, v
+        snap.bars += len(keys) - start
+
+    def _clause_result(self, c: Clause) -> Optional[bool]:
+        st = self.clause_states[clause_key(c)]
+        if st.seen < c.observations:
+            return None
+        return st.streak >= c.observations
+
+    def update(self, series: Dict[str, Any], errors: Optional[Dict[str, str]] = None) -> RegimeSnapshot:
+        """Advance every clause over new bars of ``series`` ({signal: PriceSeries}) and persist the snapshot."""
+        snap = RegimeSnapshot(updated_utc=datetime.now(timezone.utc).replace(microsecond=0).isoformat())
+        snap.errors.update(errors or {})
+        for sym, ps in series.items():
+            snap.signals[sym] = summarize_series(ps.dates, ps.close)
+
+        for key, c in self.clauses.items():
+            ps = series.get(c.signal)
+            if ps is None:
+                # No data this pass: the clause is UNKNOWN, but its running state is kept.
+                snap.errors.setdefault(c.signal, "no data")
+                continue
+            self._advance(key, ps.dates, ps.close, snap)
+
+        for rid, rule in self.rules.items():
+            missing = [s for s in rule.condition.signals if s not in series]
+            result = None if missing else rule.condition.combine(self._clause_result)
+            rs = self.rule_states[rid]
+            if result != rs.result or not rs.since:
+                asof = [snap.signals[s]["date"] for s in rule.condition.signals if snap.signals.get(s)]
+                rs.result, rs.since = result, max(asof) if asof else snap.updated_utc
+            snap.rules[rid] = {
+                "card": rule.card,
+                "if": rule.condition.text,
+                "then": rule.then,
+                "severity": rule.severity,
+                "state": STATES[result],
+                "since": rs.since,
+                "values": {s: (snap.signals.get(s) or {}).get("last") for s in rule.condition.signals},
+            }
+
+        self.snapshot = snap
+        self.save()
+        return snap
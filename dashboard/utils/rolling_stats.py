@@ -0,0 +1,194 @@
+"""Incremental rolling covariance / correlation across a whole symbol universe.
+
+The Rotation page needs, every render, the symbol-by-symbol correlation matrix
+of daily log returns over a trailing window, plus per-symbol window returns for
+ranking. Instead of ``DataFrame.rolling(window).corr()`` over the full history,
+the engine keeps running sums over the last ``window`` bars for every pair:
+
+  C[i, j]    bars where both i and j have a return
+  Sx[i, j]   sum of x_i over those bars (so Sx[j, i] is the sum of x_j)
+  Sxx[i, j]  sum of x_i^2 over those bars
+  Sxy[i, j]  sum of x_i * x_j
+
+A new bar adds its outer products and the bar leaving the window subtracts
+its own: O(N^2) per bar, whatever the window length. Missing returns (NaN) drop
+out pairwise, as in pandas. The sums are recomputed from the ring buffer once
+per ``window`` bars so floating-point drift cannot accumulate.
+
+``update(dates, closes)`` only consumes sessions newer than the last one seen.
+If history was restated (the last consumed session is gone or its closes
+changed), the engine replays from the start. A bounded history of per-bar
+snapshots (correlation to ``reference``, window returns) backs trend and
+rank-change views without any recomputation.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class RollingPoint:
+    date: object
+    reference_corr: np.ndarray  # correlation of each symbol to ``reference`` (NaN without one)
+    window_return: np.ndarray  # sum of log returns over the window per symbol
+
+
+class RollingCovariance:
+    def __init__(self, symbols: Sequence[str], window: int = 60, min_periods: Optional[int] = None, reference: Optional[str] = None, history: int = 260):
+        if window < 2:
+            raise ValueError("window must be at least 2 bars")
+        self.symbols = list(symbols)
+        self.window = int(window)
+        self.min_periods = int(min_periods) if min_periods else max(self.window // 2, 2)
+        self.reference = reference if reference in self.symbols else None
+        self.history: Deque[RollingPoint] = deque(maxlen=history)
+        self.lock = threading.Lock()  # engines are shared across sessions; update/read under it
+        self.reset()
+
+    def reset(self) -> None:
+        n = len(self.symbols)
+        self._buf = np.full((self.window, n), np.nan)
+        self._pos = 0  # next ring slot
+        self._filled = 0
+        self._since_resync = 0
+        self.C = np.zeros((n, n))
+        self.Sx = np.zeros((n, n))
+        self.Sxx = np.zeros((n, n))
+        self.Sxy = np.zeros((n, n))
+        self.last_date = None
+        self._last_close: Optional[np.ndarray] = None
+        self.history.clear()
+
+    # -- running sums -------------------------------------------------------
+    def _apply(self, x: np.ndarray, sign: float) -> None:
+        m = np.isfinite(x).astype(float)
+        x0 = np.where(m > 0, x, 0.0)
+        self.C += sign * np.outer(m, m)
+        self.Sx += sign * np.outer(x0, m)
+        self.Sxx += sign * np.outer(x0 * x0, m)
+        self.Sxy += sign * np.outer(x0, x0)
+
+    def _resync(self) -> None:
+        rows = self._buf[: self._filled]
+        m = np.isfinite(rows).astype(float)
+        x0 = np.where(m > 0, rows, 0.0)
+        self.C = m.T @ m
+        self.Sx = x0.T @ m
+        self.Sxx = (x0 * x0).T @ m
+        self.Sxy = x0.T @ x0
+        self._since_resync = 0
+
+    def push(self, date, returns: np.ndarray) -> None:
+        """Add one bar of returns (NaN = no return for that symbol)."""
+        x = np.asarray(returns, dtype=float)
+        if self._filled == self.window:
+            self._apply(self._buf[self._pos], -1.0)
+        else:
+            self._filled += 1
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        self._apply(x, 1.0)
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+        self.last_date = date
+        corr = self.corr()
+        ref = corr[self.symbols.index(self.reference)] if self.reference else np.full(len(self.symbols), np.nan)
+        self.history.append(RollingPoint(date, ref, self.window_return()))
+
+    # -- reads --------------------------------------------------------------
+    def cov(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = (self.Sxy - self.Sx * self.Sx.T / self.C) / (self.C - 1)
+        return np.where(self.C >= self.min_periods, cov, np.nan)
+
+    def corr(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            num = self.C * self.Sxy - self.Sx * self.Sx.T
+            var = self.C * self.Sxx - self.Sx * self.Sx
+            corr = num / np.sqrt(var * var.T)
+        corr = np.clip(corr, -1.0, 1.0)
+        return np.where(self.C >= self.min_periods, corr, np.nan)
+
+    def window_return(self) -> np.ndarray:
+        """Sum of log returns over the window per symbol (NaN below ``min_periods``)."""
+        n = np.diag(self.C)
+        return np.where(n >= self.min_periods, np.diag(self.Sx), np.nan)
+
+    # -- feeding from closes ------------------------------------------------
+    def update(self, dates: Sequence, closes: np.ndarray) -> int:
+        """
+        Consume sessions of ``closes`` (sessions x symbols, this engine's column order)
+        newer than the last one seen. Returns the number of bars pushed.
+        """
+        closes = np.asarray(closes, dtype=float)
+        dates = list(dates)
+        start = 0
+        if self.last_date is not None:
+            try:
+                i = dates.index(self.last_date)
+            except ValueError:
+                i = -1
+            if i >= 0 and np.allclose(closes[i], self._last_close, equal_nan=True):
+                start = i + 1
+            else:
+                self.reset()  # restated history: replay
+        if start >= len(dates):
+            return 0
+        prev = self._last_close if start > 0 else None
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for k in range(start, len(dates)):
+                row = closes[k]
+                if prev is not None:
+                    self.push(dates[k], np.log(row / prev))
+                else:
+                    self.last_date = dates[k]
+                prev = row
+        self._last_close = prev.copy()
+        return len(dates) - start
+
+
+def ranks(values: np.ndarray) -> np.ndarray:
+    """1 = highest; NaN stays NaN."""
+    out = np.full(len(values), np.nan)
+    ok = np.isfinite(values)
+    order = np.argsort(-values[ok], kind="stable")
+    r = np.empty(ok.sum())
+    r[order] = np.arange(1, ok.sum() + 1)
+    out[ok] = r
+    return out
+
+
+def dispersion(window_returns: np.ndarray) -> float:
+    """Cross-sectional standard deviation of window returns (NaN with fewer than 2 symbols)."""
+    x = window_returns[np.isfinite(window_returns)]
+    return float(np.std(x, ddof=1)) if len(x) >= 2 else float("nan")
+
+
+def mean_pairwise(corr: np.ndarray, idx: Sequence[int]) -> float:
+    """Mean off-diagonal correlation among ``idx`` (NaN pairs ignored)."""
+    sub = corr[np.ix_(idx, idx)][~np.eye(len(idx), dtype=bool)]
+    sub = sub[np.isfinite(sub)]
+    return float(sub.mean()) if len(sub) else float("nan")
+
+
+def history_points(engine: RollingCovariance, symbols: List[str]) -> List[dict]:
+    """Rows of (date, dispersion, mean correlation to the reference) over the engine's history."""
+    idx = [engine.symbols.index(s) for s in symbols if s in engine.symbols]
+    rows = []
+    for p in engine.history:
+        ref = p.reference_corr[idx]
+        rows.append(
+            {
+                "date": p.date,
+                "dispersion": dispersion(p.window_return[idx]),
+                "mean_corr": float(np.nanmean(ref)) if np.isfinite(ref).any() else float("nan"),
+            }
+        )
+    return rows
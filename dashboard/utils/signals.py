@@ -0,0 +1,159 @@
+"""Named signal histories resolved lazily from the spec's data contract.
+
+A SignalRegistry maps signal keys (``"ISM_PMI"``, ``"HYG"``,
+``"CREDIT_DIVERGENCE.trend"``) to zero-argument providers returning the signal's
+history oldest-first. Nothing is fetched until a key is requested, so a consumer
+that references three signals only pays for those three.
+
+The CREDIT_DIVERGENCE rule (``credit_proxy`` / ``credit_trend`` / ``credit_states``)
+lives here too, so the alert engine, the credit panel and the backtest all read
+the same signal.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from .conditions import SUSTAINED_OBS
+from .indicators import sma
+
+Provider = Callable[[], Optional[Sequence[float]]]
+PriceFetch = Callable[[List[str], str, str], Dict]
+
+CREDIT_SMA_LENGTH = 50  # spec: trend = slope(SMA(proxy, 50))
+
+
+class SignalRegistry:
+    def __init__(self):
+        self._providers: Dict[str, Provider] = {}
+        self._memo: Dict[str, Optional[Sequence[float]]] = {}
+        self.errors: Dict[str, str] = {}
+
+    def register(self, key: str, provider: Provider) -> None:
+        self._providers[key] = provider
+
+    def keys(self) -> List[str]:
+        return sorted(self._providers)
+
+    def reset(self) -> None:
+        """Drop memoized values so the next lookup refetches (call once per evaluation pass)."""
+        self._memo.clear()
+        self.errors.clear()
+
+    def get(self, key: str) -> Optional[Sequence[float]]:
+        if key in self._memo:
+            return self._memo[key]
+        provider = self._providers.get(key)
+        value: Optional[Sequence[float]] = None
+        if provider is None:
+            self.errors[key] = "no provider registered"
+        else:
+            try:
+                value = provider()
+            except Exception as e:
+                self.errors[key] = str(e)
+        self._memo[key] = value
+        return value
+
+    __call__ = get
+
+
+def _slope(values: Sequence[float]) -> List[float]:
+    out = [float("nan")] * len(values)
+    for i in range(1, len(values)):
+        out[i] = values[i] - values[i - 1]
+    return out
+
+
+def credit_proxy(hyg: Sequence[float], lqd: Sequence[float]) -> List[float]:
+    """HYG/LQD per aligned observation (NaN where LQD is zero or either side is missing)."""
+    return [float(a) / float(b) if b else float("nan") for a, b in zip(hyg, lqd)]
+
+
+def credit_trend(proxy: Sequence[float], length: int = CREDIT_SMA_LENGTH) -> List[float]:
+    """slope(SMA(proxy, length)): NaN until a full window of valid observations exists."""
+    return _slope(sma(list(proxy), length))
+
+
+def credit_states(trend: Sequence[float], sustained: int = SUSTAINED_OBS) -> List[str]:
+    """
+    Status per observation, as the spec's credit_panel thresholds: trend < 0 is YELLOW,
+    trend < 0 for the last ``sustained`` observations (``<<``, as a "sustained" condition)
+    is RED, otherwise GREEN; UNKNOWN without a trend value.
+    """
+    out: List[str] = []
+    run = 0
+    for t in trend:
+        if t != t:
+            run = 0
+            out.append("UNKNOWN")
+            continue
+        run = run + 1 if t < 0 else 0
+        out.append("RED" if run >= sustained else "YELLOW" if run else "GREEN")
+    return out
+
+
+def register_market_signals(
+    reg: SignalRegistry,
+    symbols: Iterable[str],
+    fetch: PriceFetch,
+    period: str = "1y",
+    interval: str = "1d",
+) -> None:
+    """Close-price history per symbol."""
+    for sym in symbols:
+        reg.register(sym, lambda s=sym: fetch([s], period, interval)[s].close)
+
+
+def register_credit_signals(
+    reg: SignalRegistry,
+    fetch: PriceFetch,
+    hyg: str = "HYG",
+    lqd: str = "LQD",
+    length: int = CREDIT_SMA_LENGTH,
+    period: str = "1y",
+    interval: str = "1d",
+) -> None:
+    """CREDIT_DIVERGENCE per the spec: proxy = HYG/LQD; trend = slope(SMA(proxy, length))."""
+
+    def proxy() -> List[float]:
+        series = fetch([hyg, lqd], period, interval)
+        h = dict(zip(series[hyg].dates, series[hyg].close))
+        pairs = [(h[d], c) for d, c in zip(series[lqd].dates, series[lqd].close) if d in h]
+        return credit_proxy([a for a, _ in pairs], [b for _, b in pairs])
+
+    def trend() -> List[float]:
+        return credit_trend(reg.get("CREDIT_DIVERGENCE.proxy") or [], length)
+
+    reg.register("CREDIT_DIVERGENCE.proxy", proxy)
+    reg.register("CREDIT_DIVERGENCE", proxy)
+    reg.register("CREDIT_DIVERGENCE.trend", trend)
+
+
+def register_macro_signals(reg: SignalRegistry, series_ids: Iterable[str], fetch_macro: Callable) -> None:
+    for sid in series_ids:
+        reg.register(sid, lambda s=sid: fetch_macro([s])[s].values)
+
+
+def register_commodity_signals(reg: SignalRegistry, symbols: Iterable[str], load: Callable) -> None:
+    """Spec commodity names (COPPER, ...); ``load(symbols)`` returns {name: PriceSeries}."""
+    for sym in symbols:
+        reg.register(sym, lambda s=sym: load([s])[s].close)
+
+
+def registry_from_spec(spec: Dict, fetch: PriceFetch, fetch_macro: Callable, load_commodities: Optional[Callable] = None) -> SignalRegistry:
+    """Register every market/macro/credit (and, given a loader, commodity) signal the spec's data_contract declares."""
+    inputs = spec.get("data_contract", {}).get("required_inputs", {})
+    reg = SignalRegistry()
+    register_market_signals(reg, [m["symbol"] for m in inputs.get("market_prices", []) if m.get("symbol")], fetch)
+    register_macro_signals(reg, [m["series"] for m in inputs.get("macro", []) if m.get("series")], fetch_macro)
+    if load_commodities is not None:
+        register_commodity_signals(reg, [c["symbol"] for c in inputs.get("commodities", []) if c.get("symbol")], load_commodities)
+
+    credit = next(
+        (ind for ind in spec.get("computed_indicators", []) if ind.get("id") == "CREDIT_DIVERGENCE"),
+        {},
+    )
+    hyg, lqd = (credit.get("inputs", {}).get("symbols") or ["HYG", "LQD"])[:2]
+    register_credit_signals(reg, fetch, hyg=hyg, lqd=lqd)
+    return reg
@@ -0,0 +1,123 @@
+"""Cached manifest + dashboard spec, indexed page -> cards -> symbols.
+
+Streamlit re-executes app.py on every interaction; this module is imported once
+per process, so its cache survives reruns. Files are re-read only when their
+(mtime_ns, size) changes, and re-parsed only when their sha256 changes too.
+
+Stdlib only: the index can be built before numpy/pandas/yfinance are imported.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_BENCH = "SPY"
+DEFAULT_ROTATION = ["XLB", "XLI", "XLU", "XLP", "XLY", "IWM", "KRE"]
+DEFAULT_MACRO = ["^TNX", "DX-Y.NYB", "^VIX"]
+
+_lock = threading.Lock()
+_files: Dict[str, Tuple[int, int, str, Any]] = {}  # abspath -> (mtime_ns, size, sha256, parsed)
+_indexes: Dict[Tuple[str, str], "SpecIndex"] = {}  # (manifest sha, spec sha) -> index
+
+
+def load_json_cached(path: Path) -> Tuple[Any, str]:
+    """(parsed JSON, sha256) for ``path``; stat-only when unchanged, no re-parse when only mtime moved."""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    hit = _files.get(key)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[3], hit[2]
+    with open(key, "rb") as f:
+        data = f.read()
+    sha = hashlib.sha256(data).hexdigest()
+    parsed = hit[3] if hit and hit[2] == sha else json.loads(data.decode("utf-8"))
+    with _lock:
+        _files[key] = (st.st_mtime_ns, st.st_size, sha, parsed)
+    return parsed, sha
+
+
+def radar_symbols(card: dict) -> List[str]:
+    """Rotation radar symbols: explicit ``symbols``, else RS_50D ``series`` entries, else the default sectors."""
+    series = [s.get("symbol") for s in card.get("series", []) if s.get("indicator") == "RS_50D" and s.get("symbol")]
+    return card.get("symbols", series or DEFAULT_ROTATION)
+
+
+def card_symbols(card: dict) -> List[str]:
+    """Every ticker a card may read, including renderer defaults."""
+    syms: List[str] = []
+    ctype = card.get("type")
+    if ctype == "status_summary":
+        syms += card.get("rotation_symbols", DEFAULT_ROTATION) + [card.get("hyg", "HYG"), card.get("lqd", "LQD")]
+    if ctype == "live_market_slice":
+        syms += card.get("symbols", ["FCX", "SPY"])[:2]
+    if ctype == "intraday_rs":
+        syms += card.get("symbols", ["IWM", "SPY"])[:2]
+    if ctype == "multi_series_chart":
+        syms += radar_symbols(card)
+    if ctype == "chart_plus_thresholds":
+        syms += [card.get("hyg", "HYG"), card.get("lqd", "LQD")]
+    if ctype == "macro_panel":
+        syms += card.get("symbols", DEFAULT_MACRO)
+    if ctype in ("rs_grid", "sector_sequence"):
+        syms += card.get("symbols", DEFAULT_ROTATION)
+    if card.get("benchmark") or ctype in ("status_summary", "multi_series_chart", "rs_grid", "sector_sequence"):
+        syms.append(card.get("benchmark", DEFAULT_BENCH))
+    return list(dict.fromkeys(syms))
+
+
+@dataclass
+class SpecIndex:
+    manifest: dict
+    spec: dict
+    spec_path: Path
+    pages: List[dict]
+    cards: Dict[str, dict]
+    card_symbols: Dict[str, List[str]] = field(default_factory=dict)
+    page_symbols: Dict[str, List[str]] = field(default_factory=dict)
+    # (period, interval) -> every symbol any card fetches with those parameters (benchmark included)
+    universes: Dict[Tuple[str, str], List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, manifest: dict, spec: dict, spec_path: Path) -> "SpecIndex":
+        dashboard = spec.get("dashboard", {})
+        pages = dashboard.get("layout", {}).get("pages", [])
+        cards = dashboard.get("cards", {})
+        idx = cls(manifest=manifest, spec=spec, spec_path=spec_path, pages=pages, cards=cards)
+
+        universes: Dict[Tuple[str, str], set] = {}
+        for cid, card in cards.items():
+            syms = card_symbols(card)
+            idx.card_symbols[cid] = syms
+            key = (card.get("period", "2y"), card.get("interval", "1d"))
+            universes.setdefault(key, {DEFAULT_BENCH}).update(syms)
+        for page in pages:
+            syms = {s for cid in page.get("cards", []) for s in idx.card_symbols.get(cid, [])}
+            idx.page_symbols[page.get("id", "")] = sorted(syms)
+        idx.universes = {k: sorted(v) for k, v in universes.items()}
+        return idx
+
+    def universe_for(self, card: dict) -> Tuple[str, str, List[str]]:
+        """(period, interval, symbols) of the shared fetch this card reads from."""
+        period, interval = card.get("period", "2y"), card.get("interval", "1d")
+        return period, interval, self.universes.get((period, interval), [DEFAULT_BENCH, *card_symbols(card)])
+
+
+def load_spec_index(repo_root: Path) -> SpecIndex:
+    """Manifest + spec index for ``repo_root``; rebuilt only when either file's content changes."""
+    manifest, manifest_sha = load_json_cached(os.path.join(repo_root, "manifest_latest.json"))
+    spec_path = Path(repo_root) / manifest.get("latest", {}).get("dashboard_spec", "")
+    spec, spec_sha = load_json_cached(spec_path)
+    key = (manifest_sha, spec_sha)
+    idx = _indexes.get(key)
+    if idx is None:
+        idx = SpecIndex.build(manifest, spec, spec_path)
+        with _lock:
+            _indexes.clear()
+            _indexes[key] = idx
+    return idx
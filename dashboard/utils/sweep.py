@@ -0,0 +1,216 @@
+"""RS_SMA parameter sweeps from a single prefix-sum pass.
+
+``rs_sma_windows`` turns one cumulative sum over an RS matrix into the SMA for
+every requested window at once (each window is two gathers and a subtraction).
+``sweep_cube`` then evaluates a grid of yellow bands against those SMAs and
+reduces along time, yielding a compact (window x band x symbol) cube that can
+be charted directly (e.g. as a window/band heatmap per symbol).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .backtest import GREEN, RED, UNKNOWN, YELLOW, last_known
+
+
+def prefix_sums(rs: np.ndarray):
+    """Return (csum, ccnt): cumulative sums of valid RS values and valid counts, zero-padded on top."""
+    rs = np.asarray(rs, dtype=float)
+    valid = ~np.isnan(rs)
+    pad = np.zeros((1,) + rs.shape[1:])
+    csum = np.concatenate([pad, np.cumsum(np.where(valid, rs, 0.0), axis=0)])
+    ccnt = np.concatenate([pad, np.cumsum(valid, axis=0, dtype=np.int32)])
+    return csum, ccnt
+
+
+def rs_sma_windows(rs: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    SMA of ``rs`` (dates x symbols) for each window -> (windows x dates x symbols).
+
+    Same strict rule as indicators.sma: NaN unless all ``w`` values in the window are valid.
+    """
+    rs = np.asarray(rs, dtype=float)
+    if rs.ndim == 1:
+        rs = rs[:, None]
+    csum, ccnt = prefix_sums(rs)
+    n = rs.shape[0]
+    w = np.asarray(windows, dtype=np.int64)[:, None]
+    end = np.arange(1, n + 1)[None, :]
+    start = end - w
+    ok = (start >= 0) & (w > 0)
+    start = np.clip(start, 0, n)
+
+    win_sum = csum[end] - csum[start]
+    win_cnt = ccnt[end] - ccnt[start]
+    full = ok[..., None] & (win_cnt == w[..., None])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(full, win_sum / w[..., None], np.nan)
+
+
+def _bucket(values: np.ndarray, sorted_bands: np.ndarray) -> np.ndarray:
+    """Bucket i means sorted_bands[i-1] < value <= sorted_bands[i]; value > band_j iff j < i."""
+    # NaN would sort past every band; map it to -inf (bucket 0) and let callers mask it.
+    return np.searchsorted(sorted_bands, np.where(np.isnan(values), -np.inf, values), side="left")
+
+
+def _count_above(bucket: np.ndarray, mask: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """
+    For (W, T, S) buckets, count masked entries exceeding each band -> (W, B, S).
+
+    One bincount over (row, bucket) plus a reverse cumsum answers the whole band grid,
+    instead of materializing a (W, B, T, S) comparison.
+    """
+    W, _, S = bucket.shape
+    n_b = len(order)
+    row = np.arange(W)[:, None, None] * S + np.arange(S)[None, None, :]
+    key = row * (n_b + 1) + np.where(mask, bucket, 0)  # bucket 0 exceeds no band
+    hist = np.bincount(key.ravel(), minlength=W * S * (n_b + 1)).reshape(W, S, n_b + 1)
+    above = np.cumsum(hist[..., ::-1], axis=-1)[..., ::-1][..., 1:]  # above[j] = sum(hist[j+1:])
+
+    out = np.empty((W, n_b, S), dtype=np.int64)
+    out[:, order, :] = above.transpose(0, 2, 1)
+    return out
+
+
+@dataclass
+class SweepCube:
+    windows: np.ndarray  # (W,)
+    bands: np.ndarray  # (B,)
+    symbols: List[str]
+    rs_sma_last: np.ndarray  # (W, S) last valid RS_SMA per window
+    status_last: np.ndarray  # (W, B, S) status code on the last date
+    pct_green: np.ndarray  # (W, B, S) share of valid days GREEN
+    pct_red: np.ndarray  # (W, B, S) share of valid days RED
+    flips: np.ndarray  # (W, B, S) status changes between consecutive valid days (gaps skipped, as backtest.flip_counts)
+
+    @property
+    def pct_yellow(self) -> np.ndarray:
+        return 1.0 - self.pct_green - self.pct_red
+
+    def metric(self, name: str) -> np.ndarray:
+        return getattr(self, name)
+
+    def heatmap(self, metric: str = "flips", symbol: Optional[str] = None) -> pd.DataFrame:
+        """Window x band frame for one symbol (or the cross-symbol mean)."""
+        cube = self.metric(metric)
+        grid = cube[..., self.symbols.index(symbol)] if symbol else np.nanmean(cube, axis=-1)
+        return pd.DataFrame(
+            grid,
+            index=pd.Index(self.windows, name="window"),
+            columns=pd.Index(self.bands, name="yellow_band"),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format: one row per (window, band, symbol)."""
+        w, b, s = np.meshgrid(self.windows, self.bands, np.arange(len(self.symbols)), indexing="ij")
+        return pd.DataFrame(
+            {
+                "window": w.ravel(),
+                "yellow_band": b.ravel(),
+                "symbol": np.asarray(self.symbols, dtype=object)[s.ravel()],
+                "status_last": self.status_last.ravel(),
+                "pct_green": self.pct_green.ravel(),
+                "pct_yellow": self.pct_yellow.ravel(),
+                "pct_red": self.pct_red.ravel(),
+                "flips": self.flips.ravel(),
+            }
+        )
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            windows=self.windows,
+            bands=self.bands,
+            symbols=np.asarray(self.symbols),
+            rs_sma_last=self.rs_sma_last,
+            status_last=self.status_last,
+            pct_green=self.pct_green,
+            pct_red=self.pct_red,
+            flips=self.flips,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "SweepCube":
+        with np.load(Path(path)) as z:
+            data: Dict[str, np.ndarray] = {k: z[k] for k in z.files}
+        return cls(symbols=[str(s) for s in data.pop("symbols")], **data)
+
+
+def sweep_cube(
+    rs: np.ndarray,
+    windows: Sequence[int],
+    bands: Sequence[float],
+    symbols: Optional[Sequence[str]] = None,
+) -> SweepCube:
+    """Evaluate every (window, band) pair for every symbol of an RS matrix (dates x symbols).
+
+    Bands must be non-negative (they are symmetric thresholds around zero).
+    """
+    rs = np.asarray(rs, dtype=float)
+    if rs.ndim == 1:
+        rs = rs[:, None]
+    n, n_sym = rs.shape
+    windows_arr = np.asarray(windows, dtype=np.int64)
+    bands_arr = np.asarray(bands, dtype=float)
+    symbols = list(symbols) if symbols is not None else [str(i) for i in range(n_sym)]
+
+    sma = rs_sma_windows(rs, windows_arr)  # (W, T, S)
+    valid = ~np.isnan(sma)
+    n_valid = valid.sum(axis=1)  # (W, S)
+
+    # Last valid value per (window, symbol): index of the last True in `valid` along T.
+    last_idx = n - 1 - np.argmax(valid[:, ::-1, :], axis=1)
+    rs_sma_last = np.take_along_axis(sma, last_idx[:, None, :], axis=1)[:, 0, :]
+    rs_sma_last[n_valid == 0] = np.nan
+
+    if (bands_arr < 0).any():
+        raise ValueError("yellow bands must be non-negative")
+
+    # Per-day code is sign(x) when |x| > band, else 0. Bucket |x| against the sorted band
+    # grid once; every statistic below is then a count of buckets above each band.
+    order = np.argsort(bands_arr, kind="stable")
+    bucket = _bucket(np.abs(sma), bands_arr[order])
+    denom = np.maximum(n_valid, 1)[:, None, :]
+    pct_green = _count_above(bucket, valid & (sma > 0), order) / denom
+    pct_red = _count_above(bucket, valid & (sma < 0), order) / denom
+
+    # Each valid day x1 is paired with the previous valid day x0, skipping NaN gaps exactly
+    # as backtest.flip_counts skips UNKNOWN days. The pair changes code iff band < max(|x0|,
+    # |x1|), except that same-sign pairs keep their code while band < min(|x0|, |x1|) as
+    # well. Bucketing is monotone, so max/min of buckets stand in for max/min of magnitudes.
+    prev = last_known(valid, axis=1)[:, :-1]
+    at_prev = np.maximum(prev, 0)
+    b0, b1 = np.take_along_axis(bucket, at_prev, axis=1), bucket[:, 1:]
+    pair = valid[:, 1:] & (prev >= 0)
+    same_sign = np.take_along_axis(np.sign(sma), at_prev, axis=1) == np.sign(sma[:, 1:])
+    flips = _count_above(np.maximum(b0, b1), pair, order) - _count_above(
+        np.minimum(b0, b1), pair & same_sign, order
+    )
+
+    last = rs_sma_last[:, None, :]
+    band = bands_arr[None, :, None]
+    status_last = np.select(
+        [np.isnan(last) | np.zeros_like(band, dtype=bool), last > band, last < -band],
+        [UNKNOWN, GREEN, RED],
+        default=YELLOW,
+    ).astype(np.int8)
+
+    return SweepCube(
+        windows=windows_arr,
+        bands=bands_arr,
+        symbols=symbols,
+        rs_sma_last=rs_sma_last,
+        status_last=status_last,
+        pct_green=pct_green,
+        pct_red=pct_red,
+        flips=flips,
+    )
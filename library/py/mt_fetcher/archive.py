@@ -0,0 +1,399 @@
+"""
+mt_fetcher.archive — single-file run snapshots for moving runs between machines (v1)
+
+export_run() packs one run (raw files, evidence manifest/provenance, normalize
+outputs) into a plain, seekable tar in which every member is compressed on its
+own:
+
+    blobs/<sha256>          raw file content, stored once per distinct sha
+    evidence/<name>         manifest.json, provenance.json
+    normalize/<name>        items.jsonl, items.mtc, normalize.meta.json, ...
+    index.json              last member: every entry with its data offset, codec,
+                            compressed size, original size and sha256
+
+Codec: zstd when the optional ``zstandard`` package is importable, else zlib;
+members that do not shrink (already-compressed images, zips) are stored as-is.
+Because each member is compressed independently, import can seek straight to
+the blobs it needs. zlib streams carry an Adler-32 and zstd frames are written
+with a content checksum, both verified on decompression; stored members have no
+codec checksum, so import always hashes those.
+
+import_run() reads index.json, skips raw files the destination already holds
+(same path, size and sha), decompresses the rest, and rebuilds manifest.json for
+the new location from the recorded sha256 values, with no rehash.
+
+Both directions run reading + (de)compression on a worker pool while one thread
+writes the tar (export) or feeds the pool (import), with bounded work in flight.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import tarfile
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .events import append_event
+from .evidence import iter_manifest, sha256_file
+
+try:  # optional
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on environment
+    _zstd = None
+
+FORMAT = "mt.fetch.archive.v1"
+CHUNK = 1024 * 1024
+SPOOL_MAX = 16 * 1024 * 1024  # compressed members larger than this spill to a temp file
+STORE_RATIO = 0.95  # keep a member uncompressed unless it shrinks below this
+
+
+def default_codec() -> str:
+    return "zstd" if _zstd is not None else "zlib"
+
+
+def _compressor(codec: str, level: Optional[int]):
+    if codec == "zstd":
+        if _zstd is None:
+            raise RuntimeError("zstd requested but the zstandard package is not installed")
+        return _zstd.ZstdCompressor(level=3 if level is None else level, write_checksum=True).compressobj()
+    if codec == "zlib":
+        return zlib.compressobj(6 if level is None else level)
+    raise ValueError(f"unknown codec: {codec}")
+
+
+def _decompressor(codec: str):
+    if codec == "zstd":
+        if _zstd is None:
+            raise RuntimeError("archive uses zstd; install the zstandard package to import it")
+        return _zstd.ZstdDecompressor().decompressobj()
+    if codec == "zlib":
+        return zlib.decompressobj()
+    raise ValueError(f"unknown codec: {codec}")
+
+
+def run_dirs(var_root: Path, run_id: str) -> Dict[str, Path]:
+    """The standard per-run layout under ``var/mt`` (see pipeline.run)."""
+    var_root = Path(var_root)
+    return {
+        "raw": var_root / "fetch" / "raw" / run_id,
+        "evidence": var_root / "evidence" / run_id,
+        "normalize": var_root / "normalize" / run_id,
+    }
+
+
+# -- export -----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    archive_path: Path
+    members: int
+    raw_files: int
+    bytes_in: int
+    bytes_out: int
+    codec: str
+    elapsed_s: float
+
+
+def _compress_file(src: Path, codec: str, level: Optional[int], expect_sha: Optional[str]) -> Tuple[Any, int, int, str, str]:
+    """(spooled data, original size, stored size, sha256, stored codec); runs on a worker."""
+    h = hashlib.sha256()
+    comp = _compressor(codec, level)
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX)
+    size = 0
+    with open(src, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            size += len(chunk)
+            h.update(chunk)
+            spool.write(comp.compress(chunk))
+    spool.write(comp.flush())
+    sha = h.hexdigest()
+    if expect_sha is not None and sha != expect_sha:
+        spool.close()
+        raise ValueError(f"{src.name}: content no longer matches manifest.json (run mt-fetch verify)")
+    stored, used = spool.tell(), codec
+    if size and stored >= size * STORE_RATIO:  # incompressible: store raw bytes instead
+        spool.close()
+        spool = open(src, "rb")
+        stored, used = size, "none"
+    spool.seek(0)
+    return spool, size, stored, sha, used
+
+
+def _add_member(tar: tarfile.TarFile, name: str, fileobj, size: int) -> int:
+    """Append a member; returns the absolute offset of its data."""
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = 0  # archives of the same run are reproducible
+    info.mode = 0o644
+    tar.addfile(info, fileobj)
+    return tar.offset - ((size + tarfile.BLOCKSIZE - 1) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+
+def export_run(
+    var_root: Path,
+    run_id: str,
+    out_path: Path,
+    codec: Optional[str] = None,
+    level: Optional[int] = None,
+    workers: int = 4,
+) -> ExportResult:
+    t0 = time.monotonic()
+    codec = codec or default_codec()
+    dirs = run_dirs(var_root, run_id)
+    manifest_path = dirs["evidence"] / "manifest.json"
+    if not manifest_path.is_file():
+        raise FileNotFoundError(f"run {run_id}: missing evidence manifest (run pack-evidence first)")
+    raw_root = dirs["raw"].resolve()
+
+    # (member name, source path, expected sha or None, index fields)
+    jobs: List[Tuple[str, Path, Optional[str], Dict[str, Any]]] = []
+    raw_entries: List[Dict[str, Any]] = []
+    seen: set = set()
+    for ent in iter_manifest(manifest_path):
+        src = Path(ent["path"])
+        try:
+            rel = src.resolve().relative_to(raw_root).as_posix()
+        except ValueError:
+            raise ValueError(f"run {run_id}: manifest lists a file outside the run's raw dir: {src.name}")
+        raw_entries.append({"rel": rel, "sha256": ent["sha256"], "size": ent["size_bytes"]})
+        if ent["sha256"] not in seen:
+            seen.add(ent["sha256"])
+            jobs.append((f"blobs/{ent['sha256']}", src, ent["sha256"], {"kind": "blob"}))
+    for p in sorted(dirs["evidence"].iterdir()):
+        if p.is_file() and p.name in ("manifest.json", "provenance.json"):
+            jobs.append((f"evidence/{p.name}", p, None, {"kind": "evidence", "rel": p.name}))
+    if dirs["normalize"].is_dir():
+        for p in sorted(dirs["normalize"].iterdir()):
+            if p.is_file() and not p.name.endswith(".tmp"):
+                jobs.append((f"normalize/{p.name}", p, None, {"kind": "normalize", "rel": p.name}))
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    members: List[Dict[str, Any]] = []
+    bytes_in = 0
+    inflight: List[Tuple[str, Dict[str, Any], Future]] = []
+    pool = ThreadPoolExecutor(max_workers=max(int(workers), 1), thread_name_prefix="mt-export")
+    try:
+        with tarfile.open(tmp, "w", format=tarfile.PAX_FORMAT) as tar:
+
+            def drain(keep: int) -> None:
+                nonlocal bytes_in
+                while len(inflight) > keep:
+                    name, fields, fut = inflight[0]  # in submission order: deterministic tar layout
+                    data, size, stored, sha, used = fut.result()
+                    inflight.pop(0)
+                    with data:
+                        offset = _add_member(tar, name, data, stored)
+                    members.append({**fields, "name": name, "offset": offset, "stored": stored, "size": size, "sha256": sha, "codec": used})
+                    bytes_in += size
+
+            for name, src, expect, fields in jobs:
+                inflight.append((name, fields, pool.submit(_compress_file, src, codec, level, expect)))
+                drain(keep=workers * 2)
+            drain(keep=0)
+
+            index = {"format": FORMAT, "run_id": run_id, "codec": codec, "raw": raw_entries, "members": members}
+            body = json.dumps(index, indent=2, sort_keys=True).encode("utf-8")
+            _add_member(tar, "index.json", io.BytesIO(body), len(body))
+    except BaseException:
+        # Stop queued work, close the spools of members that were compressed but
+        # never written, and drop the partial archive.
+        pool.shutdown(wait=True, cancel_futures=True)
+        for _, _, fut in inflight:
+            if not fut.cancelled() and fut.exception() is None:
+                fut.result()[0].close()
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        pool.shutdown(wait=True)
+    tmp.replace(out_path)
+    return ExportResult(
+        archive_path=out_path,
+        members=len(members),
+        raw_files=len(raw_entries),
+        bytes_in=bytes_in,
+        bytes_out=out_path.stat().st_size,
+        codec=codec,
+        elapsed_s=time.monotonic() - t0,
+    )
+
+
+# -- import -----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    run_id: str
+    written: int
+    skipped: int
+    bytes_written: int
+    manifest_path: Path
+    elapsed_s: float
+
+
+def read_index(archive_path: Path) -> Dict[str, Any]:
+    with tarfile.open(archive_path, "r:") as tar:
+        f = tar.extractfile("index.json")
+        if f is None:
+            raise ValueError(f"{archive_path}: no index.json")
+        index = json.loads(f.read().decode("utf-8"))
+    if index.get("format") != FORMAT:
+        raise ValueError(f"{archive_path}: unsupported archive format {index.get('format')!r}")
+    return index
+
+
+def _member_chunks(archive_path: Path, m: Dict[str, Any]) -> Iterator[bytes]:
+    with open(archive_path, "rb") as f:
+        f.seek(m["offset"])
+        left = m["stored"]
+        while left:
+            chunk = f.read(min(CHUNK, left))
+            if not chunk:
+                raise ValueError(f"{archive_path}: truncated member {m['name']}")
+            left -= len(chunk)
+            yield chunk
+
+
+def _extract_member(archive_path: Path, m: Dict[str, Any], dests: List[Path], check: bool) -> int:
+    """Decompress one member to each of ``dests`` (tmp + replace); runs on a worker."""
+    dec = _decompressor(m["codec"]) if m["codec"] != "none" else None
+    h = hashlib.sha256() if check or dec is None else None  # stored members have no codec checksum
+    first = dests[0]
+    first.parent.mkdir(parents=True, exist_ok=True)
+    tmp = first.with_name(f"{first.name}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as out:
+            for chunk in _member_chunks(archive_path, m):
+                data = dec.decompress(chunk) if dec is not None else chunk
+                if h is not None:
+                    h.update(data)
+                out.write(data)
+            if dec is not None and hasattr(dec, "flush"):
+                tail = dec.flush()
+                if h is not None:
+                    h.update(tail)
+                out.write(tail)
+    except Exception as e:  # codec checksum mismatch, corrupt stream, truncated archive
+        tmp.unlink(missing_ok=True)
+        raise ValueError(f"{m['name']}: {e}") from e
+    if dec is not None and not getattr(dec, "eof", True):
+        tmp.unlink()
+        raise ValueError(f"{m['name']}: compressed stream ends early")
+    if h is not None and h.hexdigest() != m["sha256"]:
+        tmp.unlink()
+        raise ValueError(f"{m['name']}: sha256 mismatch after decompression")
+    for extra in dests[1:]:  # same blob at several paths
+        extra.parent.mkdir(parents=True, exist_ok=True)
+        copy = extra.with_name(f"{extra.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "rb") as src, open(copy, "wb") as dst:
+            for chunk in iter(lambda: src.read(CHUNK), b""):
+                dst.write(chunk)
+        copy.replace(extra)
+    tmp.replace(first)
+    return m["size"] * len(dests)
+
+
+def _held(dest: Path, size: int, sha: str, known: Dict[str, str]) -> bool:
+    try:
+        if dest.stat().st_size != size:
+            return False
+    except OSError:
+        return False
+    if known.get(str(dest)) == sha:
+        return True  # destination manifest already vouches for it
+    return sha256_file(dest) == sha
+
+
+def import_run(
+    archive_path: Path,
+    var_root: Path,
+    run_id: Optional[str] = None,
+    workers: int = 4,
+    check: bool = False,
+    event_log: Optional[Path] = None,
+) -> ImportResult:
+    """
+    Restore a run from ``archive_path`` under ``var_root`` (optionally as ``run_id``).
+
+    ``check=True`` also hashes what it decompresses. By default compressed members
+    rely on their codec's checksum (Adler-32 for zlib, the frame checksum for zstd)
+    and only stored (``none``) members are hashed against the recorded sha256.
+    """
+    t0 = time.monotonic()
+    archive_path = Path(archive_path)
+    index = read_index(archive_path)
+    run_id = run_id or index["run_id"]
+    dirs = run_dirs(var_root, run_id)
+    raw_root = dirs["raw"].resolve() if dirs["raw"].exists() else dirs["raw"].absolute()
+
+    known: Dict[str, str] = {}
+    old_manifest = dirs["evidence"] / "manifest.json"
+    if old_manifest.is_file():
+        known = {str(Path(e["path"])): e["sha256"] for e in iter_manifest(old_manifest)}
+
+    blobs = {m["sha256"]: m for m in index["members"] if m["kind"] == "blob"}
+    targets: Dict[str, List[Path]] = {}
+    skipped = 0
+    for ent in index["raw"]:
+        dest = raw_root / ent["rel"]
+        if raw_root not in dest.resolve().parents:
+            raise ValueError(f"{archive_path}: unsafe path in archive: {ent['rel']}")
+        if _held(dest, ent["size"], ent["sha256"], known):
+            skipped += 1
+        else:
+            targets.setdefault(ent["sha256"], []).append(dest)
+
+    work: List[Tuple[Dict[str, Any], List[Path]]] = [(blobs[sha], dests) for sha, dests in targets.items()]
+    for m in index["members"]:
+        if m["kind"] == "normalize":
+            work.append((m, [dirs["normalize"] / Path(m["rel"]).name]))
+        elif m["kind"] == "evidence" and m["rel"] != "manifest.json":
+            work.append((m, [dirs["evidence"] / Path(m["rel"]).name]))
+    work.sort(key=lambda w: w[0]["offset"])  # sequential reads through the archive
+
+    written = bytes_written = 0
+    with ThreadPoolExecutor(max_workers=max(int(workers), 1), thread_name_prefix="mt-import") as pool:
+        inflight: List[Future] = []
+        for m, dests in work:
+            inflight.append(pool.submit(_extract_member, archive_path, m, dests, check))
+            while len(inflight) > workers * 2:
+                bytes_written += inflight.pop(0).result()
+            written += len(dests)
+        for fut in inflight:
+            bytes_written += fut.result()
+
+    # manifest.json for this machine's paths, from the recorded hashes (same format as pack)
+    manifest = {"files": [{"path": str(raw_root / e["rel"]), "sha256": e["sha256"], "size_bytes": e["size"]} for e in index["raw"]]}
+    dirs["evidence"].mkdir(parents=True, exist_ok=True)
+    manifest_path = dirs["evidence"] / "manifest.json"
+    manifest_text = json.dumps(manifest, indent=2, sort_keys=True)
+    manifest_path.write_text(manifest_text, encoding="utf-8")
+
+    if event_log is not None:
+        append_event(
+            event_log,
+            "import",
+            run_id=run_id,
+            counts={"files": len(index["raw"]), "written": written, "skipped": skipped},
+            hashes={
+                "manifest_sha256": hashlib.sha256(manifest_text.encode("utf-8")).hexdigest(),
+                "archive_index_sha256": hashlib.sha256(json.dumps(index, sort_keys=True).encode("utf-8")).hexdigest(),
+            },
+        )
+    return ImportResult(
+        run_id=run_id,
+        written=written,
+        skipped=skipped,
+        bytes_written=bytes_written,
+        manifest_path=manifest_path,
+        elapsed_s=time.monotonic() - t0,
+    )
@@ -0,0 +1,359 @@
+"""
+mt_fetcher.columnar — compact binary columnar twin of items.jsonl (v1)
+
+items.jsonl repeats run_id/source_id/retrieved_utc/url/tags on every line and
+stores sha256 as 64 hex chars. items.mtc stores the same rows column by column:
+
+- run-constant / low-cardinality fields: dictionary-encoded (u32 code per row,
+  values once in the header)
+- raw_evidence_sha256: 32 raw bytes per row
+- size_bytes: i64 per row
+- title: u64 offsets + one utf-8 blob
+- any other key: a per-row JSON object in the generic ``extra`` column
+
+Layout (little-endian): magic b"MTCOL\\x00\\x01\\x00", u64 header length, header
+JSON, then 8-byte-aligned column buffers at the offsets the header records.
+Readers mmap the file and scan columns without parsing rows (ItemsTable).
+
+Round trip is exact: a value that does not fit its column's encoding (e.g. an
+empty or non-hex sha, a float size) is kept verbatim in the header as an
+override, and absent keys are recorded as absent. columnar_to_jsonl() reproduces
+normalize's items.jsonl byte for byte. Stdlib only.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import re
+import struct
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+MAGIC = b"MTCOL\x00\x01\x00"
+FORMAT = "mt.normalize.items.columnar.v1"
+ABSENT = 0xFFFFFFFF  # dict code for "key not present in this row"
+
+# column name -> encoding, in file order; every other key goes to "extra"
+ITEM_COLUMNS = {
+    "schema": "dict",
+    "run_id": "dict",
+    "source_id": "dict",
+    "retrieved_utc": "dict",
+    "url": "dict",
+    "content_type": "dict",
+    "tags": "dict",
+    "title": "str",
+    "raw_evidence_sha256": "sha256",
+    "size_bytes": "i64",
+}
+EXTRA = "extra"
+
+_SHA_RE = re.compile(r"[0-9a-f]{64}")
+_LITTLE = sys.byteorder == "little"
+
+
+def _dumps(v: Any) -> str:
+    return json.dumps(v, sort_keys=True)
+
+
+class _Column:
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.missing: List[int] = []
+        self.overrides: Dict[int, Any] = {}
+        self.values: List[Any] = []  # dict
+        self._index: Dict[str, int] = {}
+        self.codes = array("I")  # dict
+        self.offsets = array("Q", [0])  # str / json
+        self.blob = bytearray()  # str / json / sha256
+        self.ints = array("q")  # i64
+
+    def _placeholder(self) -> None:
+        if self.kind == "dict":
+            self.codes.append(ABSENT)
+        elif self.kind == "sha256":
+            self.blob += bytes(32)
+        elif self.kind == "i64":
+            self.ints.append(0)
+        else:
+            self.offsets.append(len(self.blob))
+
+    def add(self, row: int, present: bool, v: Any = None) -> None:
+        if not present:
+            self.missing.append(row)
+            self._placeholder()
+            return
+        if self.kind == "dict":
+            key = _dumps(v)
+            code = self._index.get(key)
+            if code is None:
+                code = self._index[key] = len(self.values)
+                self.values.append(v)
+            self.codes.append(code)
+            return
+        if self.kind == "sha256" and isinstance(v, str) and _SHA_RE.fullmatch(v):
+            self.blob += bytes.fromhex(v)
+            return
+        if self.kind == "i64" and type(v) is int and -(2**63) <= v < 2**63:
+            self.ints.append(v)
+            return
+        if self.kind in ("str", "json") and isinstance(v, str):
+            self.blob += v.encode("utf-8")
+            self.offsets.append(len(self.blob))
+            return
+        self.overrides[row] = v
+        self._placeholder()
+
+    def buffers(self) -> List[bytes]:
+        def le(a: array) -> bytes:
+            if not _LITTLE:
+                a = array(a.typecode, a)
+                a.byteswap()
+            return a.tobytes()
+
+        if self.kind == "dict":
+            return [le(self.codes)]
+        if self.kind == "i64":
+            return [le(self.ints)]
+        if self.kind == "sha256":
+            return [bytes(self.blob)]
+        return [le(self.offsets), bytes(self.blob)]
+
+
+class ColumnarWriter:
+    """Streams items (dicts) into columns; ``close()`` writes the file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self.columns = [_Column(name, kind) for name, kind in ITEM_COLUMNS.items()]
+        self.extra = _Column(EXTRA, "json")
+
+    def add(self, item: Dict[str, Any]) -> None:
+        row = self.count
+        for col in self.columns:
+            present = col.name in item
+            col.add(row, present, item.get(col.name))
+        rest = {k: v for k, v in item.items() if k not in ITEM_COLUMNS}
+        self.extra.add(row, bool(rest), _dumps(rest) if rest else None)
+        self.count += 1
+
+    def close(self) -> Path:
+        cols = self.columns + [self.extra]
+        chunks: List[bytes] = []
+        specs = []
+        offset = 0
+        for col in cols:
+            spec: Dict[str, Any] = {"name": col.name, "kind": col.kind, "buffers": []}
+            for buf in col.buffers():
+                spec["buffers"].append([offset, len(buf)])
+                pad = -len(buf) % 8
+                chunks.append(buf + b"\x00" * pad)
+                offset += len(buf) + pad
+            if col.kind == "dict":
+                spec["values"] = col.values
+            if col.missing:
+                spec["missing"] = col.missing
+            if col.overrides:
+                spec["overrides"] = [[r, v] for r, v in sorted(col.overrides.items())]
+            specs.append(spec)
+
+        header = json.dumps({"format": FORMAT, "count": self.count, "columns": specs}, sort_keys=True).encode("utf-8")
+        header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for chunk in chunks:
+                f.write(chunk)
+        tmp.replace(self.path)
+        return self.path
+
+
+def write_items(items: Iterable[Dict[str, Any]], path: Path) -> Path:
+    w = ColumnarWriter(path)
+    for item in items:
+        w.add(item)
+    return w.close()
+
+
+class ItemsTable:
+    """Read-only, memory-mapped view of an items.mtc file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._f = self.path.open("rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._f.close()
+            raise ValueError(f"{self.path}: not an items columnar file")
+        if self._mm[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path}: not an items columnar file")
+        (hlen,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        self.data_start = len(MAGIC) + 8 + hlen
+        header = json.loads(self._mm[len(MAGIC) + 8 : self.data_start].decode("utf-8"))
+        if header.get("format") != FORMAT:
+            self.close()
+            raise ValueError(f"{self.path}: unsupported format {header.get('format')!r}")
+        self.count: int = header["count"]
+        self.specs: Dict[str, Dict[str, Any]] = {c["name"]: c for c in header["columns"]}
+        self._missing = {n: set(c.get("missing", [])) for n, c in self.specs.items()}
+        self._overrides = {n: {r: v for r, v in c.get("overrides", [])} for n, c in self.specs.items()}
+
+    def close(self) -> None:
+        mm, self._mm = getattr(self, "_mm", None), None
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:  # a caller still holds a column view; the map goes with it
+                pass
+        self._f.close()
+
+    def __enter__(self) -> "ItemsTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.specs)
+
+    def _buffer(self, name: str, i: int = 0, fmt: Optional[str] = None):
+        off, length = self.specs[name]["buffers"][i]
+        view = memoryview(self._mm)[self.data_start + off : self.data_start + off + length]
+        if fmt is None:
+            return view
+        if _LITTLE:
+            return view.cast(fmt)
+        a = array(fmt, view)
+        a.byteswap()
+        return a
+
+    # -- column scans (no row decoding) -------------------------------------
+    def codes(self, name: str):
+        """u32 codes of a dict column (ABSENT where the key is missing)."""
+        return self._buffer(name, 0, "I")
+
+    def dict_values(self, name: str) -> List[Any]:
+        return self.specs[name]["values"]
+
+    def value_counts(self, name: str) -> Dict[str, int]:
+        """Row counts per value of a dict column, keyed by the value's JSON text."""
+        values = self.dict_values(name)
+        counts = Counter(self.codes(name))
+        return {_dumps(values[c]) if c != ABSENT else "<absent>": n for c, n in counts.items()}
+
+    def int_column(self, name: str = "size_bytes"):
+        """Raw i64 buffer (rows with an override or missing key hold 0)."""
+        return self._buffer(name, 0, "q")
+
+    def sha256_bytes(self, row: int) -> bytes:
+        off = row * 32
+        return bytes(self._buffer("raw_evidence_sha256")[off : off + 32])
+
+    def find_sha256(self, sha_hex: str) -> List[int]:
+        """Rows whose raw_evidence_sha256 equals ``sha_hex`` (byte search over the 32-byte slots)."""
+        if not _SHA_RE.fullmatch(sha_hex):
+            return [r for r, v in self._overrides["raw_evidence_sha256"].items() if v == sha_hex]
+        needle = bytes.fromhex(sha_hex)
+        buf = self._buffer("raw_evidence_sha256")
+        off, _ = self.specs["raw_evidence_sha256"]["buffers"][0]
+        base = self.data_start + off
+        rows = []
+        pos = self._mm.find(needle, base, base + len(buf))
+        while pos != -1:
+            rel = pos - base
+            if rel % 32 == 0 and rel // 32 not in self._overrides["raw_evidence_sha256"]:
+                rows.append(rel // 32)
+            pos = self._mm.find(needle, pos + 1, base + len(buf))
+        return rows
+
+    # -- rows ---------------------------------------------------------------
+    def value(self, name: str, row: int) -> Any:
+        """Decoded value; raises KeyError if the row does not have ``name``."""
+        if row in self._missing[name]:
+            raise KeyError(name)
+        over = self._overrides[name]
+        if row in over:
+            return over[row]
+        kind = self.specs[name]["kind"]
+        if kind == "dict":
+            return self.specs[name]["values"][self.codes(name)[row]]
+        if kind == "sha256":
+            return self.sha256_bytes(row).hex()
+        if kind == "i64":
+            return self.int_column(name)[row]
+        offsets = self._buffer(name, 0, "Q")
+        text = bytes(self._buffer(name, 1)[offsets[row] : offsets[row + 1]]).decode("utf-8")
+        return json.loads(text) if kind == "json" else text
+
+    def row(self, row: int) -> Dict[str, Any]:
+        item: Dict[str, Any] = {}
+        for name in self.specs:
+            if name == EXTRA:
+                continue
+            try:
+                item[name] = self.value(name, row)
+            except KeyError:
+                pass
+        if EXTRA in self.specs and row not in self._missing[EXTRA]:
+            item.update(self.value(EXTRA, row))
+        return item
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.count):
+            yield self.row(i)
+
+
+def read_items(path: Path) -> List[Dict[str, Any]]:
+    with ItemsTable(path) as t:
+        return list(t)
+
+
+def jsonl_to_columnar(jsonl_path: Path, out_path: Union[Path, None] = None) -> Path:
+    jsonl_path = Path(jsonl_path)
+    w = ColumnarWriter(out_path or jsonl_path.with_suffix(".mtc"))
+    with jsonl_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                w.add(json.loads(line))
+    return w.close()
+
+
+def columnar_to_jsonl(path: Path, out_path: Union[Path, None] = None) -> Path:
+    path = Path(path)
+    out_path = Path(out_path or path.with_suffix(".jsonl"))
+    with ItemsTable(path) as t, out_path.open("w", encoding="utf-8") as f:
+        for item in t:
+            f.write(_dumps(item) + "\n")
+    return out_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m mt_fetcher.columnar", description="Convert items.jsonl <-> items.mtc (exact round trip).")
+    ap.add_argument("direction", choices=["to-columnar", "to-jsonl"])
+    ap.add_argument("src", type=Path)
+    ap.add_argument("dst", type=Path, nargs="?")
+    args = ap.parse_args(argv)
+    out = jsonl_to_columnar(args.src, args.dst) if args.direction == "to-columnar" else columnar_to_jsonl(args.src, args.dst)
+    print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+"""
+mt_fetcher.events — append-only, sequence-numbered run event log (v1)
+
+pack and normalize append one JSON line per completed stage to
+var/mt/events/events.jsonl:
+
+    {"schema": "mt.fetch.event.v1", "seq": 42, "ts_utc": "...", "stage": "pack",
+     "run_id": "...", "source_id": "...", "counts": {...}, "hashes": {...}}
+
+Privacy contract: hashes, counts and timestamps only — never paths or names.
+
+Consumers keep a Cursor (last seq + byte offset) and read only what came after
+it; ``follow`` blocks until new events arrive, woken by inotify on Linux
+(polling elsewhere), so an idle consumer costs nothing but a blocked read.
+Writers take an exclusive flock while numbering + appending, so concurrent
+stages never reuse a seq. The highest seq is also kept in ``events.jsonl.seq``,
+so numbering continues across log rotation; a line torn by a crashed writer is
+terminated and skipped rather than resetting the count.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import os
+import select
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single-writer only
+    fcntl = None  # type: ignore[assignment]
+
+SCHEMA = "mt.fetch.event.v1"
+
+
+def _now_utc() -> str:
+    return _dt.datetime.now(_dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _seq_of(line: bytes) -> Optional[int]:
+    try:
+        return int(json.loads(line)["seq"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _last_seq(f) -> int:
+    """seq of the last valid line, reading backwards from the end; torn or garbled lines are skipped."""
+    pos = f.seek(0, os.SEEK_END)
+    carry = b""
+    while pos > 0:
+        step = min(4096, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + carry).split(b"\n")
+        carry = lines.pop(0) if pos > 0 else b""  # may start mid-line: finish it next round
+        for line in reversed(lines):
+            seq = _seq_of(line) if line.strip() else None
+            if seq is not None:
+                return seq
+    seq = _seq_of(carry) if carry.strip() else None
+    return seq or 0
+
+
+def _seq_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + ".seq")
+
+
+def _seed_seq(log_path: Path) -> int:
+    """
+    Highest seq handed out before ``log_path`` was rotated away: the ``.seq`` sidecar,
+    else the last line of a rotated sibling (``events.jsonl.1`` etc., uncompressed).
+    """
+    try:
+        return int(_seq_path(log_path).read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        pass
+    best = 0
+    for p in log_path.parent.glob(log_path.name + ".*"):
+        if p.suffix in (".seq", ".tmp", ".gz", ".bz2", ".xz", ".zst") or not p.is_file():
+            continue
+        try:
+            with p.open("rb") as f:
+                best = max(best, _last_seq(f))
+        except OSError:
+            continue
+    return best
+
+
+def append_event(
+    log_path: Path,
+    stage: str,
+    run_id: str,
+    source_id: str = "",
+    counts: Optional[Dict[str, int]] = None,
+    hashes: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Append one event with the next seq; returns it."""
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            # The sidecar covers a new or rotated log, so numbering stays monotonic.
+            last = max(_last_seq(f), _seed_seq(log_path))
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")  # terminate a line torn by a crashed writer
+            event = {
+                "schema": SCHEMA,
+                "seq": last + 1,
+                "ts_utc": _now_utc(),
+                "stage": stage,
+                "run_id": run_id,
+                "source_id": source_id,
+                "counts": counts or {},
+                "hashes": hashes or {},
+            }
+            f.seek(0, os.SEEK_END)
+            f.write((json.dumps(event, sort_keys=True) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            seq_path = _seq_path(log_path)
+            tmp = seq_path.with_name(seq_path.name + ".tmp")
+            tmp.write_text(str(event["seq"]), encoding="utf-8")
+            tmp.replace(seq_path)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    return event
+
+
+@dataclass(frozen=True)
+class Cursor:
+    seq: int = 0  # last event consumed
+    offset: int = 0  # byte offset just past it
+
+    @classmethod
+    def load(cls, path: Path) -> "Cursor":
+        try:
+            d = json.loads(Path(path).read_text(encoding="utf-8"))
+            return cls(int(d["seq"]), int(d["offset"]))
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"seq": self.seq, "offset": self.offset}), encoding="utf-8")
+        tmp.replace(path)
+
+
+class EventLog:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    @staticmethod
+    def _at_line(f, offset: int, seq: int) -> bool:
+        """True if the line ending exactly at ``offset`` is event ``seq``."""
+        start = max(offset - 64 * 1024, 0)
+        f.seek(start)
+        chunk = f.read(offset - start)
+        if not chunk.endswith(b"\n"):
+            return False
+        lines = chunk[:-1].split(b"\n")
+        if len(lines) == 1 and start > 0:
+            return False  # longer than the window: cannot confirm
+        return _seq_of(lines[-1]) == seq
+
+    def _scan(self, cursor: Cursor) -> Iterator[Tuple[Dict[str, Any], Cursor]]:
+        try:
+            f = self.path.open("rb")
+        except FileNotFoundError:
+            return
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            offset = cursor.offset if cursor.offset <= size else 0
+            if offset and not self._at_line(f, offset, cursor.seq):
+                # The log was rotated or rewritten under the cursor: rescan from the
+                # start and skip by seq (numbering carries across rotation).
+                offset = 0
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return  # a writer is mid-append; pick it up next time
+                offset += len(line)
+                try:
+                    ev = json.loads(line)
+                except ValueError:
+                    continue
+                if ev.get("seq", 0) > cursor.seq:
+                    yield ev, Cursor(ev["seq"], offset)
+
+    def read(self, cursor: Cursor = Cursor(), limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Cursor]:
+        """Complete events after ``cursor`` and the cursor to resume from."""
+        events: List[Dict[str, Any]] = []
+        for ev, cursor in self._scan(cursor):
+            events.append(ev)
+            if limit is not None and len(events) >= limit:
+                break
+        return events, cursor
+
+    def follow(self, cursor: Cursor = Cursor(), timeout: Optional[float] = None, poll: float = 1.0) -> Iterator[Tuple[Dict[str, Any], Cursor]]:
+        """
+        Yield (event, cursor after it) forever, or until ``timeout`` seconds pass
+        with nothing new. Sleeps on inotify where available, else polls.
+        """
+        watcher = _Inotify.create(self.path)
+        try:
+            while True:
+                seen = False
+                for ev, cursor in self._scan(cursor):
+                    seen = True
+                    yield ev, cursor
+                if seen:
+                    continue
+                if watcher is not None:
+                    woke = watcher.wait(timeout)
+                else:
+                    woke = _poll_wait(self.path, cursor.offset, timeout, poll)
+                if not woke:
+                    return
+        finally:
+            if watcher is not None:
+                watcher.close()
+
+
+def _poll_wait(path: Path, offset: int, timeout: Optional[float], poll: float) -> bool:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            if path.stat().st_size != offset:
+                return True
+        except OSError:
+            pass
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+class _Inotify:
+    """Minimal ctypes inotify watch on the log's directory (Linux only)."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+
+    def __init__(self, fd: int, name: bytes):
+        self.fd = fd
+        self.name = name
+
+    @classmethod
+    def create(cls, path: Path) -> Optional["_Inotify"]:
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            path.parent.mkdir(parents=True, exist_ok=True)
+            mask = cls.IN_MODIFY | cls.IN_CLOSE_WRITE | cls.IN_MOVED_TO | cls.IN_CREATE
+            if libc.inotify_add_watch(fd, os.fsencode(str(path.parent)), mask) < 0:
+                os.close(fd)
+                return None
+        except (OSError, AttributeError):
+            return None
+        return cls(fd, os.fsencode(path.name))
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """True once our file changed; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            left = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            ready, _, _ = select.select([self.fd], [], [], left)
+            if not ready:
+                return False
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            pos = 0
+            while pos + 16 <= len(buf):
+                _, _, _, name_len = struct.unpack_from("iIII", buf, pos)
+                name = buf[pos + 16 : pos + 16 + name_len].rstrip(b"\x00")
+                pos += 16 + name_len
+                if name == self.name:
+                    return True
+
+    def close(self) -> None:
+        os.close(self.fd)
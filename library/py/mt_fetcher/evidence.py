@@ -2,14 +2,25 @@
 mt_fetcher.evidence
 
 Interfaces-only v1 for hashing + manifest/provenance emission.
+
+verify() re-checks a run against its manifest without touching it: the
+manifest is streamed, files are re-hashed on a small thread pool under an
+optional bandwidth cap, progress is checkpointed so an interrupted run resumes,
+and ``sample`` audits a deterministic fraction of files.
 """
 from __future__ import annotations
 
 import hashlib
 import json
-from dataclasses import dataclass
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .events import append_event
 
 @dataclass(frozen=True)
 class EvidenceFile:
@@ -25,18 +36,23 @@ class EvidencePack:
     files: List[EvidenceFile]
     meta: Dict[str, Any]
 
-def sha256_file(p: Path) -> str:
+CHUNK = 1024 * 1024
+
+def sha256_file(p: Path, limiter: Optional["RateLimiter"] = None) -> str:
     h = hashlib.sha256()
     with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            if limiter is not None:
+                limiter.consume(len(chunk))
             h.update(chunk)
     return h.hexdigest()
 
-def pack(run_root: Path, files: Iterable[Path], meta: Dict[str, Any]) -> EvidencePack:
+def pack(run_root: Path, files: Iterable[Path], meta: Dict[str, Any], event_log: Optional[Path] = None) -> EvidencePack:
     """
     Write:
       - manifest.json: list of files + sha256 + sizes
       - provenance.json: meta + timestamps + tool versions (filled later)
+      - (optional) a "pack" event in ``event_log`` (see mt_fetcher.events)
 
     Atomicity: best-effort (write temp then replace) — implement later if needed.
     """
@@ -59,9 +75,23 @@ def pack(run_root: Path, files: Iterable[Path], meta: Dict[str, Any]) -> Evidenc
     manifest = {"files": [e.__dict__ for e in ef]}
     provenance = {"meta": meta}
 
-    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    manifest_text = json.dumps(manifest, indent=2, sort_keys=True)
+    manifest_path.write_text(manifest_text, encoding="utf-8")
     provenance_path.write_text(json.dumps(provenance, indent=2, sort_keys=True), encoding="utf-8")
 
+    if event_log is not None:
+        append_event(
+            event_log,
+            "pack",
+            run_id=str(meta.get("run_id", "")),
+            source_id=str(meta.get("source_id", "")),
+            counts={"files": len(ef), "bytes": sum(e.size_bytes for e in ef)},
+            hashes={
+                "manifest_sha256": hashlib.sha256(manifest_text.encode("utf-8")).hexdigest(),
+                "blobs_sha256": sorted({e.sha256 for e in ef}),
+            },
+        )
+
     return EvidencePack(
         run_root=run_root,
         manifest_path=manifest_path,
@@ -69,3 +99,237 @@ def pack(run_root: Path, files: Iterable[Path], meta: Dict[str, Any]) -> Evidenc
         files=ef,
         meta=meta,
     )
+
+
+# -- verify -----------------------------------------------------------------
+
+OK, MISSING, CHANGED = "ok", "missing", "changed"
+
+
+class RateLimiter:
+    """Token bucket shared by all hashing threads (bytes per second)."""
+
+    def __init__(self, bytes_per_sec: float, burst: float = CHUNK * 4):
+        self.rate = float(bytes_per_sec)
+        self.burst = max(float(burst), CHUNK)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= n
+            debt = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if debt:
+            time.sleep(debt)
+
+
+def iter_manifest(manifest_path: Path, chunk_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+    """Entries of manifest.json's "files" array, decoded one at a time (constant memory)."""
+    dec = json.JSONDecoder()
+    with Path(manifest_path).open("r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def more() -> bool:
+            nonlocal buf, pos, eof
+            data = f.read(chunk_size)
+            if not data:
+                eof = True
+                return False
+            buf = buf[pos:] + data
+            pos = 0
+            return True
+
+        while True:  # find the "files" array
+            i = buf.find('"files"', pos)
+            if i != -1:
+                j = buf.find("[", i)
+                if j != -1:
+                    pos = j + 1
+                    break
+            if not more():
+                return
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                if not more():
+                    return
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                ent, end = dec.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not more():
+                    raise
+                continue
+            pos = end
+            yield ent
+
+
+def _sampled(key: str, fraction: Optional[float], seed: str) -> bool:
+    if fraction is None or fraction >= 1.0:
+        return True
+    h = hashlib.sha256(f"{seed}:{key}".encode("utf-8")).digest()
+    return int.from_bytes(h[:8], "big") / 2.0**64 < fraction
+
+
+def _path_digest(path: str) -> bytes:
+    return hashlib.blake2b(os.path.abspath(path).encode("utf-8", "surrogateescape"), digest_size=8).digest()
+
+
+def _check(ent: Dict[str, Any], limiter: Optional[RateLimiter]) -> Tuple[str, int]:
+    p = Path(ent.get("path", ""))
+    try:
+        size = p.stat().st_size
+    except OSError:
+        return MISSING, 0
+    if size != ent.get("size_bytes"):
+        return CHANGED, 0  # no need to hash
+    try:
+        sha = sha256_file(p, limiter)
+    except FileNotFoundError:
+        return MISSING, 0
+    return (OK if sha == ent.get("sha256") else CHANGED), size
+
+
+@dataclass
+class VerifyReport:
+    manifest_sha256: str
+    checked: int = 0
+    ok: int = 0
+    skipped: int = 0  # not in the sample
+    resumed: int = 0  # taken from the checkpoint
+    bytes_hashed: int = 0
+    elapsed_s: float = 0.0
+    missing: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not (self.missing or self.changed or self.extra)
+
+
+class _Checkpoint:
+    """Append-only progress file: a header line, then one {"i", "status"} line per checked entry."""
+
+    def __init__(self, path: Path, header: Dict[str, Any], resume: bool):
+        self.path = Path(path)
+        self.done: Dict[int, str] = {}
+        if resume and self.path.is_file():
+            with self.path.open("r", encoding="utf-8") as f:
+                lines = iter(f)
+                try:
+                    same = json.loads(next(lines)) == header
+                except (StopIteration, ValueError):
+                    same = False
+                if same:
+                    for line in lines:
+                        try:
+                            d = json.loads(line)
+                            self.done[int(d["i"])] = d["status"]
+                        except (ValueError, KeyError):
+                            break  # torn last line
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("a" if self.done else "w", encoding="utf-8")
+        if not self.done:
+            self._f.write(json.dumps(header, sort_keys=True) + "\n")
+        self._last_flush = time.monotonic()
+
+    def record(self, i: int, status: str) -> None:
+        self._f.write(json.dumps({"i": i, "status": status}) + "\n")
+        if time.monotonic() - self._last_flush > 1.0:
+            self._f.flush()
+            self._last_flush = time.monotonic()
+
+    def close(self, completed: bool) -> None:
+        self._f.close()
+        if completed:
+            self.path.unlink(missing_ok=True)
+
+
+def verify(
+    manifest_path: Path,
+    raw_dir: Optional[Path] = None,
+    workers: int = 4,
+    max_bytes_per_sec: Optional[float] = None,
+    sample: Optional[float] = None,
+    seed: str = "",
+    checkpoint: Optional[Path] = None,
+    resume: bool = True,
+) -> VerifyReport:
+    """
+    Re-hash the files listed in ``manifest_path`` and compare.
+
+    - missing / changed: manifest paths that are gone, or differ in size or sha256
+    - extra: files under ``raw_dir`` the manifest does not list (only when given,
+      and only for full runs, since a sample cannot prove absence). This is the one
+      part that is not constant-memory: the manifest is in pack order, so each listed
+      path is remembered as an 8-byte digest (~70 bytes per entry in the set, about
+      70 MB per million files) and the directory walk is streamed against it.
+    - ``max_bytes_per_sec`` caps read bandwidth across all workers
+    - ``sample`` in (0, 1]: check a deterministic (by ``seed``) fraction of entries
+    - ``checkpoint``: progress file; a rerun with the same manifest/sample/seed
+      skips entries already checked, and the file is removed once complete
+
+    The manifest is never rewritten; re-run pack to accept changes.
+    """
+    manifest_path = Path(manifest_path)
+    t0 = time.monotonic()
+    report = VerifyReport(manifest_sha256=sha256_file(manifest_path))
+    limiter = RateLimiter(max_bytes_per_sec) if max_bytes_per_sec else None
+    header = {"manifest_sha256": report.manifest_sha256, "sample": sample, "seed": seed}
+    ckpt = _Checkpoint(checkpoint, header, resume) if checkpoint is not None else None
+    check_extra = raw_dir is not None and (sample is None or sample >= 1.0)
+    listed: Set[bytes] = set()
+
+    def settle(i: int, path: str, status: str, nbytes: int, record: bool = True) -> None:
+        report.checked += 1
+        report.bytes_hashed += nbytes
+        if status == OK:
+            report.ok += 1
+        else:
+            (report.missing if status == MISSING else report.changed).append(path)
+        if record and ckpt is not None:
+            ckpt.record(i, status)
+
+    completed = False
+    pending: Dict[Future, Tuple[int, str]] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(int(workers), 1), thread_name_prefix="mt-verify") as pool:
+            for i, ent in enumerate(iter_manifest(manifest_path)):
+                path = ent.get("path", "")
+                if check_extra:
+                    listed.add(_path_digest(path))
+                if not _sampled(path, sample, seed):
+                    report.skipped += 1
+                    continue
+                if ckpt is not None and i in ckpt.done:
+                    report.resumed += 1
+                    settle(i, path, ckpt.done[i], 0, record=False)
+                    continue
+                pending[pool.submit(_check, ent, limiter)] = (i, path)
+                if len(pending) >= workers * 4:  # bounded in-flight: memory stays flat
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        settle(*pending.pop(fut), *fut.result())
+            for fut in list(pending):
+                settle(*pending.pop(fut), *fut.result())
+        if check_extra:
+            for root, dirs, files in os.walk(raw_dir):
+                dirs.sort()
+                for name in sorted(files):
+                    p = os.path.join(root, name)
+                    if _path_digest(p) not in listed:
+                        report.extra.append(p)
+        completed = True
+    finally:
+        if ckpt is not None:
+            ckpt.close(completed)
+    report.elapsed_s = time.monotonic() - t0
+    return report
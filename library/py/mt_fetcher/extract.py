@@ -0,0 +1,362 @@
+"""
+mt_fetcher.extract — content sniffing + cheap metadata for normalize (v1)
+
+normalize only sees filenames, so hash-named / extensionless inbox files would
+all be application/octet-stream. This stage looks at the bytes instead:
+
+- sniff(): content type from magic bytes (first HEAD_BYTES of an mmap)
+- extractors (pluggable, keyed by content type): PDF page count, image
+  dimensions (PNG/GIF/JPEG/WEBP), text length (chars + lines)
+
+PDF pages are read from the end of the file: startxref -> xref table (following
+/Prev) -> trailer /Root -> catalog /Pages -> /Count, touching a few KB however
+large the file is. Only when that chain cannot be followed (cross-reference
+streams, damaged tables) are the first PDF_SCAN_LIMIT bytes scanned instead.
+
+Results are cached per blob under ``cache_dir`` (one small JSON each), keyed by
+``extract_key``: the sha256 plus the filename's type guess, since sniff() falls
+back to the name for bytes it cannot place. Each (blob, name type) pair is
+examined once across all runs. Misses run on a process pool.
+Output never contains paths or content, only types and numbers (privacy contract).
+
+Add an extractor with:
+
+    @register("application/x-foo")
+    def foo_meta(mm) -> dict: ...
+
+Extractors must be module-level functions (they run in worker processes) and
+should touch only the bytes they need; ``mm`` is a read-only mmap.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+import mimetypes
+import mmap
+import os
+import re
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+EXTRACT_VERSION = 3  # bump when sniffing/extractors change; old cache entries are ignored
+HEAD_BYTES = 4096
+PDF_TAIL = 64 * 1024  # where startxref and the trailer live
+PDF_OBJ_LIMIT = 1024 * 1024  # longest object read when following the trailer (e.g. a flat /Kids array)
+PDF_SCAN_LIMIT = 32 * 1024 * 1024  # bytes the fallback scan may read
+TEXT_CHUNK = 1024 * 1024
+POOL_MIN = 8  # fewer misses than this are examined in-process
+
+Extractor = Callable[[Any], Dict[str, Any]]
+EXTRACTORS: Dict[str, Extractor] = {}
+
+
+def register(*content_types: str) -> Callable[[Extractor], Extractor]:
+    def deco(fn: Extractor) -> Extractor:
+        for t in content_types:
+            EXTRACTORS[t] = fn
+        return fn
+
+    return deco
+
+
+# -- sniffing ---------------------------------------------------------------
+
+_MAGIC: List[Tuple[bytes, str]] = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"BZh", "application/x-bzip2"),
+    (b"\xfd7zXZ\x00", "application/x-xz"),
+    (b"\x28\xb5\x2f\xfd", "application/zstd"),
+    (b"SQLite format 3\x00", "application/vnd.sqlite3"),
+]
+
+
+def _looks_text(head: bytes) -> bool:
+    if not head or b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        return e.start >= len(head) - 3  # multi-byte char cut by the head boundary
+    return True
+
+
+def sniff(head: bytes, name: str = "") -> str:
+    """Content type from the first bytes; falls back to the filename, then octet-stream."""
+    for magic, ctype in _MAGIC:
+        if head.startswith(magic):
+            return ctype
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if _looks_text(head):
+        s = head.lstrip(b"\xef\xbb\xbf \t\r\n")[:64].lower()
+        if s.startswith((b"<!doctype html", b"<html")):
+            return "text/html"
+        if s.startswith(b"<?xml"):
+            return "application/xml"
+        if s[:1] in (b"{", b"["):
+            return "application/json"
+        guessed = mimetypes.guess_type(name)[0] if name else None
+        return guessed if guessed and (guessed.startswith("text/") or guessed.endswith(("json", "xml"))) else "text/plain"
+    guessed = mimetypes.guess_type(name)[0] if name else None
+    return guessed or "application/octet-stream"
+
+
+# -- extractors -------------------------------------------------------------
+
+_PDF_COUNT = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b", re.S)
+_PDF_PAGE = re.compile(rb"/Type\s*/Page\b(?!s)")
+_PDF_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_PDF_SUBSECTION = re.compile(rb"[ \t\r\n]*(\d+) (\d+)[ \t]*\r?\n")
+_PDF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_PDF_PREV = re.compile(rb"/Prev\s+(\d+)")
+_PDF_ROOT = re.compile(rb"/Root\s+(\d+)\s+\d+\s+R")
+_PDF_PAGES_REF = re.compile(rb"/Pages\s+(\d+)\s+\d+\s+R")
+_PDF_COUNT_KEY = re.compile(rb"/Count\s+(\d+)")
+
+
+def _pdf_xref_sections(mm) -> Iterable[Tuple[int, int]]:
+    """(table start, trailer offset) per classic xref section, newest first (startxref, then /Prev)."""
+    tail_from = max(len(mm) - PDF_TAIL, 0)
+    last = None
+    for last in _PDF_STARTXREF.finditer(mm, tail_from):
+        pass
+    off = int(last.group(1)) if last else None
+    seen = set()
+    while off is not None and off not in seen and len(seen) < 64:
+        seen.add(off)
+        if mm[off : off + 4] != b"xref":
+            return  # cross-reference stream (PDF 1.5+): not parsed here
+        trailer = mm.find(b"trailer", off, off + PDF_OBJ_LIMIT)
+        if trailer < 0:
+            return
+        yield off + 4, trailer
+        prev = _PDF_PREV.search(mm, trailer, min(trailer + PDF_OBJ_LIMIT, len(mm)))
+        off = int(prev.group(1)) if prev else None
+
+
+def _pdf_object(mm, sections: List[Tuple[int, int]], num: int) -> Optional[bytes]:
+    """Body of object ``num`` via the xref tables (newest section that lists it)."""
+    for pos, end in sections:
+        while pos < end:
+            sub = _PDF_SUBSECTION.match(mm, pos, end)
+            if sub is None:
+                break
+            first, count = int(sub.group(1)), int(sub.group(2))
+            pos = sub.end()
+            if first <= num < first + count:
+                entry = _PDF_ENTRY.match(mm, pos + 20 * (num - first))
+                if entry is None or entry.group(3) != b"n":
+                    return None  # odd entry width or a freed object: let the caller fall back
+                start = int(entry.group(1))
+                stop = mm.find(b"endobj", start, start + PDF_OBJ_LIMIT)
+                return mm[start:stop] if stop > 0 else None
+            pos += 20 * count
+    return None
+
+
+def _pdf_pages_from_trailer(mm) -> Optional[int]:
+    sections = list(_pdf_xref_sections(mm))
+    for _, trailer in sections:
+        root = _PDF_ROOT.search(mm, trailer, min(trailer + PDF_OBJ_LIMIT, len(mm)))
+        if root is None:
+            continue
+        catalog = _pdf_object(mm, sections, int(root.group(1)))
+        pages_ref = _PDF_PAGES_REF.search(catalog) if catalog else None
+        pages = _pdf_object(mm, sections, int(pages_ref.group(1))) if pages_ref else None
+        count = _PDF_COUNT_KEY.search(pages) if pages else None
+        return int(count.group(1)) if count else None
+    return None
+
+
+@register("application/pdf")
+def pdf_meta(mm) -> Dict[str, Any]:
+    pages = _pdf_pages_from_trailer(mm)
+    if pages is not None:
+        return {"pages": pages}
+    # Fallback, bounded to the first PDF_SCAN_LIMIT bytes: the page tree root carries the
+    # total, so take the largest /Count of any /Pages node.
+    end = min(len(mm), PDF_SCAN_LIMIT)
+    counts = [int(a or b) for a, b in _PDF_COUNT.findall(mm, 0, end)]
+    if counts:
+        return {"pages": max(counts)}
+    return {"pages": len(_PDF_PAGE.findall(mm, 0, end))}  # compressed object streams hide /Count; approximate
+
+
+@register("image/png")
+def png_meta(mm) -> Dict[str, Any]:
+    if mm[12:16] != b"IHDR":
+        return {}
+    w, h = struct.unpack(">II", mm[16:24])
+    return {"width": w, "height": h}
+
+
+@register("image/gif")
+def gif_meta(mm) -> Dict[str, Any]:
+    w, h = struct.unpack("<HH", mm[6:10])
+    return {"width": w, "height": h}
+
+
+@register("image/jpeg")
+def jpeg_meta(mm) -> Dict[str, Any]:
+    i, n = 2, len(mm)
+    while i + 9 < n:
+        if mm[i] != 0xFF:
+            i += 1
+            continue
+        marker = mm[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            i += 1 if marker == 0xFF else 2
+            continue
+        (seg_len,) = struct.unpack(">H", mm[i + 2 : i + 4])
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack(">HH", mm[i + 5 : i + 9])
+            return {"width": w, "height": h}
+        i += 2 + seg_len
+    return {}
+
+
+@register("image/webp")
+def webp_meta(mm) -> Dict[str, Any]:
+    chunk = mm[12:16]
+    if chunk == b"VP8X":
+        w = 1 + int.from_bytes(mm[24:27], "little")
+        h = 1 + int.from_bytes(mm[27:30], "little")
+    elif chunk == b"VP8L":
+        bits = int.from_bytes(mm[21:25], "little")
+        w, h = (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    elif chunk == b"VP8 ":
+        w, h = (v & 0x3FFF for v in struct.unpack("<HH", mm[26:30]))
+    else:
+        return {}
+    return {"width": w, "height": h}
+
+
+@register("text/plain", "text/html", "text/csv", "text/markdown", "application/json", "application/xml")
+def text_meta(mm) -> Dict[str, Any]:
+    dec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    size = len(mm)
+    chars = lines = 0
+    for off in range(0, size, TEXT_CHUNK):
+        chunk = mm[off : off + TEXT_CHUNK]
+        lines += chunk.count(b"\n")
+        chars += len(dec.decode(chunk))
+    chars += len(dec.decode(b"", final=True))
+    if size and mm[size - 1] != 0x0A:
+        lines += 1
+    return {"text_chars": chars, "text_lines": lines}
+
+
+# -- examine + cache --------------------------------------------------------
+
+
+def examine(path: str, name: str = "") -> Dict[str, Any]:
+    """{"content_type": ..., "meta": {...}} for one file. Runs in worker processes."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return {"content_type": sniff(b"", name), "meta": {}}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ctype = sniff(mm[:HEAD_BYTES], name)
+            fn = EXTRACTORS.get(ctype)
+            meta: Dict[str, Any] = {}
+            if fn is not None:
+                try:
+                    meta = fn(mm)
+                except Exception as e:  # malformed file: type is still useful
+                    meta = {"error": type(e).__name__}
+    return {"content_type": ctype, "meta": meta}
+
+
+def _examine_task(args: Tuple[str, str]) -> Dict[str, Any]:
+    return examine(*args)
+
+
+def extract_key(sha: str, name: str = "") -> str:
+    """Result/cache key: the sha256, plus the filename's type guess that sniff() may fall back to."""
+    hint = mimetypes.guess_type(name)[0] if name else None
+    return f"{sha}~{hint.replace('/', '_')}" if hint else sha
+
+
+class ExtractCache:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            d = json.loads(self.path_for(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return d.get("result") if d.get("version") == EXTRACT_VERSION else None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        p = self.path_for(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": EXTRACT_VERSION, "result": result}, sort_keys=True), encoding="utf-8")
+        tmp.replace(p)
+
+
+def extract_many(
+    entries: Iterable[Dict[str, Any]],
+    cache_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    {extract_key(sha256, file name): {"content_type", "meta"}} for manifest entries (path, sha256).
+
+    Cached blobs are not opened; unreadable files are left out (callers keep
+    their filename guess).
+    """
+    cache = ExtractCache(cache_dir) if cache_dir is not None else None
+    out: Dict[str, Dict[str, Any]] = {}
+    todo: Dict[str, Tuple[str, str]] = {}
+    for ent in entries:
+        sha, path = ent.get("sha256", ""), ent.get("path", "")
+        if not sha:
+            continue
+        key = extract_key(sha, os.path.basename(path))
+        if key in out or key in todo:
+            continue
+        hit = cache.get(key) if cache is not None else None
+        if hit is not None:
+            out[key] = hit
+        elif path and os.path.isfile(path):
+            todo[key] = (path, os.path.basename(path))
+
+    if not todo:
+        return out
+    keys = list(todo)
+    if len(todo) < POOL_MIN or workers == 1:
+        results = []
+        for key in keys:
+            try:
+                results.append(_examine_task(todo[key]))
+            except OSError:
+                results.append(None)
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futs = [pool.submit(_examine_task, todo[key]) for key in keys]
+            for fut in futs:
+                try:
+                    results.append(fut.result())
+                except OSError:
+                    results.append(None)
+    for key, res in zip(keys, results):
+        if res is None:
+            continue
+        out[key] = res
+        if cache is not None:
+            cache.put(key, res)
+    return out
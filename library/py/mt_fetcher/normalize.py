@@ -5,19 +5,29 @@ Defaults:
 - emits NO raw file paths
 - title defaults to artifact:<sha_prefix>
 - optional include_names exposes filenames (still no full paths)
+- optional columnar=True also writes items.mtc (see mt_fetcher.columnar)
+- optional extract=True sniffs content_type from the bytes and adds
+  content_meta (page count, image size, text length; see mt_fetcher.extract)
+- optional event_log gets a "normalize" event (see mt_fetcher.events)
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import mimetypes
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .columnar import ColumnarWriter
+from .events import append_event
+from .extract import extract_key, extract_many
+
 @dataclass(frozen=True)
 class NormalizeResult:
     items_path: Path
     count: int
+    columnar_path: Optional[Path] = None
 
 def _guess_content_type(p: str) -> str:
     t, _ = mimetypes.guess_type(p)
@@ -32,6 +42,11 @@ def normalize_run(
     out_dir: Path,
     include_names: bool = False,
     extra_meta: Optional[Dict[str, Any]] = None,
+    columnar: bool = False,
+    extract: bool = False,
+    extract_cache: Optional[Path] = None,
+    workers: Optional[int] = None,
+    event_log: Optional[Path] = None,
 ) -> NormalizeResult:
     raw_dir = Path(raw_dir)
     out_dir = Path(out_dir)
@@ -50,9 +65,12 @@ def normalize_run(
 
     m = json.loads(Path(evidence_manifest).read_text(encoding="utf-8"))
     files = m.get("files", [])
+    sniffed = extract_many(files, cache_dir=extract_cache, workers=workers) if extract else {}
 
     items_path = out_dir / "items.jsonl"
     count = 0
+    items_hash = hashlib.sha256()
+    col = ColumnarWriter(out_dir / "items.mtc") if columnar else None
 
     meta: Dict[str, Any] = {
         "run_id": run_id,
@@ -69,6 +87,9 @@ def normalize_run(
             size = ent.get("size_bytes", 0)
             raw_path = ent.get("path", "")
             ctype = _guess_content_type(raw_path)
+            found = sniffed.get(extract_key(sha, Path(raw_path).name))
+            if found is not None:
+                ctype = found["content_type"]
 
             title = f"artifact:{sha[:12]}" if sha else "artifact:unknown"
             if include_names and raw_path:
@@ -86,11 +107,22 @@ def normalize_run(
                 "size_bytes": size,
                 "tags": tags,
             }
-            f.write(json.dumps(item, sort_keys=True) + "\n")
+            if extract:
+                item["content_meta"] = found["meta"] if found is not None else {}
+            line = json.dumps(item, sort_keys=True) + "\n"
+            f.write(line)
+            items_hash.update(line.encode("utf-8"))
+            if col is not None:
+                col.add(item)
             count += 1
 
-    (out_dir / "normalize.meta.json").write_text(
-        json.dumps({"meta": meta, "count": count}, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
-    return NormalizeResult(items_path=items_path, count=count)
+    columnar_path = col.close() if col is not None else None
+
+    summary: Dict[str, Any] = {"meta": meta, "count": count}
+    if columnar:  # without items.mtc the file stays byte-identical to earlier versions
+        summary["formats"] = ["jsonl", "mtc"]
+    (out_dir / "normalize.meta.json").write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
+    if event_log is not None:
+        hashes = {"manifest_sha256": hashlib.sha256(Path(evidence_manifest).read_bytes()).hexdigest(), "items_sha256": items_hash.hexdigest()}
+        append_event(event_log, "normalize", run_id=run_id, source_id=source_id, counts={"items": count}, hashes=hashes)
+    return NormalizeResult(items_path=items_path, count=count, columnar_path=columnar_path)
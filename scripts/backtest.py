@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""scripts/backtest.py
+
+Replays thesis-health signals (RS_50D, CREDIT_DIVERGENCE, aggregate) over the
+full history held in the local price store and writes:
+  - backtest_status.csv   per-day status matrix (one column per symbol + CREDIT + THESIS)
+  - backtest_flips.csv    flip counts / status shares per series
+  - backtest_sweep.csv    (with --sweep-windows/--sweep-bands) one row per parameter combo
+  - backtest_cube.npz     (with --cube) per-symbol window x band cube (utils.sweep.SweepCube)
+
+USAGE
+  python scripts/backtest.py --refresh
+  python scripts/backtest.py --sweep-windows 20,30,50,100 --sweep-bands 0.0001,0.0002,0.0005
+
+OPTIONS
+  --refresh               Fetch full history for all symbols into the store first
+  --store <dir>           Price store root (default: var/dashboard/prices)
+  --out-dir <dir>         Output directory (default: var/dashboard/backtest)
+  --workers <n>           Processes for the sweep (default: CPU count)
+  --cube                  Also write the per-symbol RS_SMA sweep cube for the sweep grid
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DASHBOARD_DIR = REPO_ROOT / "dashboard"
+if str(DASHBOARD_DIR) not in sys.path:
+    sys.path.insert(0, str(DASHBOARD_DIR))
+
+from adapters.price_store import PriceStore  # noqa: E402
+from utils.backtest import load_price_matrix, rs_matrix, run_backtest, sweep  # noqa: E402
+from utils.sweep import sweep_cube  # noqa: E402
+
+DEFAULT_ROTATION = ["XLB", "XLI", "XLU", "XLP", "XLY", "IWM", "KRE"]
+
+
+def _csv_list(raw: str, cast=str) -> list:
+    return [cast(x.strip()) for x in raw.split(",") if x.strip()]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", default=",".join(DEFAULT_ROTATION), help="Rotation symbols (comma-separated)")
+    ap.add_argument("--benchmark", default="SPY")
+    ap.add_argument("--hyg", default="HYG")
+    ap.add_argument("--lqd", default="LQD")
+    ap.add_argument("--window", type=int, default=50)
+    ap.add_argument("--yellow-band", type=float, default=0.0002)
+    ap.add_argument("--credit-window", type=int, default=50, help="SMA length of the HYG/LQD proxy whose slope is the credit trend")
+    ap.add_argument("--credit-sustained", type=int, default=5, help="Consecutive falling-trend sessions that turn credit RED")
+    ap.add_argument("--sweep-windows", default="", help="Comma-separated SMA windows to sweep")
+    ap.add_argument("--sweep-bands", default="", help="Comma-separated yellow bands to sweep")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--cube", action="store_true", help="Write the per-symbol window x band sweep cube")
+    ap.add_argument("--store", default=None, help="Price store root (default: var/dashboard/prices)")
+    ap.add_argument("--out-dir", default=str(REPO_ROOT / "var" / "dashboard" / "backtest"))
+    ap.add_argument("--refresh", action="store_true", help="Fetch full history into the store before running")
+    args = ap.parse_args()
+
+    symbols = _csv_list(args.symbols)
+    store = PriceStore(Path(args.store) if args.store else None)
+    needed = [args.benchmark, *symbols, args.hyg, args.lqd]
+
+    if args.refresh:
+        for sym, res in store.refresh(needed, period="max").items():
+            print(f"[{'OK' if res == 'OK' else 'WARN'}] refresh {sym}: {res}")
+
+    try:
+        prices = load_price_matrix(store, needed, calendar_symbol=args.benchmark)
+    except FileNotFoundError as e:
+        print(f"[FAIL] {e}")
+        return 2
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    result = run_backtest(
+        prices,
+        symbols,
+        bench=args.benchmark,
+        hyg=args.hyg,
+        lqd=args.lqd,
+        window=args.window,
+        yellow_band=args.yellow_band,
+        credit_window=args.credit_window,
+        credit_sustained=args.credit_sustained,
+    )
+    result.status_frame().to_csv(out_dir / "backtest_status.csv")
+    flips = result.flip_stats()
+    flips.to_csv(out_dir / "backtest_flips.csv")
+    print(f"[OK] Backtest {len(prices.dates)} sessions x {len(symbols)} symbols in {time.perf_counter() - t0:.3f}s")
+    print(flips.to_string(float_format=lambda v: f"{v:.3f}"))
+
+    windows = _csv_list(args.sweep_windows, int) or [args.window]
+    bands = _csv_list(args.sweep_bands, float) or [args.yellow_band]
+    if args.sweep_windows or args.sweep_bands:
+        t0 = time.perf_counter()
+        grid = sweep(
+            prices,
+            symbols,
+            windows,
+            bands,
+            bench=args.benchmark,
+            hyg=args.hyg,
+            lqd=args.lqd,
+            credit_window=args.credit_window,
+            credit_sustained=args.credit_sustained,
+            workers=args.workers,
+        )
+        grid.to_csv(out_dir / "backtest_sweep.csv", index=False)
+        print(f"[OK] Sweep {len(windows)} windows x {len(bands)} bands in {time.perf_counter() - t0:.3f}s")
+
+    if args.cube:
+        t0 = time.perf_counter()
+        closes = prices.closes[:, [prices.symbols.index(s) for s in symbols]]
+        cube = sweep_cube(rs_matrix(closes, prices.column(args.benchmark)), windows, bands, symbols)
+        cube.save(out_dir / "backtest_cube.npz")
+        print(f"[OK] Cube {len(windows)} windows x {len(bands)} bands x {len(symbols)} symbols in {time.perf_counter() - t0:.3f}s")
+
+    print(f"Wrote: {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
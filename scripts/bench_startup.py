@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""scripts/bench_startup.py
+
+Benchmarks dashboard startup costs without launching Streamlit.
+
+1. Cold import: for each module, the median wall time of a fresh interpreter that
+   imports it, plus the cumulative self-reported time from ``python -X importtime``.
+   yfinance is listed separately: it is the cost deferred from app start to the
+   first real fetch.
+2. Rerun path: what app.py does per Streamlit rerun to get manifest + spec, comparing
+   a full re-read/re-parse (previous behavior) with the mtime/hash-keyed spec index.
+
+USAGE
+  python scripts/bench_startup.py
+  python scripts/bench_startup.py --runs 10 --reruns 500
+
+OPTIONS
+  --runs <n>              Fresh interpreters per module (default: 5)
+  --reruns <n>            Simulated reruns for the spec/manifest path (default: 200)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DASHBOARD_DIR = REPO_ROOT / "dashboard"
+if str(DASHBOARD_DIR) not in sys.path:
+    sys.path.insert(0, str(DASHBOARD_DIR))
+
+MODULES = [
+    "adapters.market_data",
+    "adapters.price_store",
+    "adapters.dividend_data",
+    "utils.portfolio",
+    "utils.spec_index",
+    "utils.indicators",
+    "utils.alignment",
+    "yfinance",
+    "streamlit",
+]
+
+
+def _import_cmd(module: str) -> list:
+    return [sys.executable, "-c", f"import sys; sys.path.insert(0, {str(DASHBOARD_DIR)!r}); import {module}"]
+
+
+def cold_import(module: str, runs: int):
+    """(median wall seconds, importtime cumulative seconds) or None if the module is not installed."""
+    walls = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        res = subprocess.run(_import_cmd(module), capture_output=True, text=True)
+        walls.append(time.perf_counter() - t0)
+        if res.returncode != 0:
+            return None
+    res = subprocess.run([sys.executable, "-X", "importtime", *_import_cmd(module)[1:]], capture_output=True, text=True)
+    cumulative = 0
+    for line in res.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", line)
+        if m and m.group(2) == module:
+            cumulative = int(m.group(1))
+    return statistics.median(walls), cumulative / 1e6
+
+
+def rerun_path(reruns: int):
+    from utils import spec_index
+
+    def reparse():
+        manifest = json.loads((REPO_ROOT / "manifest_latest.json").read_text(encoding="utf-8"))
+        spec_rel = manifest.get("latest", {}).get("dashboard_spec", "")
+        return json.loads((REPO_ROOT / spec_rel).read_text(encoding="utf-8"))
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        for _ in range(reruns):
+            fn()
+        return (time.perf_counter() - t0) / reruns
+
+    t_reparse = timed(reparse)
+    t0 = time.perf_counter()
+    spec_index.load_spec_index(REPO_ROOT)
+    t_cold = time.perf_counter() - t0
+    t_warm = timed(lambda: spec_index.load_spec_index(REPO_ROOT))
+    return t_reparse, t_cold, t_warm
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--reruns", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"Cold import (median of {args.runs} fresh interpreters; importtime cumulative):")
+    for module in MODULES:
+        result = cold_import(module, args.runs)
+        if result is None:
+            print(f"  [WARN] {module:<24} not importable here; skipped")
+            continue
+        wall, cumulative = result
+        print(f"  {module:<24} wall {wall * 1000:8.1f} ms   import {cumulative * 1000:8.1f} ms")
+
+    t_reparse, t_cold, t_warm = rerun_path(args.reruns)
+    print(f"\nPer-rerun manifest + spec load (mean of {args.reruns}):")
+    print(f"  re-read + re-parse     {t_reparse * 1e6:8.1f} us")
+    print(f"  spec index (first)     {t_cold * 1e6:8.1f} us")
+    print(f"  spec index (cached)    {t_warm * 1e6:8.1f} us   ({t_reparse / t_warm:.0f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""scripts/check_integrity.py
+
+Single-pass repository integrity check for versioned artifacts and manifests.
+
+1. Index: sha256 of every versioned artifact (v*-HR_*.md, v*-JSON_*.json,
+   v*-AGENT_*.json, v*-DATA_*.md, DASHBOARD_SPEC*.json, manifest*.json and any file
+   a manifest references), hashed in parallel. The index is cached by
+   (mtime_ns, size), so unchanged files are never re-read.
+2. Manifests: every `latest.*` and `artifacts[].filename` resolves; `version` matches
+   the filename; a frozen artifact's recorded `sha256` (if present) matches the index.
+   Only frozen artifacts (HR theses, DATA patches) are pinned: JSON/AGENT are
+   regenerated from HR and the governance doc evolves, so a pin on those would fail
+   every regen or rules edit. Pins on other types are reported and ignored.
+3. Rules (THESIS_VERSIONING_AND_INTEGRITY_RULES.md):
+   - filenames follow vX.Y-HR_/JSON_/AGENT_YYYYMMDD and vX.Y.Z-DATA_YYYYMMDD
+   - JSON/AGENT meta.version equals the filename stem
+   - JSON/AGENT meta.source_of_truth names an existing HR of the same version and date
+   - manifest_latest.json declares a DATA patch
+
+USAGE
+  python3 scripts/check_integrity.py
+  python3 scripts/check_integrity.py --record manifest_20260118_v17.json
+
+OPTIONS
+  --repo-root <dir>       Repo root (default: parent of scripts/)
+  --cache <file>          Index cache (default: var/integrity/index.json)
+  --workers <n>           Hashing threads (default: 8)
+  --record <manifest>     Pin current sha256 values of that manifest's frozen artifacts
+  --json                  Print the index as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE = REPO_ROOT / "var" / "integrity" / "index.json"
+
+ARTIFACT_GLOBS = (
+    "v*-HR_*.md",
+    "v*-JSON_*.json",
+    "v*-AGENT_*.json",
+    "v*-DATA_*.md",
+    "DASHBOARD_SPEC*.json",
+    "manifest*.json",
+)
+
+NAME_RULES = {
+    "HR": re.compile(r"^v\d+\.\d+-HR_\d{8}\.md$"),
+    "JSON": re.compile(r"^v\d+\.\d+-JSON_\d{8}\.json$"),
+    "AGENT": re.compile(r"^v\d+\.\d+-AGENT_\d{8}\.json$"),
+    "DATA": re.compile(r"^v\d+\.\d+\.\d+-DATA_\d{8}\.md$"),
+}
+
+# Artifact types that are immutable once published (see "Freeze Rules").
+FROZEN_TYPES = {"hr", "data_patch"}
+
+_CHUNK = 1 << 20
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class IntegrityIndex:
+    """{relpath: sha256} for the repo's artifacts, reusing cached hashes when (mtime_ns, size) is unchanged."""
+
+    def __init__(self, repo_root: Path, cache_path: Optional[Path] = DEFAULT_CACHE, workers: int = 8):
+        self.repo_root = repo_root
+        self.cache_path = cache_path
+        self.workers = workers
+        self.hashes: Dict[str, str] = {}
+        self.rehashed = 0
+
+    def _load_cache(self) -> Dict[str, list]:
+        if self.cache_path is None:
+            return {}
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, entries: Dict[str, list]) -> None:
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(entries, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.cache_path)
+
+    def build(self, extra: List[str] = ()) -> "IntegrityIndex":
+        rels = set(extra)
+        for pattern in ARTIFACT_GLOBS:
+            rels.update(p.name for p in self.repo_root.glob(pattern))
+
+        cached = self._load_cache()
+        entries: Dict[str, list] = {}
+        todo: List[Tuple[str, int, int]] = []
+        for rel in sorted(rels):
+            try:
+                st = (self.repo_root / rel).stat()
+            except OSError:
+                continue
+            hit = cached.get(rel)
+            if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                entries[rel] = hit
+            else:
+                todo.append((rel, st.st_mtime_ns, st.st_size))
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+                digests = pool.map(lambda t: sha256_file(self.repo_root / t[0]), todo)
+                for (rel, mtime, size), digest in zip(todo, digests):
+                    entries[rel] = [mtime, size, digest]
+        self.rehashed = len(todo)
+
+        if todo or set(entries) != set(cached):
+            self._save_cache(entries)
+        self.hashes = {rel: e[2] for rel, e in entries.items()}
+        return self
+
+
+def _resolve(repo_root: Path, ref: str) -> Optional[str]:
+    """Manifest refs are filenames or extensionless versions ("v1.7-HR_20260118")."""
+    for cand in (ref, f"{ref}.md", f"{ref}.json"):
+        if (repo_root / cand).is_file():
+            return cand
+    return None
+
+
+def _load(repo_root: Path, rel: str) -> Optional[dict]:
+    try:
+        return json.loads((repo_root / rel).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def manifest_refs(repo_root: Path) -> Dict[str, dict]:
+    manifests = {p.name: _load(repo_root, p.name) for p in sorted(repo_root.glob("manifest*.json"))}
+    return {name: m for name, m in manifests.items() if isinstance(m, dict)}
+
+
+def referenced_files(repo_root: Path, manifests: Dict[str, dict]) -> List[str]:
+    """Resolved paths of everything the manifests point at (latest.* and artifacts[].filename)."""
+    refs: List[str] = []
+    for m in manifests.values():
+        refs += [a.get("filename", "") for a in m.get("artifacts", []) or []]
+        refs += [v for v in (m.get("latest") or {}).values() if isinstance(v, str)]
+    return [r for r in (_resolve(repo_root, ref) for ref in refs if ref) if r]
+
+
+def check_manifests(repo_root: Path, manifests: Dict[str, dict], index: IntegrityIndex) -> Tuple[List[str], List[str]]:
+    errors: List[str] = []
+    warnings: List[str] = []
+    for name, m in manifests.items():
+        for key, ref in (m.get("latest") or {}).items():
+            if ref and _resolve(repo_root, ref) is None:
+                errors.append(f"{name}: latest.{key} does not resolve: {ref}")
+        for art in m.get("artifacts", []) or []:
+            fn = art.get("filename", "")
+            rel = _resolve(repo_root, fn)
+            if rel is None:
+                errors.append(f"{name}: artifact does not resolve: {fn}")
+                continue
+            recorded = art.get("sha256")
+            if recorded and art.get("type") not in FROZEN_TYPES:
+                warnings.append(f"{name}: sha256 on non-frozen {art.get('type')} artifact {fn} ignored")
+            elif recorded and index.hashes.get(rel) != recorded:
+                errors.append(f"{name}: sha256 mismatch for {fn} (recorded {recorded[:12]}, found {index.hashes.get(rel, '')[:12]})")
+            version = art.get("version")
+            if version and version != "N/A" and Path(rel).stem != version:
+                errors.append(f"{name}: version {version} does not match filename {fn}")
+    return errors, warnings
+
+
+def check_rules(repo_root: Path, index: IntegrityIndex, manifests: Dict[str, dict]) -> Tuple[List[str], List[str]]:
+    errors: List[str] = []
+    warnings: List[str] = []
+    for rel in sorted(index.hashes):
+        kind = next((k for k in NAME_RULES if f"-{k}_" in rel), None)
+        if kind and not NAME_RULES[kind].match(rel):
+            errors.append(f"{rel}: filename does not follow the {kind} versioning format")
+        if kind not in ("JSON", "AGENT"):
+            continue
+        meta = (_load(repo_root, rel) or {}).get("meta", {})
+        stem = Path(rel).stem
+        if meta.get("version") != stem:
+            errors.append(f"{rel}: meta.version {meta.get('version')!r} != {stem!r}")
+        source = meta.get("source_of_truth", "")
+        expected_hr = stem.replace(f"-{kind}_", "-HR_")
+        if source != expected_hr:
+            errors.append(f"{rel}: meta.source_of_truth {source!r} != {expected_hr!r}")
+        elif _resolve(repo_root, source) is None:
+            errors.append(f"{rel}: source HR {source} not found")
+
+    latest = (manifests.get("manifest_latest.json") or {}).get("latest", {})
+    if latest and not latest.get("data_patch_latest"):
+        warnings.append("manifest_latest.json: no DATA patch declared (latest.data_patch_latest)")
+    return errors, warnings
+
+
+def record(repo_root: Path, manifest_name: str, index: IntegrityIndex) -> int:
+    path = repo_root / manifest_name
+    m = json.loads(path.read_text(encoding="utf-8"))
+    n = 0
+    for art in m.get("artifacts", []) or []:
+        if art.get("type") not in FROZEN_TYPES:
+            art.pop("sha256", None)
+            continue
+        digest = index.hashes.get(_resolve(repo_root, art.get("filename", "")) or "")
+        if digest:
+            art["sha256"] = digest
+            n += 1
+    trailing = "\n" if path.read_text(encoding="utf-8").endswith("\n") else ""
+    path.write_text(json.dumps(m, indent=2, ensure_ascii=False) + trailing, encoding="utf-8")
+    return n
+
+
+def check_integrity(repo_root: Path, cache_path: Optional[Path] = DEFAULT_CACHE, workers: int = 8) -> int:
+    manifests = manifest_refs(repo_root)
+    index = IntegrityIndex(repo_root, cache_path, workers).build(referenced_files(repo_root, manifests))
+
+    errors, warnings = check_manifests(repo_root, manifests, index)
+    rule_errors, rule_warnings = check_rules(repo_root, index, manifests)
+    errors += rule_errors
+    warnings += rule_warnings
+
+    for w in warnings:
+        print(f"[WARN] {w}")
+    if errors:
+        print("[FAIL] Integrity check failed:")
+        for e in errors:
+            print(f"  - {e}")
+        return 1
+    print(f"[OK] Integrity valid: {len(index.hashes)} artifacts ({index.rehashed} rehashed), {len(manifests)} manifests")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repo-root", default=str(REPO_ROOT))
+    ap.add_argument("--cache", default=str(DEFAULT_CACHE), help="Index cache (default: var/integrity/index.json)")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--record", default=None, help="Pin current sha256 values of this manifest's frozen artifacts")
+    ap.add_argument("--json", action="store_true", help="Print the index as JSON")
+    args = ap.parse_args()
+
+    repo_root = Path(args.repo_root).resolve()
+    cache_path = Path(args.cache)
+
+    if args.record:
+        index = IntegrityIndex(repo_root, cache_path, args.workers).build(referenced_files(repo_root, manifest_refs(repo_root)))
+        print(f"[OK] Recorded {record(repo_root, args.record, index)} frozen-artifact sha256 values in {args.record}")
+        return 0
+
+    if args.json:
+        index = IntegrityIndex(repo_root, cache_path, args.workers).build()
+        print(json.dumps(index.hashes, indent=2, sort_keys=True))
+        return 0
+
+    return check_integrity(repo_root, cache_path, args.workers)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
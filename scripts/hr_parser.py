@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""scripts/hr_parser.py
+
+Section-level, incremental parser for HR thesis markdown (v*-HR_*.md).
+
+The HR file is streamed line by line and split at every heading into sections.
+Each section is hashed (sha256 of its exact text) and its parsed structure is
+cached by that hash, so parsing a new thesis version only re-parses the sections
+that actually changed; untouched sections are reused from the cache.
+
+Parsed section structure (``blocks``), in document order:
+  {"type": "fields",    "fields": {"Version": "v1.7-HR_20260118", ...}}   **Key:** value lines
+  {"type": "table",     "columns": [...], "rows": [{col: cell}, ...]}
+  {"type": "list",      "ordered": bool, "items": [...]}
+  {"type": "rule",      "action": "Trim", "target": "CAT", "condition": "RS breaks or ISM <48"}
+  {"type": "paragraph", "text": "..."}
+
+USAGE
+  python scripts/hr_parser.py v1.7-HR_20260118.md
+  python scripts/hr_parser.py v1.7-HR_20260118.md --diff v1.6-HR_20260118.md
+
+OPTIONS
+  --cache-dir <dir>       Parse cache directory (default: var/regen/sections)
+  --diff <hr_file>        Report which sections changed relative to another HR version
+  --json                  Print the parsed section tree as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = REPO_ROOT / "var" / "regen" / "sections"
+
+# Part of every cache key: bump when parse_section() output changes for the same text.
+PARSER_VERSION = "1"
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FIELD = re.compile(r"^\*\*([^*]+?):\*\*\s*(.*?)\s*$")
+_BULLET = re.compile(r"^\s*[-*+]\s+(.*?)\s*$")
+_NUMBERED = re.compile(r"^\s*\d+[.)]\s+(.*?)\s*$")
+_TABLE_SEP = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$")
+_RULE = re.compile(r"^(Trim|Reduce|Add|Exit|Buy|Sell|Increase|Rotate)\s+(.+?)\s+if\s+(.+)$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Section:
+    level: int  # heading level; 0 for text before the first heading
+    title: str
+    line: int  # 1-based line of the heading
+    text: str
+    sha256: str
+
+
+@dataclass
+class ParsedSection:
+    section: Section
+    blocks: List[dict]
+    reused: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "level": self.section.level,
+            "title": self.section.title,
+            "sha256": self.section.sha256,
+            "blocks": self.blocks,
+        }
+
+
+@dataclass
+class ParsedHR:
+    path: Path
+    sections: List[ParsedSection] = field(default_factory=list)
+
+    @property
+    def reused(self) -> int:
+        return sum(1 for s in self.sections if s.reused)
+
+    @property
+    def parsed(self) -> int:
+        return len(self.sections) - self.reused
+
+    def hashes(self) -> List[str]:
+        return [s.section.sha256 for s in self.sections]
+
+    def find(self, title_prefix: str) -> Optional[ParsedSection]:
+        """First section whose title starts with ``title_prefix`` (case-insensitive)."""
+        prefix = title_prefix.lower()
+        return next((s for s in self.sections if s.section.title.lower().startswith(prefix)), None)
+
+    def tree(self) -> List[dict]:
+        """Sections nested by heading level."""
+        root: List[dict] = []
+        stack: List[Tuple[int, List[dict]]] = [(-1, root)]
+        for ps in self.sections:
+            node = {**ps.to_dict(), "children": []}
+            while stack[-1][0] >= ps.section.level:
+                stack.pop()
+            stack[-1][1].append(node)
+            if ps.section.level:  # the preamble is a sibling of the top-level headings, not their parent
+                stack.append((ps.section.level, node["children"]))
+        return root
+
+
+def iter_sections(lines: Iterable[str]) -> Iterator[Section]:
+    """Split a markdown line stream at headings (outside code fences), hashing as it goes."""
+    level, title, start = 0, "", 1
+    buf: List[str] = []
+    h = hashlib.sha256()
+    in_fence = False
+
+    def emit() -> Section:
+        return Section(level=level, title=title, line=start, text="".join(buf), sha256=h.hexdigest())
+
+    for n, line in enumerate(lines, start=1):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        m = None if in_fence else _HEADING.match(line.rstrip("\n"))
+        if m:
+            if buf and (level or "".join(buf).strip()):
+                yield emit()
+            level, title, start = len(m.group(1)), m.group(2), n
+            buf, h = [], hashlib.sha256()
+        buf.append(line)
+        h.update(line.encode("utf-8"))
+    if buf and (level or "".join(buf).strip()):
+        yield emit()
+
+
+def _cells(line: str) -> List[str]:
+    return [c.strip() for c in line.strip().strip("|").split("|")]
+
+
+def _unbold(text: str) -> str:
+    return text.replace("**", "").strip()
+
+
+def parse_section(text: str) -> List[dict]:
+    """Parse one section's body (heading line excluded) into typed blocks."""
+    lines = text.splitlines()
+    if lines and _HEADING.match(lines[0]):
+        lines = lines[1:]
+
+    blocks: List[dict] = []
+    para: List[str] = []
+    i = 0
+
+    def flush_para() -> None:
+        if para:
+            blocks.append({"type": "paragraph", "text": " ".join(para)})
+            para.clear()
+
+    while i < len(lines):
+        raw = lines[i]
+        line = raw.strip()
+
+        if not line or line == "---":
+            flush_para()
+            i += 1
+            continue
+
+        if line.startswith("|") and i + 1 < len(lines) and _TABLE_SEP.match(lines[i + 1].strip()):
+            flush_para()
+            columns = _cells(line)
+            rows = []
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                cells = _cells(lines[i])
+                rows.append({c: _unbold(v) for c, v in zip(columns, cells)})
+                i += 1
+            blocks.append({"type": "table", "columns": columns, "rows": rows})
+            continue
+
+        m = _FIELD.match(line)
+        if m:
+            flush_para()
+            if not blocks or blocks[-1]["type"] != "fields":
+                blocks.append({"type": "fields", "fields": {}})
+            blocks[-1]["fields"][m.group(1).strip()] = _unbold(m.group(2))
+            i += 1
+            continue
+
+        bullet, numbered = _BULLET.match(raw), _NUMBERED.match(raw)
+        if bullet or numbered:
+            flush_para()
+            ordered = numbered is not None
+            items: List[str] = []
+            rules: List[dict] = []
+            while i < len(lines):
+                b, nm = _BULLET.match(lines[i]), _NUMBERED.match(lines[i])
+                item = (nm if ordered else b)
+                if item is None:
+                    break
+                value = _unbold(item.group(1))
+                rule = _RULE.match(value)
+                if rule:
+                    rules.append({"type": "rule", "action": rule.group(1), "target": rule.group(2), "condition": rule.group(3)})
+                else:
+                    items.append(value)
+                i += 1
+            if items:
+                blocks.append({"type": "list", "ordered": ordered, "items": items})
+            blocks.extend(rules)
+            continue
+
+        para.append(_unbold(line))
+        i += 1
+
+    flush_para()
+    return blocks
+
+
+class ParseCache:
+    """sha256(section text)-keyed store of parsed blocks: in memory, plus JSON files under ``root``."""
+
+    def __init__(self, root: Optional[Path] = DEFAULT_CACHE_DIR):
+        self.root = root
+        self._memo: Dict[str, List[dict]] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        if key in self._memo:
+            return self._memo[key]
+        if self.root is None:
+            return None
+        try:
+            blocks = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._memo[key] = blocks
+        return blocks
+
+    def put(self, key: str, blocks: List[dict]) -> None:
+        self._memo[key] = blocks
+        if self.root is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(blocks, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def parse_hr(hr_path: Path, cache: Optional[ParseCache] = None) -> ParsedHR:
+    """Parse an HR file, re-parsing only sections whose hash is not already cached."""
+    cache = cache if cache is not None else ParseCache()
+    doc = ParsedHR(path=Path(hr_path))
+    with Path(hr_path).open("r", encoding="utf-8") as f:
+        for section in iter_sections(f):
+            key = hashlib.sha256(f"{PARSER_VERSION}:{section.sha256}".encode("ascii")).hexdigest()
+            blocks = cache.get(key)
+            reused = blocks is not None
+            if not reused:
+                blocks = parse_section(section.text)
+                cache.put(key, blocks)
+            doc.sections.append(ParsedSection(section=section, blocks=blocks, reused=reused))
+    return doc
+
+
+def section_key(section: Section) -> str:
+    """Identity across versions: the section number ("7.") when present, else the title."""
+    m = re.match(r"^(\d+(?:\.\d+)*)\.?\s", section.title)
+    return m.group(1) if m else section.title
+
+
+def diff_sections(old: ParsedHR, new: ParsedHR) -> Dict[str, List[str]]:
+    """Titles of sections added, removed or changed (same key, different hash) from ``old`` to ``new``."""
+    before = {section_key(s.section): s.section for s in old.sections}
+    after = {section_key(s.section): s.section for s in new.sections}
+    return {
+        "added": [s.title for k, s in after.items() if k not in before],
+        "removed": [s.title for k, s in before.items() if k not in after],
+        "changed": [s.title for k, s in after.items() if k in before and before[k].sha256 != s.sha256],
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("hr_file", help="HR thesis markdown file (e.g., v1.7-HR_20260118.md)")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Parse cache directory (default: var/regen/sections)")
+    ap.add_argument("--diff", default=None, help="Compare sections against another HR file")
+    ap.add_argument("--json", action="store_true", help="Print the parsed section tree as JSON")
+    args = ap.parse_args()
+
+    cache = ParseCache(Path(args.cache_dir))
+    if args.diff:
+        base = parse_hr(Path(args.diff), cache)
+        print(f"[OK] {base.path.name}: {len(base.sections)} sections ({base.parsed} parsed, {base.reused} reused)")
+    doc = parse_hr(Path(args.hr_file), cache)
+    print(f"[OK] {doc.path.name}: {len(doc.sections)} sections ({doc.parsed} parsed, {doc.reused} reused)")
+
+    if args.diff:
+        for kind, titles in diff_sections(base, doc).items():
+            for title in titles:
+                print(f"  {kind:<8} {title}")
+    if args.json:
+        print(json.dumps(doc.tree(), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""scripts/load_test.py
+
+Load test for the dashboard: many concurrent simulated sessions, no network.
+
+Each scenario runs in a fresh interpreter (its own caches and peak RSS) with the
+replay data source (adapters/data_source.py; record fixtures first with
+scripts/record_fixtures.py). A session is one full run of dashboard/app.py under
+Streamlit's AppTest, which renders every page the way a browser session does;
+sessions share the process-wide caches exactly as real viewers do.
+
+Scenarios
+  cold    all sessions start at once on an empty process (8:25am, first deploy)
+  warm    one priming session, then all sessions at once
+  ramp    sessions arrive evenly over --ramp seconds
+  faulty  like warm, with upstream latency and errors injected
+
+Per scenario: render latency p50/p95/p99/max, failed sessions, peak RSS,
+price cache hits (memory / store / cold / stale), st.cache_data and
+st.cache_resource hit rates (calls that did not recompute), and upstream
+requests by kind.
+
+USAGE
+  python scripts/record_fixtures.py
+  python scripts/load_test.py
+  python scripts/load_test.py --sessions 50 --scenarios cold,warm --json var/dashboard/load/latest.json
+
+OPTIONS
+  --sessions <n>          Concurrent sessions per scenario (default: 20)
+  --scenarios <list>      Comma-separated scenario names (default: cold,warm,ramp,faulty)
+  --ramp <seconds>        Arrival window for the ramp scenario (default: 10)
+  --latency-ms <lo-hi>    Replay latency per upstream call (default: 20-150; faulty: 50-400)
+  --error-rate <p>        Upstream failure rate for the faulty scenario (default: 0.05)
+  --seed <n>              Seed for latency/failure injection (default: 0)
+  --timeout <seconds>     Per-session render timeout (default: 120)
+  --fixtures <dir>        Fixture root (default: $MT_FIXTURE_DIR or var/dashboard/fixtures)
+  --json <file>           Also write all results as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DASHBOARD_DIR = REPO_ROOT / "dashboard"
+APP = DASHBOARD_DIR / "app.py"
+if str(DASHBOARD_DIR) not in sys.path:
+    sys.path.insert(0, str(DASHBOARD_DIR))
+
+SCENARIOS = ("cold", "warm", "ramp", "faulty")
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    xs = sorted(values)
+    k = (len(xs) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(xs) - 1)
+    return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+
+class CacheCounter:
+    """
+    Wraps st.cache_data / st.cache_resource so every call and every recompute is counted.
+
+    The cached body keeps the original function's module, qualname and source
+    (functools.wraps), so Streamlit keys the cache exactly as it does unwrapped.
+    """
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.computes: Counter = Counter()
+        self.resources: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def install(self, st) -> None:
+        st.cache_data = self._wrap(st.cache_data, "data")
+        st.cache_resource = self._wrap(st.cache_resource, "resource")
+
+    def _wrap(self, real, kind: str):
+        counter = self
+
+        def decorate(func=None, **kw):
+            if func is None:
+                return lambda f: decorate(f, **kw)
+            name = f"{kind}:{func.__qualname__}"
+
+            @functools.wraps(func)
+            def body(*args, **kwargs):
+                out = func(*args, **kwargs)
+                with counter._lock:
+                    counter.computes[name] += 1
+                    if kind == "resource":
+                        counter.resources[name] = out
+                return out
+
+            cached = real(**kw)(body) if kw else real(body)
+
+            @functools.wraps(func)
+            def call(*args, **kwargs):
+                with counter._lock:
+                    counter.calls[name] += 1
+                return cached(*args, **kwargs)
+
+            call.clear = cached.clear
+            return call
+
+        return decorate
+
+    def hit_rate(self, kind: str) -> Dict[str, float]:
+        calls = sum(n for k, n in self.calls.items() if k.startswith(kind + ":"))
+        computes = sum(n for k, n in self.computes.items() if k.startswith(kind + ":"))
+        return {"calls": calls, "computes": computes, "hit_rate": (1 - computes / calls) if calls else float("nan")}
+
+
+# -- worker (one scenario, one interpreter) ---------------------------------
+def run_scenario(cfg: dict) -> dict:
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from adapters.data_source import get_source
+
+    counter = CacheCounter()
+    counter.install(st)
+    source = get_source()
+    if source.mode != "replay":
+        raise SystemExit("load tests run against the replay data source only (MT_DATA_SOURCE=replay)")
+
+    def session(delay: float) -> dict:
+        time.sleep(delay)
+        t0 = time.perf_counter()
+        try:
+            at = AppTest.from_file(str(APP), default_timeout=cfg["timeout"])
+            at.run()
+            errors = [str(e.message) for e in at.exception]
+        except Exception as e:  # a timeout or a crash outside the script
+            errors = [f"{type(e).__name__}: {e}"]
+        return {"seconds": time.perf_counter() - t0, "errors": errors}
+
+    name, n = cfg["scenario"], cfg["sessions"]
+    if name in ("warm", "faulty"):
+        session(0.0)  # primer, not measured
+        counter.calls.clear()
+        counter.computes.clear()
+        source.stats.clear()
+        for obj in counter.resources.values():
+            if hasattr(obj, "stats"):
+                obj.stats.clear()
+    delays = [cfg["ramp"] * i / max(n - 1, 1) for i in range(n)] if name == "ramp" else [0.0] * n
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n, thread_name_prefix="mt-load") as pool:
+        sessions = list(pool.map(session, delays))
+    wall = time.perf_counter() - t0
+
+    secs = [s["seconds"] for s in sessions]
+    failed = [s for s in sessions if s["errors"]]
+    price_cache = Counter()
+    for obj in counter.resources.values():
+        if isinstance(getattr(obj, "stats", None), Counter):
+            price_cache.update(obj.stats)
+    return {
+        "scenario": name,
+        "sessions": n,
+        "wall_s": wall,
+        "p50_s": percentile(secs, 0.50),
+        "p95_s": percentile(secs, 0.95),
+        "p99_s": percentile(secs, 0.99),
+        "max_s": max(secs) if secs else float("nan"),
+        "failed": len(failed),
+        "first_errors": sorted({e for s in failed for e in s["errors"]})[:5],
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,  # KiB on Linux
+        "price_cache": dict(price_cache),
+        "cache_data": counter.hit_rate("data"),
+        "cache_resource": counter.hit_rate("resource"),
+        "upstream": dict(source.stats),
+    }
+
+
+# -- driver -----------------------------------------------------------------
+def spawn(cfg: dict, env: dict) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", json.dumps(cfg)],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=REPO_ROOT,
+    )
+    lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:]
+        return {"scenario": cfg["scenario"], "error": " | ".join(tail) or f"exit {proc.returncode}"}
+    return json.loads(lines[-1])
+
+
+def report(r: dict) -> None:
+    if "error" in r:
+        print(f"[FAIL] {r['scenario']}: {r['error']}")
+        return
+    tag = "OK" if not r["failed"] else "WARN"
+    print(
+        f"[{tag}] {r['scenario']:<7} sessions={r['sessions']} failed={r['failed']} "
+        f"p50={r['p50_s']:.2f}s p95={r['p95_s']:.2f}s p99={r['p99_s']:.2f}s max={r['max_s']:.2f}s "
+        f"wall={r['wall_s']:.1f}s peak_rss={r['peak_rss_mb']:.0f}MB"
+    )
+    pc = r["price_cache"]
+    print(f"       price cache: {', '.join(f'{k}={v}' for k, v in sorted(pc.items())) or 'n/a'}")
+    for kind in ("cache_data", "cache_resource"):
+        c = r[kind]
+        print(f"       {kind}: {c['calls']} calls, {c['computes']} computes, hit rate {c['hit_rate']:.1%}")
+    print(f"       upstream: {', '.join(f'{k}={v}' for k, v in sorted(r['upstream'].items())) or 'none'}")
+    for e in r["first_errors"]:
+        print(f"       error: {e}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard (replay data, no network).")
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS))
+    ap.add_argument("--ramp", type=float, default=10.0)
+    ap.add_argument("--latency-ms", default="20-150")
+    ap.add_argument("--error-rate", type=float, default=0.05)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--fixtures", default=os.environ.get("MT_FIXTURE_DIR", ""))
+    ap.add_argument("--json", default="")
+    ap.add_argument("--worker", default="", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(json.loads(args.worker))))
+        return 0
+
+    names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SCENARIOS]
+    if unknown:
+        print(f"[FAIL] unknown scenario(s): {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+        return 2
+
+    results = []
+    for name in names:
+        env = dict(os.environ, MT_DATA_SOURCE="replay", MT_FAULT_SEED=str(args.seed))
+        if args.fixtures:
+            env["MT_FIXTURE_DIR"] = args.fixtures
+        env["MT_FAULT_LATENCY_MS"] = "50-400" if name == "faulty" and args.latency_ms == "20-150" else args.latency_ms
+        env["MT_FAULT_ERROR_RATE"] = str(args.error_rate if name == "faulty" else 0.0)
+        cfg = {"scenario": name, "sessions": args.sessions, "ramp": args.ramp, "timeout": args.timeout}
+        r = spawn(cfg, env)
+        report(r)
+        results.append(r)
+
+    if args.json:
+        out = Path(args.json)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps({"generated_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "results": results}, indent=2), encoding="utf-8")
+        print(f"[OK] wrote {out}")
+    return 0 if all("error" not in r and not r["failed"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""scripts/record_fixtures.py
+
+Records (or checks) the upstream fixtures the replay data source serves.
+
+Fetches everything the current spec's cards and data contract need (the same
+prefetch plan app.py uses), plus corporate actions and macro series, through
+the record backend of adapters/data_source.py. Running the dashboard with
+``MT_DATA_SOURCE=replay`` afterwards needs no network, so load and performance
+runs are reproducible. Running it with ``MT_DATA_SOURCE=record`` captures
+anything this script does not know about (e.g. commodities) as pages render.
+
+USAGE
+  python scripts/record_fixtures.py
+  python scripts/record_fixtures.py --check
+  MT_DATA_SOURCE=replay MT_FAULT_LATENCY_MS=50-400 MT_FAULT_ERROR_RATE=0.02 streamlit run dashboard/app.py
+
+OPTIONS
+  --fixtures <dir>        Fixture root (default: $MT_FIXTURE_DIR or var/dashboard/fixtures)
+  --no-actions            Skip dividends/splits
+  --check                 Offline: report plan entries with no fixture, record nothing
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DASHBOARD_DIR = REPO_ROOT / "dashboard"
+if str(DASHBOARD_DIR) not in sys.path:
+    sys.path.insert(0, str(DASHBOARD_DIR))
+
+from adapters.data_source import Fixtures, build_source, set_source  # noqa: E402
+from utils.prefetch import batches, plan_prefetch  # noqa: E402
+from utils.spec_index import load_spec_index  # noqa: E402
+
+
+def macro_ids(spec: dict) -> list:
+    inputs = spec.get("data_contract", {}).get("required_inputs", {})
+    ids = {m["series"] for m in inputs.get("macro", []) if m.get("series")}
+    for card in spec.get("dashboard", {}).get("cards", {}).values():
+        ids.update(p["ppi"] for p in card.get("pairs", []) if p.get("ppi"))
+    return sorted(ids)
+
+
+def check(fixtures: Fixtures, plan, macro: list, actions: bool) -> int:
+    missing = [f"{r.symbol} ({r.interval})" for r in plan if not fixtures.price_path(r.symbol, r.interval).is_file()]
+    if actions:
+        missing += [f"{s} (actions)" for s in sorted({r.symbol for r in plan}) if not fixtures.actions_path(s).is_file()]
+    missing += [f"{m} (macro)" for m in macro if not fixtures.macro_path(m).is_file()]
+    for m in missing:
+        print(f"[FAIL] no fixture: {m}")
+    total = len(plan) + len(macro) + (len({r.symbol for r in plan}) if actions else 0)
+    print(f"[{'OK' if not missing else 'WARN'}] {total - len(missing)}/{total} fixtures present under {fixtures.root}")
+    return 0 if not missing else 1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Record or check replay fixtures for the dashboard.")
+    ap.add_argument("--fixtures", default=os.environ.get("MT_FIXTURE_DIR", ""))
+    ap.add_argument("--no-actions", action="store_true")
+    ap.add_argument("--check", action="store_true")
+    args = ap.parse_args()
+
+    fixture_dir = Path(args.fixtures) if args.fixtures else None
+    fixtures = Fixtures(fixture_dir)
+    index = load_spec_index(REPO_ROOT)
+    plan = plan_prefetch(index)
+    macro = macro_ids(index.spec)
+    if args.check:
+        return check(fixtures, plan, macro, not args.no_actions)
+
+    set_source(build_source("record", fixture_dir))
+    from adapters.dividend_data import fetch_actions
+    from adapters.macro_data import fetch_macro
+    from adapters.market_data import fetch_prices, fetch_prices_batch
+
+    failed = 0
+    for (interval, period), symbols in sorted(batches(plan).items()):
+        got = fetch_prices_batch(symbols, period=period, interval=interval)
+        for sym in symbols:
+            if sym in got:
+                continue
+            try:  # one by one, like prefetch retries
+                fetch_prices([sym], period=period, interval=interval)
+            except Exception as e:
+                failed += 1
+                print(f"[FAIL] {sym} ({interval} {period}): {e}")
+        print(f"[OK] prices {interval} {period}: {len(symbols)} symbols")
+    if not args.no_actions:
+        for sym in sorted({r.symbol for r in plan}):
+            try:
+                fetch_actions(sym)
+            except Exception as e:
+                failed += 1
+                print(f"[FAIL] {sym} (actions): {e}")
+        print("[OK] corporate actions")
+    for sid in macro:
+        try:
+            fetch_macro([sid])
+        except Exception as e:
+            print(f"[WARN] {sid} (macro): {e or type(e).__name__}")
+    print(f"[{'OK' if not failed else 'WARN'}] fixtures recorded under {fixtures.root} ({failed} failures)")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
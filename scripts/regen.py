@@ -17,6 +17,18 @@ OPTIONS
   --out-dir <dir>         Output directory (default: current directory)
   --schema-dir <dir>      Schema directory (default: ./schemas)
   --validate-only         Validate existing JSON/AGENT outputs inferred from HR (no regeneration)
+  --cache-dir <dir>       Build cache directory (default: var/regen)
+  --no-cache              Ignore and do not update the build cache
+  --force                 Rebuild and revalidate even on a cache hit
+
+CACHING
+- A build is keyed by sha256(HR bytes, schema bytes, TRANSFORM_VERSION). On a hit with
+  outputs still matching their recorded hashes, nothing is rebuilt, written or revalidated.
+- Validation verdicts are keyed by sha256(artifact bytes, schema bytes); --validate-only
+  reuses a cached pass verdict. Failures are never cached.
+- Bump TRANSFORM_VERSION whenever build_*() output changes for the same HR input.
+- HR is parsed per section (scripts/hr_parser.py); sections whose hash is already in
+  <cache-dir>/sections are reused, so a new version re-parses only what it changed.
 
 NOTES
 - This repo currently uses a placeholder transformation. Replace build_*() with the real
@@ -27,9 +39,19 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
+from hr_parser import PARSER_VERSION, ParsedHR, ParseCache, parse_hr
+from schema_service import SchemaService, report, sha256_bytes
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = REPO_ROOT / "var" / "regen"
+
+# Part of every build key: bump when build_thesis_json/build_agent_json change behavior.
+TRANSFORM_VERSION = "placeholder-1"
+
 def infer_versions_from_hr(hr_path: Path) -> tuple[str, str, str]:
     """Return (base_version, json_filename, agent_filename)."""
     # HR filenames look like: v1.7-HR_20260118.md
@@ -46,9 +68,9 @@ def infer_versions_from_hr(hr_path: Path) -> tuple[str, str, str]:
     agent_name = f"{published_version_prefix}-AGENT_{date_suffix}.json"
     return (f"{published_version_prefix}_{date_suffix}", json_name, agent_name)
 
-def build_thesis_json(hr_path: Path) -> dict:
-    """Placeholder: build thesis JSON payload from HR."""
-    # TODO: Replace with real parsing/structuring. Keep deterministic.
+def build_thesis_json(hr_path: Path, doc: ParsedHR | None = None) -> dict:
+    """Placeholder: build thesis JSON payload from HR (``doc`` is its section-level parse)."""
+    # TODO: Replace with real structuring of doc.sections. Keep deterministic.
     return {
         "meta": {
             "document_type": "thesis",
@@ -58,9 +80,9 @@ def build_thesis_json(hr_path: Path) -> dict:
         }
     }
 
-def build_agent_json(hr_path: Path) -> dict:
-    """Placeholder: build agent spec payload from HR."""
-    # TODO: Replace with real parsing/structuring. Keep deterministic.
+def build_agent_json(hr_path: Path, doc: ParsedHR | None = None) -> dict:
+    """Placeholder: build agent spec payload from HR (``doc`` is its section-level parse)."""
+    # TODO: Replace with real structuring of doc.sections. Keep deterministic.
     return {
         "meta": {
             "document_type": "agent_spec",
@@ -78,19 +100,43 @@ def load_schema(schema_path: Path) -> dict:
     with schema_path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
-def validate_json(payload: dict, schema: dict, label: str) -> None:
-    """Validate payload against schema using jsonschema (if available)."""
-    try:
-        import jsonschema  # type: ignore
-    except Exception as e:
-        print(f"[WARN] jsonschema not installed; skipping {label} schema validation. ({e})")
-        return
-
-    try:
-        jsonschema.validate(instance=payload, schema=schema)
-        print(f"[OK] {label} validates against schema")
-    except jsonschema.ValidationError as ve:
-        print(f"[FAIL] {label} schema validation failed:\n  {ve.message}")
+def dump_json(payload: dict) -> bytes:
+    return (json.dumps(payload, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+class BuildCache:
+    """
+    Content-addressed cache under ``root``:
+      builds/<key>.json   payloads + output hashes for one (HR, schemas, transform) input
+    Validation verdicts live next to it (schema_service: verdicts.json).
+    A disabled cache (root=None) never hits and never writes.
+    """
+
+    def __init__(self, root: Path | None):
+        self.root = root
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def get_build(self, key: str) -> dict | None:
+        if self.root is None:
+            return None
+        path = self.root / "builds" / f"{key}.json"
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put_build(self, key: str, entry: dict) -> None:
+        if self.root is not None:
+            self._write(self.root / "builds" / f"{key}.json", json.dumps(entry, sort_keys=True).encode("utf-8"))
+
+def validate_cached(data: bytes, schema_bytes: bytes, label: str, service: SchemaService, force: bool = False) -> None:
+    """Validate serialized ``data``, skipping it when this exact (artifact, schema) pair already passed."""
+    status, message = service.check(data, schema_bytes, force)
+    if not report(status, message, label):
         sys.exit(2)
 
 def main() -> None:
@@ -99,11 +145,17 @@ def main() -> None:
     ap.add_argument("--out-dir", default=".", help="Output directory (default: .)")
     ap.add_argument("--schema-dir", default="schemas", help="Schema directory (default: ./schemas)")
     ap.add_argument("--validate-only", action="store_true", help="Validate inferred outputs only (no regeneration)")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Build cache directory (default: var/regen)")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore and do not update the build cache")
+    ap.add_argument("--force", action="store_true", help="Rebuild and revalidate even on a cache hit")
     args = ap.parse_args()
 
     hr_path = Path(args.hr_file).resolve()
     out_dir = Path(args.out_dir).resolve()
     schema_dir = Path(args.schema_dir).resolve()
+    cache = BuildCache(None if args.no_cache else Path(args.cache_dir).resolve())
+    parse_cache = ParseCache(None if cache.root is None else cache.root / "sections")
+    service = SchemaService(schema_dir=schema_dir, cache_dir=cache.root)
 
     if not hr_path.exists():
         raise FileNotFoundError(f"HR file not found: {hr_path}")
@@ -122,31 +174,54 @@ def main() -> None:
     if not agent_schema_path.exists():
         raise FileNotFoundError(f"Missing schema: {agent_schema_path}")
 
-    thesis_schema = load_schema(thesis_schema_path)
-    agent_schema = load_schema(agent_schema_path)
+    thesis_schema = thesis_schema_path.read_bytes()
+    agent_schema = agent_schema_path.read_bytes()
 
     if args.validate_only:
         if not json_path.exists():
             raise FileNotFoundError(f"Missing inferred JSON output: {json_path}")
         if not agent_path.exists():
             raise FileNotFoundError(f"Missing inferred AGENT output: {agent_path}")
-        thesis_payload = json.loads(json_path.read_text(encoding="utf-8"))
-        agent_payload = json.loads(agent_path.read_text(encoding="utf-8"))
-        validate_json(thesis_payload, thesis_schema, f"THESIS ({json_path.name})")
-        validate_json(agent_payload, agent_schema, f"AGENT ({agent_path.name})")
+        validate_cached(json_path.read_bytes(), thesis_schema, f"THESIS ({json_path.name})", service, args.force)
+        validate_cached(agent_path.read_bytes(), agent_schema, f"AGENT ({agent_path.name})", service, args.force)
         print("Validation complete.")
         return
 
-    # Regenerate
-    thesis_payload = build_thesis_json(hr_path)
-    agent_payload = build_agent_json(hr_path)
-
-    json_path.write_text(json.dumps(thesis_payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    agent_path.write_text(json.dumps(agent_payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    key = sha256_bytes(hr_path.read_bytes(), thesis_schema, agent_schema, f"{TRANSFORM_VERSION}:{PARSER_VERSION}".encode("utf-8"))
+    entry = None if args.force else cache.get_build(key)
 
-    # Validate
-    validate_json(thesis_payload, thesis_schema, f"THESIS ({json_path.name})")
-    validate_json(agent_payload, agent_schema, f"AGENT ({agent_path.name})")
+    if entry is not None:
+        current = {
+            name: sha256_bytes(p.read_bytes()) if p.exists() else None
+            for name, p in ((json_name, json_path), (agent_name, agent_path))
+        }
+        if current == entry["outputs"]:
+            print(f"[OK] Up to date (build {key[:12]}); nothing to do.")
+            return
+        # Outputs missing or edited by hand: restore them from the cached build (already validated).
+        thesis_data = entry["payloads"][json_name].encode("utf-8")
+        agent_data = entry["payloads"][agent_name].encode("utf-8")
+        print(f"[OK] Restored outputs from cached build {key[:12]}")
+    else:
+        # Regenerate (only HR sections whose hash changed are re-parsed)
+        doc = parse_hr(hr_path, parse_cache)
+        print(f"[OK] Parsed {hr_path.name}: {len(doc.sections)} sections ({doc.parsed} parsed, {doc.reused} reused)")
+        thesis_data = dump_json(build_thesis_json(hr_path, doc))
+        agent_data = dump_json(build_agent_json(hr_path, doc))
+
+        # Validate
+        validate_cached(thesis_data, thesis_schema, f"THESIS ({json_name})", service, args.force)
+        validate_cached(agent_data, agent_schema, f"AGENT ({agent_name})", service, args.force)
+
+    json_path.write_bytes(thesis_data)
+    agent_path.write_bytes(agent_data)
+
+    cache.put_build(key, {
+        "transform_version": TRANSFORM_VERSION,
+        "source_hr": hr_path.name,
+        "outputs": {json_name: sha256_bytes(thesis_data), agent_name: sha256_bytes(agent_data)},
+        "payloads": {json_name: thesis_data.decode("utf-8"), agent_name: agent_data.decode("utf-8")},
+    })
 
     print(f"Generated:\n  {json_path}\n  {agent_path}")
 
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""scripts/run_alerts.py
+
+Evaluates the dashboard spec's ``alerting`` section headless (no Streamlit).
+
+Reads manifest_latest.json -> latest.dashboard_spec, resolves only the signals the
+alert conditions reference, and delivers fired/resolved events to the sinks mapped
+from ``alerting.channels``. Alert state persists between runs, so repeated runs
+(cron, --loop) debounce and dedupe rather than re-firing.
+
+USAGE
+  python scripts/run_alerts.py
+  python scripts/run_alerts.py --loop 300
+
+OPTIONS
+  --state <file>          Alert state file (default: var/dashboard/alerts/state.json)
+  --events <file>         Event log for the ui_badge channel (default: var/dashboard/alerts/events.jsonl)
+  --webhook-url <url>     Webhook for webhook_optional (default: $MT_ALERT_WEBHOOK_URL)
+  --debounce <n>          Consecutive distinct inputs required to flip a point-in-time alert (default: 2;
+                          conditions with "for N ..."/"sustained" already count observations and use 1)
+  --dry-run               Print events without delivering them or persisting state
+  --loop <seconds>        Re-evaluate forever at this interval
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DASHBOARD_DIR = REPO_ROOT / "dashboard"
+if str(DASHBOARD_DIR) not in sys.path:
+    sys.path.insert(0, str(DASHBOARD_DIR))
+
+from adapters.alert_sinks import sinks_for_channels  # noqa: E402
+from utils.alerts import AlertEngine, rules_from_spec  # noqa: E402
+from utils.signals import registry_from_spec  # noqa: E402
+
+ALERTS_DIR = REPO_ROOT / "var" / "dashboard" / "alerts"
+
+
+def load_spec(repo_root: Path) -> dict:
+    manifest = json.loads((repo_root / "manifest_latest.json").read_text(encoding="utf-8"))
+    spec_rel = manifest.get("latest", {}).get("dashboard_spec", "")
+    return json.loads((repo_root / spec_rel).read_text(encoding="utf-8"))
+
+
+class PassCache:
+    """
+    Memoizes price fetches per symbol within one evaluation pass, so HYG is downloaded
+    once although it feeds both the HYG signal and CREDIT_DIVERGENCE (fetched with LQD).
+    """
+
+    def __init__(self):
+        self._memo = {}
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    def fetch(self, symbols, period, interval):
+        from adapters.market_data import fetch_prices
+
+        missing = [s for s in symbols if (s, period, interval) not in self._memo]
+        if missing:
+            for sym, series in fetch_prices(missing, period=period, interval=interval).items():
+                self._memo[(sym, period, interval)] = series
+        return {s: self._memo[(s, period, interval)] for s in symbols}
+
+
+def fetch_macro_lazy(series_ids):
+    from adapters.macro_data import fetch_macro
+
+    return fetch_macro(series_ids)
+
+
+class CommodityLoader:
+    """Commodity histories from the local price store (refreshed when stale), loaded once per pass."""
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self._series = None
+
+    def clear(self) -> None:
+        self._series = None
+
+    def __call__(self, symbols):
+        if self._series is None:
+            from adapters.commodity_data import commodities_from_spec, fetch_commodities
+
+            self._series, _ = fetch_commodities(commodities_from_spec(self.spec))
+        return {s: self._series[s] for s in symbols}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--state", default=str(ALERTS_DIR / "state.json"))
+    ap.add_argument("--events", default=str(ALERTS_DIR / "events.jsonl"))
+    ap.add_argument("--webhook-url", default=None)
+    ap.add_argument("--debounce", type=int, default=2)
+    ap.add_argument("--dry-run", action="store_true", help="Print events without delivering them or persisting state")
+    ap.add_argument("--loop", type=float, default=0.0, help="Seconds between passes (0 = single pass)")
+    args = ap.parse_args()
+
+    spec = load_spec(REPO_ROOT)
+    rules = rules_from_spec(spec)
+    if not rules:
+        print("[OK] No alerts defined in spec.")
+        return 0
+
+    cache = PassCache()
+    commodities = CommodityLoader(spec)
+    signals = registry_from_spec(spec, cache.fetch, fetch_macro_lazy, commodities)
+
+    if args.dry_run:
+        sinks = []
+    else:
+        channels = spec.get("alerting", {}).get("channels", [])
+        sinks = sinks_for_channels(channels, Path(args.events), webhook_url=args.webhook_url)
+
+    state_path = None if args.dry_run else Path(args.state)
+    engine = AlertEngine(rules, signals, sinks=sinks, state_path=state_path, debounce=args.debounce)
+
+    while True:
+        cache.clear()
+        commodities.clear()
+        report = engine.evaluate()
+        print(
+            f"[OK] alerts: {len(rules)} rules, {len(report.changed_signals)} changed signals, "
+            f"{len(report.evaluated)} evaluated, {len(report.events)} events"
+        )
+        for key, err in sorted(report.errors.items()):
+            print(f"[WARN] {key}: {err}")
+        for ev in report.events:
+            print(f"[{ev['severity']}] {ev['event']}: {ev['alert_id']} — {ev['message']}")
+        if args.loop <= 0:
+            return 0
+        time.sleep(args.loop)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
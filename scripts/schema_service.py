@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""scripts/schema_service.py
+
+Shared JSON Schema validation for the validation scripts (regen, validate_*).
+
+- Each schema is compiled once per process and reused for every document.
+  Backend: fastjsonschema (code generation) if installed, else jsonschema, else
+  validation is skipped with a warning (same policy as before).
+- Verdicts are cached on disk under <cache-dir> (default: var/regen):
+    verdicts.json              {sha256(artifact, schema, backend): "pass", "schema:<sha>": "pass"}
+  where backend is e.g. "jsonschema==4.23.0", so an unchanged (artifact, schema) pair
+  is never revalidated by the same validator and an unchanged schema is never
+  meta-checked again; switching or upgrading the backend revalidates everything.
+  Failures are never cached. Validators are compiled in memory only: no generated
+  code is read back from disk and executed.
+- JSON documents are parsed once per process (``load_json``).
+
+USAGE (library)
+  service = SchemaService()
+  status, message = service.check_file("thesis", Path("v1.7-JSON_20260118.json"))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SCHEMA_DIR = REPO_ROOT / "schemas"
+DEFAULT_CACHE_DIR = REPO_ROOT / "var" / "regen"
+
+SCHEMA_FILES = {
+    "thesis": "thesis.schema.json",
+    "agent": "agent.schema.json",
+    "manifest": "manifest.schema.json",
+    "dashboard_spec": "dashboard_spec.schema.json",
+}
+
+# Validator: payload -> None if valid, else an error message.
+Validator = Callable[[Any], Optional[str]]
+
+
+def sha256_bytes(*parts: bytes) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(hashlib.sha256(part).digest())
+    return h.hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def detect_backend() -> Optional[str]:
+    import importlib.util
+
+    for name in ("fastjsonschema", "jsonschema"):
+        if importlib.util.find_spec(name) is not None:
+            return name
+    return None
+
+
+def backend_id(name: Optional[str]) -> str:
+    """"<backend>==<version>" from installed package metadata (the backend itself is not imported)."""
+    if name is None:
+        return "none"
+    from importlib import metadata
+
+    try:
+        return f"{name}=={metadata.version(name)}"
+    except metadata.PackageNotFoundError:
+        return f"{name}==unknown"
+
+
+class SchemaService:
+    """Compiles schemas once and validates documents against them, with a persistent verdict cache."""
+
+    def __init__(self, schema_dir: Path = DEFAULT_SCHEMA_DIR, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, backend: Optional[str] = "auto"):
+        self.schema_dir = Path(schema_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._backend = backend
+        self._backend_id: Optional[str] = None
+        self._schema_bytes: Dict[str, bytes] = {}
+        self._compiled: Dict[str, Validator] = {}
+        self._docs: Dict[Path, Any] = {}
+        self._verdicts: Optional[Dict[str, str]] = None
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Resolved lazily: a run served entirely from cached verdicts never imports a backend."""
+        if self._backend == "auto":
+            self._backend = detect_backend()
+        return self._backend
+
+    @property
+    def backend_id(self) -> str:
+        """Backend name and version; part of every verdict key."""
+        if self._backend_id is None:
+            self._backend_id = backend_id(self.backend)
+        return self._backend_id
+
+    # ---- documents ----
+    def load_json(self, path: Path) -> Any:
+        """Parse ``path`` once per service; later calls return the same object."""
+        path = Path(path).resolve()
+        if path not in self._docs:
+            self._docs[path] = json.loads(path.read_text(encoding="utf-8"))
+        return self._docs[path]
+
+    def schema_bytes(self, name: str) -> bytes:
+        if name not in self._schema_bytes:
+            self._schema_bytes[name] = (self.schema_dir / SCHEMA_FILES.get(name, name)).read_bytes()
+        return self._schema_bytes[name]
+
+    # ---- verdict cache ----
+    def _verdict_map(self) -> Dict[str, str]:
+        if self._verdicts is None:
+            self._verdicts = {}
+            if self.cache_dir is not None:
+                try:
+                    self._verdicts = json.loads((self.cache_dir / "verdicts.json").read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    pass
+        return self._verdicts
+
+    def has_pass(self, key: str) -> bool:
+        return self._verdict_map().get(key) == "pass"
+
+    def record_pass(self, key: str) -> None:
+        if self.cache_dir is None or self.has_pass(key):
+            return
+        self._verdict_map()[key] = "pass"
+        _atomic_write(self.cache_dir / "verdicts.json", json.dumps(self._verdicts, sort_keys=True).encode("utf-8"))
+
+    # ---- compilation ----
+    def compile(self, schema_bytes: bytes) -> Optional[Validator]:
+        """Compiled validator for these schema bytes (memoized by hash); None if no backend is installed."""
+        if self.backend is None:
+            return None
+        key = sha256_bytes(schema_bytes)
+        if key not in self._compiled:
+            schema = json.loads(schema_bytes)
+            if self.backend == "fastjsonschema":
+                self._compiled[key] = self._compile_fast(schema)
+            else:
+                self._compiled[key] = self._compile_jsonschema(schema, key)
+        return self._compiled[key]
+
+    def _compile_fast(self, schema: dict) -> Validator:
+        import fastjsonschema  # type: ignore
+
+        fn = fastjsonschema.compile(schema)
+
+        def validate(payload: Any) -> Optional[str]:
+            try:
+                fn(payload)
+                return None
+            except fastjsonschema.JsonSchemaException as e:
+                return e.message
+
+        return validate
+
+    def _compile_jsonschema(self, schema: dict, key: str) -> Validator:
+        import jsonschema  # type: ignore
+
+        cls = jsonschema.validators.validator_for(schema)
+        meta_key = f"schema:{sha256_bytes(key.encode('utf-8'), self.backend_id.encode('utf-8'))}"
+        if not self.has_pass(meta_key):
+            cls.check_schema(schema)
+            self.record_pass(meta_key)
+        validator = cls(schema)
+
+        def validate(payload: Any) -> Optional[str]:
+            error = jsonschema.exceptions.best_match(validator.iter_errors(payload))
+            return None if error is None else error.message
+
+        return validate
+
+    # ---- validation ----
+    def check(self, data: bytes, schema_bytes: bytes, force: bool = False) -> Tuple[str, Optional[str]]:
+        """
+        Validate serialized JSON ``data``. Returns (status, message) with status one of:
+          "pass", "cached" (an earlier pass for identical bytes and backend), "fail", "skipped" (no backend)
+        """
+        key = sha256_bytes(data, schema_bytes, self.backend_id.encode("utf-8"))
+        if not force and self.has_pass(key):
+            return "cached", None
+        validator = self.compile(schema_bytes)
+        if validator is None:
+            return "skipped", "no JSON Schema backend installed (pip install jsonschema)"
+        message = validator(json.loads(data))
+        if message is not None:
+            return "fail", message
+        self.record_pass(key)
+        return "pass", None
+
+    def check_file(self, name: str, path: Path, force: bool = False) -> Tuple[str, Optional[str]]:
+        return self.check(Path(path).read_bytes(), self.schema_bytes(name), force)
+
+
+def report(status: str, message: Optional[str], label: str) -> bool:
+    """Print a check result in the scripts' [OK]/[WARN]/[FAIL] style; False only on failure."""
+    if status == "fail":
+        print(f"[FAIL] {label} schema validation failed:\n  {message}")
+        return False
+    if status == "skipped":
+        print(f"[WARN] {label}: {message}; skipping schema validation.")
+    elif status == "cached":
+        print(f"[OK] {label} validates against schema (cached verdict)")
+    else:
+        print(f"[OK] {label} validates against schema")
+    return True
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""scripts/validate_all.py
+
+Runs every pre-commit validation in one process with one shared SchemaService:
+each schema is compiled once, each JSON file is parsed once, and unchanged
+(artifact, schema) pairs reuse their cached verdict.
+
+Checks (all run; exit code is the first failure's):
+- manifest_latest.json      schema + referenced files exist (validate_manifest_latest.py)
+- latest thesis JSON/AGENT  schema validation (validate_latest.py)
+- dashboard spec            schema + card references (validate_spec_integrity.py)
+- all manifests/artifacts   hashes + versioning rules (check_integrity.py)
+
+USAGE
+  python3 scripts/validate_all.py
+
+OPTIONS
+  --repo-root <dir>       Repo root (default: parent of scripts/)
+  --strict                Spec check fails on warnings (unused cards)
+  --no-cache              Do not read or write cached verdicts or the hash index
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from check_integrity import check_integrity
+from schema_service import SchemaService
+from validate_latest import check_latest
+from validate_manifest_latest import check_manifest
+from validate_spec_integrity import check_spec, get_spec_path
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repo-root", default=str(Path(__file__).resolve().parents[1]))
+    ap.add_argument("--strict", action="store_true", help="Spec check fails on warnings (unused cards)")
+    ap.add_argument("--no-cache", action="store_true", help="Do not read or write cached verdicts")
+    args = ap.parse_args()
+
+    repo_root = Path(args.repo_root).resolve()
+    service = SchemaService(schema_dir=repo_root / "schemas", cache_dir=None if args.no_cache else repo_root / "var" / "regen")
+
+    codes = [
+        check_manifest(repo_root, service),
+        check_latest(repo_root, service),
+        check_spec(get_spec_path(repo_root, None, load=service.load_json), service, strict=args.strict),
+        check_integrity(repo_root, cache_path=None if args.no_cache else repo_root / "var" / "integrity" / "index.json"),
+    ]
+    return next((c for c in codes if c), 0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
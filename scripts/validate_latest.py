@@ -5,29 +5,42 @@ Used by pre-commit/CI to validate the latest HR thesis' derived artifacts.
 
 Behavior:
 - Finds the latest v*-HR_*.md (lexicographically sorted)
-- Runs: python3 scripts/regen.py <LATEST_HR> --validate-only
+- Validates the JSON/AGENT inferred from it (same checks as
+  `python3 scripts/regen.py <LATEST_HR> --validate-only`), in-process, with the
+  shared compiled validators and cached verdicts from scripts/schema_service.py
 - Exits non-zero on failure.
 """
 
 from __future__ import annotations
 
-import subprocess
 import sys
 from pathlib import Path
 
+from regen import infer_versions_from_hr
+from schema_service import SchemaService, report
+
 def find_latest_hr(repo_root: Path) -> Path:
     hrs = sorted(repo_root.glob("v*-HR_*.md"))
     if not hrs:
         raise FileNotFoundError("No HR files found matching v*-HR_*.md")
     return hrs[-1]
 
-def main() -> None:
-    repo_root = Path(__file__).resolve().parents[1]
+def check_latest(repo_root: Path, service: SchemaService) -> int:
     latest_hr = find_latest_hr(repo_root)
-    cmd = ["python3", str(repo_root / "scripts" / "regen.py"), str(latest_hr), "--validate-only"]
     print(f"[pre-commit] Validating latest HR: {latest_hr.name}")
-    res = subprocess.run(cmd, cwd=str(repo_root))
-    sys.exit(res.returncode)
+    _, json_name, agent_name = infer_versions_from_hr(latest_hr)
+    ok = True
+    for name, schema, label in ((json_name, "thesis", "THESIS"), (agent_name, "agent", "AGENT")):
+        path = repo_root / name
+        if not path.exists():
+            print(f"[FAIL] Missing inferred {label} output: {path}")
+            return 2
+        ok &= report(*service.check_file(schema, path), f"{label} ({name})")
+    return 0 if ok else 2
+
+def main() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.exit(check_latest(repo_root, SchemaService()))
 
 if __name__ == "__main__":
     main()
@@ -1,49 +1,59 @@
 #!/usr/bin/env python3
 """
 Validate manifest_latest.json:
-- Required keys exist
+- Required keys exist (schemas/manifest.schema.json)
 - Referenced files exist and are readable
 """
 
 from pathlib import Path
-import json
 import sys
 
-REQUIRED_KEYS = ["hr", "json", "agent", "dashboard_spec"]
+from schema_service import SchemaService, report
 
-def fail(msg: str) -> None:
-    print(f"[FAIL] {msg}")
-    sys.exit(1)
+REQUIRED_KEYS = ["hr", "json", "agent", "dashboard_spec"]
 
-def main() -> None:
-    repo_root = Path(".").resolve()
+def check_manifest(repo_root: Path, service: SchemaService) -> int:
     manifest_path = repo_root / "manifest_latest.json"
 
     if not manifest_path.exists():
-        fail("manifest_latest.json not found at repo root")
+        print("[FAIL] manifest_latest.json not found at repo root")
+        return 1
 
     try:
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = service.load_json(manifest_path)
     except Exception as e:
-        fail(f"Could not parse manifest_latest.json: {e}")
+        print(f"[FAIL] Could not parse manifest_latest.json: {e}")
+        return 1
+
+    if not report(*service.check_file("manifest", manifest_path), "manifest_latest.json"):
+        return 1
 
     latest = manifest.get("latest")
     if not isinstance(latest, dict):
-        fail("manifest_latest.json missing 'latest' object")
+        print("[FAIL] manifest_latest.json missing 'latest' object")
+        return 1
 
     for key in REQUIRED_KEYS:
         val = latest.get(key)
         if not val:
-            fail(f"manifest_latest.latest missing '{key}'")
+            print(f"[FAIL] manifest_latest.latest missing '{key}'")
+            return 1
 
         path = repo_root / val
         if not path.exists():
-            fail(f"{key} file does not exist: {val}")
+            print(f"[FAIL] {key} file does not exist: {val}")
+            return 1
 
         if not path.is_file():
-            fail(f"{key} path is not a file: {val}")
+            print(f"[FAIL] {key} path is not a file: {val}")
+            return 1
 
     print("[OK] manifest_latest.json integrity valid")
+    return 0
+
+def main() -> None:
+    repo_root = Path(".").resolve()
+    sys.exit(check_manifest(repo_root, SchemaService()))
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
 Validate DASHBOARD_SPEC integrity:
+- Spec structure validates against schemas/dashboard_spec.schema.json
 - Every card id referenced by pages[].cards[] must exist in dashboard.cards
 - Basic required keys exist on cards
 - Optional: warn on unused card defs
@@ -14,6 +15,8 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List, Set, Tuple
 
+from schema_service import SchemaService, report
+
 
 def load_json(path: Path) -> Dict[str, Any]:
     try:
@@ -22,14 +25,14 @@ def load_json(path: Path) -> Dict[str, Any]:
         raise SystemExit(f"[FAIL] Could not parse JSON: {path} -> {e}")
 
 
-def get_spec_path(repo_root: Path, spec_arg: str | None) -> Path:
+def get_spec_path(repo_root: Path, spec_arg: str | None, load=load_json) -> Path:
     if spec_arg:
         return (repo_root / spec_arg).resolve()
 
     # Default: read manifest_latest.json -> latest.dashboard_spec
     manifest = repo_root / "manifest_latest.json"
     if manifest.exists():
-        m = load_json(manifest)
+        m = load(manifest)
         latest = m.get("latest", {}) or {}
         spec_rel = latest.get("dashboard_spec")
         if spec_rel:
@@ -39,21 +42,19 @@ def get_spec_path(repo_root: Path, spec_arg: str | None) -> Path:
     return (repo_root / "DASHBOARD_SPEC_v1.0_20260118.json").resolve()
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--spec", default=None, help="Path to dashboard spec JSON (relative to repo root).")
-    ap.add_argument("--repo-root", default=".", help="Repo root (default: .)")
-    ap.add_argument("--strict", action="store_true", help="Fail on warnings (unused cards, missing optional fields).")
-    args = ap.parse_args()
-
-    repo_root = Path(args.repo_root).resolve()
-    spec_path = get_spec_path(repo_root, args.spec)
-
+def check_spec(spec_path: Path, service: SchemaService, strict: bool = False) -> int:
     if not spec_path.exists():
         print(f"[FAIL] Spec file not found: {spec_path}")
         return 2
 
-    spec = load_json(spec_path)
+    try:
+        spec = service.load_json(spec_path)
+    except Exception as e:
+        print(f"[FAIL] Could not parse JSON: {spec_path} -> {e}")
+        return 2
+
+    if not report(*service.check_file("dashboard_spec", spec_path), spec_path.name):
+        return 2
 
     # Basic structure
     try:
@@ -106,7 +107,7 @@ def main() -> int:
         print("[WARN] Unused card definitions (defined but not placed on any page):")
         for cid in unused:
             print(f"  - {cid}")
-        if args.strict:
+        if strict:
             ok = False
 
     if ok:
@@ -115,5 +116,16 @@ def main() -> int:
     return 1
 
 
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spec", default=None, help="Path to dashboard spec JSON (relative to repo root).")
+    ap.add_argument("--repo-root", default=".", help="Repo root (default: .)")
+    ap.add_argument("--strict", action="store_true", help="Fail on warnings (unused cards, missing optional fields).")
+    args = ap.parse_args()
+
+    repo_root = Path(args.repo_root).resolve()
+    return check_spec(get_spec_path(repo_root, args.spec), SchemaService(), strict=args.strict)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""scripts/version_diff.py
+
+Structural diff between two JSON artifacts (thesis JSON, AGENT, dashboard spec).
+
+- Subtrees are hashed Merkle-style (each node from its children's digests, memoized
+  per node), so identical branches compare in O(1) and are skipped without being walked.
+- Lists of objects are matched by an identity field (id, ticker, symbol, series,
+  rule, topic) when every element has a unique one; other lists are aligned with
+  a sequence match on element hashes (e.g. cards added to / removed from a page).
+- The result is a machine-readable delta that can be applied to the old document
+  in memory (``apply_delta``) without reloading the new one:
+
+    {"schema": "mt.delta.v1", "from_sha256": ..., "to_sha256": ..., "ops": [
+      {"op": "set",    "path": [...], "value": ..., "old": ...},
+      {"op": "remove", "path": [...], "old": ...},
+      {"op": "insert", "path": [...list], "index": 3, "value": ...},
+      {"op": "delete", "path": [...list], "index": 3, "old": ...}
+    ]}
+
+  Path segments are dict keys (str), list indices (int), or {"key": field,
+  "value": v} for an element of an identity-matched list.
+
+USAGE
+  python scripts/version_diff.py v1.6-JSON_20260118.json v1.7-JSON_20260118.json
+  python scripts/version_diff.py old_spec.json new_spec.json --delta delta.json
+
+OPTIONS
+  --delta <file>          Write the machine-readable delta to this file ("-" for stdout)
+  --markdown              Print the summary as a markdown bullet list (changelog drafts)
+  --apply <delta>         Apply a delta file to the first document and print the result
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import difflib
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+DELTA_SCHEMA = "mt.delta.v1"
+
+# Fields that identify an element of a list of objects, in preference order.
+KEY_FIELDS = ("id", "ticker", "symbol", "series", "rule", "topic")
+
+Segment = Union[str, int, Dict[str, Any]]
+
+
+class DeltaError(ValueError):
+    pass
+
+
+class SubtreeHasher:
+    """
+    Memoized Merkle hashes: a container's sha256 covers its sorted keys, its scalar
+    values' JSON text and its container children's digests.
+
+    Each node is hashed once per hasher (containers are memoized by identity), so
+    hashing a whole document is O(n) and every subtree's digest comes for free.
+    """
+
+    def __init__(self):
+        self._memo: Dict[int, tuple] = {}
+
+    def __call__(self, node: Any) -> str:
+        if not isinstance(node, (dict, list)):
+            return hashlib.sha256(self._text(node).encode("utf-8")).hexdigest()
+        hit = self._memo.get(id(node))
+        if hit is not None and hit[0] is node:
+            return hit[1]
+        children = node.values() if isinstance(node, dict) else node
+        if not any(isinstance(x, (dict, list)) for x in children):
+            text = self._text(node)  # leaf container: one canonical dump, same layout as below
+        else:
+            # A scalar child stands for itself, a container child for its digest ('#' cannot start a JSON scalar).
+            items = sorted(node.items()) if isinstance(node, dict) else enumerate(node)
+            parts = []
+            for k, x in items:
+                part = "#" + self(x) if isinstance(x, (dict, list)) else self._text(x)
+                parts.append(self._text(k) + ":" + part if isinstance(node, dict) else part)
+            text = ("{%s}" if isinstance(node, dict) else "[%s]") % ",".join(parts)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self._memo[id(node)] = (node, digest)
+        return digest
+
+    @staticmethod
+    def _text(value: Any) -> str:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def list_key(items: Sequence[Any]) -> Optional[str]:
+    """Identity field shared (and unique) across all elements, if any."""
+    if not items or not all(isinstance(x, dict) for x in items):
+        return None
+    for field in KEY_FIELDS:
+        values = [x.get(field) for x in items]
+        if all(isinstance(v, (str, int)) for v in values) and len(set(values)) == len(values):
+            return field
+    return None
+
+
+def diff(old: Any, new: Any, hasher: Optional[SubtreeHasher] = None) -> List[dict]:
+    hasher = hasher or SubtreeHasher()
+    ops: List[dict] = []
+    _diff(old, new, [], ops, hasher)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: List[Segment], ops: List[dict], hasher: SubtreeHasher) -> None:
+    if hasher(old) == hasher(new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k in old:
+            if k not in new:
+                ops.append({"op": "remove", "path": path + [k], "old": old[k]})
+        for k, v in new.items():
+            if k not in old:
+                ops.append({"op": "set", "path": path + [k], "value": v, "old": None})
+            else:
+                _diff(old[k], v, path + [k], ops, hasher)
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, ops, hasher)
+        return
+    ops.append({"op": "set", "path": path, "value": new, "old": old})
+
+
+def _diff_list(old: list, new: list, path: List[Segment], ops: List[dict], hasher: SubtreeHasher) -> None:
+    field = list_key(old) if list_key(old) == list_key(new) else None
+    if field:
+        before = {x[field]: x for x in old}
+        after = {x[field]: x for x in new}
+        # Keyed matching keeps surviving elements in place; a reorder falls back to positional.
+        if [k for k in before if k in after] != [k for k in after if k in before]:
+            field = None
+    if field:
+        for k, x in before.items():
+            if k not in after:
+                ops.append({"op": "remove", "path": path + [{"key": field, "value": k}], "old": x})
+        for k, x in after.items():
+            if k in before:
+                _diff(before[k], x, path + [{"key": field, "value": k}], ops, hasher)
+        for i, x in enumerate(new):
+            if x[field] not in before:
+                ops.append({"op": "insert", "path": path, "index": i, "value": x})
+        return
+
+    # Positional: align on element hashes; emit edits back-to-front so indices stay valid when applied in order.
+    a = [hasher(x) for x in old]
+    b = [hasher(x) for x in new]
+    edits: List[List[dict]] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(a=a, b=b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            continue
+        block: List[dict] = []
+        if tag == "replace" and i2 - i1 == j2 - j1:
+            for k in range(i2 - i1):
+                _diff(old[i1 + k], new[j1 + k], path + [i1 + k], block, hasher)
+        else:
+            block += [{"op": "delete", "path": path, "index": i, "old": old[i]} for i in reversed(range(i1, i2))]
+            block += [{"op": "insert", "path": path, "index": i1 + k, "value": new[j]} for k, j in enumerate(range(j1, j2))]
+        edits.append(block)
+    for block in reversed(edits):
+        ops.extend(block)
+
+
+def make_delta(old: Any, new: Any) -> dict:
+    hasher = SubtreeHasher()
+    return {
+        "schema": DELTA_SCHEMA,
+        "from_sha256": hasher(old),
+        "to_sha256": hasher(new),
+        "ops": diff(old, new, hasher),
+    }
+
+
+def _step(node: Any, seg: Segment) -> Any:
+    if isinstance(seg, dict):
+        return next(x for x in node if isinstance(x, dict) and x.get(seg["key"]) == seg["value"])
+    return node[seg]
+
+
+def _resolve(doc: Any, path: Sequence[Segment]) -> Any:
+    node = doc
+    try:
+        for seg in path:
+            node = _step(node, seg)
+    except (KeyError, IndexError, TypeError, StopIteration):
+        raise DeltaError(f"path does not resolve: {format_path(path)}")
+    return node
+
+
+def apply_delta(doc: Any, delta: dict, copy_doc: bool = True, verify: bool = True) -> Any:
+    """Apply ``delta`` to ``doc`` (the old document). Verifies from/to hashes unless verify=False."""
+    if delta.get("schema") != DELTA_SCHEMA:
+        raise DeltaError(f"unsupported delta schema: {delta.get('schema')!r}")
+    hasher = SubtreeHasher()
+    if verify and hasher(doc) != delta["from_sha256"]:
+        raise DeltaError("document does not match the delta's from_sha256")
+    out = copy.deepcopy(doc) if copy_doc else doc
+
+    for op in delta["ops"]:
+        kind, path = op["op"], op["path"]
+        if kind in ("insert", "delete"):
+            target = _resolve(out, path)
+            if kind == "insert":
+                target.insert(op["index"], op["value"])
+            else:
+                del target[op["index"]]
+            continue
+        if not path:
+            if kind != "set":
+                raise DeltaError("cannot remove the document root")
+            out = copy.deepcopy(op["value"])
+            continue
+        parent, last = _resolve(out, path[:-1]), path[-1]
+        if isinstance(last, dict):
+            idx = next(i for i, x in enumerate(parent) if isinstance(x, dict) and x.get(last["key"]) == last["value"])
+            if kind == "remove":
+                del parent[idx]
+            else:
+                parent[idx] = op["value"]
+        elif kind == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+
+    if verify and SubtreeHasher()(out) != delta["to_sha256"]:
+        raise DeltaError("result does not match the delta's to_sha256")
+    return out
+
+
+def format_path(path: Sequence[Segment]) -> str:
+    out = ""
+    for seg in path:
+        if isinstance(seg, dict):
+            out += f"[{seg['key']}={seg['value']}]"
+        elif isinstance(seg, int):
+            out += f"[{seg}]"
+        else:
+            out += f".{seg}" if out else seg
+    return out or "<root>"
+
+
+def _short(value: Any, limit: int = 80) -> str:
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def summarize(ops: Sequence[dict]) -> List[str]:
+    lines = []
+    for op in ops:
+        where = format_path(op["path"])
+        if op["op"] == "set" and op.get("old") is None:
+            lines.append(f"+ {where}: {_short(op['value'])}")
+        elif op["op"] == "set":
+            lines.append(f"~ {where}: {_short(op['old'])} -> {_short(op['value'])}")
+        elif op["op"] == "remove":
+            lines.append(f"- {where}")
+        elif op["op"] == "insert":
+            lines.append(f"+ {where}[{op['index']}]: {_short(op['value'])}")
+        else:
+            lines.append(f"- {where}[{op['index']}]: {_short(op['old'])}")
+    return lines
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("old", help="Older JSON document")
+    ap.add_argument("new", nargs="?", help="Newer JSON document")
+    ap.add_argument("--delta", default=None, help="Write the delta JSON to this file ('-' for stdout)")
+    ap.add_argument("--markdown", action="store_true", help="Print the summary as markdown bullets")
+    ap.add_argument("--apply", default=None, help="Apply this delta file to OLD and print the result")
+    args = ap.parse_args()
+
+    old = json.loads(Path(args.old).read_text(encoding="utf-8"))
+    if args.apply:
+        delta = json.loads(Path(args.apply).read_text(encoding="utf-8"))
+        try:
+            print(json.dumps(apply_delta(old, delta), indent=2, ensure_ascii=False))
+        except DeltaError as e:
+            print(f"[FAIL] {e}")
+            return 1
+        return 0
+    if not args.new:
+        ap.error("NEW is required unless --apply is given")
+
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    delta = make_delta(old, new)
+
+    if args.delta:
+        text = json.dumps(delta, indent=2, ensure_ascii=False)
+        if args.delta == "-":
+            print(text)
+            return 0
+        Path(args.delta).write_text(text + "\n", encoding="utf-8")
+
+    lines = summarize(delta["ops"])
+    if args.markdown:
+        for line in lines:
+            print(f"- `{line[0]}` {line[2:]}")
+    else:
+        print(f"[OK] {Path(args.old).name} -> {Path(args.new).name}: {len(delta['ops'])} changes")
+        for line in lines:
+            print(f"  {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
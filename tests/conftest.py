@@ -0,0 +1,9 @@
+"""Puts dashboard/, library/py and scripts/ on sys.path, as app.py and the scripts do."""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for p in (REPO_ROOT / "dashboard", REPO_ROOT / "library" / "py", REPO_ROOT / "scripts"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
@@ -0,0 +1,83 @@
+"""utils.adjustment: dividend/split factors and adjusted price views."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from adapters.market_data import ADJ_CLOSE, CLOSE, PriceSeries
+from utils.adjustment import adjusted_series, adjustment_factors
+
+DATES = pd.date_range("2024-01-01", periods=6, freq="D")
+CLOSE_PX = [100.0, 100.0, 50.0, 50.0, 40.0, 40.0]
+
+
+def actions(rows):
+    """rows: (ex-date, dividend amount, split ratio)."""
+    idx = pd.DatetimeIndex([pd.Timestamp(d) for d, _, _ in rows])
+    return pd.DataFrame({"amount": [a for _, a, _ in rows], "split": [s for _, _, s in rows]}, index=idx)
+
+
+def test_no_actions_means_unit_factors():
+    for acts in (None, actions([])):
+        div, split = adjustment_factors(DATES, CLOSE_PX, acts)
+        assert_allclose(div, np.ones(6))
+        assert_allclose(split, np.ones(6))
+
+
+def test_dividends_scale_every_earlier_bar_and_compound():
+    div, split = adjustment_factors(DATES, CLOSE_PX, actions([("2024-01-03", 2.0, 0.0), ("2024-01-05", 1.0, np.nan)]))
+    first, second = 1 - 2.0 / 100.0, 1 - 1.0 / 50.0  # each over the close before its ex-date
+    assert_allclose(div, [first * second, first * second, second, second, 1.0, 1.0])
+    assert_allclose(split, np.ones(6))
+
+
+def test_splits_are_undone_before_the_ex_date():
+    div, split = adjustment_factors(DATES, CLOSE_PX, actions([("2024-01-03", 0.0, 2.0), ("2024-01-05", 0.0, 1.0)]))
+    assert_allclose(split, [2.0, 2.0, 1.0, 1.0, 1.0, 1.0])  # ratio 1 is not a split
+    assert_allclose(div, np.ones(6))
+
+
+def test_events_outside_the_history_are_ignored():
+    acts = actions([("2023-12-15", 5.0, 3.0), ("2024-01-01", 1.0, 0.0), ("2024-02-01", 1.0, 4.0)])
+    div, split = adjustment_factors(DATES, CLOSE_PX, acts)
+    assert_allclose(div, np.ones(6))  # first-bar dividend has no previous close
+    assert_allclose(split, np.ones(6))
+
+
+def test_ex_date_between_bars_and_tz_aware_index():
+    dates = pd.DatetimeIndex(["2024-01-05 16:00", "2024-01-08 16:00", "2024-01-09 16:00"]).tz_localize("America/New_York")
+    div, _ = adjustment_factors(dates, [10.0, 10.0, 10.0], actions([("2024-01-06", 0.5, 0.0)]))  # Saturday
+    assert_allclose(div, [0.95, 1.0, 1.0])
+
+
+def test_dividend_at_or_above_the_close_is_dropped():
+    div, _ = adjustment_factors(DATES, CLOSE_PX, actions([("2024-01-03", 100.0, 0.0)]))
+    assert_allclose(div, np.ones(6))
+
+
+def series(kind=CLOSE):
+    return PriceSeries(dates=list(DATES), close=list(CLOSE_PX), as_of_utc="2024-01-06T00:00:00+00:00", close_kind=kind)
+
+
+def test_adjusted_series_bases():
+    acts = actions([("2024-01-03", 2.0, 2.0)])
+    s = series()
+    assert adjusted_series(s, acts, "close") is s
+
+    tr = adjusted_series(s, acts, "total_return")
+    assert tr.close_kind == "total_return" and s.close == CLOSE_PX  # input untouched
+    assert_allclose(tr.close, [98.0, 98.0, 50.0, 50.0, 40.0, 40.0])
+
+    raw = adjusted_series(s, acts, "unadjusted")
+    assert raw.close_kind == "unadjusted"
+    assert_allclose(raw.close, [200.0, 200.0, 50.0, 50.0, 40.0, 40.0])
+
+
+def test_adj_close_series_only_serves_total_return():
+    s = series(ADJ_CLOSE)
+    assert adjusted_series(s, None, "total_return") is s
+    with pytest.raises(ValueError):
+        adjusted_series(s, None, "unadjusted")
+    with pytest.raises(ValueError):
+        adjusted_series(series(), None, "dividends")
@@ -0,0 +1,81 @@
+"""utils.alerts: debounce on distinct inputs, dedupe per activation, state persistence."""
+
+import json
+
+from adapters.alert_sinks import MemorySink
+from utils.alerts import AlertEngine, rules_from_spec
+from utils.signals import SignalRegistry
+
+SPEC = {
+    "alerting": {
+        "alerts": [
+            {"id": "ism_red", "condition": "ISM_PMI < 48", "severity": "RED", "message": "contraction"},
+            {"id": "labor_red", "condition": "UNEMPLOYMENT_RATE >= 4.5 for 2 months", "severity": "RED", "message": "labor"},
+        ]
+    }
+}
+
+
+def make_engine(data, **kw):
+    reg = SignalRegistry()
+    for key in ("ISM_PMI", "UNEMPLOYMENT_RATE"):
+        reg.register(key, lambda k=key: data.get(k))
+    sink = MemorySink()
+    return AlertEngine(rules_from_spec(SPEC), reg, sinks=[sink], **kw), sink
+
+
+def fired(sink, alert_id):
+    return [e["event"] for e in sink.events if e["alert_id"] == alert_id]
+
+
+def test_point_in_time_condition_needs_distinct_inputs():
+    data = {"ISM_PMI": [50.0, 47.0], "UNEMPLOYMENT_RATE": [4.0, 4.0]}
+    engine, sink = make_engine(data, debounce=2)
+    engine.evaluate()
+    engine.evaluate()  # same data: no progress
+    assert fired(sink, "ism_red") == []
+    data["ISM_PMI"] = [50.0, 47.0, 46.5]
+    engine.evaluate()
+    assert fired(sink, "ism_red") == ["fired"]
+    data["ISM_PMI"] = [47.0, 46.5, 46.0]
+    engine.evaluate()
+    assert fired(sink, "ism_red") == ["fired"]  # deduped while active
+
+
+def test_observation_counting_condition_is_not_debounced_twice():
+    data = {"ISM_PMI": [50.0], "UNEMPLOYMENT_RATE": [4.0, 4.6, 4.7]}
+    engine, sink = make_engine(data, debounce=2)
+    report = engine.evaluate()
+    assert fired(sink, "labor_red") == ["fired"]  # "for 2 months" already counted the observations
+    assert engine.debounce_for(engine.rules["ism_red"]) == 2 and engine.debounce_for(engine.rules["labor_red"]) == 1
+    assert [e["alert_id"] for e in report.events] == ["labor_red"]
+
+
+def test_state_round_trips_and_tolerates_unknown_keys(tmp_path):
+    state = tmp_path / "state.json"
+    data = {"ISM_PMI": [47.0], "UNEMPLOYMENT_RATE": [4.6, 4.7]}
+    engine, _ = make_engine(data, state_path=state, debounce=1)
+    engine.evaluate()
+    assert {a["id"] for a in engine.active()} == {"ism_red", "labor_red"}
+
+    raw = json.loads(state.read_text(encoding="utf-8"))
+    raw["alerts"]["ism_red"]["retired_field"] = 1  # written by another version
+    raw["alerts"]["labor_red"] = {"active": True}  # older layout: missing keys take defaults
+    raw["alerts"]["gone"] = {"active": True}
+    raw["alerts"]["broken"] = "not a dict"
+    state.write_text(json.dumps(raw), encoding="utf-8")
+
+    again, sink = make_engine(data, state_path=state, debounce=1)
+    assert again.states["ism_red"].active and again.states["ism_red"].fire_count == 1
+    assert again.states["labor_red"].active and again.states["labor_red"].fire_count == 0
+    again.evaluate()
+    assert fired(sink, "ism_red") == []  # unchanged inputs: nothing re-fires
+
+
+def test_missing_signal_neither_fires_nor_resolves():
+    data = {"ISM_PMI": [47.0], "UNEMPLOYMENT_RATE": [4.0]}
+    engine, sink = make_engine(data, debounce=1)
+    engine.evaluate()
+    data["ISM_PMI"] = None
+    engine.evaluate()
+    assert engine.states["ism_red"].active and fired(sink, "ism_red") == ["fired"]
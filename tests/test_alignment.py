@@ -0,0 +1,73 @@
+"""utils.alignment: one session calendar, fill policies and pair views."""
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_array_equal
+
+from utils.alignment import SessionCalendar, align
+
+DAYS = pd.bdate_range("2026-01-05", periods=6)
+
+
+@dataclass
+class Series:
+    dates: List[pd.Timestamp]
+    close: List[float]
+    as_of_utc: str = ""
+
+
+def series(days, closes) -> Series:
+    return Series(dates=list(days), close=list(closes))
+
+
+@pytest.fixture
+def prices():
+    return {
+        "SPY": series(DAYS, [1, 2, 3, 4, 5, 6]),
+        "HYG": series(DAYS[[0, 1, 4, 5]], [10, 11, 14, 15]),  # two missing sessions
+        "LQD": series(DAYS[1:], [21, 22, 23, 24, 25]),  # starts a day late
+    }
+
+
+def test_calendar_is_the_benchmark_sessions(prices):
+    extra = series(list(DAYS) + [DAYS[-1] + pd.Timedelta(days=3)], range(7))
+    cal = SessionCalendar.build({**prices, "X": extra}, calendar_symbol="SPY")
+    assert list(cal.sessions) == list(DAYS)
+    assert_array_equal(cal.positions(extra.dates), [0, 1, 2, 3, 4, 5, -1])
+    assert len(SessionCalendar.build({**prices, "X": extra})) == 7  # union without a calendar symbol
+
+
+def test_intraday_timestamps_map_to_their_session():
+    stamps = pd.DatetimeIndex(["2026-01-05 15:00", "2026-01-05 20:59", "2026-01-06 14:31"], tz="UTC")
+    m = align({"A": series(stamps, [1.0, 2.0, 3.0])}, calendar=SessionCalendar(DAYS))
+    assert_array_equal(m.column("A")[:3], [2.0, 3.0, np.nan])  # later bar wins within a session
+
+
+def test_fill_none_leaves_gaps_and_pair_reports_them(prices):
+    m = align(prices, calendar_symbol="SPY")
+    assert np.isnan(m.column("HYG")[[2, 3]]).all()
+    assert m.observed[:, m.symbols.index("HYG")].sum() == 4
+    pair = m.pair("HYG", "LQD")
+    assert list(pair.index) == list(DAYS[[1, 4, 5]])
+    assert m.pair_dropped("HYG", "LQD") == 2  # sessions 2 and 3; session 0 predates LQD
+    assert m.pair_dropped("SPY", "LQD") == 0 and m.pair_dropped("SPY", "NOPE") == 0
+
+
+def test_ffill_respects_the_fill_limit(prices):
+    one = align(prices, calendar_symbol="SPY", fill_policy="ffill", fill_limit=1)
+    assert_array_equal(one.column("HYG"), [10, 11, 11, np.nan, 14, 15])
+    assert not one.observed[2, one.symbols.index("HYG")]  # filled, not observed
+    assert one.pair_dropped("HYG", "LQD") == 1
+
+    unlimited = align(prices, calendar_symbol="SPY", fill_policy="ffill", fill_limit=None)
+    assert_array_equal(unlimited.column("HYG"), [10, 11, 11, 11, 14, 15])
+    assert np.isnan(unlimited.column("LQD")[0])  # nothing to carry before the first bar
+
+
+def test_unknown_fill_policy_is_rejected(prices):
+    with pytest.raises(ValueError):
+        align(prices, fill_policy="bfill")
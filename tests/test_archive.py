@@ -0,0 +1,116 @@
+"""mt_fetcher.archive: export/import round trip and corruption detection."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from mt_fetcher import archive
+from mt_fetcher.archive import export_run, import_run, read_index, run_dirs
+from mt_fetcher.evidence import pack, sha256_file
+from mt_fetcher.events import EventLog
+from mt_fetcher.normalize import normalize_run
+
+RUN = "run-20260118"
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A packed + normalized run: compressible text, incompressible bytes and a duplicate blob."""
+    var_root = tmp_path / "src"
+    dirs = run_dirs(var_root, RUN)
+    raw = dirs["raw"]
+    (raw / "sub").mkdir(parents=True)
+    files = {
+        "notes.txt": b"credit spreads widening\n" * 2000,
+        "sub/image.bin": os.urandom(50_000),  # will not shrink: stored as-is
+        "copy.txt": b"credit spreads widening\n" * 2000,
+        "context.json": json.dumps({"tags": ["macro"], "url": "https://example.com"}).encode("utf-8"),
+    }
+    for rel, body in files.items():
+        (raw / rel).write_bytes(body)
+    pack(dirs["evidence"], [raw / rel for rel in files], {"run_id": RUN, "source_id": "src"})
+    normalize_run(run_id=RUN, source_id="src", raw_dir=raw, evidence_manifest=dirs["evidence"] / "manifest.json", out_dir=dirs["normalize"], columnar=True)
+    return var_root, files
+
+
+def tree(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_round_trip(source, tmp_path):
+    var_root, files = source
+    exported = export_run(var_root, RUN, tmp_path / "run.mtar", codec="zlib", workers=2)
+    assert exported.raw_files == len(files)
+    index = read_index(exported.archive_path)
+    codecs = {m["name"]: m["codec"] for m in index["members"]}
+    assert sum(1 for m in index["members"] if m["kind"] == "blob") == len(files) - 1  # duplicate stored once
+    assert "none" in codecs.values() and "zlib" in codecs.values()
+
+    dest = tmp_path / "dest"
+    log = tmp_path / "events.jsonl"
+    result = import_run(exported.archive_path, dest, workers=2, event_log=log)
+    src_dirs, dst_dirs = run_dirs(var_root, RUN), run_dirs(dest, RUN)
+    outputs = len(tree(src_dirs["normalize"])) + 1  # normalize outputs + provenance.json
+    assert (result.written, result.skipped) == (len(files) + outputs, 0)
+    assert tree(dst_dirs["raw"]) == tree(src_dirs["raw"])
+    assert tree(dst_dirs["normalize"]) == tree(src_dirs["normalize"])
+    assert (dst_dirs["evidence"] / "provenance.json").read_bytes() == (src_dirs["evidence"] / "provenance.json").read_bytes()
+
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    for ent in manifest["files"]:
+        path = Path(ent["path"])
+        assert path.is_relative_to(dst_dirs["raw"].resolve()) and sha256_file(path) == ent["sha256"]
+    events, _ = EventLog(log).read()
+    assert [e["stage"] for e in events] == ["import"]
+
+    again = import_run(exported.archive_path, dest)
+    assert (again.written, again.skipped) == (outputs, len(files))
+
+
+def test_import_under_new_run_id(source, tmp_path):
+    var_root, _ = source
+    archive = export_run(var_root, RUN, tmp_path / "run.mtar", codec="zlib").archive_path
+    result = import_run(archive, tmp_path / "dest", run_id="renamed", check=True)
+    assert result.run_id == "renamed"
+    assert tree(run_dirs(tmp_path / "dest", "renamed")["raw"]) == tree(run_dirs(var_root, RUN)["raw"])
+
+
+@pytest.mark.parametrize("codec", ["zlib", "none"])
+def test_corrupt_member_is_rejected(source, tmp_path, codec):
+    var_root, _ = source
+    archive = export_run(var_root, RUN, tmp_path / "run.mtar", codec="zlib").archive_path
+    member = next(m for m in read_index(archive)["members"] if m["kind"] == "blob" and m["codec"] == codec)
+    with open(archive, "r+b") as f:
+        f.seek(member["offset"] + member["stored"] // 2)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    with pytest.raises(ValueError):
+        import_run(archive, tmp_path / "dest")
+    assert list((tmp_path / "dest").rglob("*.tmp")) == []
+
+
+def test_export_needs_an_evidence_manifest(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        export_run(tmp_path, "missing", tmp_path / "out.mtar")
+
+
+def test_failed_export_leaves_nothing_behind(source, tmp_path, monkeypatch):
+    var_root, _ = source
+    (run_dirs(var_root, RUN)["raw"] / "notes.txt").write_bytes(b"edited after pack\n")
+    real_spool, spools = tempfile.SpooledTemporaryFile, []
+
+    def spool(*args, **kwargs):
+        spools.append(real_spool(*args, **kwargs))
+        return spools[-1]
+
+    monkeypatch.setattr(archive.tempfile, "SpooledTemporaryFile", spool)
+    out = tmp_path / "run.mtar"
+    with pytest.raises(ValueError, match="no longer matches"):
+        export_run(var_root, RUN, out, codec="zlib", workers=2)
+    assert not out.exists() and not out.with_name(out.name + ".tmp").exists()
+    assert spools and all(s.closed for s in spools)
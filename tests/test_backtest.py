@@ -0,0 +1,67 @@
+"""utils.backtest: vectorized replay, credit trend rule and flip accounting."""
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+
+from utils.backtest import GREEN, RED, STATUS_LABELS, UNKNOWN, YELLOW, PriceMatrix, credit_status, credit_trend, flip_counts, last_known, run_backtest
+from utils.signals import credit_proxy, credit_states
+from utils.signals import credit_trend as signal_trend
+
+
+def random_prices(seed: int, n: int = 300) -> PriceMatrix:
+    rng = np.random.default_rng(seed)
+    symbols = ["SPY", "HYG", "LQD", "XLE", "XLB", "CAT"]
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, (n, len(symbols))), axis=0))
+    closes[rng.random(closes.shape) < 0.02] = np.nan
+    return PriceMatrix(dates=pd.bdate_range("2024-01-02", periods=n), symbols=symbols, closes=closes)
+
+
+def test_flip_counts_skips_unknown_days():
+    status = np.array([[GREEN, GREEN], [UNKNOWN, UNKNOWN], [GREEN, RED], [UNKNOWN, RED], [YELLOW, RED]])
+    assert_array_equal(flip_counts(status), [1, 1])
+    assert_array_equal(flip_counts(np.array([UNKNOWN, UNKNOWN, GREEN])), [0])
+
+
+def test_last_known():
+    known = np.array([False, True, False, False, True, False])
+    assert_array_equal(last_known(known), [-1, 1, 1, 1, 4, 4])
+
+
+def test_falling_credit_proxy_turns_yellow_then_red():
+    n = 120
+    lqd = np.full(n, 100.0)
+    hyg = np.concatenate([np.full(80, 106.0), 106.0 - 0.2 * np.arange(1, n - 79)])  # HYG/LQD ~1.06, then falling
+    status = credit_status(credit_trend(hyg, lqd, 50), sustained=5)
+    assert (status[:50] == UNKNOWN).all()  # no slope before two SMA values
+    assert (status[50:80] == GREEN).all()  # flat proxy: trend 0 is not tightening
+    assert status[80] == YELLOW
+    assert (status[84:] == RED).all() and (status[80:84] == YELLOW).all()
+
+
+def test_rising_credit_proxy_stays_green():
+    hyg = 100.0 + 0.1 * np.arange(120)
+    status = credit_status(credit_trend(hyg, np.full(120, 100.0)))
+    assert (status[50:] == GREEN).all()
+
+
+def test_credit_states_reset_on_gaps():
+    assert credit_states([float("nan"), -1.0, -1.0, float("nan"), -1.0, 1.0], sustained=2) == ["UNKNOWN", "YELLOW", "RED", "UNKNOWN", "YELLOW", "GREEN"]
+
+
+def test_backtest_credit_matches_the_signal_rule():
+    prices = random_prices(11)
+    result = run_backtest(prices, ["XLE", "XLB"], min_rows=40)
+    proxy = credit_proxy(prices.column("HYG"), prices.column("LQD"))
+    labels = credit_states([np.nan] * 39 + signal_trend(proxy)[39:])
+    assert STATUS_LABELS[result.credit].tolist() == labels
+
+
+def test_run_backtest_withholds_status_before_min_rows():
+    prices = random_prices(3)
+    result = run_backtest(prices, ["XLE", "XLB"], window=5, min_rows=60)
+    assert (result.rotation[:59] == UNKNOWN).all()
+    assert (result.credit[:59] == UNKNOWN).all()
+    stats = result.flip_stats()
+    assert list(stats.index) == ["XLE", "XLB", "CREDIT", "THESIS"]
+    assert_array_equal(stats["flips"].to_numpy(), flip_counts(np.column_stack([result.rotation, result.credit, result.thesis])))
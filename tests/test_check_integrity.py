@@ -0,0 +1,71 @@
+"""scripts/check_integrity: cached index, manifest pins and naming rules."""
+
+import json
+
+import pytest
+
+from check_integrity import IntegrityIndex, check_integrity, manifest_refs, record
+
+
+def write_json(path, doc):
+    path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "v1.7-HR_20260118.md").write_text("# Thesis\n", encoding="utf-8")
+    (tmp_path / "v1.7.1-DATA_20260118.md").write_text("# Patch\n", encoding="utf-8")
+    write_json(tmp_path / "v1.7-JSON_20260118.json", {"meta": {"version": "v1.7-JSON_20260118", "source_of_truth": "v1.7-HR_20260118"}})
+    write_json(
+        tmp_path / "manifest_20260118.json",
+        {
+            "latest": {"hr": "v1.7-HR_20260118", "data_patch_latest": "v1.7.1-DATA_20260118"},
+            "artifacts": [
+                {"type": "hr", "version": "v1.7-HR_20260118", "filename": "v1.7-HR_20260118"},  # extensionless ref
+                {"type": "json", "version": "v1.7-JSON_20260118", "filename": "v1.7-JSON_20260118.json"},
+            ],
+        },
+    )
+    return tmp_path
+
+
+def test_clean_repo_passes_and_index_is_cached(repo, tmp_path):
+    cache = tmp_path / "cache" / "index.json"
+    assert check_integrity(repo, cache) == 0
+    index = IntegrityIndex(repo, cache).build()
+    assert index.rehashed == 0 and "v1.7-HR_20260118.md" in index.hashes
+
+    (repo / "v1.7.1-DATA_20260118.md").write_text("# Patch, edited\n", encoding="utf-8")
+    assert IntegrityIndex(repo, cache).build().rehashed == 1
+
+
+def test_pins_on_frozen_artifacts(repo, capsys):
+    index = IntegrityIndex(repo, None).build()
+    assert record(repo, "manifest_20260118.json", index) == 1
+    arts = json.loads((repo / "manifest_20260118.json").read_text(encoding="utf-8"))["artifacts"]
+    assert arts[0]["sha256"] == index.hashes["v1.7-HR_20260118.md"] and "sha256" not in arts[1]
+    assert check_integrity(repo, None) == 0
+
+    (repo / "v1.7-HR_20260118.md").write_text("# Thesis, edited after freeze\n", encoding="utf-8")
+    assert check_integrity(repo, None) == 1
+    assert "sha256 mismatch for v1.7-HR_20260118" in capsys.readouterr().out
+
+
+def test_rule_violations(repo, capsys):
+    write_json(repo / "v1.7-AGENT_20260118.json", {"meta": {"version": "v1.6-AGENT_20260118", "source_of_truth": "v1.6-HR_20260118"}})
+    (repo / "v1.8-HR_2026.md").write_text("# Bad name\n", encoding="utf-8")
+    assert check_integrity(repo, None) == 1
+    out = capsys.readouterr().out
+    assert "v1.8-HR_2026.md: filename does not follow the HR versioning format" in out
+    assert "meta.version 'v1.6-AGENT_20260118'" in out and "meta.source_of_truth 'v1.6-HR_20260118'" in out
+
+
+def test_unresolved_manifest_refs(repo, capsys):
+    doc = json.loads((repo / "manifest_20260118.json").read_text(encoding="utf-8"))
+    doc["latest"]["agent"] = "v1.7-AGENT_20260118"
+    doc["artifacts"].append({"type": "json", "version": "v1.6-JSON_20260118", "filename": "v1.6-JSON_20260118.json"})
+    write_json(repo / "manifest_20260118.json", doc)
+    assert set(manifest_refs(repo)) == {"manifest_20260118.json"}
+    assert check_integrity(repo, None) == 1
+    out = capsys.readouterr().out
+    assert "latest.agent does not resolve" in out and "artifact does not resolve: v1.6-JSON_20260118.json" in out
@@ -0,0 +1,95 @@
+"""mt_fetcher.columnar: items.mtc must round-trip items.jsonl exactly."""
+
+import hashlib
+import json
+
+import pytest
+
+from mt_fetcher.columnar import ABSENT, ItemsTable, columnar_to_jsonl, jsonl_to_columnar, read_items, write_items
+from mt_fetcher.normalize import normalize_run
+
+
+def sha(i: int) -> str:
+    return hashlib.sha256(str(i).encode("utf-8")).hexdigest()
+
+
+def item(i: int, **extra):
+    base = {
+        "schema": "mt.normalize.item.v1",
+        "run_id": "run-1",
+        "source_id": "src",
+        "retrieved_utc": "2026-01-18T00:00:00Z",
+        "title": f"artifact:{sha(i)[:12]}",
+        "url": "",
+        "content_type": "application/pdf" if i % 2 else "text/plain",
+        "raw_evidence_sha256": sha(i),
+        "size_bytes": 1000 + i,
+        "tags": ["macro", "rates"],
+    }
+    base.update(extra)
+    return base
+
+
+ODD_ITEMS = [
+    item(0),
+    item(1, raw_evidence_sha256="", size_bytes=1.5),  # values that do not fit their encoding
+    item(2, raw_evidence_sha256="NOT-HEX", title="Ünïcode — title"),
+    item(3, content_meta={"pages": 3}),  # unknown key -> extra column
+    {k: v for k, v in item(4).items() if k not in ("url", "size_bytes")},  # absent keys
+    item(5, raw_evidence_sha256=sha(0)),  # duplicate sha
+]
+
+
+def test_round_trip_is_exact(tmp_path):
+    path = write_items(ODD_ITEMS, tmp_path / "items.mtc")
+    assert read_items(path) == ODD_ITEMS
+
+
+def test_jsonl_conversion_is_byte_identical(tmp_path):
+    jsonl = tmp_path / "items.jsonl"
+    jsonl.write_text("".join(json.dumps(i, sort_keys=True) + "\n" for i in ODD_ITEMS), encoding="utf-8")
+    mtc = jsonl_to_columnar(jsonl)
+    back = columnar_to_jsonl(mtc, tmp_path / "back.jsonl")
+    assert back.read_bytes() == jsonl.read_bytes()
+
+
+def test_column_scans(tmp_path):
+    with ItemsTable(write_items(ODD_ITEMS, tmp_path / "items.mtc")) as t:
+        assert len(t) == len(ODD_ITEMS)
+        assert t.find_sha256(sha(0)) == [0, 5]
+        assert t.find_sha256("NOT-HEX") == [2]
+        assert t.value_counts("content_type") == {'"text/plain"': 3, '"application/pdf"': 3}
+        assert t.codes("url")[4] == ABSENT
+        assert "content_meta" not in t.names and t.row(3)["content_meta"] == {"pages": 3}
+        with pytest.raises(KeyError):
+            t.value("size_bytes", 4)
+
+
+def test_rejects_other_files(tmp_path):
+    bad = tmp_path / "items.jsonl"
+    bad.write_text("{}\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        ItemsTable(bad)
+    empty = tmp_path / "empty.mtc"
+    empty.write_bytes(b"")
+    with pytest.raises(ValueError):
+        ItemsTable(empty)
+
+
+def test_normalize_writes_matching_twin(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    files = []
+    for i, body in enumerate([b"%PDF-1.4 a", b"plain text", b"plain text"]):
+        p = raw / f"f{i}.{'pdf' if i == 0 else 'txt'}"
+        p.write_bytes(body)
+        files.append({"path": str(p), "sha256": hashlib.sha256(body).hexdigest(), "size_bytes": len(body)})
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"files": files}), encoding="utf-8")
+
+    result = normalize_run(run_id="r1", source_id="s1", raw_dir=raw, evidence_manifest=manifest, out_dir=tmp_path / "out", columnar=True)
+    assert result.count == 3
+    back = columnar_to_jsonl(result.columnar_path, tmp_path / "back.jsonl")
+    assert back.read_bytes() == result.items_path.read_bytes()
+    meta = json.loads((tmp_path / "out" / "normalize.meta.json").read_text(encoding="utf-8"))
+    assert meta["formats"] == ["jsonl", "mtc"]
@@ -0,0 +1,93 @@
+"""adapters.data_source: fixture recording, replay period cutting and fault injection."""
+
+import pandas as pd
+import pytest
+
+from adapters.data_source import FaultInjector, Fixtures, ReplaySource, build_source
+from adapters.market_data import PriceSeries
+from utils.prefetch import PrefetchResult
+
+DAYS = pd.bdate_range("2023-01-02", "2025-01-10")
+
+
+def series(dates, start=100.0):
+    return PriceSeries(dates=list(dates), close=[start + i for i in range(len(dates))], as_of_utc="", close_kind="close")
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    fx = Fixtures(tmp_path / "fixtures")
+    fx.save_prices("SPY", "1d", series(DAYS))
+    return fx
+
+
+@pytest.mark.parametrize("period", ["1d", "5d", "1mo", "3mo", "1y", "2y"])
+def test_replay_cut_matches_the_prefetch_slice(fixtures, period):
+    full = fixtures.load_prices("SPY", "1d")
+    got = ReplaySource(fixtures).fetch_prices(["SPY"], period, "1d")["SPY"]
+    want = PrefetchResult(series={("SPY", "1d"): full}).slice("SPY", "1d", period)
+    assert got.dates == want.dates and got.close == want.close
+    assert got.dates[-1] == full.dates[-1] and got.close[-1] == full.close[-1]
+
+
+def test_replay_cut_boundary_is_exclusive(fixtures):
+    got = ReplaySource(fixtures).fetch_prices(["SPY"], "1y", "1d")["SPY"]
+    cutoff = pd.Timestamp("2025-01-10") - pd.Timedelta(days=366)  # 2024-01-10, a business day
+    assert cutoff in DAYS
+    assert got.dates[0] == cutoff + pd.offsets.BDay(1)
+
+
+@pytest.mark.parametrize("period", ["5y", "10y", "max"])
+def test_replay_returns_everything_for_long_periods(fixtures, period):
+    got = ReplaySource(fixtures).fetch_prices(["SPY"], period, "1d")["SPY"]
+    assert len(got.dates) == len(DAYS)
+
+
+def test_replay_intraday_cut(tmp_path):
+    fx = Fixtures(tmp_path)
+    bars = pd.date_range("2025-01-06 14:30", periods=7 * 390, freq="min", tz="UTC")
+    fx.save_prices("QQQ", "1m", series(bars))
+    got = ReplaySource(fx).fetch_prices(["QQQ"], "1d", "1m")["QQQ"]
+    assert got.dates[0] == bars[-1] - pd.Timedelta(days=1) + pd.Timedelta(minutes=1)
+    assert got.last_bar_utc == bars[-1].isoformat()
+
+
+def test_missing_fixture(fixtures):
+    src = ReplaySource(fixtures)
+    with pytest.raises(RuntimeError, match="no fixture for XLE"):
+        src.fetch_prices(["SPY", "XLE"], "5d", "1d")
+    assert set(src.fetch_prices_batch(["SPY", "XLE"], "5d", "1d")) == {"SPY"}
+    assert src.fetch_actions("XLE").empty
+    assert (src.stats["prices"], src.stats["prices_batch"], src.stats["actions"]) == (1, 1, 1)
+
+
+def test_recording_keeps_the_longest_history(fixtures):
+    fixtures.save_prices("SPY", "1d", series(DAYS[-5:], start=1.0))
+    assert len(fixtures.load_prices("SPY", "1d").dates) == len(DAYS)
+    longer = pd.bdate_range("2022-01-03", "2025-01-10")
+    fixtures.save_prices("SPY", "1d", series(longer))
+    assert len(fixtures.load_prices("SPY", "1d").dates) == len(longer)
+
+
+def test_fault_injection_is_deterministic(fixtures):
+    def outcomes(seed):
+        src = FaultInjector(ReplaySource(fixtures), error_rate=0.5, seed=seed)
+        out = []
+        for _ in range(20):
+            try:
+                src.fetch_prices(["SPY"], "5d", "1d")
+                out.append(True)
+            except RuntimeError:
+                out.append(False)
+        return out, src.stats["injected_errors"]
+
+    first, errors = outcomes(7)
+    assert outcomes(7) == (first, errors)
+    assert errors == first.count(False) and 0 < errors < 20
+
+
+def test_build_source_modes(tmp_path):
+    assert build_source("replay", tmp_path).mode == "replay"
+    assert isinstance(build_source("replay", tmp_path, error_rate=0.1), FaultInjector)
+    with pytest.raises(ValueError):
+        build_source("offline", tmp_path)
@@ -0,0 +1,99 @@
+"""mt_fetcher.evidence: verify() findings, sampling and checkpoint resume."""
+
+import pytest
+
+from mt_fetcher import evidence
+from mt_fetcher.evidence import pack, verify
+
+
+@pytest.fixture
+def packed(tmp_path):
+    raw = tmp_path / "raw"
+    (raw / "sub").mkdir(parents=True)
+    paths = []
+    for i in range(12):
+        p = raw / ("sub" if i % 2 else "") / f"f{i:02d}.txt"
+        p.write_bytes(f"file {i}\n".encode("utf-8") * (i + 1))
+        paths.append(p)
+    ev = pack(tmp_path / "evidence", paths, {"run_id": "r1"})
+    return raw, ev.manifest_path, paths
+
+
+def test_clean_run(packed):
+    raw, manifest, paths = packed
+    report = verify(manifest, raw_dir=raw, workers=2)
+    assert report.clean
+    assert (report.checked, report.ok, report.skipped) == (len(paths), len(paths), 0)
+    assert report.bytes_hashed == sum(p.stat().st_size for p in paths)
+
+
+def test_missing_changed_and_extra(packed):
+    raw, manifest, paths = packed
+    paths[0].unlink()
+    paths[1].write_bytes(b"edited\n")  # size differs
+    paths[2].write_bytes(paths[2].read_bytes().upper())  # same size, different hash
+    (raw / "sub" / "stray.txt").write_bytes(b"not packed\n")
+
+    report = verify(manifest, raw_dir=raw)
+    assert not report.clean
+    assert report.missing == [str(paths[0])]
+    assert sorted(report.changed) == sorted([str(paths[1]), str(paths[2])])
+    assert report.extra == [str(raw / "sub" / "stray.txt")]
+
+
+def test_extra_check_needs_a_full_run(packed):
+    raw, manifest, _ = packed
+    (raw / "stray.txt").write_bytes(b"not packed\n")
+    assert verify(manifest, raw_dir=raw, sample=1.0).extra == [str(raw / "stray.txt")]
+    assert verify(manifest, raw_dir=raw, sample=0.5).extra == []  # a sample cannot prove absence
+
+
+def test_sampling_is_deterministic(packed):
+    _, manifest, paths = packed
+    a = verify(manifest, sample=0.5, seed="audit-1")
+    b = verify(manifest, sample=0.5, seed="audit-1")
+    assert (a.checked, a.skipped) == (b.checked, b.skipped)
+    assert a.checked + a.skipped == len(paths) and 0 < a.checked < len(paths)
+
+
+def interrupt(monkeypatch, after):
+    """Make _check fail once ``after`` entries have been checked; returns a restore callable."""
+    real_check, calls = evidence._check, []
+
+    def flaky(ent, limiter):
+        calls.append(ent["path"])
+        if len(calls) > after:
+            raise OSError("disk went away")
+        return real_check(ent, limiter)
+
+    monkeypatch.setattr(evidence, "_check", flaky)
+    return lambda: monkeypatch.setattr(evidence, "_check", real_check)
+
+
+def test_checkpoint_resume(packed, tmp_path, monkeypatch):
+    raw, manifest, paths = packed
+    ckpt = tmp_path / "verify.ckpt"
+    restore = interrupt(monkeypatch, after=6)
+    with pytest.raises(OSError):
+        verify(manifest, raw_dir=raw, workers=1, checkpoint=ckpt)
+    assert ckpt.is_file()
+
+    restore()
+    report = verify(manifest, raw_dir=raw, workers=1, checkpoint=ckpt)
+    assert 0 < report.resumed <= 6
+    assert report.clean and report.checked == len(paths)
+    assert report.bytes_hashed < sum(p.stat().st_size for p in paths)  # resumed entries are not re-read
+    assert not ckpt.exists()
+
+
+@pytest.mark.parametrize("rerun", [{"seed": "other"}, {"sample": 1.0}, {"resume": False}])
+def test_checkpoint_is_not_reused_for_other_settings(packed, tmp_path, monkeypatch, rerun):
+    _, manifest, paths = packed
+    ckpt = tmp_path / "verify.ckpt"
+    restore = interrupt(monkeypatch, after=6)
+    with pytest.raises(OSError):
+        verify(manifest, workers=1, checkpoint=ckpt)
+
+    restore()
+    report = verify(manifest, workers=1, checkpoint=ckpt, **rerun)
+    assert report.resumed == 0 and report.checked == len(paths)
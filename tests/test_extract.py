@@ -0,0 +1,137 @@
+"""mt_fetcher.extract: magic sniffing, PDF page counts from the trailer, and the result cache."""
+
+import struct
+
+import pytest
+
+from mt_fetcher import extract
+from mt_fetcher.extract import examine, extract_key, extract_many, sniff
+
+
+def pdf(objects, updates=(), xref_stream=False) -> bytes:
+    """A minimal PDF with a classic xref table; ``updates`` appends incremental revisions."""
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def revision(objs, prev=None):
+        offsets = {}
+        for num, body in objs.items():
+            offsets[num] = len(out)
+            out.extend(b"%d 0 obj\n%s\nendobj\n" % (num, body))
+        xref = len(out)
+        if xref_stream:
+            out.extend(b"%d 0 obj\n<< /Type /XRef /Root 1 0 R /Size 9 >>\nstream\n\nendstream\nendobj\n" % (max(objs) + 1))
+        else:
+            out.extend(b"xref\n")
+            for num in sorted(offsets):
+                out.extend(b"%d 1\n%010d 00000 n\r\n" % (num, offsets[num]))
+            trailer = b"<< /Size %d /Root 1 0 R" % (max(objs) + 1)
+            if prev is not None:
+                trailer += b" /Prev %d" % prev
+            out.extend(b"trailer\n" + trailer + b" >>\n")
+        out.extend(b"startxref\n%d\n%%%%EOF\n" % xref)
+        return xref
+
+    prev = revision(objects)
+    for objs in updates:
+        prev = revision(objs, prev)
+    return bytes(out)
+
+
+BASE = {
+    1: b"<< /Type /Catalog /Pages 2 0 R /PageLabels 5 0 R >>",
+    2: b"<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >>",
+    3: b"<< /Type /Page /Parent 2 0 R >>",
+    4: b"<< /Type /Page /Parent 2 0 R >>",
+    5: b"<< /Nums [0 << /S /D >>] >>",
+}
+
+
+def meta(tmp_path, data: bytes, name: str = "blob"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return examine(str(path), name)
+
+
+def test_pdf_pages_come_from_the_trailer_chain(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "PDF_SCAN_LIMIT", 0)  # a fallback scan would find nothing
+    assert meta(tmp_path, pdf(BASE)) == {"content_type": "application/pdf", "meta": {"pages": 2}}
+
+
+def test_pdf_incremental_update_wins(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "PDF_SCAN_LIMIT", 0)
+    update = {2: b"<< /Type /Pages /Kids [3 0 R 4 0 R 6 0 R] /Count 3 >>", 6: b"<< /Type /Page /Parent 2 0 R >>"}
+    assert meta(tmp_path, pdf(BASE, [update]))["meta"] == {"pages": 3}
+    # Catalog only in the older section: found through /Prev.
+    assert meta(tmp_path, pdf(BASE, [{6: b"<< /Type /Page >>"}]))["meta"] == {"pages": 2}
+
+
+def test_pdf_with_a_nested_page_tree_reads_the_root_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "PDF_SCAN_LIMIT", 0)
+    tree = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [3 0 R] /Count 7 >>",
+        3: b"<< /Type /Pages /Parent 2 0 R /Kids [] /Count 7 >>",
+    }
+    assert meta(tmp_path, pdf(tree))["meta"] == {"pages": 7}
+
+
+def test_pdf_falls_back_to_a_bounded_scan(tmp_path, monkeypatch):
+    streamed = pdf(BASE, xref_stream=True)
+    assert meta(tmp_path, streamed)["meta"] == {"pages": 2}
+    broken = pdf(BASE).replace(b"startxref\n", b"startxref\n9")  # offset points nowhere
+    assert meta(tmp_path, broken)["meta"] == {"pages": 2}
+    no_count = b"%PDF-1.4\n" + b"<< /Type /Page >>\n" * 3 + b"<< /Type /Pages >>\n"
+    assert meta(tmp_path, no_count)["meta"] == {"pages": 3}
+
+    monkeypatch.setattr(extract, "PDF_SCAN_LIMIT", 8)
+    assert meta(tmp_path, streamed)["meta"] == {"pages": 0}  # the scan stops at the limit
+
+
+@pytest.mark.parametrize(
+    "head, name, expected",
+    [
+        (b"%PDF-1.7", "", "application/pdf"),
+        (b"\x89PNG\r\n\x1a\n", "x.txt", "image/png"),  # bytes beat the name
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "", "image/webp"),
+        (b"PK\x03\x04", "", "application/zip"),
+        (b"\xef\xbb\xbf  <!DOCTYPE html><html>", "", "text/html"),
+        (b'{"a": 1}', "", "application/json"),
+        (b"a,b\n1,2\n", "data.csv", "text/csv"),
+        (b"plain words", "report.pdf", "text/plain"),  # text that is not what the name says
+        (b"caf\xc3", "", "text/plain"),  # multi-byte char cut by the head boundary
+        (b"\x00\x01\x02", "photo.jpg", "image/jpeg"),
+        (b"\x00\x01\x02", "", "application/octet-stream"),
+    ],
+)
+def test_sniff(head, name, expected):
+    assert sniff(head, name) == expected
+
+
+def test_image_dimensions(tmp_path):
+    png = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 640, 480) + b"\x08\x02\x00\x00\x00"
+    assert meta(tmp_path, png)["meta"] == {"width": 640, "height": 480}
+    gif = b"GIF89a" + struct.pack("<HH", 32, 16) + b"\x00" * 8
+    assert meta(tmp_path, gif)["meta"] == {"width": 32, "height": 16}
+    jpeg = b"\xff\xd8\xff\xe0" + struct.pack(">H", 4) + b"JF" + b"\xff\xc0" + struct.pack(">HBHH", 11, 8, 200, 300) + b"\x00" * 8
+    assert meta(tmp_path, jpeg)["meta"] == {"width": 300, "height": 200}
+
+
+def test_text_counts_chars_and_lines(tmp_path):
+    body = ("é" * 10 + "\n") * 3 + "tail"
+    assert meta(tmp_path, body.encode("utf-8"), "notes.txt")["meta"] == {"text_chars": len(body), "text_lines": 4}
+
+
+def test_malformed_file_keeps_its_type(tmp_path):
+    assert meta(tmp_path, b"GIF89a")["meta"] == {"error": "error"}
+
+
+def test_extract_many_caches_per_sha_and_name_hint(tmp_path):
+    blob = tmp_path / "a.bin"
+    blob.write_bytes(b"\x00\x01")
+    entries = [{"path": str(blob), "sha256": "ab" * 32}, {"path": str(tmp_path / "missing"), "sha256": "cd" * 32}]
+    first = extract_many(entries, cache_dir=tmp_path / "cache", workers=1)
+    assert list(first) == [extract_key("ab" * 32, "a.bin")]
+    blob.unlink()  # cached results are served without opening the file
+    assert extract_many(entries, cache_dir=tmp_path / "cache") == first
+    assert extract_key("ab" * 32, "x.pdf") == "ab" * 32 + "~application_pdf"
+    assert extract_key("ab" * 32, "noext") == "ab" * 32
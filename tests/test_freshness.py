@@ -0,0 +1,167 @@
+"""utils.freshness budgets and utils.fresh_cache stale-while-revalidate serving."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+
+from utils.fresh_cache import FreshPriceCache
+from utils.freshness import CLOSED_BUDGET, FRESH, MISSING, NY, STALE, assess, budget_seconds, is_open, last_completed_session
+from utils.prefetch import FetchRequest
+
+MON_11 = datetime(2026, 1, 5, 11, 0, tzinfo=NY)  # Monday, equity session open
+MON_20 = datetime(2026, 1, 5, 20, 0, tzinfo=NY)
+SAT_12 = datetime(2026, 1, 10, 12, 0, tzinfo=NY)
+
+
+def iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+@pytest.mark.parametrize(
+    "symbol, interval, now, budget",
+    [
+        ("SPY", "1m", MON_11, 120.0),  # 2 bars
+        ("SPY", "5m", MON_11, 600.0),
+        ("SPY", "1d", MON_11, 900.0),  # capped at 15 minutes while the daily bar moves
+        ("SPY", "1d", MON_20, CLOSED_BUDGET),
+        ("HG=F", "1d", MON_20, 900.0),  # futures trade in the evening
+        ("HG=F", "1d", datetime(2026, 1, 5, 17, 30, tzinfo=NY), CLOSED_BUDGET),  # daily break
+        ("EURUSD=X", "1h", SAT_12, CLOSED_BUDGET),
+        ("EURUSD=X", "1h", datetime(2026, 1, 11, 17, 30, tzinfo=NY), 900.0),  # Sunday evening reopen
+    ],
+)
+def test_budget_follows_market_hours(symbol, interval, now, budget):
+    assert budget_seconds(symbol, interval, now) == budget
+
+
+def test_equity_session_edges():
+    assert is_open("SPY", datetime(2026, 1, 5, 9, 30, tzinfo=NY))
+    assert not is_open("SPY", datetime(2026, 1, 5, 16, 0, tzinfo=NY))
+    assert not is_open("SPY", SAT_12)
+
+
+def test_assess_fresh_stale_missing_and_sessions_behind():
+    fresh = assess("SPY", "1m", iso(MON_11), iso(MON_11 - timedelta(seconds=60)), now=MON_11)
+    assert fresh.status == FRESH and fresh.market_open and fresh.fetched_age_s == 60.0
+    assert assess("SPY", "1m", iso(MON_11), iso(MON_11 - timedelta(seconds=121)), now=MON_11).status == STALE
+    assert assess("SPY", "1d", "", "", now=MON_11).status == MISSING
+
+    wed_20 = datetime(2026, 1, 7, 20, 0, tzinfo=NY)
+    assert last_completed_session(wed_20).isoformat() == "2026-01-07"
+    behind = assess("SPY", "1d", "2026-01-05T21:00:00+00:00", iso(wed_20), now=wed_20)
+    assert behind.status == FRESH and behind.sessions_behind == 2
+    assert last_completed_session(SAT_12).isoformat() == "2026-01-09"
+
+
+@dataclass
+class Series:
+    dates: List[int] = field(default_factory=lambda: [1])
+    close: List[float] = field(default_factory=lambda: [1.0])
+    last_bar_utc: str = ""
+    fetched_utc: str = ""
+
+
+class FakeFetch:
+    def __init__(self, age_s: float = 0.0):
+        self.calls = []
+        self.age_s = age_s
+        self.fail = set()
+        self.gate = None  # set to an Event to hold fetches until it is set
+
+    def __call__(self, symbols, period, interval):
+        self.calls.append(tuple(symbols))
+        if self.gate is not None:
+            self.gate.wait(5)
+        fetched = iso(datetime.now(timezone.utc) - timedelta(seconds=self.age_s))
+        return {s: Series(fetched_utc=fetched) for s in symbols if s not in self.fail}
+
+
+def wait_for_refresh():
+    for t in threading.enumerate():
+        if t.name == "mt-swr-refresh":
+            t.join(5)
+
+
+PLAN = (FetchRequest("SPY", "1d", 365), FetchRequest("XLE", "1d", 365))
+
+
+def test_cold_fetch_once_then_memory():
+    fetch = FakeFetch()
+    cache = FreshPriceCache(fetch)
+    first = cache.get_many(PLAN)
+    assert set(first.series) == {("SPY", "1d"), ("XLE", "1d")} and fetch.calls == [("SPY", "XLE")]
+    cache.get_many(PLAN)
+    assert fetch.calls == [("SPY", "XLE")] and cache.stats["memory"] == 2
+
+
+def test_stale_entries_are_served_then_refreshed_in_the_background():
+    fetch = FakeFetch(age_s=7 * 3600)  # older than any budget
+    cache = FreshPriceCache(fetch)
+    cold = cache.get_many(PLAN)
+    fetch.age_s, fetch.gate = 0.0, threading.Event()
+    served = cache.get_many(PLAN)  # stale: served at once, refresh scheduled
+    assert served.series[("SPY", "1d")] is cold.series[("SPY", "1d")]
+    assert cache.stats["stale"] == 2 and served.refreshing == {("SPY", "1d"), ("XLE", "1d")}
+    cache.get_many(PLAN)  # already refreshing: not resubmitted
+    fetch.gate.set()
+    wait_for_refresh()
+    assert len(fetch.calls) == 2
+    assert cache.freshness(("SPY", "1d")).status == FRESH
+    cache.get_many(PLAN)
+    wait_for_refresh()
+    assert len(fetch.calls) == 2  # fresh now: no further refresh
+
+
+def test_failed_symbol_reports_error_and_backs_off():
+    fetch = FakeFetch()
+    fetch.fail = {"XLE"}
+    cache = FreshPriceCache(fetch, retry_after=300.0)
+    result = cache.get_many(PLAN)
+    assert ("XLE", "1d") in result.errors and ("SPY", "1d") in result.series
+    calls = len(fetch.calls)
+    cache.get_many(PLAN)
+    wait_for_refresh()
+    assert len(fetch.calls) == calls  # inside the backoff window nothing is retried
+
+
+class MemoryStore:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    def load(self, symbol, interval):
+        return self.entries.get((symbol, interval))
+
+    def save(self, symbol, ps, interval):
+        self.entries[(symbol, interval)] = ps
+
+
+def test_warm_start_from_store_counts_and_skips_upstream():
+    fetched = iso(datetime.now(timezone.utc))
+    store = MemoryStore({("SPY", "1d"): Series(fetched_utc=fetched), ("XLE", "1d"): Series(fetched_utc=fetched)})
+    fetch = FakeFetch()
+    cache = FreshPriceCache(fetch, store=store)
+    assert set(cache.get_many(PLAN).series) == {("SPY", "1d"), ("XLE", "1d")}
+    assert fetch.calls == [] and cache.stats["store"] == 2 and cache.stats["cold"] == 0
+
+
+def test_concurrent_cold_callers_share_one_fetch():
+    fetch = FakeFetch()
+    fetch.gate = threading.Event()
+    cache = FreshPriceCache(fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_many(PLAN))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.stats["joined"] < 4 and time.monotonic() < deadline:  # both latecomers are waiting
+        time.sleep(0.01)
+    fetch.gate.set()
+    for t in threads:
+        t.join(5)
+    assert fetch.calls == [("SPY", "XLE")] and cache.upstream_calls == 1
+    assert cache.stats["cold"] == 2 and cache.stats["joined"] == 4
+    assert all(set(r.series) == {("SPY", "1d"), ("XLE", "1d")} for r in results)
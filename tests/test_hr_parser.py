@@ -0,0 +1,81 @@
+"""scripts/hr_parser: section splitting, block parsing and the section parse cache."""
+
+from hr_parser import ParseCache, diff_sections, iter_sections, parse_hr, parse_section
+
+HR = """Preamble line.
+
+# 1. Summary
+
+**Version:** v1.7-HR_20260118
+**Status:** **Active**
+
+Credit spreads are
+widening.
+
+## 1.1 Rules
+
+- Trim CAT if RS breaks or ISM <48
+- Watch copper
+1. first
+2. second
+
+```
+# not a heading
+```
+
+# 2. Holdings
+
+| Ticker | Weight |
+|---|---:|
+| CAT | **10%** |
+| XLE | 5% |
+"""
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_sections_split_at_headings_outside_fences():
+    sections = list(iter_sections(HR.splitlines(keepends=True)))
+    assert [(s.level, s.title, s.line) for s in sections] == [(0, "", 1), (1, "1. Summary", 3), (2, "1.1 Rules", 11), (1, "2. Holdings", 22)]
+    assert "".join(s.text for s in sections) == HR
+    assert "# not a heading" in sections[2].text
+
+
+def test_parse_section_blocks():
+    sections = list(iter_sections(HR.splitlines(keepends=True)))
+    assert parse_section(sections[1].text) == [
+        {"type": "fields", "fields": {"Version": "v1.7-HR_20260118", "Status": "Active"}},
+        {"type": "paragraph", "text": "Credit spreads are widening."},
+    ]
+    rules = parse_section(sections[2].text)
+    assert rules[:3] == [
+        {"type": "list", "ordered": False, "items": ["Watch copper"]},
+        {"type": "rule", "action": "Trim", "target": "CAT", "condition": "RS breaks or ISM <48"},
+        {"type": "list", "ordered": True, "items": ["first", "second"]},
+    ]
+    assert parse_section(sections[3].text) == [
+        {"type": "table", "columns": ["Ticker", "Weight"], "rows": [{"Ticker": "CAT", "Weight": "10%"}, {"Ticker": "XLE", "Weight": "5%"}]}
+    ]
+
+
+def test_unchanged_sections_are_reused(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    first = parse_hr(write(tmp_path, "v1.6-HR.md", HR), cache)
+    assert (first.parsed, first.reused) == (4, 0)
+
+    edited = HR.replace("| XLE | 5% |", "| XLE | 7% |")
+    second = parse_hr(write(tmp_path, "v1.7-HR.md", edited), ParseCache(tmp_path / "cache"))  # from disk
+    assert (second.parsed, second.reused) == (1, 3)
+    assert second.find("2.").blocks[0]["rows"][1]["Weight"] == "7%"
+    assert diff_sections(first, second) == {"added": [], "removed": [], "changed": ["2. Holdings"]}
+
+
+def test_tree_nests_by_level(tmp_path):
+    doc = parse_hr(write(tmp_path, "hr.md", HR), ParseCache(None))
+    tree = doc.tree()
+    assert [n["title"] for n in tree] == ["", "1. Summary", "2. Holdings"]
+    assert [n["title"] for n in tree[1]["children"]] == ["1.1 Rules"]
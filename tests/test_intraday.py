@@ -0,0 +1,80 @@
+"""utils.intraday: ring buffers, session-anchored resampling and incremental ingest."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+
+from utils.intraday import BarAggregator, IntradayBook, RingBuffer
+
+NY = ZoneInfo("America/New_York")
+OPEN = int(datetime(2026, 1, 5, 9, 30, tzinfo=NY).timestamp())
+
+
+def minutes(n: int, start: int = OPEN) -> list:
+    return [start + 60 * i for i in range(n)]
+
+
+def test_ring_buffer_keeps_the_newest_values_oldest_first():
+    ring = RingBuffer(3)
+    assert np.isnan(ring.last()) and len(ring.values()) == 0
+    for v in range(5):
+        ring.append(float(v))
+    assert len(ring) == 3 and ring.last() == 4.0
+    assert_array_equal(ring.values(), [2.0, 3.0, 4.0])
+
+
+def test_buckets_are_anchored_to_the_session_open():
+    agg = BarAggregator("15m")
+    for i, ts in enumerate(minutes(40)):
+        agg.update(ts, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i)
+    ts = agg.series("ts")
+    assert_array_equal(ts, [OPEN, OPEN + 900, OPEN + 1800])  # 09:30, 09:45, 10:00 (in progress)
+    assert_array_equal(agg.series("open", include_partial=False), [100.0, 115.0])
+    assert_array_equal(agg.series("close", include_partial=False), [114.5, 129.5])
+    assert agg.series("high")[0] == 115.0 and agg.series("low")[0] == 99.0
+    assert not agg.update(OPEN + 60, 1.0, 1.0, 1.0, 1.0)  # late bar for a closed bucket is dropped
+    assert agg.series("close")[-1] == 139.5
+
+
+def test_daily_bars_cover_the_local_date():
+    agg = BarAggregator("1d")
+    day2 = int(datetime(2026, 1, 6, 9, 30, tzinfo=NY).timestamp())
+    for ts in minutes(5) + minutes(5, day2):
+        agg.update(ts, 1.0, 1.0, 1.0, 1.0)
+    assert_array_equal(agg.series("ts"), [OPEN, day2])
+
+
+def test_capacity_bounds_memory():
+    agg = BarAggregator("5m", capacity=4)
+    for ts in minutes(5 * 20):
+        agg.update(ts, 1.0, 1.0, 1.0, 1.0)
+    assert len(agg.series("ts", include_partial=False)) == 4
+    assert len(agg) == 5
+
+
+def test_ingest_reads_only_bars_after_the_last_one():
+    book = IntradayBook(["5m"])
+    dates = list(pd.to_datetime(minutes(30), unit="s", utc=True))
+    closes = [100.0 + i for i in range(30)]
+    assert book.ingest("IWM", dates[:20], closes[:20]) == 20
+    assert book.ingest("IWM", dates[:20], closes[:20]) == 0
+    assert book.ingest("IWM", dates, closes) == 10
+    assert book.ingest("IWM", dates[5:], closes[5:]) == 0  # window slid forward, nothing new
+
+    fresh = IntradayBook(["5m"])
+    fresh.ingest("IWM", dates, closes)
+    assert_array_equal(book.closes("IWM", "5m"), fresh.closes("IWM", "5m"))
+
+
+def test_rs_sma_last_applies_the_min_rows_guard():
+    book = IntradayBook(["1m"])
+    ts = minutes(120)
+    book.ingest("IWM", ts, [100.0 * 1.001 ** i for i in range(120)])
+    book.ingest("SPY", ts[10:], [100.0] * 110)
+    value, note = book.rs_sma_last("IWM", "SPY", "1m", length=20, min_rows=80)
+    assert note == "OK" and value > 0
+    value, note = book.rs_sma_last("IWM", "SPY", "1m", length=20, min_rows=200)
+    assert np.isnan(value) and note.startswith("Not enough")
@@ -0,0 +1,82 @@
+"""utils.parallel: bounded runner timeouts, failure isolation and nested runs."""
+
+import threading
+import time
+
+import pytest
+
+from utils.parallel import ERROR, OK, TIMEOUT, BoundedRunner
+
+
+@pytest.fixture
+def runner():
+    r = BoundedRunner(max_workers=4)
+    yield r
+    r.shutdown()
+
+
+def test_results_errors_and_timeouts_are_per_key(runner):
+    release = threading.Event()
+
+    def boom():
+        raise ValueError("bad card")
+
+    t0 = time.monotonic()
+    results = runner.run({"ok": lambda: 42, "boom": boom, "slow": lambda: release.wait(5)}, timeout=0.2)
+    elapsed = time.monotonic() - t0
+    release.set()
+
+    assert results["ok"].status == OK and results["ok"].value == 42
+    assert results["boom"].status == ERROR and results["boom"].error == "bad card"
+    assert results["slow"].status == TIMEOUT
+    assert elapsed < 1.0  # bounded by the timeout, not the slow task
+
+
+def test_per_key_timeouts(runner):
+    release = threading.Event()
+    tasks = {"short": lambda: release.wait(5), "long": lambda: (time.sleep(0.1), "done")[1]}
+    results = runner.run(tasks, timeout={"short": 0.05, "long": 2.0})
+    release.set()
+    assert results["short"].status == TIMEOUT
+    assert results["long"].ok and results["long"].value == "done"
+
+
+def test_overrunning_tasks_are_counted_as_stragglers(runner):
+    release = threading.Event()
+    runner.run({"slow": lambda: release.wait(5)}, timeout=0.05)
+    assert runner.stragglers == 1
+    release.set()
+    deadline = time.monotonic() + 2
+    while runner.stragglers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert runner.stragglers == 0
+
+
+def test_nested_run_on_own_pool_runs_inline():
+    runner = BoundedRunner(max_workers=1)
+    try:
+        inner = lambda: runner.run({"a": lambda: 1, "b": lambda: 2}, timeout=0.1)  # noqa: E731
+        results = runner.run({"outer": inner}, timeout=2.0)
+    finally:
+        runner.shutdown()
+    assert results["outer"].ok
+    assert {k: r.value for k, r in results["outer"].value.items()} == {"a": 1, "b": 2}
+
+
+def test_wrap_is_applied_to_every_task():
+    seen = []
+
+    def wrap(fn):
+        def wrapped():
+            seen.append(threading.current_thread().name)
+            return fn()
+
+        return wrapped
+
+    runner = BoundedRunner(max_workers=2, thread_name_prefix="mt-card", wrap=wrap)
+    try:
+        results = runner.run({i: (lambda i=i: i * i) for i in range(4)}, timeout=2.0)
+    finally:
+        runner.shutdown()
+    assert {k: r.value for k, r in results.items()} == {0: 0, 1: 1, 2: 4, 3: 9}
+    assert len(seen) == 4 and all(name.startswith("mt-card") for name in seen)
@@ -0,0 +1,121 @@
+"""utils.portfolio: holdings loading, vectorized revaluation, trades, income and rules."""
+
+import json
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+from utils.portfolio import PortfolioBook, concentration_lookup, evaluate_rules, holdings_from_thesis, load_holdings, targets_from_rows
+
+HOLDINGS_CSV = """account,ticker,shares,current_price,annual_dividend_usd_est
+taxable,cat ,10,300,60
+ira,CAT,10,,
+ira,XLE,100,90,320
+ira,FCX,50,,
+"""
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = tmp_path / "holdings.csv"
+    path.write_text(HOLDINGS_CSV, encoding="utf-8")
+    targets = targets_from_rows([{"ticker": "CAT", "target_pct": 40}, {"ticker": "XLE", "target_pct": 50}, {"ticker": "SLV", "target_pct": 10}])
+    return PortfolioBook(load_holdings(path), targets)
+
+
+def test_holdings_collapse_onto_sorted_ticker_axis(book):
+    assert book.tickers.tolist() == ["CAT", "FCX", "SLV", "XLE"]
+    assert_array_equal(book.shares, [20, 50, 0, 100])
+    assert_array_equal(book.has_target, [True, False, True, True])
+    assert book.accounts.tolist() == ["ira", "taxable"]
+    assert_allclose(book.price_hint, [300, np.nan, np.nan, 90], equal_nan=True)
+    assert_allclose(book.dps_hint, [6.0, np.nan, np.nan, 3.2], equal_nan=True)
+
+
+def test_price_vector_falls_back_to_holdings_prices(book):
+    assert_allclose(book.price_vector({"FCX": 40.0, "XLE": 100.0}), [300, 40, np.nan, 100], equal_nan=True)
+    assert np.isnan(book.price_vector({}, fallback_to_hint=False)).all()
+
+
+def test_revalue_weights_and_drift(book):
+    val = book.revalue(book.price_vector({"FCX": 40.0, "XLE": 100.0}))
+    assert val.total == pytest.approx(6000 + 2000 + 10000)
+    assert_allclose(val.weight, [6000 / 18000, 2000 / 18000, np.nan, 10000 / 18000], equal_nan=True)
+    assert val.weight_of("XLE") == pytest.approx(10000 / 18000)
+    assert np.isnan(val.weight_of("QQQ"))
+    assert val.drift[0] == pytest.approx(6000 / 18000 - 0.40)
+    assert val.missing_prices == []
+    frame = val.frame()
+    assert np.isnan(frame.loc[frame.ticker == "FCX", "target"]).all()
+
+    unpriced = book.revalue(book.price_vector({}))
+    assert unpriced.missing_prices == ["FCX"]
+
+
+def test_account_weights_sum_to_one_per_account(book):
+    price = book.price_vector({"FCX": 40.0, "XLE": 100.0})
+    weights = book.account_weights(price)
+    assert_allclose(weights.sum(axis=1).to_numpy(), [1.0, 1.0])
+    assert weights.loc["taxable", "CAT"] == pytest.approx(1.0)
+    assert weights.loc["ira", "XLE"] == pytest.approx(10000 / 15000)
+
+
+def test_trade_plan_moves_toward_targets(book):
+    val = book.revalue(book.price_vector({"FCX": 40.0, "XLE": 100.0, "SLV": 25.0}))
+    plan = book.trade_plan(val, min_trade_usd=100).set_index("ticker")
+    assert plan.loc["CAT", "action"] == "BUY"  # 33% held vs 40% target
+    assert plan.loc["CAT", "shares"] == np.trunc((0.40 * 18000 - 6000) / 300)
+    assert plan.loc["XLE", "action"] == "SELL"  # 56% held vs 50% target
+    assert plan.loc["SLV", "action"] == "BUY"
+    assert plan.loc["FCX", "action"] == "HOLD" and np.isnan(plan.loc["FCX", "target"])  # untargeted: left alone
+    assert plan.loc["FCX", "shares"] == 0
+
+    liquidate = book.trade_plan(val, sell_untargeted=True).set_index("ticker")
+    assert liquidate.loc["FCX", "action"] == "SELL" and liquidate.loc["FCX", "shares"] == 50
+    assert liquidate.loc["FCX", "target"] == 0.0
+
+    no_price = book.trade_plan(book.revalue(book.price_vector({"XLE": 100.0}))).set_index("ticker")
+    assert no_price.loc["SLV", "action"] == "NO PRICE"
+    assert no_price.loc["FCX", "action"] == "HOLD"  # no order, so no price needed
+
+
+def test_income_uses_dividend_hints(book):
+    price = book.price_vector({"FCX": 40.0, "XLE": 100.0})
+    income = book.income(price, np.array([np.nan, 0.6, np.nan, np.nan])).set_index("ticker")
+    assert "SLV" not in income.index  # no shares held
+    assert income.loc["CAT", "annual_usd"] == pytest.approx(20 * 6.0)
+    assert income.loc["XLE", "yield"] == pytest.approx(3.2 / 100)
+    assert income.loc["FCX", "monthly_usd"] == pytest.approx(50 * 0.6 / 12)
+
+
+def test_concentration_rules(book):
+    val = book.revalue(book.price_vector({"FCX": 40.0, "XLE": 100.0}))
+    rules = [
+        {"id": "max_single_name", "if": "any_position_weight > 25%"},
+        {"id": "cat_specific", "if": "CAT_weight > 40%"},
+        {"id": "unknown_signal", "if": "QQQ_weight > 1%"},
+        {"id": "bad", "if": "not a condition"},
+    ]
+    states = {r["id"]: r for r in evaluate_rules(rules, concentration_lookup(val))}
+    assert states["max_single_name"]["state"] == "ACTIVE"
+    assert states["max_single_name"]["values"]["any_position_weight"] == pytest.approx(10000 / 18000)
+    assert states["cat_specific"]["state"] == "INACTIVE"
+    assert states["unknown_signal"]["state"] == "UNKNOWN"
+    assert states["bad"]["state"] == "UNKNOWN" and states["bad"]["note"]
+
+
+def test_holdings_from_json_and_thesis(tmp_path):
+    positions = [{"ticker": "CAT", "shares": 5, "price": 300.0, "dividend_yield": 0.02}]
+    path = tmp_path / "holdings.json"
+    path.write_text(json.dumps({"positions": positions}), encoding="utf-8")
+    from_file = load_holdings(path)
+    assert from_file.source == "holdings.json"
+    assert from_file.account.tolist() == ["default"]
+    assert_allclose(from_file.dps_hint, [6.0])
+
+    from_thesis = holdings_from_thesis({"portfolio": {"current_snapshot": {"positions": positions}}})
+    assert from_thesis.account.tolist() == ["thesis"]
+
+    with pytest.raises(ValueError):
+        holdings_from_thesis({})
@@ -0,0 +1,92 @@
+"""utils.prefetch: planning from the spec index, batching, per-symbol retries and slicing."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from adapters.market_data import PriceSeries
+from utils.parallel import BoundedRunner
+from utils.prefetch import FetchRequest, PrefetchResult, batches, period_days, period_for, plan_prefetch, prefetch
+from utils.spec_index import SpecIndex
+
+SPEC = {
+    "dashboard": {
+        "cards": {
+            "short": {"type": "intraday_rs", "symbols": ["IWM", "SPY"], "period": "5d", "interval": "1m"},
+            "credit": {"type": "chart_plus_thresholds", "period": "1y"},
+            "long": {"type": "chart_plus_thresholds", "hyg": "JNK", "period": "2y"},
+        }
+    },
+    "data_contract": {
+        "required_history": {"market_prices": {"lookback_days": 1200}},
+        "required_inputs": {"market_prices": [{"symbol": "CAT"}, {"name": "no symbol"}]},
+    },
+}
+
+
+def series(n=10):
+    start = datetime(2025, 1, 1)
+    return PriceSeries(dates=[start + timedelta(days=i) for i in range(n)], close=[float(i) for i in range(n)], as_of_utc="")
+
+
+def test_period_mapping():
+    assert [period_for(d) for d in (1, 2, 31, 32, 366, 1200, 4000)] == ["1d", "5d", "1mo", "3mo", "1y", "5y", "max"]
+    assert period_days("ytd") == 366
+    with pytest.raises(ValueError):
+        period_days("3d")
+
+
+def test_plan_takes_the_longest_lookback_per_symbol():
+    plan = {(r.symbol, r.interval): r.lookback_days for r in plan_prefetch(SpecIndex.build({}, SPEC, None))}
+    assert plan[("SPY", "1m")] == 5 and plan[("IWM", "1m")] == 5
+    assert plan[("LQD", "1d")] == 731  # 1y and 2y cards share LQD: fetched once at 2y
+    assert plan[("HYG", "1d")] == 366 and plan[("JNK", "1d")] == 731
+    assert plan[("SPY", "1d")] == 731  # benchmark of every universe
+    assert plan[("CAT", "1d")] == 1200
+    assert len(plan) == 7
+
+    groups = batches(plan_prefetch(SpecIndex.build({}, SPEC, None)))
+    assert groups[("1d", "2y")] == ["JNK", "LQD", "SPY"] and groups[("1d", "1y")] == ["HYG"] and groups[("1d", "5y")] == ["CAT"]
+
+
+class FakeFetch:
+    """Batch fetch that drops ``missing`` symbols and raises for ``broken`` ones when asked alone."""
+
+    def __init__(self, missing=(), broken=()):
+        self.missing, self.broken = set(missing), set(broken)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, symbols, period, interval):
+        with self._lock:
+            self.calls.append((tuple(symbols), period, interval))
+        if len(symbols) == 1 and symbols[0] in self.broken:
+            raise RuntimeError(f"upstream error for {symbols[0]}")
+        return {s: series() for s in symbols if s not in self.missing | self.broken}
+
+
+PLAN = (FetchRequest("SPY", "1d", 700), FetchRequest("XLE", "1d", 700), FetchRequest("BAD", "1d", 700), FetchRequest("GONE", "1d", 700))
+
+
+@pytest.mark.parametrize("runner", [None, "pool"])
+def test_prefetch_retries_only_the_symbols_a_batch_missed(runner):
+    fetch = FakeFetch(missing={"GONE"}, broken={"BAD"})
+    pool = BoundedRunner(4) if runner else None
+    try:
+        result = prefetch(PLAN, fetch, runner=pool)
+    finally:
+        if pool:
+            pool.shutdown()
+    assert set(result.series) == {("SPY", "1d"), ("XLE", "1d")}
+    assert result.errors[("BAD", "1d")] == "upstream error for BAD"
+    assert result.errors[("GONE", "1d")] == "No data for GONE"
+    assert result.calls == 3 and sorted(c[0] for c in fetch.calls) == [("BAD",), ("GONE",), ("SPY", "XLE", "BAD", "GONE")]
+
+
+def test_slice_trims_to_the_period_before_the_last_bar():
+    result = PrefetchResult(series={("SPY", "1d"): series(40)})
+    assert len(result.slice("SPY", "1d", "5d").dates) == 5
+    assert len(result.slice("SPY", "1d", "1mo").dates) == 31
+    assert result.slice("SPY", "1d", "2y") is result.get("SPY")
+    assert result.slice("XLE", "1d", "5d") is None
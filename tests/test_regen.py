@@ -0,0 +1,102 @@
+"""scripts/regen.py: content-addressed builds and section-level parse reuse."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+import regen
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HR_NAME = "v9.9-HR_20260101.md"
+HR_TEXT = """# Thesis v9.9
+
+**Version:** v9.9-HR_20260101
+
+## Allocation
+
+| Ticker | Target |
+|---|---|
+| CAT | 23% |
+
+## Rules
+
+- Trim CAT if RS breaks
+"""
+
+
+META_SCHEMA = '{"type": "object", "required": ["meta"]}'
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch, capsys):
+    hr = tmp_path / HR_NAME
+    hr.write_text(HR_TEXT, encoding="utf-8")
+    schemas = tmp_path / "schemas"  # the placeholder transform only fills "meta"
+    schemas.mkdir()
+    for name in ("thesis.schema.json", "agent.schema.json"):
+        (schemas / name).write_text(META_SCHEMA, encoding="utf-8")
+
+    def invoke(*extra, schema_dir=schemas):
+        argv = ["regen.py", str(hr), "--out-dir", str(tmp_path / "out"), "--schema-dir", str(schema_dir), "--cache-dir", str(tmp_path / "cache"), *extra]
+        monkeypatch.setattr(sys, "argv", argv)
+        regen.main()
+        return capsys.readouterr().out
+
+    return hr, tmp_path / "out", invoke
+
+
+def test_second_run_is_a_cache_hit(run):
+    hr, out, invoke = run
+    first = invoke()
+    assert "Parsed v9.9-HR_20260101.md: 3 sections (3 parsed, 0 reused)" in first
+    built = {p.name: p.read_bytes() for p in out.iterdir()}
+    assert sorted(built) == ["v9.9-AGENT_20260101.json", "v9.9-JSON_20260101.json"]
+
+    assert "Up to date" in invoke()
+    assert {p.name: p.read_bytes() for p in out.iterdir()} == built
+
+
+def test_edited_output_is_restored_from_the_cache(run):
+    hr, out, invoke = run
+    invoke()
+    target = out / "v9.9-JSON_20260101.json"
+    original = target.read_bytes()
+    target.write_text("{}", encoding="utf-8")
+    assert "Restored outputs from cached build" in invoke()
+    assert target.read_bytes() == original
+
+
+def test_changed_hr_reparses_only_changed_sections(run):
+    hr, _, invoke = run
+    invoke()
+    hr.write_text(HR_TEXT.replace("- Trim CAT if RS breaks", "- Trim CAT if ISM <48"), encoding="utf-8")
+    assert "3 sections (1 parsed, 2 reused)" in invoke()
+
+
+def test_force_and_no_cache_always_rebuild(run):
+    _, _, invoke = run
+    invoke()
+    assert "Parsed" in invoke("--force")
+    assert "Parsed" in invoke("--no-cache")
+
+
+def test_build_key_covers_the_transform_version(run, monkeypatch):
+    _, _, invoke = run
+    invoke()
+    monkeypatch.setattr(regen, "TRANSFORM_VERSION", regen.TRANSFORM_VERSION + "-next")
+    assert "Parsed" in invoke()
+
+
+def test_failed_validation_is_not_cached(run, tmp_path):
+    _, out, invoke = run
+    with pytest.raises(SystemExit):
+        invoke(schema_dir=REPO_ROOT / "schemas")  # real thesis schema: placeholder output fails
+    assert not out.exists() or not any(out.iterdir())
+    assert not (tmp_path / "cache" / "builds").exists()
+
+
+def test_versions_are_inferred_from_the_hr_name():
+    assert regen.infer_versions_from_hr(Path(HR_NAME)) == ("v9.9_20260101", "v9.9-JSON_20260101.json", "v9.9-AGENT_20260101.json")
+    with pytest.raises(ValueError):
+        regen.infer_versions_from_hr(Path("thesis.md"))
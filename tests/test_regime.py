@@ -0,0 +1,120 @@
+"""utils.regime: incremental clause streaks vs full evaluation, restatements and persistence."""
+
+import json
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from adapters.market_data import PriceSeries
+from utils.conditions import parse_condition
+from utils.regime import RegimeEngine, clause_key, rules_from_spec, summarize_series
+
+SPEC = {
+    "dashboard": {
+        "cards": {
+            "triggers": {
+                "type": "rule_list",
+                "rules": [
+                    {"id": "copper_up", "if": "COPPER > 4.50 sustained", "then": "Add FCX", "severity": "GREEN"},
+                    {"id": "metals_down", "if": "COPPER < 4.00 AND SILVER < 28", "then": "Trim miners"},
+                    {"id": "oil", "if": "OIL > 90", "then": "ignored: no OIL signal"},
+                ],
+            },
+            "other": {"type": "status_summary"},
+        }
+    }
+}
+
+START = datetime(2025, 1, 1)
+
+
+def series(values):
+    return PriceSeries(dates=[START + timedelta(days=i) for i in range(len(values))], close=list(values), as_of_utc="")
+
+
+def engine(tmp_path=None):
+    return RegimeEngine(rules_from_spec(SPEC, ["COPPER", "SILVER"]), tmp_path / "regime.json" if tmp_path else None)
+
+
+COPPER = [4.4, 4.6, 4.7, float("nan"), 4.8, 4.9, 4.6, 4.3, 3.9, 3.8, 4.6, 4.7, 4.8, 4.9, 5.0]
+SILVER = [30.0] * 8 + [27.0] * 7
+
+
+def test_rules_from_spec_skips_unknown_signals():
+    assert [r.id for r in rules_from_spec(SPEC, ["COPPER", "SILVER"])] == ["copper_up", "metals_down"]
+
+
+@pytest.mark.parametrize("step", [1, 3, len(COPPER)])
+def test_incremental_updates_match_full_evaluation(step):
+    eng = engine()
+    for n in range(step, len(COPPER) + step, step):
+        n = min(n, len(COPPER))
+        snap = eng.update({"COPPER": series(COPPER[:n]), "SILVER": series(SILVER[:n])})
+        # The engine counts observations, so a NaN bar is skipped rather than filling a slot.
+        history = {"COPPER": [v for v in COPPER[:n] if v == v], "SILVER": SILVER[:n]}
+        for rid, rule in eng.rules.items():
+            expected = rule.condition.combine(lambda c: c.evaluate(history.get))
+            assert snap.state(rid) == {True: "ACTIVE", False: "INACTIVE", None: "UNKNOWN"}[expected], (rid, n)
+    assert snap.state("copper_up") == "ACTIVE" and snap.state("metals_down") == "INACTIVE"
+
+
+def test_only_new_bars_are_consumed():
+    eng = engine()
+    eng.update({"COPPER": series(COPPER[:10]), "SILVER": series(SILVER[:10])})
+    snap = eng.update({"COPPER": series(COPPER[:12]), "SILVER": series(SILVER[:12])})
+    assert snap.bars == 2 * 3 and snap.replayed == []  # 3 clauses: 2 COPPER, 1 SILVER
+
+
+def test_restated_history_is_replayed():
+    eng = engine()
+    eng.update({"COPPER": series(COPPER), "SILVER": series(SILVER)})
+    restated = COPPER[:-1] + [4.2]
+    snap = eng.update({"COPPER": series(restated), "SILVER": series(SILVER)})
+    assert sorted(snap.replayed) == sorted(k for k in eng.clauses if k.startswith("COPPER"))
+    assert snap.state("copper_up") == "INACTIVE"
+
+
+def test_missing_signal_is_unknown_but_keeps_state():
+    eng = engine()
+    eng.update({"COPPER": series(COPPER), "SILVER": series(SILVER)})
+    snap = eng.update({"COPPER": series(COPPER)})
+    assert snap.state("metals_down") == "UNKNOWN" and snap.errors["SILVER"] == "no data"
+    key = clause_key(parse_condition("SILVER < 28").any_of[0][0])
+    assert eng.clause_states[key].seen == len(SILVER)
+
+
+def test_state_survives_a_restart(tmp_path):
+    first = engine(tmp_path)
+    first.update({"COPPER": series(COPPER[:12]), "SILVER": series(SILVER[:12])})
+    since = first.rule_states["copper_up"].since
+
+    second = engine(tmp_path)
+    assert second.snapshot.rules == first.snapshot.rules
+    snap = second.update({"COPPER": series(COPPER), "SILVER": series(SILVER)})
+    assert snap.bars == 3 * 3 and snap.state("copper_up") == "ACTIVE"
+    assert second.rule_states["copper_up"].since != since
+
+
+def test_unreadable_clause_state_starts_fresh(tmp_path):
+    engine(tmp_path).update({"COPPER": series(COPPER), "SILVER": series(SILVER)})
+    path = tmp_path / "regime.json"
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    key = next(iter(raw["clauses"]))
+    raw["clauses"][key] = {**raw["clauses"][key], "added_later": 1}
+    other = next(k for k in raw["clauses"] if k != key)
+    raw["clauses"][other] = "garbage"
+    path.write_text(json.dumps(raw), encoding="utf-8")
+
+    eng = engine(tmp_path)
+    assert eng.clause_states[key].seen == sum(1 for v in COPPER if v == v)
+    assert eng.clause_states[other].seen == 0
+
+
+def test_summarize_series():
+    s = series([100.0] * 31 + [110.0])
+    summary = summarize_series(s.dates, s.close)
+    assert summary["last"] == 110.0
+    assert math.isclose(summary["chg_1d_pct"], 10.0) and math.isclose(summary["chg_1m_pct"], 10.0)
+    assert summary["chg_1y_pct"] is None
+    assert summarize_series([], []) == {}
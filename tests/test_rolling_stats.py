@@ -0,0 +1,93 @@
+"""utils.rolling_stats: incremental rolling covariance/correlation vs pandas."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+from utils.rolling_stats import RollingCovariance, dispersion, history_points, mean_pairwise, ranks
+
+SYMBOLS = ["SPY", "XLE", "XLB", "CAT", "FCX"]
+WINDOW = 20
+
+
+def random_closes(seed: int, n: int = 120) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0.0, 0.01, (n, 1))
+    closes = 100.0 * np.exp(np.cumsum(common + rng.normal(0.0, 0.01, (n, len(SYMBOLS))), axis=0))
+    closes[rng.random(closes.shape) < 0.05] = np.nan
+    return pd.DataFrame(closes, index=pd.bdate_range("2025-01-02", periods=n), columns=SYMBOLS)
+
+
+def window_frame(returns: pd.DataFrame, end: int) -> pd.DataFrame:
+    return returns.iloc[max(end - WINDOW + 1, 1) : end + 1]
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_matches_pandas_on_every_bar(seed):
+    closes = random_closes(seed)
+    returns = np.log(closes / closes.shift(1))
+    engine = RollingCovariance(SYMBOLS, window=WINDOW, min_periods=10)
+    dates = list(closes.index)
+    for end in range(1, len(dates)):
+        engine.update(dates[: end + 1], closes.to_numpy()[: end + 1])  # one new bar per call
+        win = window_frame(returns, end)
+        assert_allclose(engine.corr(), win.corr(min_periods=10).to_numpy(), rtol=0, atol=1e-9, equal_nan=True)
+        assert_allclose(engine.cov(), win.cov(min_periods=10).to_numpy(), rtol=0, atol=1e-12, equal_nan=True)
+        counts = win.notna().sum().to_numpy()
+        expected_ret = np.where(counts >= 10, win.sum().to_numpy(), np.nan)
+        assert_allclose(engine.window_return(), expected_ret, rtol=0, atol=1e-12, equal_nan=True)
+
+
+def test_last_bar_matches_pandas_rolling_corr():
+    closes = random_closes(2)
+    returns = np.log(closes / closes.shift(1))
+    engine = RollingCovariance(SYMBOLS, window=WINDOW, min_periods=10)
+    assert engine.update(list(closes.index), closes.to_numpy()) == len(closes)
+    expected = returns.rolling(WINDOW, min_periods=10).corr().loc[closes.index[-1]]
+    assert_allclose(engine.corr(), expected.to_numpy(), rtol=0, atol=1e-9, equal_nan=True)
+
+
+def test_update_consumes_only_new_sessions_and_replays_restatements():
+    closes = random_closes(3)
+    dates, values = list(closes.index), closes.to_numpy()
+    engine = RollingCovariance(SYMBOLS, window=WINDOW, reference="SPY")
+    assert engine.update(dates[:80], values[:80]) == 80
+    assert engine.update(dates[:80], values[:80]) == 0
+    assert engine.update(dates, values) == len(dates) - 80
+
+    fresh = RollingCovariance(SYMBOLS, window=WINDOW, reference="SPY")
+    fresh.update(dates, values)
+    assert_allclose(engine.corr(), fresh.corr(), rtol=0, atol=1e-12, equal_nan=True)
+
+    restated = values.copy()
+    restated[-1] *= 1.01  # last consumed session changed: replay from the start
+    assert engine.update(dates, restated) == len(dates)
+    fresh.reset()
+    fresh.update(dates, restated)
+    assert_allclose(engine.corr(), fresh.corr(), rtol=0, atol=1e-12, equal_nan=True)
+
+
+def test_history_tracks_reference_correlation():
+    closes = random_closes(4)
+    engine = RollingCovariance(SYMBOLS, window=WINDOW, reference="SPY", history=30)
+    engine.update(list(closes.index), closes.to_numpy())
+    assert len(engine.history) == 30
+    last = engine.history[-1]
+    assert last.date == closes.index[-1]
+    assert_allclose(last.reference_corr, engine.corr()[0], equal_nan=True)
+    rows = history_points(engine, ["XLE", "XLB", "NOPE"])
+    assert len(rows) == 30 and set(rows[0]) == {"date", "dispersion", "mean_corr"}
+
+
+def test_window_must_hold_two_bars():
+    with pytest.raises(ValueError):
+        RollingCovariance(SYMBOLS, window=1)
+
+
+def test_ranking_helpers():
+    assert_array_equal(ranks(np.array([0.1, np.nan, 0.3, -0.2])), [2, np.nan, 1, 3])
+    assert dispersion(np.array([0.1, np.nan, 0.3])) == pytest.approx(np.std([0.1, 0.3], ddof=1))
+    assert np.isnan(dispersion(np.array([0.1])))
+    corr = np.array([[1.0, 0.5, np.nan], [0.5, 1.0, 0.1], [np.nan, 0.1, 1.0]])
+    assert mean_pairwise(corr, [0, 1, 2]) == pytest.approx(0.3)
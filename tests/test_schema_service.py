@@ -0,0 +1,61 @@
+"""scripts/schema_service.py: compiled validators and the persistent verdict cache."""
+
+import json
+
+import pytest
+
+from schema_service import SchemaService, backend_id, detect_backend, sha256_bytes
+
+SCHEMA = json.dumps({"type": "object", "required": ["meta"], "properties": {"meta": {"type": "object"}}}).encode("utf-8")
+GOOD = b'{"meta": {}}'
+BAD = b'{"meta": 1}'
+
+needs_backend = pytest.mark.skipif(detect_backend() is None, reason="no JSON Schema backend installed")
+
+
+@needs_backend
+def test_pass_is_cached_and_failure_is_not(tmp_path):
+    service = SchemaService(cache_dir=tmp_path)
+    assert service.check(GOOD, SCHEMA) == ("pass", None)
+    assert service.check(GOOD, SCHEMA) == ("cached", None)
+    assert service.check(BAD, SCHEMA)[0] == "fail"
+    assert service.check(BAD, SCHEMA)[0] == "fail"
+
+    fresh = SchemaService(cache_dir=tmp_path)  # verdicts persist across processes
+    assert fresh.check(GOOD, SCHEMA) == ("cached", None)
+    assert fresh.check(GOOD, SCHEMA, force=True) == ("pass", None)
+
+
+@needs_backend
+def test_verdict_key_includes_backend_and_version(tmp_path):
+    service = SchemaService(cache_dir=tmp_path)
+    service.check(GOOD, SCHEMA)
+    verdicts = json.loads((tmp_path / "verdicts.json").read_text(encoding="utf-8"))
+    assert sha256_bytes(GOOD, SCHEMA, service.backend_id.encode("utf-8")) in verdicts
+    assert sha256_bytes(GOOD, SCHEMA) not in verdicts
+    assert service.backend_id.startswith(f"{service.backend}==")
+
+    upgraded = SchemaService(cache_dir=tmp_path)
+    upgraded._backend_id = f"{upgraded.backend}==0.0.0"  # same backend, other version
+    assert upgraded.check(GOOD, SCHEMA) == ("pass", None)
+
+
+def test_no_backend_skips_without_caching(tmp_path):
+    service = SchemaService(cache_dir=tmp_path, backend=None)
+    assert service.check(GOOD, SCHEMA)[0] == "skipped"
+    assert not (tmp_path / "verdicts.json").exists()
+    assert backend_id(None) == "none"
+
+
+@needs_backend
+def test_disabled_cache_never_hits():
+    service = SchemaService(cache_dir=None)
+    assert service.check(GOOD, SCHEMA) == ("pass", None)
+    assert service.check(GOOD, SCHEMA) == ("pass", None)
+
+
+def test_load_json_parses_once(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_bytes(GOOD)
+    service = SchemaService(cache_dir=None)
+    assert service.load_json(path) is service.load_json(tmp_path / "." / "doc.json")
@@ -0,0 +1,65 @@
+"""utils.spec_index: cached JSON loads and the page -> cards -> symbols index."""
+
+import json
+import os
+
+from utils.spec_index import DEFAULT_BENCH, DEFAULT_ROTATION, card_symbols, load_json_cached, load_spec_index
+
+SPEC = {
+    "dashboard": {
+        "layout": {"pages": [{"id": "overview", "cards": ["status", "credit"]}, {"id": "rotation", "cards": ["radar"]}]},
+        "cards": {
+            "status": {"type": "status_summary"},
+            "credit": {"type": "chart_plus_thresholds", "hyg": "JNK", "period": "1y"},
+            "radar": {"type": "multi_series_chart", "series": [{"indicator": "RS_50D", "symbol": "XLE"}, {"indicator": "PRICE", "symbol": "CL=F"}]},
+        },
+    }
+}
+
+
+def write_repo(root, spec=SPEC):
+    (root / "spec.json").write_text(json.dumps(spec), encoding="utf-8")
+    (root / "manifest_latest.json").write_text(json.dumps({"latest": {"dashboard_spec": "spec.json"}}), encoding="utf-8")
+
+
+def test_card_symbols_include_renderer_defaults():
+    assert card_symbols({"type": "status_summary"}) == [*DEFAULT_ROTATION, "HYG", "LQD", DEFAULT_BENCH]
+    assert card_symbols(SPEC["dashboard"]["cards"]["radar"]) == ["XLE", DEFAULT_BENCH]
+    assert card_symbols({"type": "macro_panel", "symbols": ["^VIX", "^VIX"], "benchmark": "QQQ"}) == ["^VIX", "QQQ"]
+
+
+def test_index_pages_and_universes(tmp_path):
+    write_repo(tmp_path)
+    idx = load_spec_index(tmp_path)
+    assert idx.page_symbols["rotation"] == sorted(["XLE", DEFAULT_BENCH])
+    assert "JNK" in idx.page_symbols["overview"] and "HYG" in idx.page_symbols["overview"]
+    assert idx.universes[("1y", "1d")] == sorted([DEFAULT_BENCH, "JNK", "LQD"])
+    period, interval, syms = idx.universe_for(SPEC["dashboard"]["cards"]["radar"])
+    assert (period, interval) == ("2y", "1d") and "XLE" in syms and "XLB" in syms  # shared with the status card
+
+
+def test_index_is_rebuilt_only_on_content_change(tmp_path):
+    write_repo(tmp_path)
+    first = load_spec_index(tmp_path)
+    assert load_spec_index(tmp_path) is first
+
+    spec_path = tmp_path / "spec.json"
+    st = spec_path.stat()
+    os.utime(spec_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touched, same bytes
+    assert load_spec_index(tmp_path) is first
+
+    changed = json.loads(json.dumps(SPEC))
+    changed["dashboard"]["cards"]["radar"]["symbols"] = ["XLK"]
+    write_repo(tmp_path, changed)
+    second = load_spec_index(tmp_path)
+    assert second is not first and second.card_symbols["radar"] == ["XLK", DEFAULT_BENCH]
+
+
+def test_load_json_cached_skips_reparse_when_only_mtime_moves(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text('{"a": 1}', encoding="utf-8")
+    doc, sha = load_json_cached(path)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    again, sha2 = load_json_cached(path)
+    assert again is doc and sha2 == sha
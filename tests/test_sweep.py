@@ -0,0 +1,82 @@
+"""utils.sweep (prefix-sum cube) must agree with utils.backtest (per-parameter replay)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+from utils.backtest import GREEN, RED, UNKNOWN, PriceMatrix, flip_counts, last_known, rolling_mean, rs_status, run_backtest, sweep
+from utils.sweep import SweepCube, rs_sma_windows, sweep_cube
+
+WINDOWS = [1, 5, 20, 50]
+BANDS = [0.0005, 0.0, 0.0002, 0.0002, 0.002]  # unsorted, with a duplicate
+
+
+def random_rs(seed: int, n: int = 400, symbols: int = 3, gap_rate: float = 0.03) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rs = rng.normal(0.0, 0.004, (n, symbols)) + rng.normal(0.0, 0.001, symbols)
+    rs[rng.random((n, symbols)) < gap_rate] = np.nan
+    rs[0] = np.nan
+    return rs
+
+
+def random_prices(seed: int, n: int = 300) -> PriceMatrix:
+    rng = np.random.default_rng(seed)
+    symbols = ["SPY", "HYG", "LQD", "XLE", "XLB", "CAT"]
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, (n, len(symbols))), axis=0))
+    closes[rng.random(closes.shape) < 0.02] = np.nan
+    return PriceMatrix(dates=pd.bdate_range("2024-01-02", periods=n), symbols=symbols, closes=closes)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_rs_sma_windows_matches_rolling_mean(seed):
+    rs = random_rs(seed)
+    sma = rs_sma_windows(rs, WINDOWS)
+    for i, w in enumerate(WINDOWS):
+        assert_allclose(sma[i], rolling_mean(rs, w), rtol=0, atol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_sweep_cube_matches_backtest(seed):
+    rs = random_rs(seed)
+    cube = sweep_cube(rs, WINDOWS, BANDS, symbols=["A", "B", "C"])
+    for i, w in enumerate(WINDOWS):
+        sma = rolling_mean(rs, w)
+        for j, band in enumerate(BANDS):
+            status = rs_status(sma, band)
+            known = (status != UNKNOWN).sum(axis=0)
+            denom = np.maximum(known, 1)
+            assert_array_equal(cube.flips[i, j], flip_counts(status), err_msg=f"flips w={w} band={band}")
+            assert_allclose(cube.pct_green[i, j], (status == GREEN).sum(axis=0) / denom)
+            assert_allclose(cube.pct_red[i, j], (status == RED).sum(axis=0) / denom)
+            last = last_known(status != UNKNOWN)[-1]
+            expected_last = np.where(last >= 0, status[np.maximum(last, 0), np.arange(status.shape[1])], UNKNOWN)
+            assert_array_equal(cube.status_last[i, j], expected_last)
+
+
+def test_sweep_cube_round_trips_through_npz(tmp_path):
+    cube = sweep_cube(random_rs(5), WINDOWS, BANDS, symbols=["A", "B", "C"])
+    loaded = SweepCube.load(cube.save(tmp_path / "cube.npz"))
+    assert loaded.symbols == cube.symbols
+    for name in ("windows", "bands", "rs_sma_last", "status_last", "pct_green", "pct_red", "flips"):
+        assert_array_equal(getattr(loaded, name), getattr(cube, name))
+    assert cube.heatmap("flips", "B").shape == (len(WINDOWS), len(BANDS))
+
+
+def test_sweep_cube_rejects_negative_bands():
+    with pytest.raises(ValueError):
+        sweep_cube(random_rs(0), [5], [-0.001])
+
+
+def test_parameter_sweep_matches_single_backtests():
+    prices = random_prices(7)
+    rotation = ["XLE", "XLB", "CAT"]
+    windows, bands = [10, 30], [0.0, 0.0005]
+    grid = sweep(prices, rotation, windows, bands, min_rows=40, workers=1)
+    assert len(grid) == len(windows) * len(bands)
+    for row in grid.itertuples():
+        result = run_backtest(prices, rotation, window=row.window, yellow_band=row.yellow_band, min_rows=40)
+        assert row.thesis_flips == flip_counts(result.thesis)[0]
+        assert row.symbol_flips == flip_counts(result.rotation).sum()
+        assert row.pct_green == pytest.approx((result.thesis == GREEN).mean())
+        assert row.pct_unknown == pytest.approx((result.thesis == UNKNOWN).mean())
@@ -0,0 +1,112 @@
+"""scripts/version_diff.py: Merkle subtree hashes, structural diffs and delta application."""
+
+import copy
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from version_diff import DeltaError, SubtreeHasher, apply_delta, diff, make_delta, summarize
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+OLD = {
+    "meta": {"version": "v1.6", "notes": ["a", "b"]},
+    "positions": [{"ticker": "CAT", "target_pct": 25}, {"ticker": "XLE", "target_pct": 10}, {"ticker": "DOW", "target_pct": 6}],
+    "pages": [{"cards": ["thesis_health", "credit_panel", "macro_panel"]}],
+    "thresholds": [1, 2, 3],
+}
+
+
+def new_version():
+    new = copy.deepcopy(OLD)
+    new["meta"]["version"] = "v1.7"
+    new["positions"][0]["target_pct"] = 23
+    del new["positions"][2]
+    new["positions"].append({"ticker": "FCX", "target_pct": 5})
+    new["pages"][0]["cards"].insert(1, "rotation_radar")
+    new["thresholds"] = [1, 3]
+    new["added"] = {"x": None}
+    return new
+
+
+def test_hash_is_canonical_and_structural():
+    h = SubtreeHasher()
+    assert h({"a": 1, "b": [1, {"c": 2}]}) == SubtreeHasher()({"b": [1, {"c": 2}], "a": 1})  # key order ignored
+    assert h([1, 2]) != h([2, 1])
+    assert h({"a": "1"}) != h({"a": 1})
+    assert h({"a": [1]}) != h({"a": "#" + h([1])})  # a digest-looking string is not a subtree
+
+
+def test_identical_documents_have_no_ops():
+    assert diff(OLD, copy.deepcopy(OLD)) == []
+
+
+def test_keyed_and_positional_list_ops():
+    ops = diff(OLD, new_version())
+    lines = summarize(ops)
+    assert "~ meta.version: \"v1.6\" -> \"v1.7\"" in lines
+    assert "~ positions[ticker=CAT].target_pct: 25 -> 23" in lines
+    assert "- positions[ticker=DOW]" in lines
+    assert any(line.startswith("+ positions[2]: ") and "FCX" in line for line in lines)
+    assert "+ pages[0].cards[1]: \"rotation_radar\"" in lines
+    assert "- thresholds[1]: 2" in lines
+    assert "+ added: {\"x\": null}" in lines
+
+
+def test_delta_round_trips_and_leaves_the_input_alone():
+    new = new_version()
+    delta = json.loads(json.dumps(make_delta(OLD, new)))  # survives serialization
+    before = copy.deepcopy(OLD)
+    assert apply_delta(OLD, delta) == new
+    assert OLD == before
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_list_edits_round_trip(seed):
+    rng = random.Random(seed)
+    old = {"items": [rng.randrange(6) for _ in range(rng.randrange(12))], "rows": [{"v": rng.randrange(3)} for _ in range(5)]}
+    new = copy.deepcopy(old)
+    for _ in range(rng.randrange(1, 5)):
+        if new["items"] and rng.random() < 0.5:
+            del new["items"][rng.randrange(len(new["items"]))]
+        else:
+            new["items"].insert(rng.randrange(len(new["items"]) + 1), rng.randrange(6))
+    new["rows"][rng.randrange(5)]["v"] = 9
+    assert apply_delta(old, make_delta(old, new)) == new
+
+
+def test_reordered_keyed_list_falls_back_to_positional():
+    old = {"xs": [{"id": "a", "v": 1}, {"id": "b", "v": 2}]}
+    new = {"xs": [{"id": "b", "v": 2}, {"id": "a", "v": 1}]}
+    assert apply_delta(old, make_delta(old, new)) == new
+
+
+def test_apply_rejects_wrong_base_and_schema():
+    delta = make_delta(OLD, new_version())
+    with pytest.raises(DeltaError):
+        apply_delta(new_version(), delta)
+    with pytest.raises(DeltaError):
+        apply_delta(OLD, {**delta, "schema": "mt.delta.v0"})
+    broken = {**delta, "ops": [{"op": "set", "path": ["nope", "deeper"], "value": 1}]}
+    with pytest.raises(DeltaError):
+        apply_delta(OLD, broken, verify=False)
+
+
+def test_deep_documents_stay_within_the_recursion_limit():
+    old = new = None
+    for i in range(400):
+        old, new = {"n": old, "i": i}, {"n": new, "i": i}
+    new_leaf = new
+    while new_leaf["n"] is not None:
+        new_leaf = new_leaf["n"]
+    new_leaf["i"] = -1
+    assert len(diff(old, new)) == 1
+
+
+def test_real_thesis_versions_round_trip():
+    old = json.loads((REPO_ROOT / "v1.6-JSON_20260118.json").read_text(encoding="utf-8"))
+    new = json.loads((REPO_ROOT / "v1.7-JSON_20260118.json").read_text(encoding="utf-8"))
+    delta = make_delta(old, new)
+    assert delta["ops"] and apply_delta(old, delta) == new